@@ -0,0 +1,6 @@
+# python -m benchmarks: run the whole benchmark suite (see benchmarks/suite.py)
+import sys
+
+from benchmarks.suite import main
+
+sys.exit(main())
@@ -0,0 +1,79 @@
+# Benchmark: computing a derived column with calculator.py
+# Evaluates one formula over N rows of random bindings three ways:
+#   - parse per row:    parse and check the expression again for every row
+#   - compiled per row: compile once (LRU cache), call the function per row
+#   - vectorized:       compile once, one call over NumPy arrays (skipped if
+#                       NumPy is not installed)
+#
+# Usage (from the repository root):
+#   python -m benchmarks.bench_calculator --rows 1000000
+#   python -m benchmarks.bench_calculator --expression "(a + b) ** 2 % c"
+
+import argparse
+import random
+import time
+
+from week_01_python_basics.calculator import CompiledExpression, compile_expression, evaluate_columns
+
+DEFAULT_EXPRESSION = 'price / area + (rooms - 1) * 1500 - age ** 2 // 7 % 100'
+
+
+def make_columns(variables, rows, seed=0):
+    rng = random.Random(seed)
+    return {name: [rng.uniform(1, 1000) for _ in range(rows)] for name in variables}
+
+
+def parse_per_row(source, columns, rows):
+    names = list(columns)
+    return [CompiledExpression(source)({name: columns[name][i] for name in names}) for i in range(rows)]
+
+
+def compiled_per_row(source, columns, rows):
+    expression = compile_expression(source)
+    return list(map(expression.function, *[columns[name] for name in expression.variables]))
+
+
+def vectorized(source, columns, rows):
+    return evaluate_columns(source, columns)
+
+
+def run(source, rows, parse_rows):
+    """Return a list of result dicts, one per method."""
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+    columns = make_columns(compile_expression(source).variables, rows)
+    cases = [('parse per row', parse_per_row, parse_rows, columns),
+             ('compiled per row', compiled_per_row, rows, columns)]
+    if np is not None:
+        cases.append(('vectorized', vectorized, rows, {name: np.array(values) for name, values in columns.items()}))
+
+    results = []
+    for name, func, count, data in cases:
+        data = {key: values[:count] for key, values in data.items()}
+        start = time.perf_counter()
+        func(source, data, count)
+        seconds = time.perf_counter() - start
+        results.append({'name': name, 'rows': count, 'seconds': seconds, 'rows_per_s': count / seconds})
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark derived-column evaluation with calculator.py.')
+    parser.add_argument('--expression', default=DEFAULT_EXPRESSION, help='formula to evaluate')
+    parser.add_argument('--rows', type=int, default=1000000, help='rows for compiled methods (default: 1000000)')
+    parser.add_argument('--parse-rows', type=int, default=50000,
+                        help='rows for the parse-per-row baseline (default: 50000)')
+    args = parser.parse_args(argv)
+
+    results = run(args.expression, args.rows, args.parse_rows)
+    for result in results:
+        print(f'{result["name"]:<17} {result["rows"]:>9,} rows in {result["seconds"]:7.3f} s  '
+              f'{result["rows_per_s"]:>14,.0f} rows/s')
+    if len(results) == 2:
+        print('vectorized: skipped (NumPy is not installed)')
+
+
+if __name__ == '__main__':
+    main()
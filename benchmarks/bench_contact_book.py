@@ -0,0 +1,110 @@
+# Benchmark: contact_book load time, memory per contact and search latency
+# Builds a ContactBook of N synthetic contacts, loaded from a CSV file, and measures:
+#   - load time (CSV -> ContactBook) and contacts per second
+#   - memory per contact (tracemalloc, includes the indexes)
+#   - latency of find_by_email, find_by_name and prefix search
+#
+# Usage (from the repository root):
+#   python -m benchmarks.bench_contact_book --contacts 1000000
+#   python -m benchmarks.bench_contact_book --contacts 5000000
+
+import argparse
+import csv
+import os
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from week_01_python_basics.contact_book import ContactBook
+
+FIRST_NAMES = ['James', 'Mary', 'John', 'Patricia', 'Robert', 'Jennifer', 'Michael', 'Linda', 'William',
+               'Elizabeth', 'David', 'Barbara', 'Richard', 'Susan', 'Joseph', 'Jessica', 'Thomas', 'Sarah',
+               'Charles', 'Karen', 'Aarav', 'Priya', 'Wei', 'Mei', 'Omar', 'Fatima', 'Lucas', 'Sofia']
+LAST_NAMES = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez',
+              'Martinez', 'Sharma', 'Patel', 'Chen', 'Wang', 'Kim', 'Nguyen', 'Khan', 'Silva', 'Rossi']
+
+
+def generate_contacts(path, count, seed=0):
+    """Write `count` synthetic contacts (id,name,email,phone) to a CSV file."""
+    rng = random.Random(seed)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['id', 'name', 'email', 'phone'])
+        for contact_id in range(1, count + 1):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            # A numeric suffix keeps the names fairly distinct, like real data.
+            name = f'{first} {last} {rng.randint(1, count // 10 + 1)}'
+            writer.writerow([contact_id, name, f'{first.lower()}.{last.lower()}{contact_id}@example.com',
+                             f'+1-555-{rng.randint(0, 9999999):07d}'])
+
+
+def time_calls(func, arguments):
+    """Per-call latency in microseconds for each argument."""
+    latencies = []
+    for argument in arguments:
+        start = time.perf_counter()
+        func(argument)
+        latencies.append((time.perf_counter() - start) * 1e6)
+    return latencies
+
+
+def run(path, count, queries=10000, seed=1):
+    """Load `path` into a ContactBook and return a dict of measurements."""
+    start = time.perf_counter()
+    book = ContactBook()
+    book.load_csv(path)
+    book.search('a')  # builds the sorted name index once
+    load_seconds = time.perf_counter() - start
+
+    # Memory is measured on a second load: tracemalloc slows allocation down.
+    del book
+    tracemalloc.start()
+    book = ContactBook()
+    book.load_csv(path)
+    book.search('a')
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    rng = random.Random(seed)
+    sample = [book.get(rng.randint(1, count)) for _ in range(queries)]
+    results = {
+        'contacts': len(book),
+        'load_seconds': load_seconds,
+        'contacts_per_s': len(book) / load_seconds,
+        'bytes_per_contact': memory / len(book),
+    }
+    for name, func, arguments in [
+        ('find_by_email', book.find_by_email, [contact.email.upper() for contact in sample]),
+        ('find_by_name', book.find_by_name, [contact.name for contact in sample]),
+        ('search_prefix', book.search, [contact.name[:rng.randint(2, 8)] for contact in sample]),
+    ]:
+        latencies = sorted(time_calls(func, arguments))
+        results[f'{name}_p50_us'] = statistics.median(latencies)
+        results[f'{name}_p99_us'] = latencies[int(len(latencies) * 0.99)]
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark contact_book load time, memory and search.')
+    parser.add_argument('--contacts', type=int, default=1000000, help='number of contacts (default: 1000000)')
+    args = parser.parse_args(argv)
+
+    fd, path = tempfile.mkstemp(suffix='.csv', prefix='contacts_')
+    os.close(fd)
+    try:
+        print(f'generating {args.contacts} contacts ...')
+        generate_contacts(path, args.contacts)
+        results = run(path, args.contacts)
+    finally:
+        os.remove(path)
+    print(f'loaded {results["contacts"]} contacts in {results["load_seconds"]:.2f} s '
+          f'({results["contacts_per_s"]:,.0f} contacts/s)')
+    print(f'memory per contact: {results["bytes_per_contact"]:.0f} bytes')
+    for name in ('find_by_email', 'find_by_name', 'search_prefix'):
+        print(f'{name:<15} p50 {results[f"{name}_p50_us"]:8.2f} us   p99 {results[f"{name}_p99_us"]:8.2f} us')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+# Benchmark: csv_reader engines vs the stdlib csv module
+# Generates a synthetic, wide house-prices style CSV (default 1 GB) and times
+# reading 3 numeric columns out of it with:
+#   - csv.DictReader           (what most scripts in this repo did before)
+#   - csv.reader               (stdlib, index based)
+#   - read_chunks(engine='csv')
+#   - read_chunks(engine='mmap')
+#
+# Usage (from the repository root):
+#   python -m benchmarks.bench_csv_reader                 # 1 GB file in /tmp
+#   python -m benchmarks.bench_csv_reader --size-mb 100   # quicker run
+
+import argparse
+import csv
+import os
+import random
+import tempfile
+import time
+
+from week_02_files_data_structures.csv_reader import FLOAT, INT, chunk_length, read_chunks
+
+HOUSE_COLUMNS = ['id', 'price', 'area', 'bedrooms', 'bathrooms', 'stories', 'mainroad', 'guestroom',
+                 'basement', 'hotwaterheating', 'airconditioning', 'parking', 'prefarea',
+                 'furnishingstatus', 'year_built', 'lot_size', 'latitude', 'longitude',
+                 'zipcode', 'condition', 'grade', 'sqft_above', 'sqft_basement', 'view']
+READ_COLUMNS = ['price', 'area', 'bedrooms']
+READ_SCHEMA = [('price', FLOAT), ('area', INT), ('bedrooms', INT)]
+
+
+def generate_house_prices(path, size_mb, seed=0):
+    """Write a synthetic house-prices CSV of roughly `size_mb` megabytes."""
+    rng = random.Random(seed)
+    target = size_mb * 1024 * 1024
+    yes_no = ['yes', 'no']
+    furnishing = ['furnished', 'semi-furnished', 'unfurnished']
+    with open(path, 'w', newline='') as f:
+        f.write(','.join(HOUSE_COLUMNS) + '\n')
+        row_id = 0
+        while f.tell() < target:
+            lines = []
+            for _ in range(10000):
+                row_id += 1
+                area = rng.randint(1500, 16000)
+                lines.append(','.join(map(str, [
+                    row_id, round(area * rng.uniform(500, 1200), 2), area, rng.randint(1, 6),
+                    rng.randint(1, 4), rng.randint(1, 4), rng.choice(yes_no), rng.choice(yes_no),
+                    rng.choice(yes_no), rng.choice(yes_no), rng.choice(yes_no), rng.randint(0, 3),
+                    rng.choice(yes_no), rng.choice(furnishing), rng.randint(1900, 2024),
+                    rng.randint(2000, 50000), round(rng.uniform(47.1, 47.8), 6),
+                    round(rng.uniform(-122.5, -121.3), 6), rng.randint(98001, 98199),
+                    rng.randint(1, 5), rng.randint(3, 13), rng.randint(500, 9000),
+                    rng.randint(0, 3000), rng.randint(0, 4),
+                ])))
+            f.write('\n'.join(lines) + '\n')
+    return row_id
+
+
+def read_dictreader(path):
+    rows = 0
+    total = 0.0
+    with open(path, newline='') as f:
+        for row in csv.DictReader(f):
+            total += float(row['price']) + int(row['area']) + int(row['bedrooms'])
+            rows += 1
+    return rows, total
+
+
+def read_stdlib_csv(path):
+    rows = 0
+    total = 0.0
+    with open(path, newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        price, area, bedrooms = (header.index(name) for name in READ_COLUMNS)
+        for row in reader:
+            total += float(row[price]) + int(row[area]) + int(row[bedrooms])
+            rows += 1
+    return rows, total
+
+
+def read_engine(path, engine):
+    rows = 0
+    total = 0.0
+    for chunk in read_chunks(path, columns=READ_COLUMNS, schema=READ_SCHEMA, engine=engine):
+        rows += chunk_length(chunk)
+        total += sum(chunk['price']) + sum(chunk['area']) + sum(chunk['bedrooms'])
+    return rows, total
+
+
+CASES = {
+    'csv.DictReader': read_dictreader,
+    'csv.reader': read_stdlib_csv,
+    'read_chunks(csv)': lambda path: read_engine(path, 'csv'),
+    'read_chunks(mmap)': lambda path: read_engine(path, 'mmap'),
+}
+
+
+def run(path, cases=CASES):
+    """Time every case on `path`, return a list of result dicts."""
+    size = os.path.getsize(path)
+    results = []
+    expected = None
+    for name, func in cases.items():
+        start = time.perf_counter()
+        rows, total = func(path)
+        elapsed = time.perf_counter() - start
+        if expected is None:
+            expected = (rows, total)
+        elif rows != expected[0] or abs(total - expected[1]) > 1e-6 * abs(expected[1]):
+            raise AssertionError(f'{name} returned {rows} rows / {total}, expected {expected}')
+        results.append({'case': name, 'seconds': elapsed, 'rows': rows,
+                        'mb_per_s': size / 1024 / 1024 / elapsed, 'rows_per_s': rows / elapsed})
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark csv_reader engines against the stdlib csv module.')
+    parser.add_argument('--size-mb', type=int, default=1024, help='size of the synthetic file (default: 1024)')
+    parser.add_argument('--path', help='reuse an existing house-prices style CSV instead of generating one')
+    args = parser.parse_args(argv)
+
+    path = args.path
+    cleanup = False
+    if path is None:
+        fd, path = tempfile.mkstemp(suffix='.csv', prefix='house_prices_')
+        os.close(fd)
+        cleanup = True
+        print(f'generating {args.size_mb} MB synthetic file {path} ...')
+        generate_house_prices(path, args.size_mb)
+    try:
+        print(f'{"case":<20} {"seconds":>9} {"MB/s":>9} {"rows/s":>12}')
+        for result in run(path):
+            print(f'{result["case"]:<20} {result["seconds"]:>9.2f} {result["mb_per_s"]:>9.1f} {result["rows_per_s"]:>12,.0f}')
+    finally:
+        if cleanup:
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+# Benchmark: csv_log_analyzer serial vs parallel
+# Generates a synthetic request log and times the serial path against the
+# process pool with an increasing number of workers. Every parallel result is
+# checked against the serial one.
+#
+# With --approx the sketch mode is timed as well and its accuracy against the
+# exact mode is printed.
+#
+# Usage (from the repository root):
+#   python -m benchmarks.bench_log_analyzer --size-mb 500 --workers 1,2,4,8,16,32
+#   python -m benchmarks.bench_log_analyzer --size-mb 100 --approx
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from week_02_files_data_structures.csv_log_analyzer import accuracy, analyze_parallel, analyze_serial, same_results
+
+LEVELS = ['INFO'] * 90 + ['WARN'] * 7 + ['ERROR'] * 3
+STATUSES = ['200'] * 85 + ['201'] * 3 + ['304'] * 4 + ['400'] * 2 + ['404'] * 4 + ['500'] * 2
+ENDPOINTS = [f'/api/v1/resource{i}' for i in range(200)]
+
+
+def generate_log(path, size_mb, users=100000, seed=0):
+    """Write a synthetic CSV request log of roughly `size_mb` megabytes."""
+    rng = random.Random(seed)
+    target = size_mb * 1024 * 1024
+    with open(path, 'w', newline='') as f:
+        f.write('timestamp,level,status,endpoint,user_id,latency_ms\n')
+        second = 1714557600
+        while f.tell() < target:
+            lines = []
+            for _ in range(10000):
+                second += rng.randint(0, 1)
+                # Zipf-like endpoint popularity so top-N is meaningful.
+                endpoint = ENDPOINTS[min(int(rng.paretovariate(1.2)) - 1, len(ENDPOINTS) - 1)]
+                lines.append(f'{second},{rng.choice(LEVELS)},{rng.choice(STATUSES)},{endpoint},'
+                             f'u{rng.randint(1, users)},{rng.lognormvariate(3.5, 0.8):.2f}')
+            f.write('\n'.join(lines) + '\n')
+
+
+def run(path, worker_counts, approx=False):
+    """Time the serial path and each worker count, return a list of result dicts.
+
+    With approx=True each worker count is also run in sketch mode and the
+    result dict gets an 'accuracy' entry (see csv_log_analyzer.accuracy).
+    """
+    size = os.path.getsize(path)
+    start = time.perf_counter()
+    serial = analyze_serial(path)
+    serial_seconds = time.perf_counter() - start
+    results = [{'case': 'serial', 'seconds': serial_seconds, 'rows': serial.rows,
+                'mb_per_s': size / 1024 / 1024 / serial_seconds, 'speedup': 1.0}]
+    for workers in worker_counts:
+        start = time.perf_counter()
+        stats = analyze_parallel(path, workers=workers)
+        seconds = time.perf_counter() - start
+        if not same_results(stats, serial):
+            raise AssertionError(f'{workers} workers: result differs from the serial path')
+        results.append({'case': f'{workers} workers', 'seconds': seconds, 'rows': stats.rows,
+                        'mb_per_s': size / 1024 / 1024 / seconds, 'speedup': serial_seconds / seconds})
+        if approx:
+            start = time.perf_counter()
+            sketched = analyze_parallel(path, workers=workers, approx=True)
+            seconds = time.perf_counter() - start
+            results.append({'case': f'{workers} approx', 'seconds': seconds, 'rows': sketched.rows,
+                            'mb_per_s': size / 1024 / 1024 / seconds, 'speedup': serial_seconds / seconds,
+                            'accuracy': accuracy(sketched, serial)})
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark csv_log_analyzer serial vs parallel.')
+    parser.add_argument('--size-mb', type=int, default=200, help='size of the synthetic log (default: 200)')
+    parser.add_argument('--workers', default='2,4,8', help='comma separated worker counts (default: 2,4,8)')
+    parser.add_argument('--path', help='reuse an existing log instead of generating one')
+    parser.add_argument('--approx', action='store_true', help='also time sketch mode and report its accuracy')
+    args = parser.parse_args(argv)
+
+    path = args.path
+    cleanup = False
+    if path is None:
+        fd, path = tempfile.mkstemp(suffix='.csv', prefix='access_log_')
+        os.close(fd)
+        cleanup = True
+        print(f'generating {args.size_mb} MB synthetic log {path} ...')
+        generate_log(path, args.size_mb)
+    try:
+        print(f'{"case":<12} {"seconds":>9} {"MB/s":>9} {"speedup":>8}')
+        for result in run(path, [int(n) for n in args.workers.split(',')], args.approx):
+            print(f'{result["case"]:<12} {result["seconds"]:>9.2f} {result["mb_per_s"]:>9.1f} {result["speedup"]:>7.2f}x')
+            if 'accuracy' in result:
+                errors = result['accuracy']
+                percentiles = ', '.join(f'{name} {error:.2%}' for name, error in errors['latency_percentiles'].items())
+                print(f'{"":<12} distinct users error {errors["distinct_users"]:.2%}, '
+                      f'top-10 recall {errors["top_keys_recall"]:.0%}, latency error {percentiles}')
+    finally:
+        if cleanup:
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
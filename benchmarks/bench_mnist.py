@@ -0,0 +1,123 @@
+# Benchmark: MNIST input pipeline, images per second per epoch (CPU)
+# Compares the notebook's per-image pipeline with the memory-mapped one:
+#   per-image      -> every image decoded from the IDX bytes, converted to
+#                     float and normalized one by one, batches collated from
+#                     single samples (like ToTensor + Normalize + DataLoader)
+#   memmap uint8   -> MNISTMemmap batches, normalized once per batch
+#   memmap float16 -> MNISTMemmap batches stored already normalized
+# Each case is measured for loading only and for a full training epoch.
+#
+# If data/mnist has no IDX files, synthetic ones with the MNIST shapes are
+# generated in a temporary directory (throughput does not depend on content).
+#
+# Usage (from the repository root):
+#   python -m benchmarks.bench_mnist
+#   python -m benchmarks.bench_mnist --images 60000 --workers 0,2,4 --mode load
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import torch
+from torch.utils.data import DataLoader, Dataset
+
+from week_07_deep_learning.mnist_data import (MNIST_MEAN, MNIST_STD, RAW_DIR, RAW_FILES, MNISTMemmap, find_raw,
+                                              make_loader, preprocess, read_idx, write_idx)
+from week_07_deep_learning.mnist_model import MNISTNet, train_epoch
+
+
+class PerImageDataset(Dataset):
+    """The 'before' pipeline: one image decoded and transformed per __getitem__."""
+
+    def __init__(self, raw_dir):
+        images_path, labels_path = (find_raw(raw_dir, name) for name in RAW_FILES['train'])
+        images = read_idx(images_path)
+        self.labels = read_idx(labels_path)
+        self.shape = images.shape[1:]
+        self.raw = images.tobytes()  # the encoded file contents, decoded per image below
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __getitem__(self, index):
+        size = self.shape[0] * self.shape[1]
+        pixels = np.frombuffer(self.raw, dtype=np.uint8, count=size, offset=index * size).reshape(self.shape)
+        image = torch.tensor(pixels, dtype=torch.float32).div(255).unsqueeze(0)
+        return (image - MNIST_MEAN) / MNIST_STD, int(self.labels[index])
+
+
+def generate_raw(directory, images, seed=0):
+    """Write synthetic train IDX files with MNIST shapes."""
+    rng = np.random.default_rng(seed)
+    os.makedirs(directory, exist_ok=True)
+    write_idx(os.path.join(directory, RAW_FILES['train'][0]), rng.integers(0, 256, (images, 28, 28), dtype=np.uint8))
+    write_idx(os.path.join(directory, RAW_FILES['train'][1]), rng.integers(0, 10, images, dtype=np.uint8))
+
+
+def measure(loader, mode):
+    if mode == 'load':
+        seen = 0
+        start = time.perf_counter()
+        for images, labels in loader:
+            seen += len(labels)
+        return seen / (time.perf_counter() - start)
+    torch.manual_seed(0)
+    model = MNISTNet()
+    optimizer = torch.optim.SGD(model.parameters(), lr=0.01)
+    return train_epoch(model, loader, optimizer)[1]
+
+
+def run(raw_dir, cache_dir, batch_size, worker_counts, modes):
+    """Return a list of result dicts, one per (pipeline, workers, mode)."""
+    for dtype in ('uint8', 'float16'):
+        preprocess('train', raw_dir, cache_dir, dtype)
+    results = []
+    for mode in modes:
+        baseline = PerImageDataset(raw_dir)
+        loader = DataLoader(baseline, batch_size=batch_size, shuffle=True, num_workers=0)
+        results.append({'name': 'per-image', 'workers': 0, 'mode': mode, 'images_per_s': measure(loader, mode)})
+        for dtype in ('uint8', 'float16'):
+            dataset = MNISTMemmap('train', cache_dir, dtype)
+            for workers in worker_counts:
+                loader = make_loader(dataset, batch_size, shuffle=True, workers=workers)
+                # Warm-up epoch: starts the persistent workers and pages the file in.
+                for _ in loader:
+                    pass
+                results.append({'name': f'memmap {dtype}', 'workers': workers, 'mode': mode,
+                                'images_per_s': measure(loader, mode)})
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark MNIST input pipelines on CPU.')
+    parser.add_argument('--raw-dir', default=RAW_DIR, help='directory with MNIST IDX files')
+    parser.add_argument('--images', type=int, default=60000, help='synthetic images if no IDX files (default: 60000)')
+    parser.add_argument('--batch-size', type=int, default=256)
+    parser.add_argument('--workers', default='0,2', help='comma separated worker counts (default: 0,2)')
+    parser.add_argument('--mode', choices=['load', 'train', 'both'], default='both')
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix='bench_mnist_')
+    try:
+        raw_dir = args.raw_dir
+        try:
+            find_raw(raw_dir, RAW_FILES['train'][0])
+        except FileNotFoundError:
+            raw_dir = os.path.join(workdir, 'raw')
+            print(f'no MNIST files in {args.raw_dir}: generating {args.images} synthetic images')
+            generate_raw(raw_dir, args.images)
+        modes = ['load', 'train'] if args.mode == 'both' else [args.mode]
+        results = run(raw_dir, os.path.join(workdir, 'cache'), args.batch_size,
+                      [int(value) for value in args.workers.split(',')], modes)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    for result in results:
+        print(f'{result["mode"]:<6} {result["name"]:<15} workers={result["workers"]}  '
+              f'{result["images_per_s"]:>12,.0f} images/s')
+
+
+if __name__ == '__main__':
+    main()
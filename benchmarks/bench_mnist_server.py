@@ -0,0 +1,109 @@
+# Benchmark: MNIST inference server under concurrent load (CPU)
+# Starts mnist_server in-process on a free port and runs a closed-loop load
+# generator against it: `clients` keep-alive connections, each sending its next
+# request as soon as the previous reply arrives. Reports requests/s and the
+# p50/p99 latency seen by the clients for:
+#   unbatched   -> max_batch_size=1, float32, eager (one forward pass per request)
+#   batched     -> micro-batches, float32, eager
+#   optimized   -> micro-batches, int8 dynamic quantization + TorchScript
+#
+# The model has random weights unless --model is given (speed does not depend
+# on the weights).
+#
+# Usage (from the repository root):
+#   python -m benchmarks.bench_mnist_server
+#   python -m benchmarks.bench_mnist_server --clients 1,16,64 --requests 4000 --max-latency-ms 2
+
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from week_07_deep_learning.mnist_server import (DEFAULT_MAX_BATCH_SIZE, DEFAULT_MAX_LATENCY_MS, IMAGE_BYTES,
+                                                load_model, serve)
+
+CASES = {
+    'unbatched': {'batch': False, 'quantize': False, 'script': False},
+    'batched': {'batch': True, 'quantize': False, 'script': False},
+    'optimized': {'batch': True, 'quantize': True, 'script': True},
+}
+
+
+async def client(host, port, bodies, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for body in bodies:
+            start = time.perf_counter()
+            writer.write(b'POST /predict HTTP/1.1\r\nHost: bench\r\nContent-Type: application/octet-stream\r\n'
+                         b'Content-Length: %d\r\n\r\n' % len(body) + body)
+            await writer.drain()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                if line.lower().startswith(b'content-length:'):
+                    length = int(line.split(b':')[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+async def load_test(model, clients, requests, max_batch_size, max_latency_ms, seed=0):
+    """Serve `model` on a free port and send `requests` requests from `clients` connections."""
+    rng = np.random.default_rng(seed)
+    bodies = [rng.integers(0, 256, IMAGE_BYTES, dtype=np.uint8).tobytes() for _ in range(64)]
+    ready = asyncio.get_running_loop().create_future()
+    server = asyncio.create_task(serve(model, '127.0.0.1', 0, max_batch_size, max_latency_ms, ready=ready))
+    port = await ready
+    per_client = [[bodies[(c + i) % len(bodies)] for i in range(c, requests, clients)] for c in range(clients)]
+    await client('127.0.0.1', port, bodies[:8], [])  # warm-up
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client('127.0.0.1', port, work, latencies) for work in per_client))
+    seconds = time.perf_counter() - start
+    server.cancel()
+    try:
+        await server
+    except asyncio.CancelledError:
+        pass
+    latencies = np.array(latencies) * 1000
+    return {'requests_per_s': len(latencies) / seconds,
+            'p50_ms': float(np.percentile(latencies, 50)), 'p99_ms': float(np.percentile(latencies, 99))}
+
+
+def run(client_counts, requests, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_latency_ms=DEFAULT_MAX_LATENCY_MS,
+        model_path=None, cases=tuple(CASES)):
+    """Return a list of result dicts, one per (case, clients)."""
+    results = []
+    for name in cases:
+        case = CASES[name]
+        model, applied = load_model(model_path, quantize=case['quantize'], script=case['script'])
+        for clients in client_counts:
+            result = asyncio.run(load_test(model, clients, requests,
+                                           max_batch_size if case['batch'] else 1, max_latency_ms))
+            results.append({'name': name, 'clients': clients, 'optimizations': applied, **result})
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load-test the MNIST inference server.')
+    parser.add_argument('--clients', default='1,8,64', help='comma separated concurrent clients (default: 1,8,64)')
+    parser.add_argument('--requests', type=int, default=2000, help='requests per run (default: 2000)')
+    parser.add_argument('--max-batch-size', type=int, default=DEFAULT_MAX_BATCH_SIZE)
+    parser.add_argument('--max-latency-ms', type=float, default=DEFAULT_MAX_LATENCY_MS)
+    parser.add_argument('--model', help='state_dict from mnist_model.py --save (default: random weights)')
+    parser.add_argument('--cases', default=','.join(CASES), help=f'comma separated subset of {",".join(CASES)}')
+    args = parser.parse_args(argv)
+
+    results = run([int(value) for value in args.clients.split(',')], args.requests, args.max_batch_size,
+                  args.max_latency_ms, args.model, args.cases.split(','))
+    for result in results:
+        print(f'{result["name"]:<10} clients={result["clients"]:<4} {result["requests_per_s"]:>9,.0f} req/s  '
+              f'p50 {result["p50_ms"]:>7.2f} ms  p99 {result["p99_ms"]:>7.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+# Benchmark: drawing large series and point clouds to PNG (matplotlib Agg)
+#   line    raw      -> ax.plot() of every point
+#   line    lttb     -> line_plot(): LTTB down to 2 points per pixel column
+#   line    minmax   -> line_plot(method='minmax')
+#   scatter raw      -> ax.scatter() of every point
+#   scatter hist2d   -> density_plot(): np.bincount grid drawn with pcolormesh
+#   scatter hexbin   -> density_plot(kind='hexbin') over pre-binned counts
+#   cached           -> RenderCache.render() of an unchanged figure (fingerprint + file check)
+# Times include creating the figure and writing the PNG.
+#
+# Usage (from the repository root):
+#   python -m benchmarks.bench_plot_helpers
+#   python -m benchmarks.bench_plot_helpers --points 10000000 --raw-limit 1000000
+
+import argparse
+import io
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from week_05_visualization.plot_helpers import DEFAULT_DPI, DEFAULT_FIGSIZE, RenderCache, density_plot, line_plot
+
+
+def make_series(points, seed=0):
+    """Minute temperatures: yearly and daily cycles plus noise and a few spikes."""
+    rng = np.random.default_rng(seed)
+    minutes = np.arange(points)
+    values = (10 + 8 * np.sin(minutes * 2 * np.pi / 525600) + 4 * np.sin(minutes * 2 * np.pi / 1440)
+              + rng.standard_normal(points))
+    values[rng.integers(0, points, 10)] += 25
+    return np.datetime64('2000-01-01T00:00') + minutes.astype('timedelta64[m]'), values
+
+
+def timed(draw):
+    from matplotlib.figure import Figure
+
+    start = time.perf_counter()
+    fig = Figure(figsize=DEFAULT_FIGSIZE, dpi=DEFAULT_DPI)
+    draw(fig.add_subplot())
+    fig.savefig(io.BytesIO(), format='png')
+    return time.perf_counter() - start
+
+
+def draw_cached(fig, data):
+    line_plot(fig.add_subplot(), data['time'], data['value'])
+
+
+def run(points, raw_limit):
+    """Return a list of result dicts; raw cases run on at most raw_limit points."""
+    times, values = make_series(points)
+    rng = np.random.default_rng(1)
+    x = rng.standard_normal(points)
+    y = 0.5 * x + rng.standard_normal(points)
+    raw = min(points, raw_limit)
+    cases = [
+        ('line', 'raw', raw, lambda ax: ax.plot(times[:raw], values[:raw])),
+        ('line', 'lttb', points, lambda ax: line_plot(ax, times, values)),
+        ('line', 'minmax', points, lambda ax: line_plot(ax, times, values, method='minmax')),
+        ('scatter', 'raw', raw, lambda ax: ax.scatter(x[:raw], y[:raw], s=1)),
+        ('scatter', 'hist2d', points, lambda ax: density_plot(ax, x, y)),
+        ('scatter', 'hexbin', points, lambda ax: density_plot(ax, x, y, kind='hexbin')),
+    ]
+    results = []
+    for plot, name, n, draw in cases:
+        seconds = timed(draw)
+        results.append({'plot': plot, 'name': name, 'points': n, 'seconds': seconds, 'points_per_s': n / seconds})
+
+    cache_dir = tempfile.mkdtemp(prefix='bench_plots_')
+    try:
+        cache = RenderCache(cache_dir)
+        data = {'time': times, 'value': values}
+        cache.render(draw_cached, data)
+        start = time.perf_counter()
+        cache.render(draw_cached, data)
+        seconds = time.perf_counter() - start
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    results.append({'plot': 'line', 'name': 'cached', 'points': points, 'seconds': seconds,
+                    'points_per_s': points / seconds})
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark large line and scatter plots.')
+    parser.add_argument('--points', type=int, default=2_000_000, help='points per plot (default: 2000000)')
+    parser.add_argument('--raw-limit', type=int, default=1_000_000,
+                        help='points given to the raw matplotlib cases (default: 1000000)')
+    args = parser.parse_args(argv)
+
+    for result in run(args.points, args.raw_limit):
+        print(f'{result["plot"]:<8} {result["name"]:<7} {result["points"]:>11,} points  {result["seconds"]:8.3f} s  '
+              f'{result["points_per_s"]:>14,.0f} points/s')
+
+
+if __name__ == '__main__':
+    main()
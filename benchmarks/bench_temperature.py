@@ -0,0 +1,81 @@
+# Benchmark: rolling windows in temperature_analysis vs Python loops
+# A synthetic per-minute temperature series (daily cycle + noise + a few
+# spikes) is processed three ways:
+#   - python loop:  statistics of each window recomputed in Python
+#   - vectorized:   rolling_stats() over the whole series
+#   - streaming:    RollingWindow.update() over chunks of the series
+#
+# Usage (from the repository root):
+#   python -m benchmarks.bench_temperature                     # 10M points, 1 day window
+#   python -m benchmarks.bench_temperature --points 1000000 --window 60
+
+import argparse
+import time
+
+import numpy as np
+
+from week_03_numpy.temperature_analysis import RollingWindow, rolling_stats
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def make_series(points, seed=0):
+    rng = np.random.default_rng(seed)
+    minutes = np.arange(points)
+    values = 12 + 8 * np.sin(minutes / MINUTES_PER_DAY * 2 * np.pi) + rng.normal(0, 0.5, points)
+    values[rng.integers(0, points, max(1, points // 100000))] += 25
+    values[rng.random(points) < 0.001] = np.nan  # sensor gaps
+    return values
+
+
+def python_loop(values, window):
+    values = values.tolist()
+    means, lows, highs = [], [], []
+    for i in range(len(values)):
+        present = [value for value in values[max(0, i - window + 1):i + 1] if value == value]
+        means.append(sum(present) / len(present) if present else None)
+        lows.append(min(present, default=None))
+        highs.append(max(present, default=None))
+    return means
+
+
+def vectorized(values, window):
+    return rolling_stats(values, window)
+
+
+def streaming(values, window, chunk_size=1 << 20):
+    rolling = RollingWindow(window)
+    for start in range(0, len(values), chunk_size):
+        rolling.update(values[start:start + chunk_size])
+
+
+def run(points, window, loop_points):
+    """Return a list of result dicts, one per method."""
+    values = make_series(points)
+    results = []
+    for name, func, count in [('python loop', python_loop, loop_points), ('vectorized', vectorized, points),
+                              ('streaming', streaming, points)]:
+        if count <= 0:
+            continue
+        start = time.perf_counter()
+        func(values[:count], window)
+        seconds = time.perf_counter() - start
+        results.append({'name': name, 'points': count, 'seconds': seconds, 'points_per_s': count / seconds})
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark rolling window statistics.')
+    parser.add_argument('--points', type=int, default=10000000, help='series length (default: 10000000)')
+    parser.add_argument('--window', type=int, default=MINUTES_PER_DAY, help='window length (default: 1440)')
+    parser.add_argument('--loop-points', type=int, default=5000,
+                        help='points for the Python loop baseline, 0 to skip (default: 5000)')
+    args = parser.parse_args(argv)
+
+    for result in run(args.points, args.window, args.loop_points):
+        print(f'{result["name"]:<12} {result["points"]:>11,} points in {result["seconds"]:7.3f} s  '
+              f'{result["points_per_s"]:>14,.0f} points/s')
+
+
+if __name__ == '__main__':
+    main()
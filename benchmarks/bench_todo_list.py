@@ -0,0 +1,101 @@
+# Benchmark: TaskQueue (heap + lazy deletion) vs re-sorting a list
+# Runs a stream of mixed operations against the queue:
+#   40% add, 20% pop next task, 20% complete by id, 20% reprioritise by id
+# and reports operations per second. The naive baseline keeps a plain list and
+# sorts it on every operation, the way the job queue worked before; it is only
+# run on a small number of operations because its cost grows with the list.
+#
+# Usage (from the repository root):
+#   python -m benchmarks.bench_todo_list                   # 1M operations
+#   python -m benchmarks.bench_todo_list --ops 200000 --naive-ops 20000
+
+import argparse
+import random
+import time
+
+from week_01_python_basics.todo_list import NO_DUE_DATE, Task, TaskQueue
+
+
+def make_operations(count, seed=0):
+    """A reproducible list of (operation, priority, due) tuples."""
+    rng = random.Random(seed)
+    operations = []
+    for _ in range(count):
+        roll = rng.random()
+        operation = 'add' if roll < 0.4 else 'pop' if roll < 0.6 else 'complete' if roll < 0.8 else 'update'
+        operations.append((operation, rng.randint(1, 5), f'2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}'))
+    return operations
+
+
+def run_queue(operations, seed=1):
+    rng = random.Random(seed)
+    queue = TaskQueue()
+    live = []  # ids for picking random targets; stale ids are skipped
+    for operation, priority, due in operations:
+        if operation == 'add' or not queue:
+            live.append(queue.add('task', priority, due).id)
+        elif operation == 'pop':
+            queue.pop()
+        else:
+            index = rng.randrange(len(live))
+            task_id = live[index]
+            if task_id not in queue:
+                live[index] = live[-1]
+                live.pop()
+                continue
+            if operation == 'complete':
+                queue.complete(task_id)
+            else:
+                queue.update(task_id, priority=priority)
+    return len(queue)
+
+
+def run_naive(operations, seed=1):
+    rng = random.Random(seed)
+    tasks = []
+    next_id = 1
+    for operation, priority, due in operations:
+        if operation == 'add' or not tasks:
+            tasks.append(Task(next_id, 'task', priority, due))
+            next_id += 1
+        elif operation == 'pop':
+            tasks.pop(0)
+        elif operation == 'complete':
+            tasks.pop(rng.randrange(len(tasks)))
+        else:
+            tasks[rng.randrange(len(tasks))].priority = priority
+        tasks.sort(key=lambda task: (task.priority, task.due or NO_DUE_DATE, task.id))
+    return len(tasks)
+
+
+def timed(func, operations):
+    start = time.perf_counter()
+    remaining = func(operations)
+    seconds = time.perf_counter() - start
+    return {'ops': len(operations), 'seconds': seconds, 'ops_per_s': len(operations) / seconds,
+            'remaining': remaining}
+
+
+def run(ops, naive_ops):
+    """Return a list of result dicts, one per implementation."""
+    results = []
+    for name, func, count in [('TaskQueue', run_queue, ops), ('sorted list', run_naive, naive_ops)]:
+        if count > 0:
+            results.append(dict(timed(func, make_operations(count)), name=name))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark TaskQueue against a re-sorted list.')
+    parser.add_argument('--ops', type=int, default=1000000, help='operations for TaskQueue (default: 1000000)')
+    parser.add_argument('--naive-ops', type=int, default=20000,
+                        help='operations for the naive list, 0 to skip (default: 20000)')
+    args = parser.parse_args(argv)
+
+    for result in run(args.ops, args.naive_ops):
+        print(f'{result["name"]:<12} {result["ops"]:>9,} ops in {result["seconds"]:7.2f} s  '
+              f'{result["ops_per_s"]:>12,.0f} ops/s  ({result["remaining"]:,} tasks left)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+# Synthetic datasets for the benchmark suite
+# CSV files with the schemas of the repository's data files, at any row count:
+#   titanic       -> data/titanic.csv (Kaggle columns, missing Age/Cabin/Embarked)
+#   house_prices  -> data/house_prices.csv (Housing.csv columns, yes/no flags)
+#   temperatures  -> data/temperatures.csv (date,temperature; one row per minute)
+#   access_log    -> request log read by csv_log_analyzer.py
+#   contacts      -> id,name,email,phone as read by contact_book.py
+#
+# Files are generated once per (dataset, rows) and kept in
+# data/.cache/benchmarks, so repeated suite runs read identical data.
+#
+# Usage (from the repository root):
+#   python -m benchmarks.datasets titanic 1000000
+#   python -m benchmarks.datasets temperatures 10m --directory /tmp/bench
+
+import argparse
+import os
+
+import numpy as np
+
+from benchmarks.bench_contact_book import generate_contacts
+from benchmarks.bench_log_analyzer import ENDPOINTS, LEVELS, STATUSES
+from week_02_files_data_structures.column_cache import DATA_DIR
+
+DEFAULT_DIRECTORY = os.path.join(DATA_DIR, '.cache', 'benchmarks')
+GENERATOR_VERSION = 1  # bump when a generator changes, so old files are not reused
+BLOCK_ROWS = 100000
+SIZES = {'10k': 10_000, '1m': 1_000_000, '10m': 10_000_000}
+
+TITANIC_COLUMNS = ['PassengerId', 'Survived', 'Pclass', 'Name', 'Sex', 'Age', 'SibSp', 'Parch', 'Ticket', 'Fare',
+                   'Cabin', 'Embarked']
+HOUSE_COLUMNS = ['price', 'area', 'bedrooms', 'bathrooms', 'stories', 'mainroad', 'guestroom', 'basement',
+                 'hotwaterheating', 'airconditioning', 'parking', 'prefarea', 'furnishingstatus']
+SURNAMES = ['Smith', 'Brown', 'Kelly', 'Andersson', 'Sage', 'Johnson', 'Goodwin', 'Carter', 'Skoog', 'Rice']
+FIRST_NAMES = ['John', 'William', 'Mary', 'Anna', 'Elizabeth', 'Charles', 'Margaret', 'Thomas', 'Helen', 'Karl']
+TITLES = ['Mr', 'Mrs', 'Miss', 'Master', 'Dr', 'Rev', 'Mlle', 'Col']
+TITLE_WEIGHTS = [0.58, 0.14, 0.2, 0.045, 0.01, 0.01, 0.005, 0.01]
+
+
+def parse_rows(text):
+    """Row count from '10k', '1m', '10m' or a plain number."""
+    text = str(text).lower().replace('_', '')
+    if text in SIZES:
+        return SIZES[text]
+    for suffix, factor in (('k', 1_000), ('m', 1_000_000)):
+        if text.endswith(suffix):
+            return int(float(text[:-1]) * factor)
+    return int(text)
+
+
+def _write_blocks(path, header, rows, make_lines, seed):
+    """Write `header`, then make_lines(rng, start, count) for blocks of BLOCK_ROWS rows."""
+    rng = np.random.default_rng(seed)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        f.write(','.join(header) + '\n')
+        for start in range(0, rows, BLOCK_ROWS):
+            lines = make_lines(rng, start, min(BLOCK_ROWS, rows - start))
+            f.write('\n'.join(lines) + '\n')
+
+
+def _with_missing(rng, values, fraction):
+    values = values.astype(object)
+    values[rng.random(len(values)) < fraction] = ''
+    return values
+
+
+def generate_titanic(path, rows, seed=0):
+    def make_lines(rng, start, count):
+        pclass = rng.choice([1, 2, 3], count, p=[0.24, 0.21, 0.55])
+        title = rng.choice(TITLES, count, p=TITLE_WEIGHTS)
+        female = np.isin(title, ['Mrs', 'Miss', 'Mlle'])
+        survived = (rng.random(count) < np.where(female, 0.74, 0.19)).astype(int)
+        age = _with_missing(rng, np.round(np.clip(rng.normal(30, 14, count), 0.42, 80), 1), 0.2)
+        fare = np.round(rng.lognormal(2.6, 1.0, count) * (4 - pclass) / 2, 4)
+        cabin = _with_missing(rng, np.char.add(rng.choice(list('ABCDEF'), count), rng.integers(1, 130, count)
+                                               .astype(str)), 0.77)
+        embarked = _with_missing(rng, rng.choice(['S', 'C', 'Q'], count, p=[0.72, 0.19, 0.09]), 0.002)
+        surname = rng.choice(SURNAMES, count)
+        first = rng.choice(FIRST_NAMES, count)
+        return [f'{start + i + 1},{survived[i]},{pclass[i]},"{surname[i]}, {title[i]}. {first[i]}",'
+                f'{"female" if female[i] else "male"},{age[i]},{sibsp},{parch},{ticket},{fare[i]},{cabin[i]},'
+                f'{embarked[i]}'
+                for i, sibsp, parch, ticket in zip(range(count), rng.poisson(0.5, count).tolist(),
+                                                   rng.poisson(0.4, count).tolist(),
+                                                   rng.integers(100000, 999999, count).tolist())]
+
+    _write_blocks(path, TITANIC_COLUMNS, rows, make_lines, seed)
+
+
+def generate_house_prices(path, rows, seed=0):
+    def make_lines(rng, start, count):
+        area = rng.integers(1650, 16200, count)
+        bedrooms = rng.integers(1, 7, count)
+        flags = np.where(rng.random((count, 6)) < [0.86, 0.18, 0.35, 0.05, 0.32, 0.23], 'yes', 'no')
+        furnishing = rng.choice(['furnished', 'semi-furnished', 'unfurnished'], count)
+        price = (area * 400 + bedrooms * 250000 + (flags == 'yes') @ np.array([400000, 300000, 350000, 800000,
+                                                                              850000, 600000])
+                 + rng.normal(0, 900000, count)).round(-3).astype(np.int64)
+        columns = [price, area, bedrooms, rng.integers(1, 5, count), rng.integers(1, 5, count), *flags.T[:5],
+                   rng.integers(0, 4, count), flags[:, 5], furnishing]
+        return [','.join(map(str, row)) for row in zip(*(column.tolist() for column in columns))]
+
+    _write_blocks(path, HOUSE_COLUMNS, rows, make_lines, seed)
+
+
+def generate_temperatures(path, rows, seed=0):
+    def make_lines(rng, start, count):
+        minutes = np.arange(start, start + count)
+        values = (11 + 9 * np.sin(minutes * 2 * np.pi / 525960) + 4 * np.sin(minutes * 2 * np.pi / 1440)
+                  + rng.normal(0, 0.6, count))
+        values[rng.random(count) < 1e-5] += 20  # spikes
+        times = (np.datetime64('2000-01-01T00:00') + minutes.astype('timedelta64[m]')).astype(str)
+        text = _with_missing(rng, np.round(values, 2), 0.001)  # sensor gaps
+        return [f'{time[:10]} {time[11:16]},{value}' for time, value in zip(times.tolist(), text.tolist())]
+
+    _write_blocks(path, ['date', 'temperature'], rows, make_lines, seed)
+
+
+def generate_access_log(path, rows, seed=0, users=100000):
+    def make_lines(rng, start, count):
+        seconds = 1714557600 + start // 2 + np.cumsum(rng.integers(0, 2, count))
+        endpoints = np.minimum(rng.pareto(1.2, count).astype(np.int64), len(ENDPOINTS) - 1)
+        levels = rng.choice(LEVELS, count)
+        statuses = rng.choice(STATUSES, count)
+        user_ids = rng.integers(1, users + 1, count)
+        latency = rng.lognormal(3.5, 0.8, count)
+        return [f'{second},{level},{status},{ENDPOINTS[endpoint]},u{user},{ms:.2f}'
+                for second, level, status, endpoint, user, ms in zip(seconds.tolist(), levels.tolist(),
+                                                                     statuses.tolist(), endpoints.tolist(),
+                                                                     user_ids.tolist(), latency.tolist())]
+
+    _write_blocks(path, ['timestamp', 'level', 'status', 'endpoint', 'user_id', 'latency_ms'], rows, make_lines,
+                  seed)
+
+
+GENERATORS = {
+    'titanic': generate_titanic,
+    'house_prices': generate_house_prices,
+    'temperatures': generate_temperatures,
+    'access_log': generate_access_log,
+    'contacts': generate_contacts,
+}
+
+
+def dataset_path(name, rows, directory=DEFAULT_DIRECTORY):
+    """Path of the synthetic `name` dataset with `rows` rows, generated on first use."""
+    if name not in GENERATORS:
+        raise ValueError(f'unknown dataset {name!r}, expected one of: {", ".join(GENERATORS)}')
+    path = os.path.join(directory, f'{name}_{rows}_v{GENERATOR_VERSION}.csv')
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        GENERATORS[name](tmp_path, rows)
+        os.replace(tmp_path, path)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate a synthetic benchmark dataset.')
+    parser.add_argument('name', choices=list(GENERATORS))
+    parser.add_argument('rows', help="row count, e.g. 10000, 10k, 1m, 10m")
+    parser.add_argument('--directory', default=DEFAULT_DIRECTORY)
+    args = parser.parse_args(argv)
+    path = dataset_path(args.name, parse_rows(args.rows), args.directory)
+    print(f'{path} ({os.path.getsize(path) / 1e6:.1f} MB)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,486 @@
+# Benchmark suite - every data path in the repository, one command
+# Runs each case on synthetic datasets (benchmarks/datasets.py) at one or
+# more sizes and records, per case and size:
+#   seconds       wall time of the timed part (setup such as generating
+#                 todo operations is excluded)
+#   items_per_s   rows (or operations) processed per second
+#   peak_rss_mb   peak resident memory of the process that ran the case,
+#                 including the interpreter and imports
+#   case_rss_mb   how far that peak rose above the memory the process had
+#                 just before the case started: the case's own imports, data
+#                 and work, without the interpreter and the suite itself
+# Every case runs in a fresh interpreter, so peak memory belongs to that case
+# alone and no case warms caches for another. The child imports only this
+# file's standard library modules before measuring the baseline; the datasets
+# module (numpy) and the case's modules are imported by the case. Results are
+# written as JSON; --compare checks them against an earlier file and flags
+# every case that got slower (or bigger, by case_rss_mb) by more than
+# --threshold. Times under MIN_SECONDS and memory under MIN_MEMORY_MB are
+# noise and are not compared. The exit status is 1 when something regressed,
+# so the suite can gate a CI job.
+#
+# Cases whose optional dependency (pandas, scikit-learn, matplotlib, torch) is
+# not installed are reported as skipped. The MNIST cases generate their own
+# synthetic images (at most 60,000, the size of the MNIST training set) and
+# send at most 5,000 requests to the inference server.
+#
+# Usage (from the repository root):
+#   python -m benchmarks                                   # 10k and 1m rows
+#   python -m benchmarks --sizes 10k,1m,10m --output before.json
+#   python -m benchmarks --compare before.json --threshold 0.1
+#   python -m benchmarks --cases csv_reader.mmap,todo_list.queue --repeat 3
+#   python -m benchmarks --list
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+DEFAULT_SIZES = '10k,1m'
+DEFAULT_THRESHOLD = 0.10
+MIN_SECONDS = 0.05  # faster than this, timing noise is larger than any regression
+MIN_MEMORY_MB = 16  # smaller than this, allocator and page cache jitter is larger than any regression
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+RESULTS_VERSION = 1
+MNIST_IMAGES = 60000  # most images an MNIST case uses, whatever the size
+SERVER_REQUESTS = 5000  # most requests the inference server case sends
+SEARCH_GRID = {'alpha': [0.1, 1.0, 10.0]}
+
+
+# ============================================================================
+# 1. CASES
+# ============================================================================
+# A case's setup(path, rows, workdir) runs untimed and returns a function
+# whose call is timed; that function returns the number of items processed.
+# `path` is the dataset file (None for cases without one) and `workdir` an
+# empty directory for caches, removed after the case.
+def _linked(path, workdir):
+    """A symlink to `path` inside workdir, so caches built next to the file start empty."""
+    link = os.path.join(workdir, os.path.basename(path))
+    os.symlink(os.path.abspath(path), link)
+    return link
+
+
+def setup_read_chunks(engine):
+    def setup(path, rows, workdir):
+        from week_02_files_data_structures.csv_reader import chunk_length, infer_schema, read_chunks
+
+        schema = infer_schema(path)
+
+        def work():
+            return sum(chunk_length(chunk) for chunk in read_chunks(path, schema=schema, engine=engine))
+        return work
+    return setup
+
+
+def setup_column_cache(path, rows, workdir):
+    from week_02_files_data_structures.column_cache import ensure_cache
+
+    path = _linked(path, workdir)
+    return lambda: ensure_cache(path)['rows']
+
+
+def setup_log_analyzer(workers):
+    def setup(path, rows, workdir):
+        from week_02_files_data_structures.csv_log_analyzer import analyze_parallel, analyze_serial
+
+        if workers == 1:
+            return lambda: analyze_serial(path).rows
+        return lambda: analyze_parallel(path, workers=workers).rows
+    return setup
+
+
+def setup_contact_book(path, rows, workdir, queries=10000):
+    import random
+
+    from week_01_python_basics.contact_book import ContactBook
+
+    rng = random.Random(0)
+    ids = [rng.randint(1, rows) for _ in range(queries)]
+
+    def work():
+        book = ContactBook()
+        book.load_csv(path)
+        for contact_id in ids:
+            contact = book.get(contact_id)
+            book.find_by_email(contact.email)
+            book.search(contact.name[:4])
+        return len(book)
+    return work
+
+
+def setup_todo_list(path, rows, workdir):
+    from benchmarks.bench_todo_list import make_operations, run_queue
+
+    operations = make_operations(rows)
+
+    def work():
+        run_queue(operations)
+        return len(operations)
+    return work
+
+
+def setup_calculator(path, rows, workdir, source='price / area + bedrooms * 1000'):
+    from week_01_python_basics.calculator import evaluate_chunks
+    from week_02_files_data_structures.csv_reader import infer_schema, read_chunks
+
+    schema = infer_schema(path)
+    columns = ['price', 'area', 'bedrooms']
+
+    def work():
+        chunks = read_chunks(path, columns=columns, schema=schema, engine='mmap')
+        return sum(len(values) for values in evaluate_chunks(source, chunks))
+    return work
+
+
+def setup_temperature(path, rows, workdir, window=1440):
+    from week_03_numpy.temperature_analysis import RollingWindow, anomalies, iter_series
+
+    def work():
+        rolling = RollingWindow(window)
+        count = 0
+        for _, values in iter_series(path):
+            anomalies(rolling.update(values)['zscore'])
+            count += len(values)
+        return count
+    return work
+
+
+def setup_titanic(path, rows, workdir):
+    from week_04_pandas.titanic_pipeline import build_features
+
+    path = _linked(path, workdir)
+    return lambda: len(build_features(path, cache_dir=os.path.join(workdir, 'pipeline'), use_cache=False)[0])
+
+
+def setup_house_prices(path, rows, workdir):
+    from week_06_ml_basics.house_price_model import default_features, evaluate, fit_normal
+
+    features = default_features(path)
+
+    def work():
+        evaluate(fit_normal(path, features), path)
+        return rows * 2  # two passes: fit and evaluate
+    return work
+
+
+def setup_model_search(path, rows, workdir, folds=5):
+    from week_06_ml_basics.house_price_model import default_features
+    from week_06_ml_basics.model_search import arrays_from_csv, search
+
+    features = default_features(path)
+
+    def work():
+        x_path, y_path = arrays_from_csv(path, features, directory=workdir)
+        search('ridge', SEARCH_GRID, x_path, y_path, folds=folds, scale=True, workers=1,
+               cache_path=os.path.join(workdir, 'results.jsonl'))
+        return rows
+    return work
+
+
+def setup_mnist_epoch(path, rows, workdir):
+    import torch
+
+    from benchmarks.bench_mnist import generate_raw
+    from week_07_deep_learning.mnist_data import MNISTMemmap, make_loader, preprocess
+    from week_07_deep_learning.mnist_model import MNISTNet, train_epoch
+
+    images = min(rows, MNIST_IMAGES)
+    generate_raw(os.path.join(workdir, 'raw'), images)
+    preprocess('train', os.path.join(workdir, 'raw'), workdir)
+    loader = make_loader(MNISTMemmap('train', workdir), workers=0)
+
+    def work():
+        torch.manual_seed(0)
+        model = MNISTNet()
+        train_epoch(model, loader, torch.optim.SGD(model.parameters(), lr=0.01))
+        return images
+    return work
+
+
+def setup_mnist_server(path, rows, workdir, clients=8):
+    import asyncio
+
+    from benchmarks.bench_mnist_server import load_test
+    from week_07_deep_learning.mnist_server import DEFAULT_MAX_BATCH_SIZE, DEFAULT_MAX_LATENCY_MS, load_model
+
+    requests = min(rows, SERVER_REQUESTS)
+    model, _ = load_model(quantize=True, script=True)
+
+    def work():
+        asyncio.run(load_test(model, clients, requests, DEFAULT_MAX_BATCH_SIZE, DEFAULT_MAX_LATENCY_MS))
+        return requests
+    return work
+
+
+def setup_downsample(path, rows, workdir):
+    import numpy as np
+
+    from week_03_numpy.temperature_analysis import iter_series
+    from week_05_visualization.plot_helpers import downsample
+
+    chunks = list(iter_series(path))
+    times = np.concatenate([times for times, _ in chunks])
+    values = np.concatenate([values for _, values in chunks])
+
+    def work():
+        downsample(times, values, method='lttb')
+        downsample(times, values, method='minmax')
+        return len(values)
+    return work
+
+
+# name -> (dataset, setup, description)
+CASES = {
+    'csv_reader.csv': ('house_prices', setup_read_chunks('csv'), 'read_chunks(engine=csv), every column'),
+    'csv_reader.mmap': ('house_prices', setup_read_chunks('mmap'), 'read_chunks(engine=mmap), every column'),
+    'column_cache.build': ('house_prices', setup_column_cache, 'ensure_cache() from an empty cache'),
+    'csv_log_analyzer.serial': ('access_log', setup_log_analyzer(1), 'analyze_serial()'),
+    'csv_log_analyzer.parallel': ('access_log', setup_log_analyzer(os.cpu_count() or 1),
+                                  'analyze_parallel(), one worker per CPU'),
+    'contact_book.load_search': ('contacts', setup_contact_book, 'load_csv() + 10k id/email/prefix lookups'),
+    'todo_list.queue': (None, setup_todo_list, 'TaskQueue add/pop/complete/update stream'),
+    'calculator.columns': ('house_prices', setup_calculator, 'evaluate_chunks() of a derived column'),
+    'temperature.rolling': ('temperatures', setup_temperature, 'streaming 1-day rolling z-scores from CSV'),
+    'titanic.features': ('titanic', setup_titanic, 'build_features() with empty caches'),
+    'house_prices.fit': ('house_prices', setup_house_prices, 'fit_normal() + evaluate(), out of core'),
+    'model_search.ridge': ('house_prices', setup_model_search,
+                           'arrays_from_csv() + 3 x 5-fold ridge search, one worker'),
+    'mnist.epoch': (None, setup_mnist_epoch, 'one training epoch from MNISTMemmap (synthetic images)'),
+    'mnist_server.batched': (None, setup_mnist_server, 'micro-batched int8 server, 8 clients'),
+    'plot_helpers.downsample': ('temperatures', setup_downsample, 'LTTB and min-max to 2000 points'),
+}
+
+
+# ============================================================================
+# 2. RUNNING ONE CASE (IN A CHILD PROCESS)
+# ============================================================================
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)  # bytes on macOS, KB elsewhere
+
+
+def run_case(name, rows, data_dir=None):
+    """Run one case in this process and return its result dict."""
+    baseline = _peak_rss_mb()
+    dataset, setup, _ = CASES[name]
+    path = None
+    if dataset:
+        from benchmarks.datasets import DEFAULT_DIRECTORY, dataset_path
+
+        path = dataset_path(dataset, rows, data_dir or DEFAULT_DIRECTORY)
+    workdir = tempfile.mkdtemp(prefix='bench_suite_')
+    try:
+        work = setup(path, rows, workdir)
+        start = time.perf_counter()
+        items = work()
+        seconds = time.perf_counter() - start
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    peak = _peak_rss_mb()
+    return {'case': name, 'rows': rows, 'seconds': seconds, 'items': items, 'items_per_s': items / seconds,
+            'peak_rss_mb': peak, 'case_rss_mb': None if peak is None else peak - baseline}
+
+
+def run_isolated(name, rows, data_dir=None, timeout=None):
+    """run_case() in a fresh interpreter; failures come back as {'error': ...}."""
+    command = [sys.executable, '-m', 'benchmarks.suite', '--child', name, '--rows', str(rows)]
+    if data_dir:
+        command += ['--data-dir', data_dir]
+    try:
+        completed = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {'case': name, 'rows': rows, 'error': f'timed out after {timeout} s'}
+    if completed.returncode != 0:
+        lines = completed.stderr.strip().splitlines() or [f'exit status {completed.returncode}']
+        error = lines[-1]
+        key = 'skipped' if error.startswith('ModuleNotFoundError') else 'error'
+        return {'case': name, 'rows': rows, key: error}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def run_suite(names, sizes, repeat=1, data_dir=None, timeout=None, log=print):
+    """Run every case at every size `repeat` times; keep the run with the median time."""
+    from benchmarks.datasets import DEFAULT_DIRECTORY, dataset_path
+
+    data_dir = data_dir or DEFAULT_DIRECTORY
+    results = []
+    for rows in sizes:
+        for name in names:
+            dataset = CASES[name][0]
+            if dataset:
+                dataset_path(dataset, rows, data_dir)  # generate outside the timed child
+            runs = [run_isolated(name, rows, data_dir, timeout) for _ in range(repeat)]
+            good = [result for result in runs if 'seconds' in result]
+            if good:
+                median = statistics.median_low([result['seconds'] for result in good])
+                result = next(result for result in good if result['seconds'] == median)
+                result['runs'] = [result['seconds'] for result in good]
+            else:
+                result = runs[0]
+            result['dataset'] = dataset
+            results.append(result)
+            if log:
+                log(format_result(result))
+    return results
+
+
+# ============================================================================
+# 3. RESULT FILES AND REGRESSION CHECK
+# ============================================================================
+def _git_commit():
+    try:
+        completed = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                   cwd=os.path.dirname(os.path.abspath(__file__)))
+    except OSError:
+        return None
+    return completed.stdout.strip() or None
+
+
+def make_report(results):
+    return {
+        'version': RESULTS_VERSION,
+        'created': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'results': results,
+    }
+
+
+def load_report(path):
+    with open(path, encoding='utf-8') as f:
+        report = json.load(f)
+    if report.get('version') != RESULTS_VERSION:
+        raise ValueError(f'{path}: results version {report.get("version")}, expected {RESULTS_VERSION}')
+    return report
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD, min_seconds=MIN_SECONDS, min_memory_mb=MIN_MEMORY_MB):
+    """Compare with the results of an earlier report; return a list of change dicts.
+
+    Cases are matched by (case, rows). A change is a 'regression' when the
+    time or the peak memory grew by more than `threshold` (0.1 = 10%),
+    an 'improvement' when it shrank by as much. Values below min_seconds or
+    min_memory_mb count as that floor: they are noise, not a measurement, so
+    1 MB -> 12 MB is no change and 1 MB -> 40 MB is measured from 16 MB.
+    """
+    before = {(result['case'], result['rows']): result for result in baseline['results'] if 'seconds' in result}
+    changes = []
+    for result in results:
+        old = before.get((result['case'], result['rows']))
+        if old is None or 'seconds' not in result:
+            continue
+        metrics = [('seconds', result['seconds'], old['seconds'])]
+        # Memory above the pre-case baseline; results written before it was
+        # recorded only have the whole process's peak.
+        memory = 'peak_rss_mb'
+        if result.get('case_rss_mb') is not None and old.get('case_rss_mb') is not None:
+            memory = 'case_rss_mb'
+        if result.get(memory) is not None and old.get(memory) is not None:
+            metrics.append((memory, result[memory], old[memory]))
+        for metric, new_value, old_value in metrics:
+            floor = min_seconds if metric == 'seconds' else min_memory_mb
+            if max(new_value, old_value) < floor:
+                continue
+            ratio = max(new_value, floor) / max(old_value, floor)
+            if ratio > 1 + threshold:
+                kind = 'regression'
+            elif ratio < 1 / (1 + threshold):
+                kind = 'improvement'
+            else:
+                continue
+            changes.append({'case': result['case'], 'rows': result['rows'], 'metric': metric, 'kind': kind,
+                            'before': old_value, 'after': new_value, 'ratio': ratio})
+    return changes
+
+
+def format_result(result):
+    label = f'{result["case"]:<26} {result["rows"]:>11,} rows'
+    if 'seconds' not in result:
+        return f'{label}  {"skipped" if "skipped" in result else "FAILED"}: {result.get("skipped") or result["error"]}'
+    memory = ''
+    if result.get('peak_rss_mb'):
+        memory = f'{result["peak_rss_mb"]:8.0f} MB'
+        if result.get('case_rss_mb') is not None:
+            memory += f' ({result["case_rss_mb"]:+.0f} MB in the case)'
+    return f'{label}  {result["seconds"]:9.3f} s  {result["items_per_s"]:>13,.0f} items/s  {memory}'
+
+
+# ============================================================================
+# 4. COMMAND LINE INTERFACE
+# ============================================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description='Run the benchmark suite and compare with earlier results.')
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help=f'comma separated row counts (default: {DEFAULT_SIZES})')
+    parser.add_argument('--cases', help='comma separated case names or prefixes (default: all, see --list)')
+    parser.add_argument('--repeat', type=int, default=1, help='runs per case; the median is kept (default: 1)')
+    parser.add_argument('--output', help='results file (default: benchmarks/results/<time>.json)')
+    parser.add_argument('--compare', help='earlier results file to check for regressions')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='relative change flagged by --compare (default: 0.10)')
+    parser.add_argument('--timeout', type=float, help='seconds allowed per case run')
+    parser.add_argument('--data-dir', help='where synthetic datasets are kept (default: data/.cache/benchmarks)')
+    parser.add_argument('--list', action='store_true', help='list the cases and exit')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    parser.add_argument('--rows', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:  # before anything else is imported: see case_rss_mb
+        print(json.dumps(run_case(args.child, args.rows, args.data_dir)))
+        return 0
+    from benchmarks.datasets import parse_rows
+
+    if args.list:
+        for name, (dataset, _, description) in CASES.items():
+            print(f'{name:<26} {dataset or "-":<13} {description}')
+        return 0
+
+    names = list(CASES)
+    if args.cases:
+        wanted = args.cases.split(',')
+        names = [name for name in CASES if any(name.startswith(item) for item in wanted)]
+        if not names:
+            parser.error(f'no case matches {args.cases!r}; see --list')
+    baseline = load_report(args.compare) if args.compare else None
+    sizes = [parse_rows(size) for size in args.sizes.split(',')]
+
+    results = run_suite(names, sizes, args.repeat, args.data_dir, args.timeout)
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, time.strftime('%Y%m%d-%H%M%S') + '.json')
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(make_report(results), f, indent=1)
+    print(f'results written to {output}')
+
+    status = 1 if any('error' in result for result in results) else 0
+    if baseline is not None:
+        changes = compare(results, baseline, args.threshold)
+        print(f'compared with {args.compare} (commit {baseline.get("commit")}), threshold {args.threshold:.0%}:')
+        for change in changes:
+            print(f'  {change["kind"].upper():<11} {change["case"]:<26} {change["rows"]:>11,} rows  '
+                  f'{change["metric"]:<11} {change["before"]:.3f} -> {change["after"]:.3f} ({change["ratio"]:.2f}x)')
+        if not changes:
+            print('  no changes beyond the threshold')
+        if any(change['kind'] == 'regression' for change in changes):
+            status = 1
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
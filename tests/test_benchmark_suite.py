@@ -0,0 +1,36 @@
+# Tests for benchmarks/suite.py: comparing results with an earlier run.
+# Run from the repository root: python -m pytest tests
+
+import pytest
+
+from benchmarks.suite import compare
+
+
+def result(seconds=1.0, case_rss_mb=None, peak_rss_mb=50.0):
+    return {'case': 'csv_reader.csv', 'rows': 10000, 'seconds': seconds, 'items_per_s': 10000 / seconds,
+            'peak_rss_mb': peak_rss_mb, 'case_rss_mb': case_rss_mb}
+
+
+def changes(new, old):
+    return {(change['metric'], change['kind']) for change in compare([new], {'results': [old]})}
+
+
+@pytest.mark.parametrize('old_mb, new_mb, expected', [
+    (1.3, 12.9, set()),                                  # allocator jitter in a small case
+    (0.0, 4.0, set()),
+    (1.0, 40.0, {('case_rss_mb', 'regression')}),        # measured from the floor: 16 -> 40 MB
+    (100.0, 105.0, set()),
+    (100.0, 150.0, {('case_rss_mb', 'regression')}),
+    (150.0, 100.0, {('case_rss_mb', 'improvement')}),
+])
+def test_case_memory(old_mb, new_mb, expected):
+    assert changes(result(case_rss_mb=new_mb), result(case_rss_mb=old_mb)) == expected
+
+
+def test_fast_cases_are_not_timed():
+    assert changes(result(seconds=0.004), result(seconds=0.001)) == set()
+    assert changes(result(seconds=2.0), result(seconds=1.0)) == {('seconds', 'regression')}
+
+
+def test_results_without_case_memory_compare_the_peak():
+    assert changes(result(peak_rss_mb=100.0), result(peak_rss_mb=50.0)) == {('peak_rss_mb', 'regression')}
@@ -0,0 +1,36 @@
+# Tests for week_01_python_basics/calculator.py: powers that are too large to compute.
+# Run from the repository root: python -m pytest tests
+
+import pytest
+
+from week_01_python_basics.calculator import MAX_POWER_BITS, evaluate, evaluate_columns
+
+
+@pytest.mark.parametrize('source', ['9 ** 9 ** 9', '2 ** 100000', '(-3) ** n', '((((2 ** 16) ** 16) ** 16) ** 16)',
+                                    'n ** n'])
+def test_huge_power_is_rejected_before_it_is_computed(source):
+    with pytest.raises(ValueError, match='power too large'):
+        evaluate(source, n=10 ** 6)
+
+
+@pytest.mark.parametrize('source, expected', [
+    ('2 ** 10 // 3', 341),
+    ('2 ** -1', 0.5),
+    ('(-2) ** 3', -8),
+    ('x ** 2 + x ** 0.5', 16 + 2.0),
+    ('(x + 1) ** 3', 125),
+    (f'2 ** {MAX_POWER_BITS - 1}', 2 ** (MAX_POWER_BITS - 1)),
+])
+def test_ordinary_powers(source, expected):
+    assert evaluate(source, x=4) == expected
+
+
+def test_float_power_overflows():
+    with pytest.raises(OverflowError):
+        evaluate('10.0 ** n', n=400)
+
+
+def test_power_over_columns():
+    np = pytest.importorskip('numpy')
+    result = evaluate_columns('a ** b + (a + 1) ** 2', {'a': np.arange(4), 'b': np.full(4, 3)})
+    assert result.tolist() == [1, 5, 17, 43]
@@ -0,0 +1,69 @@
+# Tests for week_02_files_data_structures/code_fingerprint.py.
+# Run from the repository root: python -m pytest tests
+
+import os
+import subprocess
+import sys
+
+from week_02_files_data_structures.code_fingerprint import code_fingerprint
+from week_04_pandas import titanic_pipeline
+
+LABELS = {'a': 'A'}
+COLUMNS = ('x', 'y')
+
+
+def helper(value):
+    return LABELS.get(value, value)
+
+
+def other_helper(value):
+    return value.upper()
+
+
+def stage(values, columns=COLUMNS):
+    return [helper(value) for value in values if value in columns]
+
+
+def test_stable_for_unchanged_code():
+    assert code_fingerprint(stage) == code_fingerprint(stage)
+
+
+def test_default_arguments(monkeypatch):
+    before = code_fingerprint(stage)
+    monkeypatch.setattr(stage, '__defaults__', (('x', 'y', 'z'),))
+    assert code_fingerprint(stage) != before
+
+
+def test_global_constant_read_by_a_helper(monkeypatch):
+    before = code_fingerprint(stage)
+    monkeypatch.setitem(LABELS, 'b', 'B')
+    assert code_fingerprint(stage) != before
+
+
+def test_helper_code(monkeypatch):
+    before = code_fingerprint(stage)
+    monkeypatch.setattr(helper, '__code__', other_helper.__code__)
+    assert code_fingerprint(stage) != before
+
+
+def uses_module(df):
+    return titanic_pipeline.clean(df)
+
+
+def test_helper_read_from_a_project_module(monkeypatch):
+    before = code_fingerprint(uses_module)
+    monkeypatch.setattr(titanic_pipeline, 'TITLE_MAP', {'Mlle': 'Miss'})
+    assert code_fingerprint(uses_module) != before
+
+
+def test_same_in_every_process():
+    # Set literals and dict keys must not make the key depend on the string hash seed.
+    code = ('from week_02_files_data_structures.code_fingerprint import code_fingerprint;'
+            'from week_04_pandas.titanic_pipeline import clean, fit_statistics;'
+            'print(code_fingerprint(clean), code_fingerprint(fit_statistics))')
+    outputs = set()
+    for seed in ('1', '2', '3'):
+        env = dict(os.environ, PYTHONHASHSEED=seed, PYTHONPATH=os.getcwd())
+        outputs.add(subprocess.run([sys.executable, '-c', code], env=env, capture_output=True, text=True,
+                                   check=True).stdout)
+    assert len(outputs) == 1
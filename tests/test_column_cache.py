@@ -0,0 +1,54 @@
+# Tests for week_02_files_data_structures/column_cache.py: string categories outside the index.
+# Run from the repository root: python -m pytest tests
+
+import json
+import os
+
+from week_02_files_data_structures.column_cache import cache_paths, ensure_cache, load
+
+ROWS = 1000
+
+
+def write(tmp_path):
+    path = tmp_path / 'data.csv'
+    path.write_text('date,city,temperature\n' + ''.join(
+        f'2024-01-01 {i // 60:02d}:{i % 60:02d},{"" if i % 7 == 0 else ["Oslo", "Rome"][i % 2]},{i / 10}\n'
+        for i in range(ROWS)))
+    return str(path), str(tmp_path / 'cache')
+
+
+def test_strings_round_trip(tmp_path):
+    path, cache_dir = write(tmp_path)
+    result = load(path, cache_dir=cache_dir)
+    assert list(result['date'][:2]) == ['2024-01-01 00:00', '2024-01-01 00:01']
+    assert list(result['city'][:3]) == [None, 'Rome', 'Oslo']
+    assert list(result['temperature'][:2]) == [0.0, 0.1]
+    codes, categories = load(path, columns=['city'], cache_dir=cache_dir, decode_strings=False)['city']
+    assert categories == ['Rome', 'Oslo'] and codes[0] == -1
+
+
+def test_index_does_not_hold_the_categories(tmp_path):
+    path, cache_dir = write(tmp_path)
+    index = ensure_cache(path, cache_dir)
+    assert os.path.getsize(cache_paths(path, cache_dir)[1]) < 1000
+    assert [column['categories'] for column in index['columns']] == [
+        'col000.categories.json', 'col001.categories.json', None]
+
+
+def test_numeric_column_does_not_read_categories(tmp_path):
+    path, cache_dir = write(tmp_path)
+    index = ensure_cache(path, cache_dir)
+    directory = os.path.join(cache_dir, index['directory'])
+    os.remove(os.path.join(directory, 'col000.categories.json'))
+    assert len(load(path, columns=['temperature'], cache_dir=cache_dir)['temperature']) == ROWS
+
+
+def test_version_1_index_is_rebuilt(tmp_path):
+    path, cache_dir = write(tmp_path)
+    index_path = cache_paths(path, cache_dir)[1]
+    index = ensure_cache(path, cache_dir)
+    index['version'] = 1
+    with open(index_path, 'w') as f:
+        json.dump(index, f)
+    assert ensure_cache(path, cache_dir)['version'] == 2
+    assert len(load(path, columns=['city'], cache_dir=cache_dir)['city']) == ROWS
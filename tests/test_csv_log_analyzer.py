@@ -0,0 +1,117 @@
+# Tests for week_02_files_data_structures/csv_log_analyzer.py: incremental tail mode and log rotation.
+# Run from the repository root: python -m pytest tests
+
+import json
+import os
+import random
+
+from week_02_files_data_structures.csv_log_analyzer import (
+    LogStats, analyze_serial, load_checkpoint, same_results, save_checkpoint, update_incremental)
+
+HEADER = 'timestamp,level,status,endpoint,user_id,latency_ms\n'
+
+
+def lines(count, seed):
+    rng = random.Random(seed)
+    return ''.join(f'2024-05-01T10:00:00,INFO,{rng.choice([200, 404, 500])},/api/{rng.randrange(20)},'
+                   f'u{rng.randrange(5000)},{rng.uniform(1, 500):.3f}\n' for _ in range(count))
+
+
+def grow(tmp_path, refreshes=4, count=2000):
+    """Append to a log and update the checkpoint after each append; return (log, checkpoint, stats, JSON sizes)."""
+    log, checkpoint = tmp_path / 'access.csv', str(tmp_path / 'access.ckpt')
+    log.write_text(HEADER)
+    stats, sizes = None, []
+    for refresh in range(refreshes):
+        with open(log, 'a') as f:
+            f.write(lines(count, refresh))
+        stats, _, _ = update_incremental(str(log), checkpoint, previous=stats)
+        sizes.append(os.path.getsize(checkpoint))
+    return str(log), checkpoint, stats, sizes
+
+
+def test_incremental_matches_a_full_pass(tmp_path):
+    log, checkpoint, stats, _ = grow(tmp_path)
+    full = analyze_serial(log)
+    assert same_results(stats, full)
+    assert sorted(stats.latencies) == sorted(full.latencies) and stats.users == full.users
+    # a new process reads the state back from the checkpoint and its sidecars
+    again, new_bytes, event = update_incremental(log, checkpoint)
+    assert (new_bytes, event) == (0, 'append')
+    assert same_results(again, full) and again.users == full.users
+
+
+def test_checkpoint_json_does_not_grow_with_the_samples(tmp_path):
+    _, checkpoint, stats, sizes = grow(tmp_path, refreshes=5)
+    state = load_checkpoint(checkpoint)
+    assert 'latencies' not in state['stats'] and 'users' not in state['stats']
+    assert max(sizes) - min(sizes) < 200  # only the counters change
+    assert os.path.getsize(checkpoint + '.latencies') == 8 * len(stats.latencies)
+
+
+def test_bytes_past_the_saved_length_are_cut_off(tmp_path):
+    # A run that appended to the sidecars but stopped before saving the checkpoint.
+    log, checkpoint, _, _ = grow(tmp_path, refreshes=2)
+    for name in ('latencies', 'users'):
+        with open(f'{checkpoint}.{name}', 'ab') as f:
+            f.write(b'garbage\n' * 3)
+    with open(log, 'a') as f:
+        f.write(lines(500, 99))
+    stats, _, _ = update_incremental(log, checkpoint)
+    assert same_results(stats, analyze_serial(log)) and stats.users == analyze_serial(log).users
+
+
+def test_version_2_checkpoint_is_migrated(tmp_path):
+    log, checkpoint = tmp_path / 'access.csv', str(tmp_path / 'access.ckpt')
+    log.write_text(HEADER + lines(1000, 1))
+    stats, _, _ = update_incremental(str(log), checkpoint)
+    state = load_checkpoint(checkpoint)
+    del state['sidecars']
+    state.update(version=2, stats=stats.to_dict())
+    for name in ('latencies', 'users'):
+        os.remove(f'{checkpoint}.{name}')
+    save_checkpoint(checkpoint, state)
+    with open(log, 'a') as f:
+        f.write(lines(1000, 2))
+    update_incremental(str(log), checkpoint)
+    reloaded, _, _ = update_incremental(str(log), checkpoint)
+    full = analyze_serial(str(log))
+    assert same_results(reloaded, full) and reloaded.users == full.users
+    assert json.load(open(checkpoint))['version'] == 3
+
+
+def test_approx_checkpoint_has_no_sidecars(tmp_path):
+    log, checkpoint = tmp_path / 'access.csv', str(tmp_path / 'access.ckpt')
+    log.write_text(HEADER + lines(1000, 1))
+    stats, _, _ = update_incremental(str(log), checkpoint, approx=True)
+    assert isinstance(stats, LogStats) and stats.approx
+    assert not os.path.exists(checkpoint + '.latencies')
+
+
+def rotate_test(tmp_path, replace):
+    log, checkpoint = tmp_path / 'access.csv', str(tmp_path / 'access.ckpt')
+    log.write_text(HEADER + lines(1000, 1))
+    old = analyze_serial(str(log))
+    update_incremental(str(log), checkpoint)
+    # The new file is longer than the old offset, so reading on from the old
+    # offset would skip its first lines instead of failing.
+    replace(log, HEADER + lines(3000, 2))
+    stats, new_bytes, event = update_incremental(str(log), checkpoint)
+    new = analyze_serial(str(log))
+    assert event == 'rotated'
+    assert new_bytes == os.path.getsize(log) - len(HEADER)
+    assert stats.rows == old.rows + new.rows == 4000
+    assert same_results(stats, old.merge(new))
+
+
+def test_rotated_file_is_read_from_the_start(tmp_path):
+    def rotate(log, text):  # logrotate: a new file (new inode) takes the old name
+        new_log = log.with_suffix('.new')
+        new_log.write_text(text)
+        os.replace(new_log, log)
+    rotate_test(tmp_path, rotate)
+
+
+def test_file_rewritten_in_place_is_read_from_the_start(tmp_path):
+    # Same inode, different content: detected by the hash of the head.
+    rotate_test(tmp_path, lambda log, text: log.write_text(text))
@@ -0,0 +1,94 @@
+# Tests for week_02_files_data_structures/csv_reader.py: malformed rows and quoted rows across blocks.
+# Run from the repository root: python -m pytest tests
+
+import csv
+
+import pytest
+
+from week_02_files_data_structures import csv_reader
+from week_02_files_data_structures.csv_reader import BadRows, MalformedRowError, chunk_length, read_chunks
+
+SCHEMA = [('a', 'int'), ('b', 'int')]
+ENGINES = ['csv', 'mmap']
+
+
+def write(tmp_path, text):
+    path = tmp_path / 'data.csv'
+    path.write_text(text)
+    return str(path)
+
+
+def read(path, engine, policy, chunk_size):
+    with BadRows(path, policy) as bad_rows:
+        chunks = list(read_chunks(path, chunk_size=chunk_size, schema=SCHEMA, engine=engine, bad_rows=bad_rows))
+    rows = [list(zip(chunk['a'], chunk['b'])) for chunk in chunks]
+    return [row for chunk in rows for row in chunk], bad_rows
+
+
+def quarantined(bad_rows):
+    with open(bad_rows.quarantine_path, newline='') as f:
+        return [row[:2] for row in list(csv.reader(f))[1:]]
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+@pytest.mark.parametrize('policy', ['skip', 'quarantine'])
+@pytest.mark.parametrize('text, chunk_size, expected, bad', [
+    ('a,b\n1,2\n3,4\n\n\n', 2, [(1, 2), (3, 4)], 0),   # the last chunk holds only blank lines
+    ('a,b\n1,2\n3\n5\n7,8\n', 1, [(1, 2), (7, 8)], 2),  # chunks in which every row is rejected
+])
+def test_chunks_without_valid_rows(tmp_path, engine, policy, text, chunk_size, expected, bad):
+    rows, bad_rows = read(write(tmp_path, text), engine, policy, chunk_size)
+    assert rows == expected
+    assert bad_rows.count == bad
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 100])
+def test_engines_reject_the_same_rows(tmp_path, chunk_size):
+    # too few fields, too many fields, a quoted delimiter in an int column, a bad value
+    path = write(tmp_path, 'a,b\n1,2\n3\n4,5,6\n"7",8\n9,"1,0"\nx,1\n11,12\n')
+    for engine in ENGINES:
+        rows, bad_rows = read(path, engine, 'quarantine', chunk_size)
+        assert rows == [(1, 2), (7, 8), (11, 12)], engine
+        rejected = dict(quarantined(bad_rows))
+        assert sorted(rejected, key=int) == ['2', '3', '5', '6'], engine
+        assert '1 fields, expected 2' in rejected['2'] and '3 fields, expected 2' in rejected['3'], engine
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_fail_names_the_row(tmp_path, engine):
+    path = write(tmp_path, 'a,b\n1,2\n3,4,5\n')
+    with pytest.raises(MalformedRowError, match='row 2'):
+        for _ in read_chunks(path, schema=SCHEMA, engine=engine):
+            pass
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_clean_file_keeps_every_row(tmp_path, engine):
+    path = write(tmp_path, 'a,b\n' + ''.join(f'{i},{i * 2}\n' for i in range(10)))
+    chunks = list(read_chunks(path, chunk_size=3, schema=SCHEMA, engine=engine))
+    assert [chunk_length(chunk) for chunk in chunks] == [3, 3, 3, 1]
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_rows_with_extra_fields_are_rejected_when_reading_one_column(tmp_path, engine):
+    path = write(tmp_path, 'a,b,c\n1,2,3\n4,5,6,7\n8,9\n"1,0",1,2\n10,11,12\n')
+    with BadRows(path, 'skip') as bad_rows:
+        chunks = list(read_chunks(path, chunk_size=2, columns=['a'], schema=[('a', 'int'), ('b', 'int'), ('c', 'int')],
+                                  engine=engine, bad_rows=bad_rows))
+    assert [value for chunk in chunks for value in chunk['a']] == [1, 10]
+    assert bad_rows.count == 3
+
+
+def test_quoted_rows_carried_over_to_a_block_without_quotes(tmp_path, monkeypatch):
+    # Quoted lines left over from one block are split together with the next,
+    # quote-free block; they must still be split as quoted lines.
+    monkeypatch.setattr(csv_reader, 'BLOCK_SIZE', 256)
+    path = write(tmp_path, 'a,b,c\n' + ''.join(f'{i},"x,y",1\n' for i in range(40))
+                 + ''.join(f'{i},z,2\n' for i in range(200)))
+    schema = [('a', 'int'), ('b', 'str'), ('c', 'int')]
+    results = []
+    for engine in ENGINES:
+        chunks = list(read_chunks(path, chunk_size=1000, schema=schema, engine=engine))
+        results.append([row for chunk in chunks for row in zip(chunk['a'], chunk['b'], chunk['c'])])
+    assert len(results[0]) == 240 and results[0][0] == (0, 'x,y', 1)
+    assert results[1] == results[0]
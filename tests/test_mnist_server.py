@@ -0,0 +1,36 @@
+# Tests for week_07_deep_learning/mnist_server.py: request body decoding and import cost.
+# Run from the repository root: python -m pytest tests
+
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from week_07_deep_learning.mnist_server import IMAGE_BYTES, decode_image
+
+
+def test_raw_image_starting_with_brace_byte():
+    body = bytes([123]) + bytes(IMAGE_BYTES - 1)  # first pixel 123 == ord('{')
+    image = decode_image(body, 'application/octet-stream')
+    assert image.shape == (28, 28) and image[0, 0] == 123
+
+
+def test_json_by_content_type_or_sniffed():
+    body = json.dumps({'pixels': [7] * IMAGE_BYTES}).encode()
+    for content_type in ('application/json', 'Application/JSON; charset=utf-8', ''):
+        assert np.all(decode_image(body, content_type) == 7)
+
+
+def test_raw_image_of_the_wrong_size():
+    with pytest.raises(ValueError, match='expected 784 bytes'):
+        decode_image(bytes(10), 'application/octet-stream')
+
+
+def test_import_does_not_load_torch():
+    code = 'import sys, week_07_deep_learning.mnist_server; print("torch" in sys.modules)'
+    env = dict(os.environ, PYTHONPATH=os.getcwd())
+    output = subprocess.run([sys.executable, '-c', code], env=env, capture_output=True, text=True, check=True).stdout
+    assert output.strip() == 'False'
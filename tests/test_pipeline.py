@@ -0,0 +1,74 @@
+# Tests for week_08_final_project/pipeline.py: skipping and re-running stages.
+# Run from the repository root: python -m pytest tests
+
+import pytest
+
+from week_08_final_project.pipeline import Pipeline, Stage, StageError
+
+SCALE = 2
+
+
+def scale(value):
+    return value * SCALE
+
+
+def shifted(value):
+    return value + 100
+
+
+def make_numbers(path, count):
+    with open(path, 'w') as f:
+        f.write('\n'.join(str(number) for number in range(count)))
+
+
+def transform(numbers, result):
+    with open(numbers) as f, open(result, 'w') as out:
+        out.write('\n'.join(str(scale(int(line))) for line in f))
+
+
+def total(result, report):
+    with open(result) as f, open(report, 'w') as out:
+        out.write(str(sum(int(line) for line in f)))
+
+
+def fail(result, report):
+    raise RuntimeError('broken stage')
+
+
+def build(work_dir, last=total):
+    return Pipeline([
+        Stage('numbers', make_numbers, outputs={'path': 'numbers.txt'}, count=5),
+        Stage('transform', transform, inputs={'numbers': 'numbers.txt'}, outputs={'result': 'result.txt'}),
+        Stage('total', last, inputs={'result': 'result.txt'}, outputs={'report': 'report.txt'}),
+    ], str(work_dir))
+
+
+def statuses(log):
+    return {name: status for name, status, _ in log}
+
+
+def test_unchanged_pipeline_is_skipped(tmp_path):
+    assert set(statuses(build(tmp_path).run()).values()) == {'ran'}
+    assert set(statuses(build(tmp_path).run()).values()) == {'skipped'}
+    assert (tmp_path / 'report.txt').read_text() == '20'
+
+
+def test_changed_helper_runs_its_stage_again(tmp_path, monkeypatch):
+    build(tmp_path).run()
+    monkeypatch.setattr(scale, '__code__', shifted.__code__)
+    assert statuses(build(tmp_path).run()) == {'numbers': 'skipped', 'transform': 'ran', 'total': 'ran'}
+    assert (tmp_path / 'report.txt').read_text() == '510'
+
+
+def test_changed_global_constant_runs_its_stage_again(tmp_path, monkeypatch):
+    build(tmp_path).run()
+    monkeypatch.setitem(globals(), 'SCALE', 3)
+    assert statuses(build(tmp_path).run())['transform'] == 'ran'
+    assert (tmp_path / 'report.txt').read_text() == '30'
+
+
+def test_failed_run_resumes_with_the_unfinished_stages(tmp_path):
+    with pytest.raises(StageError, match="'total' failed"):
+        build(tmp_path, last=fail).run()
+    assert not (tmp_path / 'report.txt').exists()
+    assert statuses(build(tmp_path).run()) == {'numbers': 'skipped', 'transform': 'skipped', 'total': 'ran'}
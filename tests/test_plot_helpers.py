@@ -0,0 +1,27 @@
+# Tests for week_05_visualization/plot_helpers.py: scatter_plot keyword arguments.
+# Run from the repository root: python -m pytest tests
+
+import numpy as np
+import pytest
+
+matplotlib = pytest.importorskip('matplotlib')
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt  # noqa: E402
+
+from week_05_visualization.plot_helpers import scatter_plot  # noqa: E402
+
+
+@pytest.fixture
+def ax():
+    figure, ax = plt.subplots()
+    yield ax
+    plt.close(figure)
+
+
+@pytest.mark.parametrize('points', [1000, 60000])
+@pytest.mark.parametrize('kind', ['hist2d', 'hexbin'])
+def test_same_call_below_and_above_max_points(ax, points, kind):
+    x = np.random.default_rng(0).normal(size=points)
+    artist = scatter_plot(ax, x, x, kind=kind, s=1, alpha=0.5, marker='.', edgecolors='none', bins=50, gridsize=20)
+    assert artist.get_alpha() == 0.5  # shared keyword arguments reach both sides
+    assert (len(artist.get_offsets()) == points) == (points <= 50000)
@@ -0,0 +1,105 @@
+# Tests for week_02_files_data_structures/sketches.py: accuracy against exact results.
+# Run from the repository root: python -m pytest tests
+#
+# Every test uses seeded data and checks the error bound the sketch promises:
+#   HyperLogLog    relative error of the distinct count within 3 standard errors (3 x 1.04 / sqrt(m))
+#   TDigest        rank error: the fraction of values below the estimate is within a bound of q
+#   CountMinSketch never under-counts; over-count above e / width x total for at most exp(-depth) of values
+#   HeavyHitters   the exact top 10 is found, counts within the Count-Min bound
+
+import math
+import random
+from bisect import bisect_left
+from collections import Counter
+
+import pytest
+
+from week_02_files_data_structures.csv_log_analyzer import accuracy, analyze_serial
+from week_02_files_data_structures.sketches import CountMinSketch, HeavyHitters, HyperLogLog, TDigest
+
+RANK_ERROR = {0.5: 0.005, 0.9: 0.003, 0.99: 0.001, 0.999: 0.0005}
+
+
+def relative_error(estimate, truth):
+    return abs(estimate - truth) / truth
+
+
+def rank_error(estimate, ordered, q):
+    return abs(bisect_left(ordered, estimate) / len(ordered) - q)
+
+
+def zipf_keys(count, seed=7):
+    rng = random.Random(seed)
+    return [f'/api/{min(int(rng.paretovariate(1.1)), 5000)}' for _ in range(count)]
+
+
+@pytest.mark.parametrize('distinct', [100, 10000, 200000])
+def test_hyperloglog_distinct_count(distinct):
+    sketch = HyperLogLog()
+    sketch.update(f'user{i}' for i in range(distinct))
+    bound = 3 * 1.04 / math.sqrt(len(sketch.registers))
+    assert relative_error(sketch.count(), distinct) <= bound
+
+
+def test_hyperloglog_merge_equals_one_pass():
+    rng = random.Random(1)
+    values = [f'user{rng.randrange(10 ** 6)}' for _ in range(50000)]
+    whole, first, second = HyperLogLog(), HyperLogLog(), HyperLogLog()
+    whole.update(values)
+    first.update(values[:20000])
+    second.update(values[20000:])
+    assert first.merge(second).registers == whole.registers
+
+
+@pytest.mark.parametrize('parts', [1, 4])
+def test_tdigest_rank_error(parts):
+    rng = random.Random(42)
+    values = [rng.lognormvariate(3, 1) for _ in range(200000)]
+    digests = [TDigest() for _ in range(parts)]
+    for index, digest in enumerate(digests):
+        digest.extend(values[index::parts])
+    digest = digests[0]
+    for other in digests[1:]:
+        digest.merge(other)
+    ordered = sorted(values)
+    for q, bound in RANK_ERROR.items():
+        assert rank_error(digest.quantile(q), ordered, q) <= bound, q
+    assert digest.quantile(0.0) == ordered[0] and digest.quantile(1.0) == ordered[-1]
+
+
+def test_count_min_bounds():
+    keys = zipf_keys(200000)
+    sketch = CountMinSketch()
+    for key, count in Counter(keys).items():
+        sketch.add(key, count)
+    exact = Counter(keys)
+    bound = math.e / sketch.width * sketch.total
+    over = [sketch.estimate(key) - count for key, count in exact.items()]
+    assert min(over) >= 0
+    assert sum(error > bound for error in over) <= math.exp(-sketch.depth) * len(exact)
+
+
+def test_heavy_hitters_top_keys():
+    keys = zipf_keys(200000)
+    hitters = HeavyHitters()
+    for start in range(0, len(keys), 10000):  # in chunks, as the log analyzer feeds it
+        hitters.update(keys[start:start + 10000])
+    exact = Counter(keys)
+    bound = math.e / hitters.sketch.width * hitters.sketch.total
+    assert {key for key, _ in hitters.most_common(10)} == {key for key, _ in exact.most_common(10)}
+    for key, count in hitters.most_common(10):
+        assert 0 <= count - exact[key] <= bound
+
+
+def test_log_analyzer_approx_against_exact(tmp_path):
+    rng = random.Random(3)
+    keys = zipf_keys(50000, seed=3)
+    path = tmp_path / 'access.csv'
+    with open(path, 'w') as f:
+        f.write('timestamp,level,status,endpoint,user_id,latency_ms\n')
+        for key in keys:
+            f.write(f'2024-05-01T10:00:00,INFO,200,{key},u{rng.randrange(20000)},{rng.lognormvariate(3, 1):.3f}\n')
+    errors = accuracy(analyze_serial(str(path), approx=True), analyze_serial(str(path)))  # relative errors
+    assert errors['distinct_users'] <= 3 * 1.04 / math.sqrt(2 ** 14)
+    assert errors['top_keys_recall'] == 1.0
+    assert errors['latency_percentiles']['p50'] <= 0.01 and errors['latency_percentiles']['p99'] <= 0.02
@@ -0,0 +1,52 @@
+# Tests for week_01_python_basics/todo_list.py: the most urgent task from the store and from TaskQueue.
+# Run from the repository root: python -m pytest tests
+
+import random
+
+from week_01_python_basics.todo_list import DONE, TaskQueue, TaskStore, main
+
+
+def fill(store, count=300, seed=0):
+    rng = random.Random(seed)
+    # Few priorities and dates, many tasks without a due date: lots of ties.
+    store.add_many((f'task {i}', rng.randint(1, 3), rng.choice(['', '', '2024-06-01', '2024-05-01', '2024-07-15']),
+                    rng.choice(['open', 'open', 'done'])) for i in range(count))
+
+
+def test_most_urgent_follows_the_queue_order(tmp_path):
+    with TaskStore(str(tmp_path / 'tasks.db')) as store:
+        fill(store)
+        queue = TaskQueue.from_store(store)
+        while queue:
+            expected = queue.pop()
+            assert store.most_urgent() == expected
+            store.complete(expected.id)
+        assert store.most_urgent() is None
+
+
+def test_queue_built_at_once_pops_like_pushed_one_by_one(tmp_path):
+    with TaskStore(str(tmp_path / 'tasks.db')) as store:
+        fill(store, seed=1)
+        tasks = list(store.query(order='id'))
+    built, pushed = TaskQueue(tasks), TaskQueue()
+    for task in tasks:
+        if task.status != DONE:
+            pushed.push(task)
+    assert [built.pop().id for _ in range(len(built))] == [pushed.pop().id for _ in range(len(pushed))]
+
+
+def test_next_command_takes_the_most_urgent_task(tmp_path, capsys):
+    db = str(tmp_path / 'tasks.db')
+    main(['--db', db, 'next'])
+    assert 'No open tasks.' in capsys.readouterr().out
+    with TaskStore(db) as store:
+        store.add('later', 2, '2024-06-01')
+        store.add('undated', 1)
+        urgent = store.add('urgent', 1, '2024-09-01')
+    main(['--db', db, 'next', '--peek'])
+    main(['--db', db, 'next'])
+    out = capsys.readouterr().out
+    assert out.count('urgent') == 2
+    with TaskStore(db) as store:
+        assert store.get(urgent.id).status == DONE
+        assert store.most_urgent().title == 'undated'
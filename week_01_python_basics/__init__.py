@@ -0,0 +1 @@
+"""Week 1: Python basics (numbers, strings, collections) and small command line apps."""
@@ -2,11 +2,17 @@
 # Integers are whole numbers (positive, negative, or zero) without a decimal point.
 # Floats are numbers that contain a decimal point.
 # Python supports various arithmetic operations on integers and floats.
+#
+# Every section is a function, so importing this file prints nothing; run it
+# to print the sections:
+#   python -m week_01_python_basics.basics_integers_float              # every section
+#   python -m week_01_python_basics.basics_integers_float --section 2  # one section
+#   python -m week_01_python_basics.basics_integers_float --docs       # include the full help() text
 
 # ============================================================================
 # Basic Arithmetic Operations:
 # Addition: +
-# Subtraction: -    
+# Subtraction: -
 # Multiplication: *
 # Division: /
 # Floor Division: //
@@ -24,83 +30,130 @@
 # 6. Comparison Operators (==, !=, >, <, >=, <=)
 # ============================================================================
 
- 
+import argparse
+
+
+def banner(title):
+    print('\n' + '='*80)
+    print(title)
+    print('='*80)
+
+
+def doc_text(obj):
+    """The text help(obj) shows, as a string (help() opens a pager and waits for a key press)."""
+    import pydoc
+
+    return pydoc.render_doc(obj, renderer=pydoc.plaintext)
+
+
 # ============================================================================
 # 1. INTEGER AND FLOAT ATTRIBUTES AND METHODS
 # ============================================================================
-print('\n' + '='*80)
-print('1. INTEGER AND FLOAT ATTRIBUTES AND METHODS')
-print('='*80)
-print(dir(int))  # This will print all the attributes and methods available for integer objects.
-print(help(int))  # This will print the help documentation for integer objects.
-print(dir(float))  # This will print all the attributes and methods available for float objects.
-print(help(float))  # This will print the help documentation for float objects.
+def attributes_and_methods(docs=False):
+    """Print dir() of int and float, and their help text when docs=True."""
+    banner('1. INTEGER AND FLOAT ATTRIBUTES AND METHODS')
+    print(dir(int))  # This will print all the attributes and methods available for integer objects.
+    if docs:
+        print(doc_text(int))  # The help documentation for integer objects.
+    print(dir(float))  # This will print all the attributes and methods available for float objects.
+    if docs:
+        print(doc_text(float))  # The help documentation for float objects.
+
 
 # ============================================================================
 # 2. BASIC ARITHMETIC OPERATIONS
 # ============================================================================
-print('\n' + '='*80)
-print('2. BASIC ARITHMETIC OPERATIONS')
-print('='*80)
-a = 10
-b = 3
-print('Addition (a + b):', a + b)               # Output: 13
-print('Subtraction (a - b):', a - b)            # Output: 7
-print('Multiplication (a * b):', a * b)         # Output: 30
-print('Division (a / b):', a / b)               # Output: 3.3333...
-print('Floor Division (a // b):', a // b)       # Output: 3
-print('Modulus (a % b):', a % b)                # Output: 1
-print('Exponentiation (a ** b):', a ** b)       # Output: 1000
+def arithmetic(a=10, b=3):
+    """Print and return the results of the seven arithmetic operators."""
+    banner('2. BASIC ARITHMETIC OPERATIONS')
+    results = {
+        'Addition (a + b)': a + b,               # Output: 13
+        'Subtraction (a - b)': a - b,            # Output: 7
+        'Multiplication (a * b)': a * b,         # Output: 30
+        'Division (a / b)': a / b,               # Output: 3.3333...
+        'Floor Division (a // b)': a // b,       # Output: 3
+        'Modulus (a % b)': a % b,                # Output: 1
+        'Exponentiation (a ** b)': a ** b,       # Output: 1000
+    }
+    for label, value in results.items():
+        print(f'{label}:', value)
+    return results
+
 
 # ============================================================================
 # 3. TYPE CONVERSION/CASTING
 # ============================================================================
-print('\n' + '='*80)
-print('3. TYPE CONVERSION/CASTING')
-print('='*80)
-int_value = 5
-float_value = 3.7
-string_value = '10'
-converted_to_float = float(int_value)
-converted_to_int = int(float_value)
-converted_to_int_from_string = int(string_value)
-print('Convert integer to float:', converted_to_float)                     # Output: 5.0
-print('Convert float to integer:', converted_to_int)                       # Output: 3
-print('Convert string to integer:', converted_to_int_from_string)          # Output: 10
+def type_conversion(int_value=5, float_value=3.7, string_value='10'):
+    """Print and return int -> float, float -> int and str -> int conversions."""
+    banner('3. TYPE CONVERSION/CASTING')
+    converted_to_float = float(int_value)
+    converted_to_int = int(float_value)
+    converted_to_int_from_string = int(string_value)
+    print('Convert integer to float:', converted_to_float)                     # Output: 5.0
+    print('Convert float to integer:', converted_to_int)                       # Output: 3
+    print('Convert string to integer:', converted_to_int_from_string)          # Output: 10
+    return converted_to_float, converted_to_int, converted_to_int_from_string
+
 
 # ============================================================================
 # 4. ROUNDING NUMBERS
 # ============================================================================
-print('\n' + '='*80)
-print('4. ROUNDING NUMBERS')
-print('='*80)
-num = 5.6789
-rounded_num = round(num, 2)
-print('Round number to 2 decimal places:', rounded_num)                    # Output: 5.68
+def rounding(num=5.6789, digits=2):
+    banner('4. ROUNDING NUMBERS')
+    rounded_num = round(num, digits)
+    print(f'Round number to {digits} decimal places:', rounded_num)            # Output: 5.68
+    return rounded_num
+
 
 # ============================================================================
 # 5. ABSOLUTE VALUE
 # ============================================================================
-print('\n' + '='*80)
-print('5. ABSOLUTE VALUE')
-print('='*80)
-negative_num = -10
-absolute_value = abs(negative_num)
-print('Absolute value of -10:', absolute_value)                             # Output: 10
+def absolute_value(negative_num=-10):
+    banner('5. ABSOLUTE VALUE')
+    value = abs(negative_num)
+    print(f'Absolute value of {negative_num}:', value)                          # Output: 10
+    return value
+
 
 # ============================================================================
 # 6. COMPARISON OPERATORS
 # ============================================================================
-print('\n' + '='*80)
-print('6. COMPARISON OPERATORS')
-print('='*80)
-x = 10
-y = 20
-print('x == y:', x == y)           # Output: False
-print('x != y:', x != y)           # Output: True
-print('x > y:', x > y)             # Output: False
-print('x < y:', x < y)             # Output: True
-print('x >= y:', x >= y)           # Output: False
-print('x <= y:', x <= y)           # Output: True
-
-# End of basics_integers_float.py
\ No newline at end of file
+def comparison(x=10, y=20):
+    """Print and return the six comparison operators applied to x and y."""
+    banner('6. COMPARISON OPERATORS')
+    results = {
+        'x == y': x == y,           # Output: False
+        'x != y': x != y,           # Output: True
+        'x > y': x > y,             # Output: False
+        'x < y': x < y,             # Output: True
+        'x >= y': x >= y,           # Output: False
+        'x <= y': x <= y,           # Output: True
+    }
+    for label, value in results.items():
+        print(f'{label}:', value)
+    return results
+
+
+SECTIONS = [attributes_and_methods, arithmetic, type_conversion, rounding, absolute_value, comparison]
+
+
+def run(sections=None, docs=False):
+    """Run the numbered sections (default: all) in order."""
+    for number, section in enumerate(SECTIONS, 1):
+        if sections is None or number in sections:
+            section(docs) if section is attributes_and_methods else section()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Integer and float basics, section by section.')
+    parser.add_argument('--section', type=int, action='append', choices=range(1, len(SECTIONS) + 1),
+                        help='run only this section (repeatable; default: all)')
+    parser.add_argument('--docs', action='store_true', help='include the full help() text of int and float')
+    args = parser.parse_args(argv)
+    run(args.section, args.docs)
+
+
+if __name__ == '__main__':
+    main()
+
+# End of basics_integers_float.py
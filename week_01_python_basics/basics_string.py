@@ -2,6 +2,12 @@
 # A string is a sequence of characters enclosed in single quotes (' '), double quotes (" "), or triple quotes (''' ''' or """ """).
 # Strings are immutable, meaning they cannot be changed after they are created.
 # Strings can be manipulated using various built-in methods and operations.
+#
+# Every section is a function, so importing this file prints nothing; run it
+# to print the sections:
+#   python -m week_01_python_basics.basics_string              # every section
+#   python -m week_01_python_basics.basics_string --section 3  # one section
+#   python -m week_01_python_basics.basics_string --docs       # include the full help() text
 
 # ============================================================================
 # INDEX - Topics Covered in This File
@@ -16,115 +22,159 @@
 # 8. String Concatenation AND INTERPOLATION (+, .format(), f-strings, .join())
 # ============================================================================
 
+import argparse
 from pprint import pprint
+
+MESSAGE = 'Hello, World!'
+
+
+def banner(title):
+    print('\n' + '='*80)
+    print(title)
+    print('='*80)
+
+
+def doc_text(obj):
+    """The text help(obj) shows, as a string (help() opens a pager and waits for a key press)."""
+    import pydoc
+
+    return pydoc.render_doc(obj, renderer=pydoc.plaintext)
+
+
 # ==========================================================================
 # 1. STRING ATTRIBUTES AND METHODS
 # ==========================================================================
-print('\n' + '='*80)
-print('1. STRING ATTRIBUTES AND METHODS')
-print('='*80)
-pprint(dir(str))  # This will print all the attributes and methods available for string objects.
-pprint(help(str))  # This will print the help documentation for string objects.
-pprint(help(str.upper))  # This will print the help documentation for the upper() method of string objects.
+def attributes_and_methods(docs=False):
+    """Print dir(str), and the help text of str and str.upper when docs=True."""
+    banner('1. STRING ATTRIBUTES AND METHODS')
+    pprint(dir(str))  # This will print all the attributes and methods available for string objects.
+    if docs:
+        print(doc_text(str))  # The help documentation for string objects.
+        print(doc_text(str.upper))  # The help documentation for str.upper().
 
-message = 'Hello, World!'
 
 # ==========================================================================
 # 2. LENGTH OF THE STRING
 # ==========================================================================
-print('\n' + '='*80)
-print('2. LENGTH OF THE STRING')
-print('='*80)
-# len() function is a build-in function in Python that returns the number of items in an object, can be used with many data types(strings, lists, tuples, etc). When used with a string, it returns the number of characters in the string, including spaces and punctuation.
-length = len(message)
-print('Print the length of message string:', length)  # Output: 13
+def length(message=MESSAGE):
+    banner('2. LENGTH OF THE STRING')
+    # len() function is a build-in function in Python that returns the number of items in an object, can be used with many data types(strings, lists, tuples, etc). When used with a string, it returns the number of characters in the string, including spaces and punctuation.
+    size = len(message)
+    print('Print the length of message string:', size)  # Output: 13
+    return size
+
 
 # ==========================================================================
 # 3. SLICING THE STRING
 # ==========================================================================
-print('\n' + '='*80)
-print('3. SLICING THE STRING')
-print('='*80)
-# Slicing is a way to extract a portion of a string by specifying a start and end index. The syntax is string[start:end], where 'start' is the index to begin the slice (inclusive) and 'end' is the index to end the slice (exclusive). Slicing is just part of Python's grammar, not a function.
-first_five = message[0:5]
-print('Print the first five characters of message string:', first_five)  # Output: Hello
-first_five_without_start = message[:5]
-print('Print the first five characters of message string without specifying start index:', first_five_without_start)  # Output: Hello
-last_six = message[-6:]
-print('Print the last six characters of message string:', last_six)  # Output: World!
-last_six_without_last = message[6:]
-print('Print the last six characters of message string without end index:', last_six_without_last)  # Output: World!
+def slicing(message=MESSAGE):
+    banner('3. SLICING THE STRING')
+    # Slicing is a way to extract a portion of a string by specifying a start and end index. The syntax is string[start:end], where 'start' is the index to begin the slice (inclusive) and 'end' is the index to end the slice (exclusive). Slicing is just part of Python's grammar, not a function.
+    first_five = message[0:5]
+    print('Print the first five characters of message string:', first_five)  # Output: Hello
+    first_five_without_start = message[:5]
+    print('Print the first five characters of message string without specifying start index:', first_five_without_start)  # Output: Hello
+    last_six = message[-6:]
+    print('Print the last six characters of message string:', last_six)  # Output: World!
+    last_six_without_last = message[6:]
+    print('Print the last six characters of message string without end index:', last_six_without_last)  # Output: World!
+    return first_five, last_six
+
 
 # ==========================================================================
 # 4. CHANGING CASE
 # ==========================================================================
-print('\n' + '='*80)
-print('4. CHANGING CASE')
-print('='*80)
-# Strings in Python have built-in methods to change their case. The .upper() method converts all characters in the string to uppercase, while the .lower() method converts all characters to lowercase.
-upper_message = message.upper()
-print('Print the message string in uppercase:', upper_message)  # Output: HELLO, WORLD!
-lower_message = message.lower()
-print('Print the message string in lowercase:', lower_message)  # Output: hello, world!
+def changing_case(message=MESSAGE):
+    banner('4. CHANGING CASE')
+    # Strings in Python have built-in methods to change their case. The .upper() method converts all characters in the string to uppercase, while the .lower() method converts all characters to lowercase.
+    upper_message = message.upper()
+    print('Print the message string in uppercase:', upper_message)  # Output: HELLO, WORLD!
+    lower_message = message.lower()
+    print('Print the message string in lowercase:', lower_message)  # Output: hello, world!
+    return upper_message, lower_message
+
 
 # ==========================================================================
 # 5. COUNTING OCCURRENCES
 # ==========================================================================
-print('\n' + '='*80)
-print('5. COUNTING OCCURRENCES')
-print('='*80)
-# The .count() method returns the number of occurrences of a substring in the string. It takes the substring as an argument.
-count_l = message.count('l')
-print('Print the number of occurrences of \'l\' in message string:', count_l)  # Output: 3
-count_o = message.count('o')
-print('Print the number of occurrences of \'o\' in message string:', count_o)  # Output: 2
+def counting(message=MESSAGE):
+    banner('5. COUNTING OCCURRENCES')
+    # The .count() method returns the number of occurrences of a substring in the string. It takes the substring as an argument.
+    count_l = message.count('l')
+    print('Print the number of occurrences of \'l\' in message string:', count_l)  # Output: 3
+    count_o = message.count('o')
+    print('Print the number of occurrences of \'o\' in message string:', count_o)  # Output: 2
+    return count_l, count_o
+
 
 # ==========================================================================
 # 6. FINDING A SUBSTRING
 # ==========================================================================
-print('\n' + '='*80)
-print('6. FINDING A SUBSTRING')
-print('='*80)
-# The .find() method returns the lowest index of the substring if it is found in the string. If the substring is not found, it returns -1.
-index_world = message.find('World')
-print('Print the starting index of \'World\' in message string:', index_world) # Output: 7
-index_python = message.find('Python')
-print('Print the starting index of \'Python\' in message string (not found):', index_python) # Output: -1
+def finding(message=MESSAGE):
+    banner('6. FINDING A SUBSTRING')
+    # The .find() method returns the lowest index of the substring if it is found in the string. If the substring is not found, it returns -1.
+    index_world = message.find('World')
+    print('Print the starting index of \'World\' in message string:', index_world) # Output: 7
+    index_python = message.find('Python')
+    print('Print the starting index of \'Python\' in message string (not found):', index_python) # Output: -1
+    return index_world, index_python
+
 
 # ==========================================================================
 # 7. REPLACING A SUBSTRING
 # ==========================================================================
-print('\n' + '='*80)
-print('7. REPLACING A SUBSTRING')
-print('='*80)
-# The .replace() method returns a new string where all occurrences of a specified substring are replaced with another substring. It takes two arguments: the substring to be replaced and the substring to replace it with.
-new_message = message.replace('World', 'Python')
-print('Print the message string after replacing \'World\' with \'Python\':', new_message) # Output: Hello, Python!
-remove_exclamation = message.replace('!', '')
-print('Print the message string after removing exclamation mark:', remove_exclamation) # Output: Hello, Python
+def replacing(message=MESSAGE):
+    banner('7. REPLACING A SUBSTRING')
+    # The .replace() method returns a new string where all occurrences of a specified substring are replaced with another substring. It takes two arguments: the substring to be replaced and the substring to replace it with.
+    new_message = message.replace('World', 'Python')
+    print('Print the message string after replacing \'World\' with \'Python\':', new_message) # Output: Hello, Python!
+    remove_exclamation = message.replace('!', '')
+    print('Print the message string after removing exclamation mark:', remove_exclamation) # Output: Hello, World
+    return new_message, remove_exclamation
+
 
 # ==========================================================================
 # 8. STRING CONCATENATION AND INTERPOLATION(INSERTING VARIABLES AND EXPRESSIONS INTO STRINGS)
 # ==========================================================================
-print('\n' + '='*80)
-print('8. STRING CONCATENATION AND INTERPOLATION(INSERTING VARIABLES AND EXPRESSIONS INTO STRINGS)')
-print('='*80)
-# String concatenation is the operation of joining two or more strings together. In Python, this can be done in multiple ways:
-greeting = 'Hello'
-name = 'Alice'
-### 1. Using the + operator
-greeting_message = greeting + ',' + ' ' + name + '!'
-print('Print the greeting message using + operator:', greeting_message)  # Output: Hello, Alice!
-# 2. Using .format() method
-greeting_message_format = '{}, {}! Welcome to Python.'.format(greeting, name)
-print('Print the greeting message using .format() method:', greeting_message_format)  # Output: Hello, Alice! Welcome to Python.
-# 3. Using formatted string literals (f-strings)
-greeting_message_fstring = f'{greeting}, {name}! How are you?'
-print('Print the greeting message using f-string:', greeting_message_fstring)  # Output: Hello, Alice! How are you?
-# 3.1 Using f-strings with expressions and String methods
-age = 30
-greeting_message_fstring_expr = f'{greeting}, {name.upper()}! Next year, you will be {age + 1} years old.'
-print('Print the greeting message using f-string with expressions and String methods:', greeting_message_fstring_expr)  # Output: Hello, ALICE! Next year, you will be 31 years old.
-# 4. Using the .join() method
-greeting_message_join = ' '.join([greeting + ',', name + '!'])
-print('Print the greeting message using join() method:', greeting_message_join)  # Output: Hello, Alice!
\ No newline at end of file
+def concatenation(greeting='Hello', name='Alice', age=30):
+    banner('8. STRING CONCATENATION AND INTERPOLATION(INSERTING VARIABLES AND EXPRESSIONS INTO STRINGS)')
+    # String concatenation is the operation of joining two or more strings together. In Python, this can be done in multiple ways:
+    ### 1. Using the + operator
+    greeting_message = greeting + ',' + ' ' + name + '!'
+    print('Print the greeting message using + operator:', greeting_message)  # Output: Hello, Alice!
+    # 2. Using .format() method
+    greeting_message_format = '{}, {}! Welcome to Python.'.format(greeting, name)
+    print('Print the greeting message using .format() method:', greeting_message_format)  # Output: Hello, Alice! Welcome to Python.
+    # 3. Using formatted string literals (f-strings)
+    greeting_message_fstring = f'{greeting}, {name}! How are you?'
+    print('Print the greeting message using f-string:', greeting_message_fstring)  # Output: Hello, Alice! How are you?
+    # 3.1 Using f-strings with expressions and String methods
+    greeting_message_fstring_expr = f'{greeting}, {name.upper()}! Next year, you will be {age + 1} years old.'
+    print('Print the greeting message using f-string with expressions and String methods:', greeting_message_fstring_expr)  # Output: Hello, ALICE! Next year, you will be 31 years old.
+    # 4. Using the .join() method
+    greeting_message_join = ' '.join([greeting + ',', name + '!'])
+    print('Print the greeting message using join() method:', greeting_message_join)  # Output: Hello, Alice!
+    return greeting_message
+
+
+SECTIONS = [attributes_and_methods, length, slicing, changing_case, counting, finding, replacing, concatenation]
+
+
+def run(sections=None, docs=False):
+    """Run the numbered sections (default: all) in order."""
+    for number, section in enumerate(SECTIONS, 1):
+        if sections is None or number in sections:
+            section(docs) if section is attributes_and_methods else section()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='String basics, section by section.')
+    parser.add_argument('--section', type=int, action='append', choices=range(1, len(SECTIONS) + 1),
+                        help='run only this section (repeatable; default: all)')
+    parser.add_argument('--docs', action='store_true', help='include the full help() text of str and str.upper')
+    args = parser.parse_args(argv)
+    run(args.section, args.docs)
+
+
+if __name__ == '__main__':
+    main()
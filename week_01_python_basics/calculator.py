@@ -0,0 +1,270 @@
+# Calculator
+# Evaluates arithmetic expressions built from numbers, variable names,
+# parentheses and the operators from basics_integers_float.py:
+#   +  -  *  /  //  %  **   (and unary + and -)
+#
+# An expression is parsed once with the ast module, checked against that
+# whitelist and compiled into a Python function of its variables. Compiled
+# expressions are kept in an LRU cache, so using the same formula again costs
+# a dictionary lookup instead of a parse.
+#
+# `**` is the one operator whose result can be far bigger than its operands:
+# 9 ** 9 ** 9 has about 370 million digits and would keep Python busy for
+# hours. It is compiled into a call to power(), which refuses an integer
+# result of more than MAX_POWER_BITS bits before computing it. A variable or
+# number raised to a small literal exponent (area ** 2, x ** 0.5) cannot grow
+# out of hand and keeps the faster plain `**`.
+#
+# Because the compiled function only uses the arithmetic operators, it works
+# on NumPy arrays as well as on plain numbers: evaluate_columns() computes a
+# derived column over millions of rows in one call instead of once per row.
+#
+# Usage:
+#   python -m week_01_python_basics.calculator                 # interactive
+#   python -m week_01_python_basics.calculator "2 ** 10 // 3"
+#   python -m week_01_python_basics.calculator "price / area" --var price=250000 --var area=80
+
+# ============================================================================
+# INDEX - Topics Covered in This File
+# ============================================================================
+# 1. Parsing and checking an expression (ast)
+# 2. Compiled expressions and the LRU cache
+# 3. Vectorized evaluation over columns (NumPy)
+# 4. Interactive calculator and command line interface
+# ============================================================================
+
+import argparse
+import ast
+import math
+from functools import lru_cache
+
+BINARY_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow)
+UNARY_OPERATORS = (ast.UAdd, ast.USub)
+CACHE_SIZE = 256
+MAX_POWER_BITS = 10000  # about 3,000 decimal digits, below Python's int-to-str limit
+SAFE_EXPONENT = 16  # `x ** 2` with a literal exponent this small stays a plain `**`
+
+
+# ============================================================================
+# 1. PARSING AND CHECKING AN EXPRESSION
+# ============================================================================
+def parse(source):
+    """Parse `source` and return (ast.Expression, sorted variable names).
+
+    Raises ValueError for anything that is not plain arithmetic: function
+    calls, attributes, comparisons, strings, ... are all rejected, so an
+    expression can never run arbitrary code. The size of a power is checked
+    when the expression is evaluated, see power().
+    """
+    try:
+        tree = ast.parse(source.strip(), mode='eval')
+    except SyntaxError as e:
+        raise ValueError(f'invalid expression {source!r}: {e.msg}') from None
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.BinOp):
+            if not isinstance(node.op, BINARY_OPERATORS):
+                raise ValueError(f'operator {type(node.op).__name__} is not allowed in {source!r}')
+        elif isinstance(node, ast.UnaryOp):
+            if not isinstance(node.op, UNARY_OPERATORS):
+                raise ValueError(f'operator {type(node.op).__name__} is not allowed in {source!r}')
+        elif isinstance(node, ast.Constant):
+            if type(node.value) not in (int, float):
+                raise ValueError(f'only numbers are allowed in {source!r}, got {node.value!r}')
+        elif isinstance(node, ast.Name):
+            if node.id.startswith('_'):
+                raise ValueError(f'variable names cannot start with "_": {node.id!r}')
+            names.add(node.id)
+        elif not isinstance(node, (ast.Expression, ast.Load, ast.operator, ast.unaryop)):
+            raise ValueError(f'{type(node).__name__} is not allowed in {source!r}')
+    return tree, tuple(sorted(names))
+
+
+# ============================================================================
+# 2. COMPILED EXPRESSIONS AND THE LRU CACHE
+# ============================================================================
+def power(base, exponent):
+    """base ** exponent, raising ValueError instead of building a huge integer.
+
+    Only Python ints can grow without bound: floats overflow (OverflowError)
+    and NumPy integers wrap around, so they are passed straight to `**`.
+    """
+    if isinstance(base, int) and isinstance(exponent, int) and exponent > 1 and abs(base) > 1:
+        bits = exponent * math.log2(abs(base))
+        if bits > MAX_POWER_BITS:
+            raise ValueError(f'power too large: the result would have about {bits:,.0f} bits '
+                             f'(at most {MAX_POWER_BITS:,})')
+    return base ** exponent
+
+
+def _is_small_power(node):
+    # Bounded growth: a float exponent gives a float; a small int exponent at
+    # most multiplies the size of a base that is not itself computed.
+    exponent = node.right.value if isinstance(node.right, ast.Constant) else None
+    return (isinstance(node.left, (ast.Name, ast.Constant))
+            and (isinstance(exponent, float) or (isinstance(exponent, int) and exponent <= SAFE_EXPONENT)))
+
+
+class _PowerToCall(ast.NodeTransformer):
+    # a ** b  ->  _power(a, b); variables cannot start with '_', so the name is free.
+    def visit_BinOp(self, node):
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Pow) and not _is_small_power(node):
+            return ast.Call(func=ast.Name(id='_power', ctx=ast.Load()), args=[node.left, node.right], keywords=[])
+        return node
+
+
+class CompiledExpression:
+    """An expression compiled into `function(*values)`, values in `variables` order."""
+
+    __slots__ = ('source', 'variables', 'function')
+
+    def __init__(self, source):
+        tree, variables = parse(source)
+        # Wrap the checked expression in `lambda a, b, ...: <expression>` so a
+        # call is a normal function call with positional arguments.
+        arguments = ast.arguments(posonlyargs=[], args=[ast.arg(arg=name) for name in variables],
+                                  kwonlyargs=[], kw_defaults=[], defaults=[])
+        wrapper = ast.Expression(body=ast.Lambda(args=arguments, body=_PowerToCall().visit(tree.body)))
+        code = compile(ast.fix_missing_locations(wrapper), '<expression>', 'eval')
+        self.source = source
+        self.variables = variables
+        self.function = eval(code, {'__builtins__': {}, '_power': power})
+
+    def __call__(self, bindings=None, **kwargs):
+        """Evaluate with variables from a mapping and/or keyword arguments."""
+        if kwargs:
+            bindings = dict(bindings or {}, **kwargs)
+        elif bindings is None:
+            bindings = {}
+        try:
+            return self.function(*[bindings[name] for name in self.variables])
+        except KeyError as e:
+            raise ValueError(f'no value for variable {e.args[0]!r} in {self.source!r}') from None
+
+    def __repr__(self):
+        return f'CompiledExpression({self.source!r})'
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def compile_expression(source):
+    """Return the CompiledExpression for `source`, parsing it only the first time."""
+    return CompiledExpression(source)
+
+
+def evaluate(source, bindings=None, **kwargs):
+    """Evaluate `source` once, e.g. evaluate('a * b + 1', a=2, b=3) -> 7."""
+    return compile_expression(source)(bindings, **kwargs)
+
+
+# ============================================================================
+# 3. VECTORIZED EVALUATION OVER COLUMNS
+# ============================================================================
+def evaluate_columns(source, columns):
+    """Evaluate `source` over whole columns at once and return a NumPy array.
+
+    `columns` maps variable names to sequences of equal length (lists,
+    array.array, NumPy arrays, ...). The compiled function runs a single time
+    with NumPy arrays as arguments, so every operator loops in C instead of in
+    Python. Division by zero gives inf/nan like NumPy does, without warnings.
+    """
+    import numpy as np  # only needed here; the rest of the calculator is stdlib
+
+    expression = compile_expression(source)
+    arrays = []
+    for name in expression.variables:
+        if name not in columns:
+            raise ValueError(f'no column for variable {name!r} in {source!r}')
+        arrays.append(np.asarray(columns[name]))
+    lengths = {len(array) for array in arrays}
+    if len(lengths) > 1:
+        raise ValueError(f'columns for {source!r} have different lengths: {sorted(lengths)}')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # A constant expression (no variables) gives a 0-d array.
+        return np.asarray(expression.function(*arrays))
+
+
+def evaluate_chunks(source, chunks):
+    """Yield one result array per chunk from csv_reader.read_chunks().
+
+    Only the columns the expression uses are converted to NumPy (zero-copy
+    for numeric columns), so a derived column over a file that does not fit
+    in memory is computed one chunk at a time.
+    """
+    from week_02_files_data_structures.csv_reader import to_numpy
+
+    variables = compile_expression(source).variables
+    for chunk in chunks:
+        yield evaluate_columns(source, to_numpy({name: chunk[name] for name in variables}))
+
+
+# ============================================================================
+# 4. INTERACTIVE CALCULATOR AND COMMAND LINE INTERFACE
+# ============================================================================
+def parse_assignment(line):
+    """Split 'name = expression' into (name, expression); (None, line) otherwise."""
+    name, sep, rest = line.partition('=')
+    name = name.strip()
+    if sep and name.isidentifier() and not rest.startswith('='):
+        return name, rest
+    return None, line
+
+
+def interactive(variables):
+    """Read expressions until 'quit'. 'x = ...' stores a variable, 'ans' is the last result."""
+    print("Calculator - type an expression, 'name = expression' to store a value, 'quit' to exit.")
+    while True:
+        try:
+            line = input('calc> ').strip()
+        except EOFError:
+            print()
+            break
+        if line in ('quit', 'exit', 'q'):
+            break
+        if not line:
+            continue
+        name, source = parse_assignment(line)
+        try:
+            result = evaluate(source, variables)
+        except (ValueError, ArithmeticError) as e:
+            print(f'Error: {e}')
+            continue
+        variables['ans'] = result
+        if name:
+            variables[name] = result
+        print(result)
+
+
+def parse_variable(text):
+    name, sep, value = text.partition('=')
+    if not sep or not name.strip().isidentifier():
+        raise argparse.ArgumentTypeError(f'expected NAME=NUMBER, got {text!r}')
+    try:
+        number = int(value)
+    except ValueError:
+        try:
+            number = float(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f'{value!r} is not a number') from None
+    return name.strip(), number
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Evaluate arithmetic expressions.')
+    parser.add_argument('expression', nargs='?', help='expression to evaluate (interactive if omitted)')
+    parser.add_argument('--var', action='append', type=parse_variable, default=[], metavar='NAME=NUMBER',
+                        help='bind a variable (repeatable)')
+    args = parser.parse_args(argv)
+
+    variables = dict(args.var)
+    if args.expression is None:
+        interactive(variables)
+        return
+    try:
+        print(evaluate(args.expression, variables))
+    except (ValueError, ArithmeticError) as e:
+        parser.exit(1, f'error: {e}\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,466 @@
+# Contact Book
+# Stores contacts in memory with indexes for fast lookups:
+#
+#   Operation                      | How                               | Cost
+#   get by id                      | dict id -> Contact                | O(1)
+#   find by email                  | dict email -> id                  | O(1)
+#   find by exact name             | dict name -> id (or list of ids)  | O(1)
+#   search by name prefix          | sorted list of names + bisect     | O(log n + matches)
+#
+# Each contact is a Contact object with __slots__: no per-instance __dict__, so
+# millions of contacts fit in memory (see benchmarks/bench_contact_book.py).
+# Names and emails are compared case-insensitively.
+#
+# ContactStore offers the same operations on a SQLite database (sqlite_store.py)
+# for data that should not live in memory: bulk import/export in batched
+# transactions, indexed queries and results streamed page by page.
+#
+# Usage:
+#   python -m week_01_python_basics.contact_book                    # interactive menu
+#   python -m week_01_python_basics.contact_book --file contacts.csv
+#   python -m week_01_python_basics.contact_book --db contacts.db --import contacts.csv
+
+# ============================================================================
+# INDEX - Topics Covered in This File
+# ============================================================================
+# 1. Contact record (__slots__)
+# 2. ContactBook: adding, removing and O(1) lookups
+# 3. Prefix search with a sorted index (autocomplete)
+# 4. Loading and saving CSV files
+# 5. SQLite-backed persistent store
+# 6. Interactive menu
+# ============================================================================
+
+import argparse
+import csv
+import os
+import sqlite3
+from bisect import bisect_left, insort
+
+from week_01_python_basics.sqlite_store import bulk_insert, bulk_load, connect, iter_query, prefix_upper_bound
+
+FIELDS = ['id', 'name', 'email', 'phone']
+
+
+def normalize(text):
+    """Key used by the indexes: trimmed and case-folded."""
+    return text.strip().casefold()
+
+
+# ============================================================================
+# 1. CONTACT RECORD
+# ============================================================================
+class Contact:
+    """One contact. __slots__ keeps each instance small (no __dict__)."""
+
+    __slots__ = ('id', 'name', 'email', 'phone')
+
+    def __init__(self, id, name, email='', phone=''):
+        self.id = id
+        self.name = name
+        self.email = email
+        self.phone = phone
+
+    def __repr__(self):
+        return f'Contact(id={self.id!r}, name={self.name!r}, email={self.email!r}, phone={self.phone!r})'
+
+    def __eq__(self, other):
+        if not isinstance(other, Contact):
+            return NotImplemented
+        return (self.id, self.name, self.email, self.phone) == (other.id, other.name, other.email, other.phone)
+
+    def as_row(self):
+        return [self.id, self.name, self.email, self.phone]
+
+
+# ============================================================================
+# 2. CONTACT BOOK
+# ============================================================================
+class ContactBook:
+    """Contacts with O(1) id/email/name lookups and prefix search on names.
+
+    Emails are unique (adding a second contact with the same email raises
+    ValueError). Names are not: the name index maps a name to one id, or to a
+    list of ids when several contacts share it.
+    """
+
+    def __init__(self):
+        self._by_id = {}
+        self._by_email = {}
+        self._by_name = {}
+        self._sorted_names = []     # sorted unique normalized names, for prefix search
+        self._sorted_dirty = False  # True after a bulk load: rebuilt on the next search
+        self._next_id = 1
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __iter__(self):
+        return iter(self._by_id.values())
+
+    def __contains__(self, contact_id):
+        return contact_id in self._by_id
+
+    def add(self, name, email='', phone='', id=None):
+        """Create a contact and return it. Raises ValueError if the email is already used."""
+        name = name.strip()
+        if not name:
+            raise ValueError('name must not be empty')
+        email = email.strip()
+        email_key = normalize(email)
+        if email_key == email:
+            email = email_key  # share one string between the record and the index
+        if email_key and email_key in self._by_email:
+            raise ValueError(f'a contact with email {email!r} already exists')
+        if id is None:
+            id = self._next_id
+        elif id in self._by_id:
+            raise ValueError(f'a contact with id {id!r} already exists')
+        self._next_id = max(self._next_id, id + 1)
+
+        contact = Contact(id, name, email, phone.strip())
+        self._by_id[id] = contact
+        if email_key:
+            self._by_email[email_key] = id
+        self._index_name(normalize(name), id)
+        return contact
+
+    def _index_name(self, key, contact_id):
+        existing = self._by_name.get(key)
+        if existing is None:
+            self._by_name[key] = contact_id
+            if not self._sorted_dirty:
+                insort(self._sorted_names, key)
+        elif isinstance(existing, list):
+            existing.append(contact_id)
+        else:
+            self._by_name[key] = [existing, contact_id]
+
+    def _unindex_name(self, key, contact_id):
+        existing = self._by_name[key]
+        if isinstance(existing, list):
+            existing.remove(contact_id)
+            if len(existing) == 1:
+                self._by_name[key] = existing[0]
+            return
+        del self._by_name[key]
+        if not self._sorted_dirty:
+            del self._sorted_names[bisect_left(self._sorted_names, key)]
+
+    def remove(self, contact_id):
+        """Delete a contact by id and return it. Raises KeyError if it does not exist."""
+        contact = self._by_id.pop(contact_id)
+        email_key = normalize(contact.email)
+        if email_key:
+            del self._by_email[email_key]
+        self._unindex_name(normalize(contact.name), contact_id)
+        return contact
+
+    def update(self, contact_id, name=None, email=None, phone=None):
+        """Change fields of a contact, keeping the indexes in sync."""
+        contact = self._by_id[contact_id]
+        if email is not None and normalize(email) != normalize(contact.email):
+            email_key = normalize(email)
+            if email_key and email_key in self._by_email:
+                raise ValueError(f'a contact with email {email!r} already exists')
+            if normalize(contact.email):
+                del self._by_email[normalize(contact.email)]
+            if email_key:
+                self._by_email[email_key] = contact_id
+            contact.email = email.strip()
+        if name is not None and name.strip():
+            self._unindex_name(normalize(contact.name), contact_id)
+            contact.name = name.strip()
+            self._index_name(normalize(contact.name), contact_id)
+        if phone is not None:
+            contact.phone = phone.strip()
+        return contact
+
+    def get(self, contact_id):
+        """Contact with this id, or None."""
+        return self._by_id.get(contact_id)
+
+    def find_by_email(self, email):
+        """Contact with this email (case-insensitive), or None."""
+        contact_id = self._by_email.get(normalize(email))
+        return None if contact_id is None else self._by_id[contact_id]
+
+    def find_by_name(self, name):
+        """List of contacts with exactly this name (case-insensitive)."""
+        ids = self._by_name.get(normalize(name))
+        if ids is None:
+            return []
+        if not isinstance(ids, list):
+            return [self._by_id[ids]]
+        return [self._by_id[contact_id] for contact_id in ids]
+
+    # ========================================================================
+    # 3. PREFIX SEARCH
+    # ========================================================================
+    def search(self, prefix, limit=10):
+        """Contacts whose name starts with `prefix` (case-insensitive), in name order.
+
+        Binary search finds the first matching name in the sorted index, then
+        names are read in order until one stops matching: O(log n + limit).
+        """
+        if self._sorted_dirty:
+            self._sorted_names = sorted(self._by_name)
+            self._sorted_dirty = False
+        key = normalize(prefix)
+        names = self._sorted_names
+        results = []
+        position = bisect_left(names, key)
+        while position < len(names) and names[position].startswith(key) and len(results) < limit:
+            results.extend(self.find_by_name(names[position])[:limit - len(results)])
+            position += 1
+        return results
+
+    # ========================================================================
+    # 4. LOADING AND SAVING CSV FILES
+    # ========================================================================
+    def load_csv(self, path, skip_duplicates=True):
+        """Add every contact of a CSV file with columns id,name,email,phone.
+
+        Duplicate emails are skipped (or raise ValueError if skip_duplicates is
+        False). Returns the number of skipped rows. The sorted name index is
+        rebuilt once, on the next search(), instead of once per row.
+        """
+        skipped = 0
+        self._sorted_dirty = True
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                contact_id = int(row['id']) if row.get('id') else None
+                try:
+                    self.add(row['name'], row.get('email') or '', row.get('phone') or '', id=contact_id)
+                except ValueError:
+                    if not skip_duplicates:
+                        raise
+                    skipped += 1
+        return skipped
+
+    def save_csv(self, path):
+        """Write all contacts to a CSV file (written to a temporary file first)."""
+        temporary = f'{path}.tmp'
+        with open(temporary, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(FIELDS)
+            writer.writerows(contact.as_row() for contact in self)
+        os.replace(temporary, path)
+
+
+# ============================================================================
+# 5. SQLITE-BACKED PERSISTENT STORE
+# ============================================================================
+# name_key/email_key hold the normalized values so the indexes serve
+# case-insensitive lookups; email_key is UNIQUE like the email index of
+# ContactBook (NULL for contacts without an email).
+CONTACTS_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS contacts (
+    id        INTEGER PRIMARY KEY,
+    name      TEXT NOT NULL,
+    email     TEXT NOT NULL DEFAULT '',
+    phone     TEXT NOT NULL DEFAULT '',
+    name_key  TEXT NOT NULL,
+    email_key TEXT UNIQUE
+);
+CREATE INDEX IF NOT EXISTS contacts_name_key ON contacts (name_key);
+'''
+
+_INSERT_CONTACT = ('INSERT INTO contacts (id, name, email, phone, name_key, email_key) '
+                   'VALUES (?, ?, ?, ?, ?, ?)')
+_INSERT_CONTACT_OR_SKIP = _INSERT_CONTACT.replace('INSERT', 'INSERT OR IGNORE', 1)
+
+
+def _contact_params(contact_id, name, email, phone):
+    name, email, phone = name.strip(), email.strip(), phone.strip()
+    return contact_id, name, email, phone, normalize(name), normalize(email) or None
+
+
+def _contact_from_row(row):
+    return Contact(row['id'], row['name'], row['email'], row['phone'])
+
+
+class ContactStore:
+    """Contacts in a SQLite database, with the same lookups as ContactBook."""
+
+    def __init__(self, path):
+        self.conn = connect(path)
+        self.conn.executescript(CONTACTS_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.conn.execute('SELECT COUNT(*) FROM contacts').fetchone()[0]
+
+    def __iter__(self):
+        return self.iter_contacts()
+
+    def add(self, name, email='', phone='', id=None):
+        """Insert one contact and return it. Raises ValueError if the email is already used."""
+        params = _contact_params(id, name, email, phone)
+        if not params[1]:
+            raise ValueError('name must not be empty')
+        try:
+            with self.conn:
+                cursor = self.conn.execute(_INSERT_CONTACT, params)
+        except sqlite3.IntegrityError:
+            if id is None:
+                raise ValueError(f'a contact with email {email!r} already exists') from None
+            raise ValueError(f'a contact with email {email!r} or id {id!r} already exists') from None
+        return Contact(cursor.lastrowid, *params[1:4])
+
+    def add_many(self, contacts, batch_size=50000):
+        """Bulk insert (name, email, phone) or (id, name, email, phone) tuples.
+
+        Rows with an email or id that is already stored are skipped. When the
+        table is empty the name index is built once after the load (see bulk_load).
+        Returns the number of rows inserted.
+        """
+        params = (_contact_params(*row) if len(row) == 4 else _contact_params(None, *row) for row in contacts)
+        if self.conn.execute('SELECT 1 FROM contacts LIMIT 1').fetchone() is None:
+            return bulk_load(self.conn, 'contacts', _INSERT_CONTACT_OR_SKIP, params, batch_size)
+        return bulk_insert(self.conn, _INSERT_CONTACT_OR_SKIP, params, batch_size)
+
+    def import_csv(self, path, batch_size=50000):
+        """Stream a CSV file with columns id,name,email,phone into the store."""
+        with open(path, newline='', encoding='utf-8') as f:
+            rows = ((int(row['id']) if row.get('id') else None, row['name'], row.get('email') or '',
+                     row.get('phone') or '') for row in csv.DictReader(f))
+            return self.add_many(rows, batch_size)
+
+    def export_csv(self, path, page_size=10000):
+        """Stream every contact to a CSV file without loading them all in memory."""
+        temporary = f'{path}.tmp'
+        with open(temporary, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(FIELDS)
+            writer.writerows(iter_query(self.conn, 'SELECT id, name, email, phone FROM contacts ORDER BY id',
+                                        page_size=page_size))
+        os.replace(temporary, path)
+
+    def remove(self, contact_id):
+        """Delete a contact by id and return it. Raises KeyError if it does not exist."""
+        contact = self.get(contact_id)
+        if contact is None:
+            raise KeyError(contact_id)
+        with self.conn:
+            self.conn.execute('DELETE FROM contacts WHERE id = ?', (contact_id,))
+        return contact
+
+    def get(self, contact_id):
+        row = self.conn.execute('SELECT * FROM contacts WHERE id = ?', (contact_id,)).fetchone()
+        return None if row is None else _contact_from_row(row)
+
+    def find_by_email(self, email):
+        row = self.conn.execute('SELECT * FROM contacts WHERE email_key = ?', (normalize(email),)).fetchone()
+        return None if row is None else _contact_from_row(row)
+
+    def find_by_name(self, name):
+        rows = self.conn.execute('SELECT * FROM contacts WHERE name_key = ? ORDER BY id', (normalize(name),))
+        return [_contact_from_row(row) for row in rows]
+
+    def search(self, prefix, limit=10):
+        """Contacts whose name starts with `prefix`, in name order (index range scan)."""
+        key = normalize(prefix)
+        if not key:
+            rows = self.conn.execute('SELECT * FROM contacts ORDER BY name_key, id LIMIT ?', (limit,))
+        else:
+            rows = self.conn.execute('SELECT * FROM contacts WHERE name_key >= ? AND name_key < ? '
+                                     'ORDER BY name_key, id LIMIT ?', (key, prefix_upper_bound(key), limit))
+        return [_contact_from_row(row) for row in rows]
+
+    def iter_contacts(self, page_size=1000):
+        """Yield every contact in id order, fetching `page_size` rows at a time."""
+        for row in iter_query(self.conn, 'SELECT * FROM contacts ORDER BY id', page_size=page_size):
+            yield _contact_from_row(row)
+
+
+# ============================================================================
+# 6. INTERACTIVE MENU
+# ============================================================================
+MENU = '''
+1. Add contact
+2. Search by name (prefix)
+3. Find by email
+4. List all contacts
+5. Delete contact
+6. Quit'''
+
+
+def print_contacts(contacts):
+    found = False
+    for contact in contacts:
+        found = True
+        print(f'  [{contact.id}] {contact.name:<25} {contact.email:<30} {contact.phone}')
+    if not found:
+        print('No contacts found.')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='A small contact book.')
+    parser.add_argument('--file', default='contacts.csv', help='CSV file to load from and save to')
+    parser.add_argument('--db', help='use a SQLite database instead of a CSV file')
+    parser.add_argument('--import', dest='import_path', help='with --db: bulk import a CSV file and exit')
+    parser.add_argument('--export', dest='export_path', help='with --db: export all contacts to a CSV file and exit')
+    args = parser.parse_args(argv)
+
+    if args.db:
+        book = ContactStore(args.db)
+        if args.import_path or args.export_path:
+            if args.import_path:
+                print(f'Imported {book.import_csv(args.import_path)} contacts from {args.import_path}')
+            if args.export_path:
+                book.export_csv(args.export_path)
+                print(f'Exported {len(book)} contacts to {args.export_path}')
+            return
+        save = lambda: None  # every change is already committed to the database
+    else:
+        if args.import_path or args.export_path:
+            parser.error('--import/--export require --db')
+        book = ContactBook()
+        if os.path.exists(args.file):
+            book.load_csv(args.file)
+            print(f'Loaded {len(book)} contacts from {args.file}')
+        save = lambda: book.save_csv(args.file)
+
+    while True:
+        print(MENU)
+        choice = input('Choose an option: ').strip()
+        if choice == '1':
+            try:
+                contact = book.add(input('Name: '), input('Email: '), input('Phone: '))
+            except ValueError as error:
+                print(f'Error: {error}')
+            else:
+                save()
+                print(f'Added {contact.name} with id {contact.id}')
+        elif choice == '2':
+            print_contacts(book.search(input('Name starts with: ')))
+        elif choice == '3':
+            contact = book.find_by_email(input('Email: '))
+            print_contacts([contact] if contact else [])
+        elif choice == '4':
+            print_contacts(book)
+        elif choice == '5':
+            try:
+                book.remove(int(input('Id to delete: ')))
+            except (KeyError, ValueError):
+                print('Error: no contact with that id')
+            else:
+                save()
+                print('Deleted.')
+        elif choice == '6':
+            break
+        else:
+            print('Please choose a number from 1 to 6.')
+
+
+if __name__ == '__main__':
+    main()
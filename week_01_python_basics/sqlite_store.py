@@ -0,0 +1,91 @@
+# SQLite helpers shared by contact_book.py and todo_list.py
+# Everything here uses only the standard library sqlite3 module.
+#
+#   connect()      -> opens a database in WAL mode (readers do not block the writer)
+#   bulk_insert()  -> executemany() in batches, one transaction per batch
+#   bulk_load()    -> bulk_insert() into an empty table, building indexes afterwards
+#   iter_query()   -> streams query results with fetchmany(), page by page
+#
+# Why batches and transactions: by default every INSERT is its own transaction
+# and has to reach the disk before the next one starts. Grouping tens of
+# thousands of rows per transaction is what makes a 1M row import take seconds.
+
+import sqlite3
+from itertools import islice
+
+DEFAULT_BATCH_SIZE = 50000
+DEFAULT_PAGE_SIZE = 1000
+
+
+def connect(path):
+    """Open (or create) a SQLite database tuned for bulk loads and concurrent reads."""
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    if path != ':memory:':
+        conn.execute('PRAGMA journal_mode=WAL')
+    # With WAL, NORMAL only syncs at checkpoints: still safe against application
+    # crashes, much faster than FULL.
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA cache_size=-65536')  # 64 MB page cache (negative = KiB)
+    return conn
+
+
+def bulk_insert(conn, sql, rows, batch_size=DEFAULT_BATCH_SIZE):
+    """Insert an iterable of parameter tuples with executemany(), `batch_size` rows per transaction.
+
+    `rows` may be a generator, so the input never has to fit in memory.
+    Returns the number of rows actually inserted (INSERT OR IGNORE may skip some).
+    """
+    rows = iter(rows)
+    before = conn.total_changes
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            break
+        with conn:  # one transaction per batch, rolled back on error
+            conn.executemany(sql, batch)
+    return conn.total_changes - before
+
+
+def bulk_load(conn, table, sql, rows, batch_size=DEFAULT_BATCH_SIZE):
+    """Like bulk_insert(), but drop the table's indexes first and recreate them at the end.
+
+    Building an index once over sorted data is much faster than updating it
+    for every inserted row. Only worth it when the table is empty or small
+    compared to the import. Indexes created by UNIQUE/PRIMARY KEY constraints
+    cannot be dropped and are kept.
+    """
+    indexes = conn.execute("SELECT name, sql FROM sqlite_master "
+                           "WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL", (table,)).fetchall()
+    with conn:
+        for name, _ in indexes:
+            conn.execute(f'DROP INDEX "{name}"')
+    try:
+        return bulk_insert(conn, sql, rows, batch_size)
+    finally:
+        with conn:
+            for _, create_sql in indexes:
+                conn.execute(create_sql)
+
+
+def iter_query(conn, sql, params=(), page_size=DEFAULT_PAGE_SIZE):
+    """Yield the rows of a query, fetching `page_size` rows at a time."""
+    cursor = conn.execute(sql, params)
+    try:
+        while True:
+            rows = cursor.fetchmany(page_size)
+            if not rows:
+                break
+            yield from rows
+    finally:
+        cursor.close()
+
+
+def prefix_upper_bound(prefix):
+    """Smallest string greater than every string starting with `prefix`.
+
+    `column >= prefix AND column < prefix_upper_bound(prefix)` is a prefix
+    match that can use an index, unlike LIKE 'prefix%'.
+    """
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
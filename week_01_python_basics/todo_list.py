@@ -0,0 +1,435 @@
+# To-Do List
+# Tasks with a title, a priority (1 = most urgent), an optional due date
+# (YYYY-MM-DD) and a status ('open' or 'done').
+#
+# Tasks are kept in a SQLite database (sqlite_store.py), so the list does not
+# have to fit in memory and a change does not rewrite the whole file:
+#   - bulk import/export of CSV files in batched transactions
+#   - indexed queries on title, due date and status
+#   - results streamed page by page with a cursor
+#
+# TaskQueue is an in-memory scheduler for using the list as a job queue: a heap
+# ordered by (priority, due date) plus an id -> entry map, so getting the next
+# task, adding, completing and reprioritising are all O(log n). The 'next'
+# command does not load the queue: TaskStore.most_urgent() finds the same task
+# (same order as TaskQueue) with a few index lookups, and it is marked done in
+# the store.
+#
+# Usage:
+#   python -m week_01_python_basics.todo_list add "Write report" --priority 1 --due 2024-06-01
+#   python -m week_01_python_basics.todo_list list --status open --due-before 2024-07-01
+#   python -m week_01_python_basics.todo_list done 3
+#   python -m week_01_python_basics.todo_list next --peek     # show the most urgent open task
+#   python -m week_01_python_basics.todo_list next            # take it: print it and mark it done
+#   python -m week_01_python_basics.todo_list import tasks.csv
+#   python -m week_01_python_basics.todo_list export tasks.csv
+
+# ============================================================================
+# INDEX - Topics Covered in This File
+# ============================================================================
+# 1. Task record (__slots__)
+# 2. SQLite-backed task store
+# 3. Priority-heap scheduler (TaskQueue)
+# 4. Command line interface
+# ============================================================================
+
+import argparse
+import csv
+import heapq
+import itertools
+import os
+
+from week_01_python_basics.sqlite_store import bulk_insert, bulk_load, connect, iter_query, prefix_upper_bound
+
+OPEN = 'open'
+DONE = 'done'
+STATUSES = (OPEN, DONE)
+FIELDS = ['id', 'title', 'priority', 'due', 'status']
+DEFAULT_PRIORITY = 3
+
+
+# ============================================================================
+# 1. TASK RECORD
+# ============================================================================
+class Task:
+    """One task. __slots__ keeps each instance small (no __dict__)."""
+
+    __slots__ = ('id', 'title', 'priority', 'due', 'status')
+
+    def __init__(self, id, title, priority=DEFAULT_PRIORITY, due='', status=OPEN):
+        self.id = id
+        self.title = title
+        self.priority = priority
+        self.due = due
+        self.status = status
+
+    def __repr__(self):
+        return (f'Task(id={self.id!r}, title={self.title!r}, priority={self.priority!r}, '
+                f'due={self.due!r}, status={self.status!r})')
+
+    def __eq__(self, other):
+        if not isinstance(other, Task):
+            return NotImplemented
+        return self.as_row() == other.as_row()
+
+    def as_row(self):
+        return [self.id, self.title, self.priority, self.due, self.status]
+
+
+def _task_params(task_id, title, priority=DEFAULT_PRIORITY, due='', status=OPEN):
+    title = title.strip()
+    if not title:
+        raise ValueError('title must not be empty')
+    if status not in STATUSES:
+        raise ValueError(f'status must be one of {STATUSES}, not {status!r}')
+    return task_id, title, int(priority), (due or '').strip(), status
+
+
+def _task_from_row(row):
+    return Task(row['id'], row['title'], row['priority'], row['due'], row['status'])
+
+
+# ============================================================================
+# 2. SQLITE-BACKED TASK STORE
+# ============================================================================
+# Dates are stored as ISO strings, which sort in date order. An empty due date
+# sorts before every real date, so "due before X" queries exclude it explicitly.
+TASKS_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS tasks (
+    id       INTEGER PRIMARY KEY,
+    title    TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    due      TEXT NOT NULL DEFAULT '',
+    status   TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_status_due ON tasks (status, due);
+CREATE INDEX IF NOT EXISTS tasks_status_priority_due ON tasks (status, priority, due);
+CREATE INDEX IF NOT EXISTS tasks_title ON tasks (title);
+'''
+
+_INSERT_TASK = 'INSERT INTO tasks (id, title, priority, due, status) VALUES (?, ?, ?, ?, ?)'
+_INSERT_TASK_OR_SKIP = _INSERT_TASK.replace('INSERT', 'INSERT OR IGNORE', 1)
+_ORDERS = {
+    'id': 'id',
+    'due': "due = '', due, priority, id",  # tasks without a due date last
+    'priority': "priority, due = '', due, id",
+}
+
+
+class TaskStore:
+    """Tasks in a SQLite database."""
+
+    def __init__(self, path):
+        self.conn = connect(path)
+        self.conn.executescript(TASKS_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.conn.execute('SELECT COUNT(*) FROM tasks').fetchone()[0]
+
+    def add(self, title, priority=DEFAULT_PRIORITY, due='', status=OPEN):
+        """Insert one task and return it."""
+        params = _task_params(None, title, priority, due, status)
+        with self.conn:
+            cursor = self.conn.execute(_INSERT_TASK, params)
+        return Task(cursor.lastrowid, *params[1:])
+
+    def add_many(self, tasks, batch_size=50000):
+        """Bulk insert (title, priority, due, status) or (id, title, priority, due, status) tuples.
+
+        Rows with an id that is already stored are skipped. When the table is
+        empty the indexes are built once after the load (see bulk_load).
+        Returns the number of rows inserted.
+        """
+        params = (_task_params(*row) if len(row) == 5 else _task_params(None, *row) for row in tasks)
+        if self.conn.execute('SELECT 1 FROM tasks LIMIT 1').fetchone() is None:
+            return bulk_load(self.conn, 'tasks', _INSERT_TASK_OR_SKIP, params, batch_size)
+        return bulk_insert(self.conn, _INSERT_TASK_OR_SKIP, params, batch_size)
+
+    def import_csv(self, path, batch_size=50000):
+        """Stream a CSV file with columns id,title,priority,due,status into the store."""
+        with open(path, newline='', encoding='utf-8') as f:
+            rows = ((int(row['id']) if row.get('id') else None, row['title'],
+                     row.get('priority') or DEFAULT_PRIORITY, row.get('due') or '', row.get('status') or OPEN)
+                    for row in csv.DictReader(f))
+            return self.add_many(rows, batch_size)
+
+    def export_csv(self, path, page_size=10000):
+        """Stream every task to a CSV file without loading them all in memory."""
+        temporary = f'{path}.tmp'
+        with open(temporary, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(FIELDS)
+            writer.writerows(iter_query(self.conn, 'SELECT id, title, priority, due, status FROM tasks ORDER BY id',
+                                        page_size=page_size))
+        os.replace(temporary, path)
+
+    def get(self, task_id):
+        row = self.conn.execute('SELECT * FROM tasks WHERE id = ?', (task_id,)).fetchone()
+        return None if row is None else _task_from_row(row)
+
+    def set_status(self, task_id, status):
+        """Change the status of a task. Raises KeyError if it does not exist."""
+        if status not in STATUSES:
+            raise ValueError(f'status must be one of {STATUSES}, not {status!r}')
+        with self.conn:
+            cursor = self.conn.execute('UPDATE tasks SET status = ? WHERE id = ?', (status, task_id))
+        if cursor.rowcount == 0:
+            raise KeyError(task_id)
+
+    def complete(self, task_id):
+        self.set_status(task_id, DONE)
+
+    def most_urgent(self):
+        """The open task TaskQueue.from_store(store).peek() would return, or None.
+
+        Ordered by priority, then due date (tasks without one last), then id.
+        A single ORDER BY over `due = ''` would sort every open task; three
+        lookups on the (status, priority, due) index find it in O(log n).
+        """
+        priority = self.conn.execute('SELECT MIN(priority) FROM tasks WHERE status = ?', (OPEN,)).fetchone()[0]
+        if priority is None:
+            return None
+        for condition in ("due > ''", "due = ''"):
+            row = self.conn.execute(f'SELECT * FROM tasks WHERE status = ? AND priority = ? AND {condition} '
+                                    'ORDER BY due, id LIMIT 1', (OPEN, priority)).fetchone()
+            if row is not None:
+                return _task_from_row(row)
+
+    def remove(self, task_id):
+        """Delete a task. Raises KeyError if it does not exist."""
+        with self.conn:
+            cursor = self.conn.execute('DELETE FROM tasks WHERE id = ?', (task_id,))
+        if cursor.rowcount == 0:
+            raise KeyError(task_id)
+
+    def query(self, status=None, due_before=None, due_after=None, title_prefix=None, order='due',
+              limit=None, page_size=1000):
+        """Yield tasks matching every given filter, streamed `page_size` rows at a time.
+
+        status       : 'open' or 'done'
+        due_before   : tasks due strictly before this date (tasks without a due date excluded)
+        due_after    : tasks due on or after this date
+        title_prefix : tasks whose title starts with this text (case-sensitive, uses the title index)
+        order        : 'due', 'priority' or 'id'
+        """
+        conditions = []
+        params = []
+        if status is not None:
+            conditions.append('status = ?')
+            params.append(status)
+        if due_before is not None:
+            conditions.append("due != '' AND due < ?")
+            params.append(due_before)
+        if due_after is not None:
+            conditions.append('due >= ?')
+            params.append(due_after)
+        if title_prefix:
+            conditions.append('title >= ? AND title < ?')
+            params.extend([title_prefix, prefix_upper_bound(title_prefix)])
+        sql = 'SELECT * FROM tasks'
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        sql += ' ORDER BY ' + _ORDERS[order]
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        for row in iter_query(self.conn, sql, params, page_size):
+            yield _task_from_row(row)
+
+
+# ============================================================================
+# 3. PRIORITY-HEAP SCHEDULER
+# ============================================================================
+# Heap entries are lists [priority, due_key, sequence, task]. `sequence` breaks
+# ties in insertion order and means tasks themselves are never compared.
+#
+# Lazy deletion: completing or reprioritising a task does not search the heap
+# (that would be O(n)). The old entry is only marked dead (task slot set to
+# None) and skipped when it reaches the top. When dead entries outnumber live
+# ones the heap is rebuilt, so memory stays proportional to the live tasks.
+NO_DUE_DATE = '9999-12-31'  # tasks without a due date come after every dated task
+
+
+class TaskQueue:
+    """Open tasks ordered by (priority, due date), with O(log n) operations."""
+
+    def __init__(self, tasks=()):
+        self._heap = []
+        self._entries = {}  # task id -> live heap entry
+        self._sequence = itertools.count()
+        self._next_id = 1
+        for task in tasks:
+            if task.status == OPEN:
+                self._claim_id(task)
+                self._heap.append(self._new_entry(task))
+        heapq.heapify(self._heap)  # one O(n) pass instead of a push per task
+
+    @classmethod
+    def from_store(cls, store, page_size=10000):
+        """Queue of every open task in a TaskStore, streamed from the database."""
+        return cls(store.query(status=OPEN, order='id', page_size=page_size))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, task_id):
+        return task_id in self._entries
+
+    def _claim_id(self, task):
+        if task.id is None:
+            task.id = self._next_id
+        if task.id in self._entries:
+            raise ValueError(f'task {task.id} is already queued')
+        self._next_id = max(self._next_id, task.id + 1)
+
+    def _new_entry(self, task):
+        # Registers the entry; the caller puts it on the heap.
+        entry = [task.priority, task.due or NO_DUE_DATE, next(self._sequence), task]
+        self._entries[task.id] = entry
+        return entry
+
+    def _kill(self, task_id):
+        entry = self._entries.pop(task_id)
+        task, entry[-1] = entry[-1], None
+        if len(self._heap) > 64 and len(self._heap) > 2 * len(self._entries):
+            self._heap = list(self._entries.values())
+            heapq.heapify(self._heap)
+        return task
+
+    def push(self, task):
+        """Add an existing Task (for example one loaded from a TaskStore)."""
+        self._claim_id(task)
+        heapq.heappush(self._heap, self._new_entry(task))
+        return task
+
+    def add(self, title, priority=DEFAULT_PRIORITY, due=''):
+        """Create a task with the next free id, queue it and return it."""
+        _, title, priority, due, _ = _task_params(None, title, priority, due)
+        return self.push(Task(None, title, priority, due))
+
+    def peek(self):
+        """Most urgent task without removing it, or None if the queue is empty."""
+        heap = self._heap
+        while heap and heap[0][-1] is None:
+            heapq.heappop(heap)
+        return heap[0][-1] if heap else None
+
+    def pop(self):
+        """Remove and return the most urgent task. Raises IndexError if the queue is empty."""
+        heap = self._heap
+        while heap:
+            task = heapq.heappop(heap)[-1]
+            if task is not None:
+                del self._entries[task.id]
+                return task
+        raise IndexError('pop from an empty TaskQueue')
+
+    def complete(self, task_id):
+        """Mark a queued task as done and remove it. Raises KeyError if it is not queued."""
+        task = self._kill(task_id)
+        task.status = DONE
+        return task
+
+    def remove(self, task_id):
+        """Remove a queued task without completing it. Raises KeyError if it is not queued."""
+        return self._kill(task_id)
+
+    def update(self, task_id, priority=None, due=None):
+        """Change the priority and/or due date of a queued task."""
+        task = self._kill(task_id)
+        if priority is not None:
+            task.priority = int(priority)
+        if due is not None:
+            task.due = due.strip()
+        heapq.heappush(self._heap, self._new_entry(task))
+        return task
+
+
+# ============================================================================
+# 4. COMMAND LINE INTERFACE
+# ============================================================================
+def print_tasks(tasks):
+    found = False
+    for task in tasks:
+        found = True
+        mark = 'x' if task.status == DONE else ' '
+        print(f'  [{mark}] {task.id:>6}  P{task.priority}  {task.due or "-":<10}  {task.title}')
+    if not found:
+        print('No tasks found.')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='A to-do list stored in SQLite.')
+    parser.add_argument('--db', default='todo.db', help='SQLite database file (default: todo.db)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    add = commands.add_parser('add', help='add a task')
+    add.add_argument('title')
+    add.add_argument('--priority', type=int, default=DEFAULT_PRIORITY, help='1 = most urgent')
+    add.add_argument('--due', default='', help='due date as YYYY-MM-DD')
+
+    listing = commands.add_parser('list', help='list tasks')
+    listing.add_argument('--status', choices=STATUSES)
+    listing.add_argument('--due-before')
+    listing.add_argument('--due-after')
+    listing.add_argument('--title', help='title prefix')
+    listing.add_argument('--order', choices=sorted(_ORDERS), default='due')
+    listing.add_argument('--limit', type=int)
+
+    taking = commands.add_parser('next', help='take the most urgent open task and mark it done')
+    taking.add_argument('--peek', action='store_true', help='only show it, leave it open')
+
+    done = commands.add_parser('done', help='mark a task as done')
+    done.add_argument('id', type=int)
+
+    remove = commands.add_parser('remove', help='delete a task')
+    remove.add_argument('id', type=int)
+
+    importing = commands.add_parser('import', help='bulk import tasks from a CSV file')
+    importing.add_argument('path')
+
+    exporting = commands.add_parser('export', help='export all tasks to a CSV file')
+    exporting.add_argument('path')
+
+    args = parser.parse_args(argv)
+    with TaskStore(args.db) as store:
+        if args.command == 'add':
+            task = store.add(args.title, args.priority, args.due)
+            print(f'Added task {task.id}: {task.title}')
+        elif args.command == 'list':
+            print_tasks(store.query(status=args.status, due_before=args.due_before, due_after=args.due_after,
+                                    title_prefix=args.title, order=args.order, limit=args.limit))
+        elif args.command == 'next':
+            task = store.most_urgent()
+            if task is None:
+                print('No open tasks.')
+            elif args.peek:
+                print_tasks([task])
+            else:
+                store.complete(task.id)
+                task.status = DONE
+                print_tasks([task])
+        elif args.command in ('done', 'remove'):
+            try:
+                store.complete(args.id) if args.command == 'done' else store.remove(args.id)
+            except KeyError:
+                parser.exit(1, f'No task with id {args.id}\n')
+            print(f'Task {args.id} {"done" if args.command == "done" else "removed"}.')
+        elif args.command == 'import':
+            print(f'Imported {store.import_csv(args.path)} tasks from {args.path}')
+        elif args.command == 'export':
+            store.export_csv(args.path)
+            print(f'Exported {len(store)} tasks to {args.path}')
+
+
+if __name__ == '__main__':
+    main()
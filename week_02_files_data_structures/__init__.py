@@ -0,0 +1 @@
+"""Week 2: files and data structures: CSV reading, log analysis, columnar cache, sketches."""
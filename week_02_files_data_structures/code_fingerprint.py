@@ -0,0 +1,171 @@
+# Code fingerprints - cache keys that change when the code behind them changes
+# A cached result is only valid for the code that produced it. The pipelines
+# (titanic_pipeline.py, week_08_final_project/pipeline.py) and the render
+# cache (plot_helpers.py) put code_fingerprint(func) into their keys, so
+# editing a stage invalidates what it cached.
+#
+# The fingerprint covers everything the function's result depends on in this
+# project, not only its own body:
+#   - its bytecode and constants (nested comprehensions and lambdas included)
+#   - its default arguments (__defaults__, __kwdefaults__) and closure values
+#   - the module globals it reads (co_names found in func.__globals__):
+#       plain values (TITLE_MAP, a tuple of columns, ...) by their value
+#       functions and classes of this project by their own fingerprint, so a
+#         helper it calls, and the helpers that one calls, are part of it
+#       modules of this project: the attributes it reads from them
+#         (model_search.make_estimator)
+#       anything else (numpy, sklearn, ...) by its qualified name only
+#
+# Values are hashed by content, never by repr() of arbitrary objects: a repr
+# with a memory address would change the key on every run.
+#
+#   from week_02_files_data_structures.code_fingerprint import code_fingerprint
+#   key = hashlib.blake2b(f'{params}{code_fingerprint(stage_func)}'.encode()).hexdigest()
+
+# ============================================================================
+# INDEX - Topics Covered in This File
+# ============================================================================
+# 1. Hashing values
+# 2. Hashing functions and what they read
+# ============================================================================
+
+import hashlib
+import inspect
+import os
+import sys
+import types
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PLAIN_TYPES = (type(None), bool, int, float, complex, str, bytes)
+
+
+def _in_project(filename):
+    # Source files of this repository; a virtual environment inside it does not count.
+    if not filename:
+        return False
+    filename = os.path.abspath(filename)
+    return filename.startswith(PROJECT_DIR + os.sep) and 'site-packages' not in filename
+
+
+# ============================================================================
+# 1. HASHING VALUES
+# ============================================================================
+def _hash_value(value, digest, seen):
+    if isinstance(value, PLAIN_TYPES):
+        digest.update(f'{type(value).__name__}:{value!r};'.encode())
+    elif isinstance(value, (tuple, list)):
+        digest.update(f'{type(value).__name__}[{len(value)}'.encode())
+        for item in value:
+            _hash_value(item, digest, seen)
+        digest.update(b']')
+    elif isinstance(value, (set, frozenset)):
+        digest.update(f'{type(value).__name__}{{{len(value)}'.encode())
+        for item in sorted(value, key=repr):
+            _hash_value(item, digest, seen)
+        digest.update(b'}')
+    elif isinstance(value, dict):
+        digest.update(b'dict{')
+        for key in sorted(value, key=repr):
+            _hash_value(key, digest, seen)
+            _hash_value(value[key], digest, seen)
+        digest.update(b'}')
+    elif isinstance(value, types.FunctionType):
+        _hash_function(value, digest, seen)
+    elif isinstance(value, types.ModuleType):
+        digest.update(f'module:{value.__name__};'.encode())
+    elif isinstance(value, type) and _in_project(getattr(sys.modules.get(value.__module__), '__file__', None)):
+        _hash_class(value, digest, seen)
+    else:
+        # Library functions and classes, instances: the name, not the repr
+        # (which may hold a memory address).
+        name = getattr(value, '__qualname__', None) or type(value).__qualname__
+        digest.update(f'{getattr(value, "__module__", None) or type(value).__module__}.{name};'.encode())
+
+
+def _hash_class(cls, digest, seen):
+    if cls in seen:
+        digest.update(f'class:{cls.__qualname__};'.encode())
+        return
+    seen.add(cls)
+    digest.update(f'class:{cls.__qualname__}('.encode())
+    for base in cls.__bases__:
+        _hash_value(base, digest, seen)
+    for name, member in sorted(vars(cls).items()):
+        if isinstance(member, (staticmethod, classmethod)):
+            member = member.__func__
+        elif isinstance(member, property):
+            member = member.fget
+        if isinstance(member, types.FunctionType) or (isinstance(member, PLAIN_TYPES + (tuple, dict))
+                                                      and not name.startswith('__')):
+            digest.update(f'{name}='.encode())
+            _hash_value(member, digest, seen)
+    digest.update(b')')
+
+
+# ============================================================================
+# 2. HASHING FUNCTIONS AND WHAT THEY READ
+# ============================================================================
+def _hash_code(code, digest):
+    # Returns every name the code (and the code nested in it) looks up.
+    digest.update(code.co_code)
+    names = set(code.co_names)
+    for constant in code.co_consts:
+        # Nested code objects (comprehensions, lambdas) are hashed by content:
+        # their repr contains a memory address that changes on every run.
+        # Other constants by value: the repr of a frozenset ('x in {"a", "b"}')
+        # depends on the string hash seed of the process.
+        if inspect.iscode(constant):
+            names |= _hash_code(constant, digest)
+        else:
+            _hash_value(constant, digest, set())
+    return names
+
+
+def _hash_function(func, digest, seen):
+    func = inspect.unwrap(func)  # a decorated function (functools.wraps) stands for the one it wraps
+    code = func.__code__
+    if not _in_project(code.co_filename):
+        digest.update(f'{func.__module__}.{func.__qualname__};'.encode())
+        return
+    if code in seen:  # recursion, or a helper already hashed: its name is enough
+        digest.update(f'function:{func.__qualname__};'.encode())
+        return
+    seen.add(code)
+    digest.update(f'function:{func.__qualname__}('.encode())
+    names = _hash_code(code, digest)
+    _hash_value(func.__defaults__, digest, seen)
+    _hash_value(func.__kwdefaults__, digest, seen)
+    for cell in func.__closure__ or ():
+        try:
+            _hash_value(cell.cell_contents, digest, seen)
+        except ValueError:  # a cell that is not filled yet
+            digest.update(b'empty;')
+    namespace = func.__globals__
+    for name in sorted(names):
+        if name not in namespace:  # builtins, attribute names, locals
+            continue
+        value = namespace[name]
+        digest.update(f'{name}='.encode())
+        if isinstance(value, types.ModuleType) and _in_project(getattr(value, '__file__', None)):
+            # A module of this project: the attributes read from it, e.g.
+            # model_search.make_estimator (co_names holds both names).
+            digest.update(f'module:{value.__name__}('.encode())
+            for attribute in sorted(names):
+                if attribute in vars(value) and not isinstance(vars(value)[attribute], types.ModuleType):
+                    digest.update(f'{attribute}='.encode())
+                    _hash_value(vars(value)[attribute], digest, seen)
+            digest.update(b')')
+        else:
+            _hash_value(value, digest, seen)
+    digest.update(b')')
+
+
+def code_fingerprint(func):
+    """Hash of a function's code, defaults and the globals and project helpers it uses.
+
+    Editing the function, one of its default arguments, a module constant it
+    reads or a function of this project it calls changes the fingerprint.
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    _hash_function(func, digest, set())
+    return digest.hexdigest()
@@ -0,0 +1,345 @@
+# Columnar binary cache for CSV files
+# Parsing a CSV file means turning text back into numbers on every run. This
+# module does it once: the first load converts the file into one binary .npy
+# file per column, and every later load memory-maps those files instead, so
+# startup takes milliseconds and only the pages that are used are read.
+#
+#   data/titanic.csv
+#   data/.cache/titanic.csv.json                           <- index: source size, mtime, hash, schema
+#   data/.cache/titanic.csv-<hash>/col000.npy              <- one file per column
+#   data/.cache/titanic.csv-<hash>/col003.categories.json  <- distinct strings of a str column
+#
+# Column types come from csv_reader.infer_schema():
+#   int   -> int64  .npy
+#   float -> float64 .npy (missing values are NaN)
+#   str   -> dictionary encoded: int32 codes in the .npy file, the distinct
+#            strings (categories) in a JSON file next to it; -1 marks a
+#            missing value
+# The categories of a column with many distinct values (dates, names) can be
+# far larger than the index, so they are kept out of it: the index stays a
+# few hundred bytes, and a column's categories are only read when that column
+# is loaded.
+#
+# The cache is keyed by the source file's size, mtime and content hash. If
+# size and mtime still match, the cache is used without reading the CSV at
+# all. If they changed, the file is hashed: same content (e.g. after a
+# `touch` or a fresh checkout) keeps the cache, new content rebuilds it.
+#
+# Building only needs the standard library (the .npy format is written by
+# hand). Loading returns NumPy memmaps when NumPy is installed and read-only
+# memoryviews otherwise; load_dataframe() builds a pandas DataFrame.
+#
+# Usage:
+#   python -m week_02_files_data_structures.column_cache data/titanic.csv data/house_prices.csv
+#   python -m week_02_files_data_structures.column_cache data/temperatures.csv --rebuild
+
+# ============================================================================
+# INDEX - Topics Covered in This File
+# ============================================================================
+# 1. The .npy file format (stdlib writer and reader)
+# 2. Cache keys: size, mtime and content hash
+# 3. Building the cache from CSV chunks
+# 4. Loading columns (memory-mapped)
+# 5. Command line interface
+# ============================================================================
+
+import argparse
+import ast
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import sys
+import time
+from array import array
+
+from week_02_files_data_structures.csv_reader import INT, MISSING_VALUES, STR, infer_schema, read_chunks
+
+CACHE_DIR_NAME = '.cache'
+CACHE_VERSION = 2  # 2: categories in one file per column instead of the index
+HASH_BLOCK_SIZE = 1024 * 1024
+BUILD_CHUNK_SIZE = 65536
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+DATASETS = {'titanic': 'titanic.csv', 'house_prices': 'house_prices.csv', 'temperatures': 'temperatures.csv'}
+
+_ENDIAN = '<' if sys.byteorder == 'little' else '>'
+# typecode of the array written to disk -> NumPy dtype string in the .npy header
+_DTYPES = {'q': _ENDIAN + 'i8', 'd': _ENDIAN + 'f8', 'i': _ENDIAN + 'i4'}
+_TYPECODES = {dtype: typecode for typecode, dtype in _DTYPES.items()}
+
+
+# ============================================================================
+# 1. THE .NPY FILE FORMAT
+# ============================================================================
+# A .npy file is a 10 byte preamble (magic, version, header length), a Python
+# dict literal describing dtype and shape, padded with spaces to a multiple of
+# 64 bytes, and then the raw little-endian values. The header is written with a
+# fixed size, so the row count can be filled in after the data is streamed.
+NPY_MAGIC = b'\x93NUMPY\x01\x00'
+NPY_HEADER_SIZE = 128  # preamble + dict, so the data starts 64-byte aligned
+
+
+def _npy_header(dtype, length):
+    text = f"{{'descr': '{dtype}', 'fortran_order': False, 'shape': ({length},), }}"
+    text = text.ljust(NPY_HEADER_SIZE - len(NPY_MAGIC) - 2 - 1) + '\n'
+    return NPY_MAGIC + len(text).to_bytes(2, 'little') + text.encode('latin1')
+
+
+class NpyWriter:
+    """Append array.array buffers to a 1-d .npy file, then fix the length on close()."""
+
+    def __init__(self, path, typecode):
+        self.path = path
+        self.dtype = _DTYPES[typecode]
+        self.length = 0
+        self._file = open(path, 'wb')
+        self._file.write(_npy_header(self.dtype, 0))
+
+    def write(self, values):
+        values.tofile(self._file)
+        self.length += len(values)
+
+    def close(self):
+        self._file.seek(0)
+        self._file.write(_npy_header(self.dtype, self.length))
+        self._file.close()
+
+
+def read_npy(path):
+    """Memory-map a 1-d .npy file written by NpyWriter and return a read-only memoryview.
+
+    Used when NumPy is not installed; with NumPy, np.load(mmap_mode='r') is used instead.
+    """
+    with open(path, 'rb') as f:
+        preamble = f.read(10)
+        if preamble[:8] != NPY_MAGIC:
+            raise ValueError(f'{path}: not a version 1.0 .npy file')
+        header_size = int.from_bytes(preamble[8:10], 'little')
+        typecode = _TYPECODES[ast.literal_eval(f.read(header_size).decode('latin1'))['descr']]
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    # The memoryview keeps the mapping alive for as long as it is used.
+    return memoryview(mapped)[10 + header_size:].cast(typecode)
+
+
+# ============================================================================
+# 2. CACHE KEYS: SIZE, MTIME AND CONTENT HASH
+# ============================================================================
+def file_hash(path):
+    """blake2b hex digest of the file contents, read in 1 MB blocks."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_paths(path, cache_dir=None):
+    """Return (cache directory, index file) for a source CSV file."""
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIR_NAME)
+    return cache_dir, os.path.join(cache_dir, os.path.basename(path) + '.json')
+
+
+def _read_index(index_path):
+    try:
+        with open(index_path, encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return index if index.get('version') == CACHE_VERSION else None
+
+
+def _write_index(index_path, index):
+    # Write to a temporary file and rename it, so a reader never sees half an index.
+    tmp_path = f'{index_path}.tmp{os.getpid()}'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f)
+    os.replace(tmp_path, index_path)
+
+
+def ensure_cache(path, cache_dir=None, rebuild=False):
+    """Return the cache index for `path`, building or refreshing the cache if needed.
+
+    The returned dict holds the source key (size, mtime_ns, hash), the row
+    count, the cache directory and one entry per column.
+    """
+    cache_dir, index_path = cache_paths(path, cache_dir)
+    stat = os.stat(path)
+    index = None if rebuild else _read_index(index_path)
+    if index is not None and index['size'] == stat.st_size and index['mtime_ns'] == stat.st_mtime_ns:
+        if os.path.isdir(os.path.join(cache_dir, index['directory'])):
+            return index
+
+    content_hash = file_hash(path)
+    if index is not None and index['hash'] == content_hash:
+        if os.path.isdir(os.path.join(cache_dir, index['directory'])):
+            # Same content, new mtime (touch, git checkout, copy): keep the data.
+            index['size'], index['mtime_ns'] = stat.st_size, stat.st_mtime_ns
+            _write_index(index_path, index)
+            return index
+
+    new_index = build_cache(path, cache_dir, content_hash)
+    new_index['size'], new_index['mtime_ns'] = stat.st_size, stat.st_mtime_ns
+    _write_index(index_path, new_index)
+    if index is not None and index['directory'] != new_index['directory']:
+        shutil.rmtree(os.path.join(cache_dir, index['directory']), ignore_errors=True)
+    return new_index
+
+
+# ============================================================================
+# 3. BUILDING THE CACHE FROM CSV CHUNKS
+# ============================================================================
+def _write_columns(path, directory, schema):
+    names = [name for name, _ in schema]
+    writers = {}
+    categories = {name: {} for name, kind in schema if kind == STR}  # value -> code
+    for position, (name, kind) in enumerate(schema):
+        typecode = 'i' if kind == STR else 'q' if kind == INT else 'd'
+        writers[name] = NpyWriter(os.path.join(directory, f'col{position:03d}.npy'), typecode)
+    try:
+        for chunk in read_chunks(path, chunk_size=BUILD_CHUNK_SIZE, schema=schema):
+            for name in names:
+                values = chunk[name]
+                if name in categories:
+                    codes = categories[name]
+                    # Each distinct string gets the next code the first time it is seen.
+                    values = array('i', [-1 if value in MISSING_VALUES else codes.setdefault(value, len(codes))
+                                         for value in values])
+                writers[name].write(values)
+    finally:
+        for writer in writers.values():
+            writer.close()
+    rows = writers[names[0]].length if names else 0
+    columns = []
+    for position, (name, kind) in enumerate(schema):
+        categories_file = None
+        if name in categories:
+            categories_file = f'col{position:03d}.categories.json'
+            with open(os.path.join(directory, categories_file), 'w', encoding='utf-8') as f:
+                json.dump(list(categories[name]), f)
+        columns.append({'name': name, 'type': kind, 'file': os.path.basename(writers[name].path),
+                        'categories': categories_file})
+    return rows, columns
+
+
+def build_cache(path, cache_dir, content_hash=None):
+    """Convert `path` into one .npy file per column and return the new index dict."""
+    if content_hash is None:
+        content_hash = file_hash(path)
+    os.makedirs(cache_dir, exist_ok=True)
+    directory = f'{os.path.basename(path)}-{content_hash[:16]}'
+    final_dir = os.path.join(cache_dir, directory)
+    tmp_dir = f'{final_dir}.tmp{os.getpid()}'
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    try:
+        schema = infer_schema(path)
+        try:
+            rows, columns = _write_columns(path, tmp_dir, schema)
+        except ValueError:
+            # A value further down did not fit the type guessed from the first
+            # rows (e.g. '3.5' in an int column): infer from the whole file.
+            schema = infer_schema(path, sample_rows=None)
+            rows, columns = _write_columns(path, tmp_dir, schema)
+        shutil.rmtree(final_dir, ignore_errors=True)
+        os.replace(tmp_dir, final_dir)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return {'version': CACHE_VERSION, 'source': os.path.abspath(path), 'hash': content_hash,
+            'rows': rows, 'directory': directory, 'columns': columns}
+
+
+# ============================================================================
+# 4. LOADING COLUMNS (MEMORY-MAPPED)
+# ============================================================================
+def load(path, columns=None, cache_dir=None, decode_strings=True):
+    """Return {column name: values} for a CSV file, served from the binary cache.
+
+    Numeric columns are memory-mapped: NumPy memmaps if NumPy is installed,
+    read-only memoryviews otherwise. String columns are decoded back to
+    strings (None for missing) unless decode_strings=False, in which case
+    they are returned as (codes, categories).
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+
+    index = ensure_cache(path, cache_dir)
+    directory = os.path.join(cache_paths(path, cache_dir)[0], index['directory'])
+    by_name = {column['name']: column for column in index['columns']}
+    wanted = list(by_name) if columns is None else columns
+    missing = [name for name in wanted if name not in by_name]
+    if missing:
+        raise KeyError(f'unknown column(s): {", ".join(missing)}')
+
+    result = {}
+    for name in wanted:
+        column = by_name[name]
+        file_path = os.path.join(directory, column['file'])
+        if np is None:
+            values = read_npy(file_path)
+        else:
+            # NumPy cannot memory-map zero rows; an empty column is loaded normally.
+            values = np.load(file_path, mmap_mode='r' if index['rows'] else None)
+        if column['type'] == STR:
+            with open(os.path.join(directory, column['categories']), encoding='utf-8') as f:
+                categories = json.load(f)
+            if not decode_strings:
+                values = (values, categories)
+            elif np is not None:
+                # Code -1 (missing) indexes the last element, the appended None.
+                values = np.array(categories + [None], dtype=object)[values]
+            else:
+                lookup = categories + [None]
+                values = [lookup[code] for code in values]
+        result[name] = values
+    return result
+
+
+def load_dataframe(path, columns=None, cache_dir=None):
+    """Return the cached columns as a pandas DataFrame; string columns become Categorical."""
+    import pandas as pd
+
+    data = {}
+    for name, values in load(path, columns=columns, cache_dir=cache_dir, decode_strings=False).items():
+        if isinstance(values, tuple):
+            codes, categories = values
+            values = pd.Categorical.from_codes(codes, categories=categories)
+        data[name] = values
+    return pd.DataFrame(data, copy=False)
+
+
+def load_dataset(name, columns=None):
+    """Load one of the course datasets by name: 'titanic', 'house_prices' or 'temperatures'."""
+    if name not in DATASETS:
+        raise KeyError(f'unknown dataset {name!r}, expected one of: {", ".join(DATASETS)}')
+    return load(os.path.join(DATA_DIR, DATASETS[name]), columns=columns)
+
+
+# ============================================================================
+# 5. COMMAND LINE INTERFACE
+# ============================================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build or refresh the columnar binary cache of CSV files.')
+    parser.add_argument('paths', nargs='*', help='CSV files (default: the files in data/)')
+    parser.add_argument('--rebuild', action='store_true', help='rebuild even if the cache is up to date')
+    parser.add_argument('--cache-dir', help='cache directory (default: .cache next to each file)')
+    args = parser.parse_args(argv)
+
+    paths = args.paths or [os.path.join(DATA_DIR, file_name) for file_name in DATASETS.values()]
+    for path in paths:
+        start = time.perf_counter()
+        index = ensure_cache(path, args.cache_dir, rebuild=args.rebuild)
+        seconds = time.perf_counter() - start
+        types = ', '.join(f'{column["name"]}:{column["type"]}' for column in index['columns'])
+        print(f'{path}: {index["rows"]} rows, {len(index["columns"])} columns in {seconds * 1000:.1f} ms'
+              f' -> {index["directory"]}')
+        if types:
+            print(f'  {types}')
+
+
+if __name__ == '__main__':
+    main()
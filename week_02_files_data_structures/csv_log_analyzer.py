@@ -0,0 +1,751 @@
+# CSV log analyzer
+# Aggregates a request log stored as CSV, for example:
+#
+#   timestamp,level,status,endpoint,user_id,latency_ms
+#   2024-05-01T10:00:00,INFO,200,/api/items,u123,35.2
+#
+# Aggregations:
+#   - request counts by level and by status
+#   - top-N keys (endpoint by default)
+#   - latency percentiles (p50, p90, p99 by default)
+#   - number of distinct users
+#
+# --approx replaces the exact structures whose memory grows with the data
+# (per-key Counter, list of every latency, set of user ids) with fixed-memory,
+# mergeable sketches from sketches.py. --check then reports their accuracy
+# against the exact mode.
+#
+# Large files are split into byte ranges aligned to line starts, and every range
+# is aggregated by a separate process (ProcessPoolExecutor). Each worker returns
+# a partial LogStats and the partials are merged, so the result is identical to
+# a single serial pass.
+#
+# Malformed lines (wrong number of fields, a latency that is not a number,
+# bytes that do not decode) fail the run by default. --on-error skip or
+# quarantine drops them instead, within an error budget (--max-errors); see
+# BadRows in csv_reader.py. Blocks are parsed and aggregated in bulk, only a
+# block that fails is parsed again line by line to find the bad lines.
+#
+# Usage:
+#   python -m week_02_files_data_structures.csv_log_analyzer access_log.csv
+#   python -m week_02_files_data_structures.csv_log_analyzer access_log.csv --workers 32
+#   python -m week_02_files_data_structures.csv_log_analyzer access_log.csv --workers 8 --check
+#   python -m week_02_files_data_structures.csv_log_analyzer access_log.csv --metrics metrics.jsonl --profile log.prof
+#   python -m week_02_files_data_structures.csv_log_analyzer access_log.csv --workers 8 --on-error quarantine --max-errors 1000
+#
+# Incremental ("tail") mode keeps the aggregates and the last processed byte
+# offset in a checkpoint file, so each run only parses lines appended since the
+# previous one. Log rotation and truncation are detected and handled:
+#   python -m week_02_files_data_structures.csv_log_analyzer access_log.csv --checkpoint access.ckpt
+#   python -m week_02_files_data_structures.csv_log_analyzer access_log.csv --checkpoint access.ckpt --follow --interval 60
+
+# ============================================================================
+# INDEX - Topics Covered in This File
+# ============================================================================
+# 1. Aggregate state (LogStats) and merging partial results
+# 2. Splitting a file into newline-aligned byte ranges
+# 3. Aggregating one byte range
+# 4. Serial and parallel drivers
+# 5. Incremental tail mode with checkpoints
+# 6. Command line entry point
+# ============================================================================
+
+import argparse
+import base64
+import csv
+import hashlib
+import io
+import json
+import math
+import os
+import time
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
+
+from week_02_files_data_structures import instrumentation
+from week_02_files_data_structures.csv_reader import MISSING_VALUES, QUARANTINE, SKIP, BadRows, add_error_arguments
+from week_02_files_data_structures.sketches import HeavyHitters, HyperLogLog, TDigest
+
+DEFAULT_COLUMNS = {
+    'level': 'level',
+    'status': 'status',
+    'key': 'endpoint',
+    'latency': 'latency_ms',
+    'user': 'user_id',
+}
+DEFAULT_PERCENTILES = (50, 90, 99)
+BLOCK_SIZE = 8 * 1024 * 1024  # bytes read per step inside one range
+
+
+# ============================================================================
+# 1. AGGREGATE STATE
+# ============================================================================
+class LogStats:
+    """Counts and latencies for a part of a log. Partial results merge with merge().
+
+    approx=False keeps exact state: a Counter per key, every latency value and
+    the set of user ids. Memory grows with the data.
+    approx=True keeps fixed-size sketches instead (see sketches.py): heavy
+    hitters for the top keys, a t-digest for latency percentiles and a
+    HyperLogLog for distinct users. Levels and statuses stay exact Counters,
+    they only have a handful of distinct values.
+    """
+
+    def __init__(self, approx=False):
+        self.approx = approx
+        self.rows = 0
+        self.bad_rows = 0  # malformed lines dropped by a skip or quarantine policy
+        self.levels = Counter()
+        self.statuses = Counter()
+        if approx:
+            self.keys = HeavyHitters()
+            self.latencies = TDigest()
+            self.users = HyperLogLog()
+        else:
+            self.keys = Counter()
+            self.latencies = array('d')
+            self.users = set()
+
+    def add_rows(self, rows, indexes):
+        """Add parsed CSV rows; `indexes` maps 'level'/'status'/'key'/'latency'/'user' to field positions.
+
+        Raises ValueError for a latency that is not a number, before anything
+        is counted, so the rows can be checked and added again.
+        """
+        latency = indexes['latency']
+        latencies = [float(row[latency]) for row in rows if row[latency] not in MISSING_VALUES]
+        self.rows += len(rows)
+        # Counter.update(), array.extend() and set.update() loop in C, one call per column.
+        self.levels.update(map(itemgetter(indexes['level']), rows))
+        self.statuses.update(map(itemgetter(indexes['status']), rows))
+        self.keys.update(map(itemgetter(indexes['key']), rows))
+        self.users.update(map(itemgetter(indexes['user']), rows))
+        self.latencies.extend(latencies)
+
+    def merge(self, other):
+        """Add the counts of another LogStats into this one and return self."""
+        if other.approx != self.approx:
+            raise ValueError('cannot merge exact and approximate LogStats')
+        self.rows += other.rows
+        self.bad_rows += other.bad_rows
+        self.levels.update(other.levels)
+        self.statuses.update(other.statuses)
+        if self.approx:
+            self.keys.merge(other.keys)
+            self.latencies.merge(other.latencies)
+            self.users.merge(other.users)
+        else:
+            self.keys.update(other.keys)
+            self.latencies.extend(other.latencies)
+            self.users.update(other.users)
+        return self
+
+    def percentiles(self, qs=DEFAULT_PERCENTILES):
+        """Latency percentiles; exact mode interpolates linearly between ranks."""
+        if self.approx:
+            return {q: self.latencies.quantile(q / 100) for q in qs}
+        values = sorted(self.latencies)
+        result = {}
+        for q in qs:
+            if not values:
+                result[q] = math.nan
+                continue
+            rank = (len(values) - 1) * q / 100
+            low = math.floor(rank)
+            high = min(low + 1, len(values) - 1)
+            result[q] = values[low] + (values[high] - values[low]) * (rank - low)
+        return result
+
+    def distinct_users(self):
+        return round(self.users.count()) if self.approx else len(self.users)
+
+    def report(self, top_n=10, qs=DEFAULT_PERCENTILES):
+        """Summary as a plain dict (JSON serialisable)."""
+        return {
+            'rows': self.rows,
+            'bad_rows': self.bad_rows,
+            'levels': dict(self.levels.most_common()),
+            'statuses': dict(self.statuses.most_common()),
+            'top_keys': self.keys.most_common(top_n),
+            'distinct_users': self.distinct_users(),
+            'latency_percentiles': {f'p{q}': value for q, value in self.percentiles(qs).items()},
+        }
+
+    def to_dict(self, samples=True):
+        """Full state as a JSON serialisable dict (exact latencies as base64 of the raw doubles).
+
+        samples=False leaves out the exact latencies and user ids, which grow
+        with the data (checkpoints keep them in append-only sidecar files).
+        """
+        data = {
+            'approx': self.approx,
+            'rows': self.rows,
+            'bad_rows': self.bad_rows,
+            'levels': dict(self.levels),
+            'statuses': dict(self.statuses),
+        }
+        if self.approx:
+            data.update(keys=self.keys.to_dict(), latencies=self.latencies.to_dict(), users=self.users.to_dict())
+        elif samples:
+            data.update(keys=dict(self.keys), users=sorted(self.users),
+                        latencies=base64.b64encode(self.latencies.tobytes()).decode('ascii'))
+        else:
+            data.update(keys=dict(self.keys))
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a LogStats saved with to_dict() (without samples: none are added)."""
+        stats = cls(approx=data['approx'])
+        stats.rows = data['rows']
+        stats.bad_rows = data.get('bad_rows', 0)  # not in checkpoints written before it was counted
+        stats.levels = Counter(data['levels'])
+        stats.statuses = Counter(data['statuses'])
+        if stats.approx:
+            stats.keys = HeavyHitters.from_dict(data['keys'])
+            stats.latencies = TDigest.from_dict(data['latencies'])
+            stats.users = HyperLogLog.from_dict(data['users'])
+        else:
+            stats.keys = Counter(data['keys'])
+            stats.users = set(data.get('users', ()))
+            stats.latencies.frombytes(base64.b64decode(data.get('latencies', '')))
+        return stats
+
+
+# ============================================================================
+# 2. SPLITTING A FILE INTO NEWLINE-ALIGNED BYTE RANGES
+# ============================================================================
+def read_header(path, encoding='utf-8'):
+    """Return (header fields, byte offset of the first data row)."""
+    with open(path, 'rb') as f:
+        line = f.readline()
+    header = next(csv.reader([line.decode(encoding)]), [])
+    return header, len(line)
+
+
+def split_ranges(path, parts, start=None, end=None):
+    """Split bytes [start, end) of `path` into at most `parts` (start, end) ranges.
+
+    `start` defaults to the first data row and `end` to the end of the file.
+    Every boundary is moved forward to the start of a line, so no line is cut
+    in two and every line belongs to exactly one range.
+    """
+    if start is None:
+        start = read_header(path)[1]
+    size = os.path.getsize(path) if end is None else end
+    if size <= start:
+        return []
+    step = max(1, (size - start) // max(1, parts))
+    boundaries = [start]
+    with open(path, 'rb') as f:
+        for i in range(1, parts):
+            offset = start + i * step
+            if offset <= boundaries[-1]:
+                continue
+            if offset >= size:
+                break
+            f.seek(offset - 1)
+            f.readline()  # finish the line that contains `offset - 1`
+            position = f.tell()
+            if position >= size:
+                break
+            if position > boundaries[-1]:
+                boundaries.append(position)
+    boundaries.append(size)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+# ============================================================================
+# 3. AGGREGATING ONE BYTE RANGE
+# ============================================================================
+def iter_line_blocks(f, start, end, block_size=BLOCK_SIZE):
+    """Yield bytes blocks covering [start, end) that always end on a newline."""
+    f.seek(start)
+    position = start
+    while position < end:
+        with instrumentation.stage('csv_log_analyzer.read_block') as stage:
+            block = f.read(min(block_size, end - position))
+            if not block:
+                break
+            if position + len(block) < end:
+                cut = block.rfind(b'\n')
+                if cut == -1:
+                    block += f.readline()  # a single line longer than block_size
+                else:
+                    block = block[:cut + 1]
+                    f.seek(position + len(block))
+            stage.add(bytes=len(block))
+        position += len(block)
+        yield block
+
+
+def column_indexes(header, columns):
+    """Map the logical columns ('level', 'status', ...) to positions in `header`."""
+    missing = [name for name in columns.values() if name not in header]
+    if missing:
+        raise KeyError(f'column(s) not found in header: {", ".join(missing)}')
+    return {role: header.index(name) for role, name in columns.items()}
+
+
+def aggregate_range(path, start, end, columns=DEFAULT_COLUMNS, approx=False, encoding='utf-8', bad_rows=None):
+    """Aggregate the rows in byte range [start, end) of `path` into a LogStats.
+
+    bad_rows : BadRows policy for malformed lines (default: fail on the first one)
+    """
+    if bad_rows is None:
+        bad_rows = BadRows(path)
+    header, _ = read_header(path, encoding)
+    indexes = column_indexes(header, columns)
+    width = len(header)
+    stats = LogStats(approx)
+    rejected_before = bad_rows.count
+    position = start
+    with open(path, 'rb') as f:
+        for block in iter_line_blocks(f, start, end):
+            with instrumentation.stage('csv_log_analyzer.parse_block') as stage:
+                rows = _parse_block(block, width, encoding)
+                stage.add(rows=len(rows) if rows else 0, bytes=len(block))
+            with instrumentation.stage('csv_log_analyzer.aggregate_block') as stage:
+                try:
+                    if rows is not None:
+                        stats.add_rows(rows, indexes)
+                except ValueError:  # a bad latency; add_rows() has not counted anything
+                    rows = None
+                if rows is None:
+                    rows = _valid_rows(block, position, width, indexes, bad_rows, encoding)
+                    stats.add_rows(rows, indexes)
+                stage.add(rows=len(rows))
+            position += len(block)
+            bad_rows.check_budget(stats.rows + bad_rows.count - rejected_before)
+    stats.bad_rows = bad_rows.count - rejected_before
+    return stats
+
+
+def _parse_block(block, width, encoding):
+    """Fast path: the rows of a block, or None if any line is malformed."""
+    try:
+        rows = [row for row in csv.reader(io.StringIO(block.decode(encoding), newline='')) if row]
+    except (UnicodeDecodeError, csv.Error):
+        return None
+    if any(len(row) != width for row in rows):
+        return None
+    return rows
+
+
+def _valid_rows(block, offset, width, indexes, bad_rows, encoding):
+    """Slow path: parse a block line by line, give the bad lines to `bad_rows` and return the other rows.
+
+    `offset` is the file position of the block. Bad lines are reported by byte
+    offset, a worker does not know the line numbers of its range.
+    """
+    latency = indexes['latency']
+    rows = []
+    for line in block.splitlines(keepends=True):
+        where = f'at byte {offset}'
+        offset += len(line)
+        try:
+            row = next(csv.reader([line.decode(encoding)]), None)
+        except (UnicodeDecodeError, csv.Error) as error:
+            bad_rows.reject(where, f'unreadable line: {error}', line.rstrip(b'\r\n'))
+            continue
+        if not row:
+            continue
+        if len(row) != width:
+            reason = f'{len(row)} fields, expected {width}'
+        elif row[latency] not in MISSING_VALUES and not _is_number(row[latency]):
+            reason = f'latency {row[latency]!r} is not a number'
+        else:
+            rows.append(row)
+            continue
+        bad_rows.reject(where, reason, line.rstrip(b'\r\n'))
+    return rows
+
+
+def _is_number(text):
+    try:
+        float(text)
+    except ValueError:
+        return False
+    return True
+
+
+# ============================================================================
+# 4. SERIAL AND PARALLEL DRIVERS
+# ============================================================================
+def analyze_serial(path, columns=DEFAULT_COLUMNS, approx=False, bad_rows=None):
+    """Aggregate the whole file in this process."""
+    _, start = read_header(path)
+    stats = aggregate_range(path, start, os.path.getsize(path), columns, approx, bad_rows=bad_rows)
+    if bad_rows is not None:
+        bad_rows.check_budget(stats.rows + stats.bad_rows, final=True)
+    return stats
+
+
+def analyze_parallel(path, workers=None, columns=DEFAULT_COLUMNS, ranges_per_worker=4, start=None, end=None,
+                     approx=False, bad_rows=None):
+    """Aggregate the file on a process pool and merge the partial results.
+
+    The file is split into `workers * ranges_per_worker` ranges so a slow range
+    does not leave the other workers idle at the end. `start`/`end` restrict the
+    work to a byte range (default: every data row). `bad_rows` is the policy for
+    malformed lines (default: fail); each range gets a part() of it.
+    """
+    workers = workers or os.cpu_count() or 1
+    if start is None:
+        start = read_header(path)[1]
+    if end is None:
+        end = os.path.getsize(path)
+    if bad_rows is None:
+        bad_rows = BadRows(path)
+    # Worker processes do not report their stages; this one covers them.
+    with instrumentation.stage('csv_log_analyzer.analyze') as stage:
+        stats = _analyze_ranges(path, workers, columns, ranges_per_worker, start, end, approx, bad_rows)
+        stage.add(rows=stats.rows, bytes=end - start)
+    bad_rows.check_budget(stats.rows + stats.bad_rows, final=True)
+    return stats
+
+
+def _analyze_ranges(path, workers, columns, ranges_per_worker, start, end, approx, bad_rows):
+    if workers == 1 or end - start < BLOCK_SIZE:
+        if end <= start:
+            return LogStats(approx)
+        return aggregate_range(path, start, end, columns, approx, bad_rows=bad_rows)
+    ranges = split_ranges(path, workers * ranges_per_worker, start, end)
+    stats = LogStats(approx)
+    if not ranges:
+        return stats
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_aggregate_part, path, start, end, columns, approx, bad_rows.part(index))
+                   for index, (start, end) in enumerate(ranges)]
+        # In range order, so quarantined lines keep their order in the file.
+        for future in futures:
+            part_stats, part = future.result()
+            stats.merge(part_stats)
+            bad_rows.absorb(part)
+    return stats
+
+
+def _aggregate_part(path, start, end, columns, approx, bad_rows):
+    # Runs in a worker. Closing the part flushes its quarantine file before
+    # the parent copies it; the part goes back with its count and examples.
+    with bad_rows:
+        stats = aggregate_range(path, start, end, columns, approx, bad_rows=bad_rows)
+    return stats, bad_rows
+
+
+def same_results(first, second, top_n=10):
+    """True if two LogStats give the same report (used by --check)."""
+    a, b = first.report(top_n), second.report(top_n)
+    a_percentiles, b_percentiles = a.pop('latency_percentiles'), b.pop('latency_percentiles')
+    # Ties in most_common() may come out in a different order after merging.
+    a['top_keys'], b['top_keys'] = sorted(a['top_keys']), sorted(b['top_keys'])
+    close = all(math.isclose(a_percentiles[q], b_percentiles[q]) or
+                (math.isnan(a_percentiles[q]) and math.isnan(b_percentiles[q])) for q in a_percentiles)
+    return a == b and first.keys == second.keys and close
+
+
+def accuracy(approx, exact, top_n=10):
+    """Compare an approximate LogStats with the exact one (used by --check --approx).
+
+    Returns relative errors (0.01 = 1%) for distinct users and each latency
+    percentile, and the recall of the exact top-N keys in the approximate top-N.
+    """
+    def relative_error(estimate, truth):
+        return abs(estimate - truth) / abs(truth) if truth else float(estimate != truth)
+
+    exact_top = [key for key, _ in exact.keys.most_common(top_n)]
+    approx_top = {key for key, _ in approx.keys.most_common(top_n)}
+    approx_percentiles = approx.percentiles()
+    return {
+        'distinct_users': relative_error(approx.distinct_users(), exact.distinct_users()),
+        'latency_percentiles': {f'p{q}': relative_error(approx_percentiles[q], value)
+                                for q, value in exact.percentiles().items()},
+        'top_keys_recall': len(approx_top.intersection(exact_top)) / len(exact_top) if exact_top else 1.0,
+        'top_keys_max_count_error': max((relative_error(approx.keys.candidates.get(key, 0), exact.keys[key])
+                                         for key in exact_top), default=0.0),
+    }
+
+
+# ============================================================================
+# 5. INCREMENTAL TAIL MODE WITH CHECKPOINTS
+# ============================================================================
+# The checkpoint is a JSON file holding:
+#   offset      -> byte offset just after the last fully processed line
+#   inode/dev   -> identity of the file that was read
+#   head_hash   -> hash of the first HEAD_BYTES bytes of that file
+#   stats       -> LogStats.to_dict() of everything processed so far
+#   sidecars    -> valid bytes in each sidecar file (exact mode, see below)
+#
+# On the next run:
+#   - different inode/device or different head hash -> the log was rotated and
+#     the path now points to a new file: read it from the first data row
+#   - same file but smaller than `offset` -> it was truncated: read it again
+#     from the first data row
+#   - otherwise only bytes [offset, last complete line] are parsed
+# In every case the running aggregates are kept, new lines are added to them.
+# A trailing line without '\n' is still being written and is left for later.
+#
+# Exact mode keeps every latency and every user id, which grow with the log.
+# They are not in the JSON, which is rewritten on every run, but in two
+# append-only sidecar files next to it, so a refresh writes only what it added:
+#   <checkpoint>.latencies -> the raw doubles, in the order they were read
+#   <checkpoint>.users     -> each distinct user id once, one per line
+# The checkpoint is saved after the sidecars and records how many of their
+# bytes are valid; bytes appended by a run that stopped before saving it are
+# cut off by the next run. --follow keeps the state in memory between refreshes,
+# so the sidecars are read once, at start-up.
+# Limit: the per-key Counter stays in the JSON. It grows with the number of
+# distinct keys, which is small for an endpoint column; for a key column with
+# millions of values use --approx, whose checkpoint has a fixed size.
+
+HEAD_BYTES = 4096
+CHECKPOINT_VERSION = 3  # version 2 kept the exact samples in the JSON; it is still read
+SIDECARS = ('latencies', 'users')
+
+
+def _head_hash(path, length):
+    with open(path, 'rb') as f:
+        return hashlib.blake2b(f.read(length), digest_size=16).hexdigest()
+
+
+def complete_lines_end(path, start, size):
+    """Offset just after the last '\\n' in bytes [start, size), or `start` if there is none."""
+    with open(path, 'rb') as f:
+        position = size
+        while position > start:
+            step = min(BLOCK_SIZE, position - start)
+            f.seek(position - step)
+            cut = f.read(step).rfind(b'\n')
+            if cut != -1:
+                return position - step + cut + 1
+            position -= step
+    return start
+
+
+def load_checkpoint(checkpoint_path):
+    """Return the saved checkpoint dict, or None if there is none yet."""
+    try:
+        with open(checkpoint_path) as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return None
+    if state.get('version') not in (2, CHECKPOINT_VERSION):
+        raise ValueError(f'{checkpoint_path}: unsupported checkpoint version {state.get("version")!r}')
+    state.setdefault('sidecars', dict.fromkeys(SIDECARS, 0))
+    return state
+
+
+def load_stats(checkpoint_path, state):
+    """The LogStats of a checkpoint, with the exact samples read from its sidecars."""
+    stats = LogStats.from_dict(state['stats'])
+    if not stats.approx:
+        stats.latencies.frombytes(_read_sidecar(checkpoint_path, 'latencies', state['sidecars']['latencies']))
+        users = _read_sidecar(checkpoint_path, 'users', state['sidecars']['users'])
+        stats.users.update(users.decode('utf-8').split('\n')[:-1])
+    return stats
+
+
+def _read_sidecar(checkpoint_path, name, length):
+    if not length:
+        return b''
+    path = f'{checkpoint_path}.{name}'
+    with open(path, 'rb') as f:
+        data = f.read(length)
+    if len(data) < length:
+        raise ValueError(f'{path}: {len(data)} bytes, the checkpoint expects {length}')
+    return data
+
+
+def _append_sidecar(checkpoint_path, name, length, data):
+    # Cut the file back to its `length` valid bytes, append `data` and return the new length.
+    with open(f'{checkpoint_path}.{name}', 'ab') as f:
+        f.truncate(length)
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    return length + len(data)
+
+
+def save_checkpoint(checkpoint_path, state):
+    """Write the checkpoint atomically (temporary file + rename)."""
+    temporary = f'{checkpoint_path}.tmp'
+    with open(temporary, 'w') as f:
+        json.dump(state, f)
+    os.replace(temporary, checkpoint_path)
+
+
+def update_incremental(path, checkpoint_path, workers=1, columns=DEFAULT_COLUMNS, approx=False, bad_rows=None,
+                       previous=None):
+    """Parse only the lines appended since the last checkpoint.
+
+    Returns (stats, new_bytes, event) where event is 'new', 'append',
+    'rotated' or 'truncated'. The checkpoint is updated before returning.
+    `approx` only applies to a new checkpoint, an existing one keeps its mode.
+    The error budget of `bad_rows` applies to the new lines.
+    `previous` is the stats returned by the last call for this checkpoint
+    (--follow); it is used instead of reading the sidecars again.
+    """
+    state = load_checkpoint(checkpoint_path)
+    info = os.stat(path)
+    _, data_start = read_header(path)
+
+    if state is None:
+        stats, offset, event = LogStats(approx), data_start, 'new'
+        sidecars = dict.fromkeys(SIDECARS, 0)
+    else:
+        saved = state['stats']
+        if previous is not None and (previous.approx, previous.rows) == (saved['approx'], saved['rows']):
+            stats = previous
+        else:
+            stats = load_stats(checkpoint_path, state)
+        offset, event, sidecars = state['offset'], 'append', state['sidecars']
+        if state['columns'] != columns:
+            raise ValueError(f'{checkpoint_path}: saved for columns {state["columns"]}, not {columns}')
+        same_file = (info.st_ino, info.st_dev) == (state['inode'], state['device'])
+        if not same_file or (info.st_size >= state['head_length'] and
+                             _head_hash(path, state['head_length']) != state['head_hash']):
+            offset, event = data_start, 'rotated'
+        elif info.st_size < offset:
+            offset, event = data_start, 'truncated'
+
+    # User ids not in the users sidecar yet: all of them after a version 2 checkpoint.
+    new_users = set() if stats.approx or sidecars['users'] else set(stats.users)
+    end = complete_lines_end(path, offset, info.st_size)
+    if end > offset:
+        part = analyze_parallel(path, workers=workers, columns=columns, start=offset, end=end,
+                                approx=stats.approx, bad_rows=bad_rows)
+        if not stats.approx:
+            new_users |= part.users - stats.users
+        stats.merge(part)
+
+    if not stats.approx:
+        sidecars = {
+            'latencies': _append_sidecar(checkpoint_path, 'latencies', sidecars['latencies'],
+                                         stats.latencies[sidecars['latencies'] // stats.latencies.itemsize:].tobytes()),
+            'users': _append_sidecar(checkpoint_path, 'users', sidecars['users'],
+                                     ''.join(f'{user}\n' for user in new_users).encode('utf-8')),
+        }
+    head_length = min(HEAD_BYTES, end)
+    save_checkpoint(checkpoint_path, {
+        'version': CHECKPOINT_VERSION,
+        'path': os.path.abspath(path),
+        'offset': end,
+        'inode': info.st_ino,
+        'device': info.st_dev,
+        'head_length': head_length,
+        'head_hash': _head_hash(path, head_length),
+        'columns': columns,
+        'stats': stats.to_dict(samples=False),
+        'sidecars': sidecars,
+    })
+    return stats, end - offset, event
+
+
+# ============================================================================
+# 6. COMMAND LINE ENTRY POINT
+# ============================================================================
+def print_report(report):
+    print(f'rows: {report["rows"]}')
+    if report['bad_rows']:
+        print(f'bad rows: {report["bad_rows"]}')
+    print('by level:')
+    for level, count in report['levels'].items():
+        print(f'  {level:<12} {count}')
+    print('by status:')
+    for status, count in report['statuses'].items():
+        print(f'  {status:<12} {count}')
+    print('top keys:')
+    for key, count in report['top_keys']:
+        print(f'  {key:<40} {count}')
+    print(f'distinct users: {report["distinct_users"]}')
+    print('latency:')
+    for name, value in report['latency_percentiles'].items():
+        print(f'  {name:<12} {value:.3f}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Aggregate a CSV request log.')
+    parser.add_argument('path', help='log file in CSV format with a header row')
+    parser.add_argument('--workers', type=int, default=1, help='worker processes (0 = one per CPU, default: 1)')
+    parser.add_argument('--top', type=int, default=10, help='number of top keys to report')
+    parser.add_argument('--level-column', default=DEFAULT_COLUMNS['level'])
+    parser.add_argument('--status-column', default=DEFAULT_COLUMNS['status'])
+    parser.add_argument('--key-column', default=DEFAULT_COLUMNS['key'])
+    parser.add_argument('--latency-column', default=DEFAULT_COLUMNS['latency'])
+    parser.add_argument('--user-column', default=DEFAULT_COLUMNS['user'])
+    parser.add_argument('--approx', action='store_true',
+                        help='use fixed-memory sketches for top keys, latency percentiles and distinct users')
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    parser.add_argument('--check', action='store_true',
+                        help='also run the serial exact path and compare results (with --approx: report accuracy)')
+    parser.add_argument('--checkpoint', help='checkpoint file: only parse lines appended since the last run')
+    parser.add_argument('--follow', action='store_true', help='keep running and refresh every --interval seconds')
+    parser.add_argument('--interval', type=float, default=60.0, help='seconds between refreshes with --follow')
+    add_error_arguments(parser)
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    columns = {'level': args.level_column, 'status': args.status_column,
+               'key': args.key_column, 'latency': args.latency_column, 'user': args.user_column}
+
+    if args.follow and not args.checkpoint:
+        parser.error('--follow requires --checkpoint')
+    with instrumentation.session(args) as metrics:
+        _run(args, parser, columns, metrics)
+
+
+def _run(args, parser, columns, metrics):
+    """The body of main() once the arguments are parsed."""
+    if args.checkpoint:
+        stats = None
+        while True:
+            # Every refresh adds its rejected lines to the same quarantine file.
+            with BadRows.from_args(args.path, args, append=True) as bad_rows:
+                stats, new_bytes, event = update_incremental(args.path, args.checkpoint, args.workers or None,
+                                                             columns, approx=args.approx, bad_rows=bad_rows,
+                                                             previous=stats)
+            report = stats.report(args.top)
+            if args.json:
+                print(json.dumps(report))
+            else:
+                print(f'--- {time.strftime("%Y-%m-%d %H:%M:%S")} {event}: {new_bytes} new bytes')
+                print_report(report)
+            if not args.follow:
+                return
+            if args.metrics:
+                metrics.write(args.metrics)  # a snapshot per refresh; counters keep growing
+            time.sleep(args.interval)
+
+    with BadRows.from_args(args.path, args) as bad_rows:
+        stats = analyze_parallel(args.path, workers=args.workers or None, columns=columns, approx=args.approx,
+                                 bad_rows=bad_rows)
+
+    # The serial pass applies the same policy but must not write the quarantine file again.
+    check_policy = SKIP if args.on_error == QUARANTINE else args.on_error
+    if args.check and args.approx:
+        errors = accuracy(stats, analyze_serial(args.path, columns, bad_rows=BadRows(args.path, check_policy)),
+                          args.top)
+        print(f'accuracy vs exact: distinct users error {errors["distinct_users"]:.2%}, '
+              f'top-{args.top} recall {errors["top_keys_recall"]:.0%}, '
+              f'top key count error {errors["top_keys_max_count_error"]:.2%}')
+        for name, error in errors['latency_percentiles'].items():
+            print(f'  latency {name} error {error:.2%}')
+    elif args.check:
+        serial = analyze_serial(args.path, columns, bad_rows=BadRows(args.path, check_policy))
+        if not same_results(stats, serial, args.top):
+            parser.exit(1, 'check FAILED: parallel and serial results differ\n')
+        print('check OK: parallel and serial results match')
+
+    report = stats.report(args.top)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+        if bad_rows.count:
+            print(bad_rows.summary())
+
+
+if __name__ == '__main__':
+    main()
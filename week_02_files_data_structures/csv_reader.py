@@ -0,0 +1,779 @@
+# Streaming, chunked CSV reader
+# Reads a CSV file as a sequence of fixed-size chunks instead of loading the
+# whole file into memory as a list of dicts.
+#
+# Each chunk is a dict of column name -> column buffer:
+#   int columns   -> array('q')   (8 bytes per value)
+#   float columns -> array('d')   (8 bytes per value, missing values are NaN)
+#   str columns   -> list of str
+#
+# Column types are inferred ONCE from a sample of rows at the top of the file,
+# so memory use is bounded by chunk_size no matter how large the file is.
+#
+# Two engines produce the same chunks:
+#   'csv'  -> stdlib csv module, handles every quoting rule
+#   'mmap' -> memory-maps the file and splits rows/fields on the raw bytes.
+#             Only the requested columns are ever decoded, which is much faster
+#             when a job reads 2-3 columns of a wide file.
+#
+# Usage:
+#   python -m week_02_files_data_structures.csv_reader data/titanic.csv
+#   python -m week_02_files_data_structures.csv_reader data/house_prices.csv --chunk-size 100000
+#   python -m week_02_files_data_structures.csv_reader data/house_prices.csv --engine mmap --columns price,area
+#   python -m week_02_files_data_structures.csv_reader data/house_prices.csv --metrics metrics.jsonl --profile read.prof
+#   python -m week_02_files_data_structures.csv_reader big.csv --on-error quarantine --max-errors 0.1%
+
+# ============================================================================
+# INDEX - Topics Covered in This File
+# ============================================================================
+# 1. Type inference from a sample of rows
+# 2. Converting string columns into typed buffers
+# 3. Malformed rows: policy, error budget and the slow path
+# 4. Reading the file as a generator of chunks
+# 5. Memory-mapped, zero-copy engine
+# 6. NumPy interop (optional, zero-copy)
+# 7. Command line entry point
+# ============================================================================
+
+import argparse
+import csv
+import io
+import math
+import mmap
+import os
+import shutil
+from array import array
+from bisect import bisect_right
+from functools import partial
+from itertools import islice, repeat
+from operator import itemgetter
+
+from week_02_files_data_structures import instrumentation
+
+INT = 'int'
+FLOAT = 'float'
+STR = 'str'
+
+# array typecodes used for the numeric column types
+TYPECODES = {INT: 'q', FLOAT: 'd'}
+
+DEFAULT_CHUNK_SIZE = 65536
+DEFAULT_SAMPLE_ROWS = 1000
+
+# Values treated as "missing" in numeric columns (empty cell, NA markers).
+MISSING_VALUES = frozenset(['', 'NA', 'N/A', 'NaN', 'nan', 'null', 'NULL', 'None'])
+
+
+# ============================================================================
+# 1. TYPE INFERENCE
+# ============================================================================
+def _infer_type(values):
+    """Return INT, FLOAT or STR for a list of sample values of one column."""
+    present = [value for value in values if value not in MISSING_VALUES]
+    if not present:
+        return STR
+    try:
+        for value in present:
+            int(value)
+    except ValueError:
+        pass
+    else:
+        # Integer columns with gaps become float so missing values can be NaN.
+        return INT if len(present) == len(values) else FLOAT
+    try:
+        for value in present:
+            float(value)
+    except ValueError:
+        return STR
+    return FLOAT
+
+
+@instrumentation.timed('csv_reader.infer_schema')
+def infer_schema(path, sample_rows=DEFAULT_SAMPLE_ROWS, delimiter=',', encoding='utf-8'):
+    """Infer column types from the header and the first `sample_rows` rows.
+
+    Returns a list of (column_name, type) tuples in file order.
+    An empty file returns an empty schema.
+    """
+    with open(path, newline='', encoding=encoding) as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        header = next(reader, None)
+        if header is None:
+            return []
+        sample = [row for row in islice(reader, sample_rows) if len(row) == len(header)]
+
+    columns = list(zip(*sample)) if sample else [() for _ in header]
+    return [(name, _infer_type(list(values))) for name, values in zip(header, columns)]
+
+
+# ============================================================================
+# 2. CONVERTING COLUMNS INTO TYPED BUFFERS
+# ============================================================================
+def _to_float(value):
+    return math.nan if value in MISSING_VALUES else float(value)
+
+
+def convert_column(values, column_type):
+    """Convert a sequence of strings into the buffer used for `column_type`.
+
+    Raises ValueError if a value does not match the inferred type.
+    """
+    if column_type == INT:
+        return array('q', map(int, values))
+    if column_type == FLOAT:
+        return array('d', map(_to_float, values))
+    return list(values)
+
+
+def _convert_columns(columns, names, types):
+    # `columns` is the chunk transposed once (rows -> columns, zip(*records));
+    # each column is converted with a single map() call instead of field by
+    # field per row.
+    return {name: convert_column(values, column_type)
+            for name, values, column_type in zip(names, columns, types)}
+
+
+# ============================================================================
+# 3. MALFORMED ROWS: POLICY, ERROR BUDGET AND THE SLOW PATH
+# ============================================================================
+# Valid rows never pay for error handling: each column of a chunk is converted
+# with one map() call and no per-field try/except. Only when that raises does
+# the chunk take the slow path, which converts the failing columns value by
+# value to find the bad rows, hands them to the BadRows policy and converts
+# the remaining rows again. Rows with the wrong number of fields (too few or
+# too many) are caught by the per-row length check of the csv engine and by a
+# delimiter count per line in the mmap engine, so both reject the same rows.
+#
+# Policies:
+#   'fail'       -> raise MalformedRowError naming the row, column and value (default)
+#   'skip'       -> drop the row and count it
+#   'quarantine' -> drop the row and write it to a side file (location, error, raw line)
+#
+# The error budget (max_errors) stops a run that is dropping too much: an int
+# is a number of bad rows, a float below 1 a fraction of the rows read. The
+# fraction is checked after every chunk once MIN_BUDGET_ROWS rows were read,
+# and at the end of the file.
+
+FAIL = 'fail'
+SKIP = 'skip'
+QUARANTINE = 'quarantine'
+POLICIES = (FAIL, SKIP, QUARANTINE)
+MIN_BUDGET_ROWS = 10000
+MAX_EXAMPLES = 5
+
+
+class MalformedRowError(ValueError):
+    """A bad row under the 'fail' policy, or more bad rows than the error budget allows."""
+
+
+def parse_max_errors(text):
+    """Error budget from the command line: '100' (rows), '0.01' or '1%' (fraction of the rows)."""
+    text = text.strip()
+    if text.endswith('%'):
+        return float(text[:-1]) / 100
+    value = float(text)
+    if value < 1:
+        return value
+    if value != int(value):
+        raise ValueError(f'error budget must be a whole number of rows or a fraction below 1, not {text}')
+    return int(value)
+
+
+class BadRows:
+    """Malformed-row policy and error budget for one file; counts the rows it rejected.
+
+    >>> with BadRows('big.csv', 'quarantine', max_errors=0.001) as bad_rows:
+    ...     for chunk in read_chunks('big.csv', bad_rows=bad_rows):
+    ...         pass
+    >>> bad_rows.count, bad_rows.quarantine_path
+
+    append=True adds to an existing quarantine file instead of replacing it.
+    """
+
+    def __init__(self, path, policy=FAIL, max_errors=None, quarantine_path=None, append=False):
+        if policy not in POLICIES:
+            raise ValueError(f'unknown policy {policy!r}, expected one of: {", ".join(POLICIES)}')
+        self.path = path
+        self.policy = policy
+        self.max_errors = max_errors
+        self.quarantine_path = (quarantine_path or f'{path}.rejects.csv') if policy == QUARANTINE else None
+        self.append = append
+        self.count = 0
+        self.examples = []
+        self._file = None
+        self._writer = None
+
+    @classmethod
+    def from_args(cls, path, args, append=False):
+        """BadRows for the options added by add_error_arguments()."""
+        return cls(path, args.on_error, args.max_errors, args.quarantine, append)
+
+    @property
+    def keeps_raw(self):
+        """True if rejected rows are written out, so readers must keep the whole raw row."""
+        return self.policy == QUARANTINE
+
+    def reject(self, row, reason, raw=None):
+        """Apply the policy to one bad row.
+
+        row    : where it is, for messages: a data row number, or text such as 'at byte 120'
+        reason : what is wrong with it
+        raw    : the row as bytes, str or a list of fields (written when quarantining)
+        """
+        if self.policy == FAIL:
+            raise MalformedRowError(f'{self.path}: row {row}: {reason}')
+        self.count += 1
+        if len(self.examples) < MAX_EXAMPLES:
+            self.examples.append(f'row {row}: {reason}')
+        if self.policy == QUARANTINE:
+            self._open().writerow([row, reason, _raw_text(raw)])
+        if isinstance(self.max_errors, int) and self.count > self.max_errors:
+            raise MalformedRowError(f'{self.path}: {self.count} bad rows, over the error budget of '
+                                    f'{self.max_errors} (row {row}: {reason})')
+
+    def check_budget(self, rows, final=False):
+        """Raise if more than the budgeted fraction of `rows` rows read so far was bad."""
+        if not isinstance(self.max_errors, float) or not self.count:
+            return
+        if (final or rows >= MIN_BUDGET_ROWS) and self.count > self.max_errors * rows:
+            raise MalformedRowError(f'{self.path}: {self.count} bad rows in {rows}, over the error budget of '
+                                    f'{self.max_errors * 100:g}% (first: {self.examples[0]})')
+
+    def part(self, index):
+        """A BadRows for one part of the file processed elsewhere (e.g. a worker); see absorb()."""
+        quarantine_path = f'{self.quarantine_path}.part{index}' if self.quarantine_path else None
+        return BadRows(self.path, self.policy, self.max_errors, quarantine_path)
+
+    def absorb(self, part):
+        """Add the rows rejected by a finished part() to this one's count and quarantine file."""
+        self.count += part.count
+        room = MAX_EXAMPLES - len(self.examples)
+        self.examples.extend(part.examples[:room])
+        if part.quarantine_path and os.path.exists(part.quarantine_path):
+            with open(part.quarantine_path, newline='', encoding='utf-8') as f:
+                f.readline()  # header
+                self._open()
+                shutil.copyfileobj(f, self._file)
+            os.remove(part.quarantine_path)
+        if isinstance(self.max_errors, int) and self.count > self.max_errors:
+            raise MalformedRowError(f'{self.path}: {self.count} bad rows, over the error budget of {self.max_errors}')
+
+    def summary(self):
+        if not self.count:
+            return 'no bad rows'
+        where = f', written to {self.quarantine_path}' if self.policy == QUARANTINE else ''
+        return f'{self.count} bad rows skipped{where}; first: {"; ".join(self.examples[:3])}'
+
+    def _open(self):
+        if self._writer is None:
+            new = not (self.append and os.path.exists(self.quarantine_path))
+            self._file = open(self.quarantine_path, 'w' if new else 'a', newline='', encoding='utf-8')
+            self._writer = csv.writer(self._file)
+            if new:
+                self._writer.writerow(['row', 'error', 'raw'])
+        return self._writer
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_file'] = state['_writer'] = None
+        return state
+
+
+def _raw_text(raw):
+    if raw is None or isinstance(raw, str):
+        return raw
+    if isinstance(raw, (bytes, bytearray, memoryview)):
+        return bytes(raw).decode('utf-8', errors='replace')
+    line = io.StringIO()
+    csv.writer(line, lineterminator='').writerow(raw)
+    return line.getvalue()
+
+
+def _describe(value):
+    return repr(bytes(value).decode('utf-8', errors='replace') if isinstance(value, (bytes, memoryview)) else value)
+
+
+def find_bad_values(columns, names, types, converters):
+    """Slow path: {position: reason} for every row with a value that does not convert.
+
+    columns    : one sequence of values per column, all the same length
+    converters : column type -> function raising ValueError for a bad value
+    Each column is first tried in one pass; only a column that fails is
+    checked value by value.
+    """
+    bad = {}
+    for name, values, column_type in zip(names, columns, types):
+        convert = converters.get(column_type)
+        if convert is None:
+            continue
+        try:
+            for _ in map(convert, values):
+                pass
+            continue
+        except ValueError:
+            pass
+        for position, value in enumerate(values):
+            try:
+                convert(value)
+            except ValueError:
+                bad.setdefault(position, f'column {name!r}: {_describe(value)} is not {column_type}')
+    return bad
+
+
+_STR_CONVERTERS = {INT: int, FLOAT: _to_float}
+
+
+# ============================================================================
+# 4. READING THE FILE AS A GENERATOR OF CHUNKS
+# ============================================================================
+def read_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE, columns=None, schema=None,
+                delimiter=',', encoding='utf-8', engine='csv', bad_rows=None):
+    """Yield the file as chunks of at most `chunk_size` rows.
+
+    path       : CSV file with a header row
+    chunk_size : maximum number of rows per chunk
+    columns    : optional list of column names to keep (default: all)
+    schema     : optional list of (name, type); inferred with infer_schema() if omitted
+    engine     : 'csv' (stdlib csv module) or 'mmap' (see MappedCSV)
+    bad_rows   : BadRows policy for malformed rows (default: fail on the first one)
+
+    Each chunk is a dict {column_name: array or list}.
+    """
+    if chunk_size <= 0:
+        raise ValueError('chunk_size must be positive')
+    if schema is None:
+        schema = infer_schema(path, delimiter=delimiter, encoding=encoding)
+    if bad_rows is None:
+        bad_rows = BadRows(path)
+    if engine == 'mmap':
+        with MappedCSV(path, delimiter=delimiter, encoding=encoding) as mapped:
+            yield from mapped.iter_chunks(chunk_size=chunk_size, columns=columns, schema=schema, bad_rows=bad_rows)
+        return
+    if engine != 'csv':
+        raise ValueError(f"unknown engine {engine!r}, expected 'csv' or 'mmap'")
+    types_by_name = dict(schema)
+
+    with open(path, newline='', encoding=encoding) as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        header = next(reader, None)
+        if header is None:
+            return
+        wanted = header if columns is None else columns
+        missing = [name for name in wanted if name not in types_by_name]
+        if missing:
+            raise KeyError(f'unknown column(s): {", ".join(missing)}')
+        indexes = [header.index(name) for name in wanted]
+        types = [types_by_name[name] for name in wanted]
+        if not indexes:
+            return
+        # itemgetter picks only the wanted fields, so the full row lists are
+        # dropped immediately instead of being held for the whole chunk.
+        pick = itemgetter(*indexes) if len(indexes) > 1 else (lambda row, index=indexes[0]: (row[index],))
+        width = len(header)
+        raw = f.buffer  # raw.tell(): bytes read from the file so far (f.tell() is disabled while iterating)
+        # Quarantined rows are written whole, so every field is kept; as tuples,
+        # which the garbage collector stops tracking, unlike 65k row lists.
+        keep_raw = bad_rows.keeps_raw
+
+        rows_read = 0  # data rows read so far, good and bad (the row numbers in error messages)
+        while True:
+            # The stage covers reading and converting one chunk, not the
+            # consumer's work between yields.
+            with instrumentation.stage('csv_reader.read_chunk') as stage:
+                position = raw.tell()
+                records = []
+                append = records.append
+                rejected = []  # len(records) at each row dropped for its field count
+                line_before = reader.line_num
+                for row in islice(reader, chunk_size):
+                    if len(row) != width:
+                        if not row:  # csv.reader returns [] for blank lines
+                            continue
+                        bad_rows.reject(rows_read + len(records) + len(rejected) + 1,
+                                        f'line {reader.line_num} has {len(row)} fields, expected {width}', row)
+                        rejected.append(len(records))
+                        continue
+                    append(tuple(row) if keep_raw else pick(row))
+                if reader.line_num == line_before:  # end of file
+                    break
+                first_row = rows_read + 1
+                rows_read += len(records) + len(rejected)
+                if not records:  # every row of the chunk was rejected or blank
+                    columns = [() for _ in indexes]
+                elif keep_raw:
+                    every = list(zip(*records))
+                    columns = [every[index] for index in indexes]
+                else:
+                    columns = zip(*records)  # lazy: each column is released once converted
+                try:
+                    chunk = _convert_columns(columns, wanted, types)
+                    kept = len(records)
+                except ValueError:
+                    columns = columns if keep_raw else list(zip(*records))
+                    bad = find_bad_values(columns, wanted, types, _STR_CONVERTERS)
+                    for index, reason in sorted(bad.items()):
+                        bad_rows.reject(first_row + index + bisect_right(rejected, index), reason, records[index])
+                    kept = len(records) - len(bad)
+                    chunk = _convert_columns([[value for index, value in enumerate(values) if index not in bad]
+                                              for values in columns], wanted, types)
+                bad_rows.check_budget(rows_read)
+                stage.add(rows=kept, bytes=raw.tell() - position)
+            if kept:
+                yield chunk
+        bad_rows.check_budget(rows_read, final=True)
+
+
+def chunk_length(chunk):
+    """Number of rows in a chunk."""
+    return len(next(iter(chunk.values()))) if chunk else 0
+
+
+# ============================================================================
+# 5. MEMORY-MAPPED, ZERO-COPY ENGINE
+# ============================================================================
+# The file is mapped into memory with mmap, so the OS pages it in on demand and
+# nothing is read into Python objects up front. Row and field boundaries are
+# found directly on the mapped bytes:
+#   - iter_rows() yields memoryview slices of the mapping (no copy, no decode)
+#   - iter_chunks() splits each line only up to the last requested column and
+#     converts just those fields, straight from bytes (int(b'3') and
+#     float(b'2.5') work without decoding to str first)
+#
+# Limitation: a quoted field containing a newline is not supported. Lines that
+# contain a quote character are parsed with the csv module (slow path), so
+# quoted delimiters such as "Braund, Mr. Owen" are still handled correctly.
+
+BLOCK_SIZE = 16 * 1024 * 1024  # bytes copied out of the mapping per step in iter_chunks()
+
+_MISSING_BYTES = frozenset(value.encode() for value in MISSING_VALUES)
+
+
+def _bytes_to_float(value):
+    return math.nan if value in _MISSING_BYTES else float(value)
+
+
+class MappedCSV:
+    """A CSV file mapped into memory. Use as a context manager.
+
+    >>> with MappedCSV('data/house_prices.csv') as mapped:
+    ...     prices = mapped.column('price', FLOAT)
+    """
+
+    def __init__(self, path, delimiter=',', encoding='utf-8'):
+        self.path = path
+        self.encoding = encoding
+        self.delimiter = delimiter
+        self._delim = delimiter.encode(encoding)
+        self._converters = {INT: int, FLOAT: _bytes_to_float, STR: partial(bytes.decode, encoding=encoding)}
+        self._file = open(path, 'rb')
+        self.size = os.fstat(self._file.fileno()).st_size
+        # mmap refuses empty files, an empty file simply has no header and no rows.
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b''
+        self._view = memoryview(self._map)
+
+        end = self._line_end(0)
+        header_line = bytes(self._view[0:end]).rstrip(b'\r').decode(encoding)
+        self.header = next(csv.reader([header_line], delimiter=delimiter)) if header_line else []
+        self.data_start = min(end + 1, self.size)
+
+    def _line_end(self, pos):
+        end = self._map.find(b'\n', pos)
+        return self.size if end == -1 else end
+
+    def close(self):
+        # Field views from iter_rows() point into the mapping. If the caller still
+        # holds some, the mapping stays open until they are garbage collected.
+        try:
+            self._view.release()
+            if self.size:
+                self._map.close()
+        except BufferError:
+            pass
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _indexes(self, columns):
+        if columns is None:
+            return list(range(len(self.header)))
+        missing = [name for name in columns if name not in self.header]
+        if missing:
+            raise KeyError(f'unknown column(s): {", ".join(missing)}')
+        return [self.header.index(name) for name in columns]
+
+    def _split_quoted(self, line):
+        # Slow path for lines with quotes: let the csv module apply the quoting rules.
+        fields = next(csv.reader([bytes(line).decode(self.encoding)], delimiter=self.delimiter))
+        return [field.encode(self.encoding) for field in fields]
+
+    def iter_rows(self, columns=None):
+        """Yield one tuple per row holding a memoryview for each requested field.
+
+        Only the delimiters up to the last requested column are searched.
+        Fields are not decoded; call bytes(field).decode() for the ones you need.
+        """
+        indexes = self._indexes(columns)
+        if not indexes:
+            return
+        last = max(indexes)
+        find = self._map.find
+        view = self._view
+        delim = self._delim
+        pos = self.data_start
+        while pos < self.size:
+            end = self._line_end(pos)
+            line_end = end - 1 if end > pos and view[end - 1] == 13 else end  # strip '\r'
+            if line_end > pos:
+                if find(b'"', pos, line_end) != -1:
+                    fields = self._split_quoted(view[pos:line_end])
+                    if len(fields) <= last:
+                        raise ValueError(f'{self.path}: row at byte {pos} has {len(fields)} fields')
+                    yield tuple(memoryview(fields[i]) for i in indexes)
+                else:
+                    bounds = []
+                    start = pos
+                    for _ in range(last + 1):
+                        stop = find(delim, start, line_end)
+                        if stop == -1:
+                            stop = line_end
+                        bounds.append((start, stop))
+                        start = stop + len(delim)
+                        if stop == line_end:
+                            break
+                    if len(bounds) <= last:
+                        raise ValueError(f'{self.path}: row at byte {pos} has {len(bounds)} fields')
+                    yield tuple(view[bounds[i][0]:bounds[i][1]] for i in indexes)
+            pos = end + 1
+
+    def _iter_lines(self):
+        # Yield (lines, has_quotes) for blocks of complete, non-empty lines,
+        # copying BLOCK_SIZE bytes at a time.
+        pos = self.data_start
+        while pos < self.size:
+            stop = min(pos + BLOCK_SIZE, self.size)
+            if stop < self.size:
+                cut = self._map.rfind(b'\n', pos, stop)
+                if cut == -1:  # a single line longer than BLOCK_SIZE
+                    cut = self._line_end(stop)
+            else:
+                cut = self.size
+            with instrumentation.stage('csv_reader.mmap_read') as stage:
+                block = self._map[pos:cut]
+                if b'\r' in block:
+                    block = block.replace(b'\r\n', b'\n').rstrip(b'\r')
+                lines = [line for line in block.split(b'\n') if line]
+                stage.add(bytes=cut - pos)
+            yield lines, b'"' in block
+            pos = cut + 1
+
+    def _split_lines(self, lines, maxsplit, has_quotes):
+        delim = self._delim
+        rows = [line.split(delim, maxsplit) for line in lines]
+        if has_quotes:
+            rows = [self._split_quoted(line) if b'"' in line else row for line, row in zip(lines, rows)]
+        return rows
+
+    def _convert(self, values, column_type):
+        if column_type == INT:
+            return array('q', map(int, values))
+        if column_type == FLOAT:
+            return array('d', map(_bytes_to_float, values))
+        encoding = self.encoding
+        return [value.decode(encoding) for value in values]
+
+    def iter_chunks(self, chunk_size=DEFAULT_CHUNK_SIZE, columns=None, schema=None, bad_rows=None):
+        """Yield chunks like read_chunks(), decoding only the requested columns."""
+        if schema is None:
+            schema = infer_schema(self.path, delimiter=self.delimiter, encoding=self.encoding)
+        if bad_rows is None:
+            bad_rows = BadRows(self.path)
+        types_by_name = dict(schema)
+        names = self.header if columns is None else columns
+        indexes = self._indexes(names)
+        if not indexes:
+            return
+        last = max(indexes)
+        maxsplit = last + 1  # fields after the last requested column stay unsplit
+        types = [types_by_name[name] for name in names]
+
+        pending = []
+        pending_quotes = False  # True if any block contributing to `pending` had a quote
+        rows_read = 0
+        for lines, has_quotes in self._iter_lines():
+            pending.extend(lines)
+            pending_quotes = pending_quotes or has_quotes
+            start = 0
+            while len(pending) - start >= chunk_size:
+                batch = pending[start:start + chunk_size]
+                with instrumentation.stage('csv_reader.mmap_chunk') as stage:
+                    chunk = self._make_chunk(batch, names, indexes, types, maxsplit, rows_read,
+                                             pending_quotes, bad_rows)
+                    rows_read += len(batch)
+                    bad_rows.check_budget(rows_read)
+                    stage.add(rows=chunk_length(chunk) if chunk else 0)
+                if chunk:
+                    yield chunk
+                start += chunk_size
+            del pending[:start]
+            pending_quotes = pending_quotes and bool(pending)  # leftover lines may come from an earlier block
+        if pending:
+            with instrumentation.stage('csv_reader.mmap_chunk') as stage:
+                chunk = self._make_chunk(pending, names, indexes, types, maxsplit, rows_read,
+                                         pending_quotes, bad_rows)
+                rows_read += len(pending)
+                stage.add(rows=chunk_length(chunk) if chunk else 0)
+            if chunk:
+                yield chunk
+        bad_rows.check_budget(rows_read, final=True)
+
+    def _make_chunk(self, lines, names, indexes, types, maxsplit, rows_read, has_quotes, bad_rows):
+        # Returns None if every row was rejected.
+        rows = self._split_lines(lines, maxsplit, has_quotes)
+        # Every line must have as many fields as the header, as in the csv
+        # engine. When the lines were split only up to the last requested
+        # column, the delimiters are counted instead (bytes.count runs in C);
+        # quoted lines were always split completely.
+        width = len(self.header)
+        if maxsplit >= width:
+            expected, counts = width, list(map(len, rows))
+        else:
+            expected, counts = width - 1, list(map(bytes.count, lines, repeat(self._delim)))
+            if has_quotes:
+                counts = [len(row) - 1 if b'"' in line else count for line, row, count in zip(lines, rows, counts)]
+        kept = None  # index in `lines` of each row in `rows`, once rows with a wrong field count were dropped
+        if counts.count(expected) != len(counts):
+            for i, count in enumerate(counts):
+                if count != expected:
+                    fields = len(rows[i]) if b'"' in lines[i] else lines[i].count(self._delim) + 1
+                    bad_rows.reject(rows_read + i + 1, f'{fields} fields, expected {width}', lines[i])
+            kept = [i for i, count in enumerate(counts) if count == expected]
+            rows = [rows[i] for i in kept]
+        if not rows:
+            return None
+        try:
+            return {name: self._convert([row[index] for row in rows], column_type)
+                    for name, index, column_type in zip(names, indexes, types)}
+        except ValueError:
+            pass
+        columns = [[row[index] for row in rows] for index in indexes]
+        bad = find_bad_values(columns, names, types, self._converters)
+        for i, reason in sorted(bad.items()):
+            line = i if kept is None else kept[i]
+            bad_rows.reject(rows_read + line + 1, reason, lines[line])
+        if len(bad) == len(rows):
+            return None
+        return {name: self._convert([value for i, value in enumerate(values) if i not in bad], column_type)
+                for name, values, column_type in zip(names, columns, types)}
+
+    def column(self, name, column_type=None):
+        """Return a single column as a typed buffer, decoding nothing else."""
+        if column_type is None:
+            column_type = dict(infer_schema(self.path, delimiter=self.delimiter, encoding=self.encoding))[name]
+        parts = [chunk[name] for chunk in self.iter_chunks(columns=[name], schema=[(name, column_type)])]
+        if column_type == STR:
+            return [value for part in parts for value in part]
+        result = array(TYPECODES[column_type])
+        for part in parts:
+            result.extend(part)
+        return result
+
+
+# ============================================================================
+# 6. NUMPY INTEROP
+# ============================================================================
+def to_numpy(chunk):
+    """Return the chunk with numeric columns as NumPy arrays.
+
+    Numeric buffers are wrapped with np.frombuffer, so no data is copied.
+    NumPy is imported here so the reader itself works without it.
+    """
+    import numpy as np
+
+    result = {}
+    for name, values in chunk.items():
+        if isinstance(values, array):
+            result[name] = np.frombuffer(values, dtype=np.int64 if values.typecode == 'q' else np.float64)
+        else:
+            result[name] = np.asarray(values, dtype=object)
+    return result
+
+
+# ============================================================================
+# 7. COMMAND LINE ENTRY POINT
+# ============================================================================
+def summarize(path, chunk_size=DEFAULT_CHUNK_SIZE, columns=None, engine='csv', bad_rows=None):
+    """Stream the file once and return (schema, row_count, numeric column stats)."""
+    schema = infer_schema(path)
+    if columns is not None:
+        types_by_name = dict(schema)
+        schema = [(name, types_by_name[name]) for name in columns if name in types_by_name]
+    stats = {name: [0, 0.0, math.inf, -math.inf] for name, kind in schema if kind != STR}  # count, sum, min, max
+    rows = 0
+    with instrumentation.stage('csv_reader.summarize') as stage:
+        for chunk in read_chunks(path, chunk_size=chunk_size, columns=columns, schema=schema, engine=engine,
+                                 bad_rows=bad_rows):
+            rows += chunk_length(chunk)
+            for name, column_stats in stats.items():
+                values = [value for value in chunk[name] if value == value]  # drop NaN
+                if values:
+                    column_stats[0] += len(values)
+                    column_stats[1] += sum(values)
+                    column_stats[2] = min(column_stats[2], min(values))
+                    column_stats[3] = max(column_stats[3], max(values))
+        stage.add(rows=rows, bytes=os.path.getsize(path))
+    return schema, rows, stats
+
+
+def add_error_arguments(parser):
+    """Add --on-error, --max-errors and --quarantine; see BadRows.from_args()."""
+    group = parser.add_argument_group('malformed rows')
+    group.add_argument('--on-error', choices=POLICIES, default=FAIL,
+                       help='what to do with a malformed row (default: fail)')
+    group.add_argument('--max-errors', type=parse_max_errors, metavar='N',
+                       help='error budget: a number of rows (100) or a fraction of the rows (0.01 or 1%%)')
+    group.add_argument('--quarantine', metavar='FILE',
+                       help='side file for --on-error quarantine (default: <input>.rejects.csv)')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Stream a CSV file in typed chunks and print a summary.')
+    parser.add_argument('path', help='CSV file with a header row')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='rows per chunk')
+    parser.add_argument('--engine', choices=['csv', 'mmap'], default='csv', help='parsing engine')
+    parser.add_argument('--columns', help='comma separated list of columns to read (default: all)')
+    add_error_arguments(parser)
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    columns = args.columns.split(',') if args.columns else None
+    with instrumentation.session(args), BadRows.from_args(args.path, args) as bad_rows:
+        schema, rows, stats = summarize(args.path, chunk_size=args.chunk_size, columns=columns, engine=args.engine,
+                                        bad_rows=bad_rows)
+    print(f'{args.path}: {rows} rows, {len(schema)} columns')
+    if bad_rows.count:
+        print(f'  {bad_rows.summary()}')
+    for name, kind in schema:
+        line = f'  {name:<20} {kind:<6}'
+        if name in stats and stats[name][0]:
+            count, total, low, high = stats[name]
+            line += f' mean={total / count:.4g} min={low:.4g} max={high:.4g} non-missing={count}'
+        print(line.rstrip())
+
+
+if __name__ == '__main__':
+    main()
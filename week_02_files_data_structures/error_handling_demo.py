@@ -0,0 +1,220 @@
+# Error handling when reading data files
+# Errors are exceptions: raise stops the normal flow, try/except catches the
+# exception further up. Data files are where most of them come from: a file
+# that is missing, a row with a field too many, a number that is not a number.
+#
+# Every section is a function, so importing this file prints nothing; run it
+# to print the sections:
+#   python -m week_02_files_data_structures.error_handling_demo              # every section
+#   python -m week_02_files_data_structures.error_handling_demo --section 4  # one section
+#   python -m week_02_files_data_structures.error_handling_demo --rows 1000000  # bigger timing in section 4
+
+# ============================================================================
+# INDEX - Topics Covered in This File
+# ============================================================================
+# 1. try / except / else / finally
+# 2. Custom exceptions and raise ... from
+# 3. EAFP vs LBYL (ask forgiveness vs look before you leap)
+# 4. The cost of per-field try/except, and batched conversion with a slow path
+# 5. Malformed-row policies: fail, skip, quarantine and an error budget
+# ============================================================================
+
+import argparse
+import os
+import tempfile
+import time
+
+from week_02_files_data_structures.csv_reader import BadRows, MalformedRowError, chunk_length, read_chunks
+
+GOOD_ROW = '4200000,7420,4,2'
+BAD_ROWS = {3: '3500000,n/a,3,1', 7: '2800000,5000,2', 11: '6100000,8100,four,2'}  # row number -> line
+
+
+def banner(title):
+    print('\n' + '='*80)
+    print(title)
+    print('='*80)
+
+
+def write_sample(directory, rows=12):
+    """Write a small house price CSV with the BAD_ROWS in it and return its path."""
+    path = os.path.join(directory, 'sample.csv')
+    with open(path, 'w') as f:
+        f.write('price,area,bedrooms,bathrooms\n')
+        for row in range(1, rows + 1):
+            f.write(BAD_ROWS.get(row, GOOD_ROW) + '\n')
+    return path
+
+
+# ============================================================================
+# 1. TRY / EXCEPT / ELSE / FINALLY
+# ============================================================================
+def try_except_else_finally(path='no_such_file.csv'):
+    banner('1. TRY / EXCEPT / ELSE / FINALLY')
+    # try     : the code that may fail
+    # except  : runs only if an exception of that type was raised inside try
+    # else    : runs only if nothing was raised (keep it out of try, so its own
+    #           errors are not caught by mistake)
+    # finally : always runs, error or not; used for cleanup
+    try:
+        f = open(path)
+    except FileNotFoundError as error:
+        print('Could not open the file:', error)  # Output: [Errno 2] No such file or directory: 'no_such_file.csv'
+        lines = None
+    else:
+        with f:
+            lines = sum(1 for _ in f)
+        print('Lines in the file:', lines)
+    finally:
+        print('finally runs in both cases')
+    return lines
+
+
+# ============================================================================
+# 2. CUSTOM EXCEPTIONS AND RAISE ... FROM
+# ============================================================================
+def custom_exceptions(value='n/a', row=3):
+    banner('2. CUSTOM EXCEPTIONS AND RAISE ... FROM')
+    # A custom exception is a subclass of an existing one. csv_reader raises
+    # MalformedRowError, a subclass of ValueError: callers that already catch
+    # ValueError keep working, new callers can catch exactly this error.
+    print('MalformedRowError is a ValueError:', issubclass(MalformedRowError, ValueError))  # Output: True
+    # raise ... from keeps the original exception as __cause__, so the traceback
+    # shows both: what went wrong (int() failed) and where (row 3).
+    try:
+        try:
+            int(value)
+        except ValueError as error:
+            raise MalformedRowError(f'row {row}: {value!r} is not an int') from error
+    except MalformedRowError as error:
+        print('Caught:', error)  # Output: row 3: 'n/a' is not an int
+        print('Caused by:', repr(error.__cause__))  # Output: ValueError("invalid literal for int() with base 10: 'n/a'")
+        return error
+
+
+# ============================================================================
+# 3. EAFP VS LBYL
+# ============================================================================
+def eafp_vs_lbyl(values=('12', '7', 'n/a', '-3')):
+    banner('3. EAFP VS LBYL')
+    # LBYL (look before you leap): check first, then act. The check has to
+    # repeat the rules of int() and is easy to get wrong: '-3'.isdigit() is False.
+    lbyl = [int(value) if value.isdigit() else None for value in values]
+    print('LBYL :', lbyl)  # Output: [12, 7, None, None]
+    # EAFP (easier to ask forgiveness than permission): just act and handle the
+    # exception. int() itself decides what is valid.
+    eafp = []
+    for value in values:
+        try:
+            eafp.append(int(value))
+        except ValueError:
+            eafp.append(None)
+    print('EAFP :', eafp)  # Output: [12, 7, None, -3]
+    return lbyl, eafp
+
+
+# ============================================================================
+# 4. THE COST OF PER-FIELD TRY/EXCEPT, AND BATCHED CONVERSION WITH A SLOW PATH
+# ============================================================================
+def per_field(values):
+    # A try block per value: the Python loop and the exception setup are paid
+    # for every field, even though almost every value is fine.
+    result = []
+    for value in values:
+        try:
+            result.append(int(value))
+        except ValueError:
+            result.append(None)
+    return result
+
+
+def batched(values):
+    # Fast path: one map() call converts the whole column in C. Only if it
+    # raises, fall back to the slow path that finds the bad values one by one.
+    try:
+        return list(map(int, values))
+    except ValueError:
+        return per_field(values)
+
+
+def conversion_cost(rows=200000):
+    banner('4. THE COST OF PER-FIELD TRY/EXCEPT, AND BATCHED CONVERSION WITH A SLOW PATH')
+    clean = [str(number) for number in range(rows)]
+    dirty = clean[:-1] + ['n/a']  # one bad value at the very end: the worst case for the fast path
+    timings = {}
+    for name, convert, values in [('per-field try/except, clean column', per_field, clean),
+                                  ('batched map(),        clean column', batched, clean),
+                                  ('batched + slow path,  one bad value', batched, dirty)]:
+        start = time.perf_counter()
+        convert(values)
+        timings[name] = time.perf_counter() - start
+        print(f'{name}: {timings[name] * 1000:7.1f} ms for {rows} values')
+    # The batched version is about a third faster on clean data. A bad value
+    # costs one extra pass over that one chunk, the other chunks of a file
+    # stay on the fast path. csv_reader does this per chunk and per column.
+    return timings
+
+
+# ============================================================================
+# 5. MALFORMED-ROW POLICIES: FAIL, SKIP, QUARANTINE AND AN ERROR BUDGET
+# ============================================================================
+def row_policies():
+    banner('5. MALFORMED-ROW POLICIES: FAIL, SKIP, QUARANTINE AND AN ERROR BUDGET')
+    # read_chunks() takes a BadRows policy for rows that do not fit the schema:
+    #   'fail'       -> raise MalformedRowError at the first one (the default)
+    #   'skip'       -> drop them, count them
+    #   'quarantine' -> drop them and write them to a side file to fix later
+    # max_errors is the error budget: after that many bad rows (or that
+    # fraction of the rows, e.g. 0.01) the read fails anyway, because a file
+    # that is mostly bad is a wrong file, not a few typos.
+    schema = [('price', 'int'), ('area', 'int'), ('bedrooms', 'int'), ('bathrooms', 'int')]
+    with tempfile.TemporaryDirectory() as directory:
+        path = write_sample(directory)
+
+        try:
+            for _ in read_chunks(path, schema=schema):
+                pass
+        except MalformedRowError as error:
+            print('fail       :', str(error).replace(directory + os.sep, ''))  # Output: sample.csv: row 7: line 8 has 3 fields, expected 4
+
+        with BadRows(path, 'skip') as bad_rows:
+            rows = sum(chunk_length(chunk) for chunk in read_chunks(path, schema=schema, bad_rows=bad_rows))
+        print('skip       :', rows, 'rows kept,', bad_rows.count, 'skipped')  # Output: 9 rows kept, 3 skipped
+
+        with BadRows(path, 'quarantine') as bad_rows:
+            for _ in read_chunks(path, schema=schema, bad_rows=bad_rows):
+                pass
+        print('quarantine :', os.path.basename(bad_rows.quarantine_path))  # Output: sample.csv.rejects.csv
+        with open(bad_rows.quarantine_path) as f:
+            print(f.read())  # rows with a wrong field count come first: they are found while reading the chunk
+
+        try:
+            with BadRows(path, 'skip', max_errors=2) as bad_rows:
+                for _ in read_chunks(path, schema=schema, bad_rows=bad_rows):
+                    pass
+        except MalformedRowError as error:
+            print('budget     :', str(error).replace(directory + os.sep, ''))  # Output: sample.csv: 3 bad rows, over the error budget of 2 (...)
+    return rows
+
+
+SECTIONS = [try_except_else_finally, custom_exceptions, eafp_vs_lbyl, conversion_cost, row_policies]
+
+
+def run(sections=None, rows=200000):
+    """Run the numbered sections (default: all) in order."""
+    for number, section in enumerate(SECTIONS, 1):
+        if sections is None or number in sections:
+            section(rows) if section is conversion_cost else section()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Error handling for data files, section by section.')
+    parser.add_argument('--section', type=int, action='append', choices=range(1, len(SECTIONS) + 1),
+                        help='run only this section (repeatable; default: all)')
+    parser.add_argument('--rows', type=int, default=200000, help='values to convert in the timing of section 4')
+    args = parser.parse_args(argv)
+    run(args.section, args.rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,357 @@
+# Instrumentation - per-stage timing, throughput and memory metrics
+# Code marks its stages; nothing is measured unless metrics are enabled.
+#
+#   from week_02_files_data_structures import instrumentation
+#
+#   @instrumentation.timed('house_price_model.fit_normal')
+#   def fit_normal(...):
+#       ...
+#       instrumentation.add(rows=len(y))      # counted on the innermost open stage
+#
+#   with instrumentation.stage('csv_reader.chunk') as stage:
+#       chunk = parse(block)
+#       stage.add(rows=len(chunk), bytes=len(block))
+#
+# Disabled (the default), stage() returns a shared object whose methods do
+# nothing, and a timed() function costs one attribute check per call. Stages
+# are meant for chunks, blocks and whole passes, not for single rows.
+#
+# Enabled, every stage name accumulates calls, wall time, rows and bytes read,
+# so a stage entered once per chunk gives one line for the whole run, plus the
+# process's peak RSS when the stage last finished (getrusage, one system call).
+# With memory=True, tracemalloc also records each stage's peak Python memory
+# above what was allocated when it started. tracemalloc hooks every allocation
+# (csv_reader parses ~10x slower with it), so it is a separate switch; stored
+# tracebacks are limited to one frame.
+#
+# Only the current process is measured: stages that run in pool workers are
+# not collected, their driver's stage covers them.
+#
+# Command line tools opt in with add_arguments() and session():
+#   --metrics FILE   append JSON lines, or write Prometheus text if FILE ends in .prom
+#   --memory         also track peak memory per stage (tracemalloc)
+#   --profile FILE   write a cProfile dump (python -m pstats FILE, snakeviz, flameprof)
+#
+#   python -m week_02_files_data_structures.csv_reader data/house_prices.csv --metrics metrics.jsonl
+#   python -m week_06_ml_basics.house_price_model data/house_prices.csv --metrics metrics.prom --memory
+#   python -m week_02_files_data_structures.instrumentation metrics.jsonl --last   # summary table
+
+# ============================================================================
+# INDEX - Topics Covered in This File
+# ============================================================================
+# 1. Stage statistics
+# 2. Stages as context managers and decorators
+# 3. JSON lines and Prometheus text output
+# 4. Command line options and profiling sessions
+# ============================================================================
+
+import argparse
+import cProfile
+import functools
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PROMETHEUS_PREFIX = 'pipeline_stage'
+# ru_maxrss is in KiB on Linux and in bytes on macOS
+RSS_UNIT = 1 if sys.platform == 'darwin' else 1024
+
+
+def max_rss():
+    """Peak resident set size of this process in bytes (None where getrusage is missing)."""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * RSS_UNIT
+
+
+# ============================================================================
+# 1. STAGE STATISTICS
+# ============================================================================
+class StageStats:
+    """Totals for one stage name: calls, seconds, rows, bytes and peak memory."""
+
+    __slots__ = ('name', 'calls', 'seconds', 'rows', 'bytes', 'peak_memory', 'max_rss')
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.seconds = 0.0
+        self.rows = 0
+        self.bytes = 0
+        self.peak_memory = None  # bytes, only when memory tracking is on
+        self.max_rss = None  # process peak RSS in bytes when the stage last finished
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def bytes_per_second(self):
+        return self.bytes / self.seconds if self.seconds > 0 else 0.0
+
+    def to_dict(self):
+        return {'stage': self.name, 'calls': self.calls, 'seconds': round(self.seconds, 6), 'rows': self.rows,
+                'bytes': self.bytes, 'rows_per_second': round(self.rows_per_second, 1),
+                'bytes_per_second': round(self.bytes_per_second, 1), 'peak_memory_bytes': self.peak_memory,
+                'max_rss_bytes': self.max_rss}
+
+
+# ============================================================================
+# 2. STAGES AS CONTEXT MANAGERS AND DECORATORS
+# ============================================================================
+class _NullStage:
+    """What stage() returns while metrics are disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def add(self, rows=0, bytes=0):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ('stats', 'rows', 'bytes', '_metrics', '_start', '_base', '_peak')
+
+    def __init__(self, metrics, stats):
+        self.stats = stats
+        self.rows = 0
+        self.bytes = 0
+        self._metrics = metrics
+
+    def add(self, rows=0, bytes=0):
+        self.rows += rows
+        self.bytes += bytes
+
+    def __enter__(self):
+        stack = self._metrics._stack
+        if self._metrics.memory:
+            # reset_peak() is global: hand the peak seen so far to the enclosing
+            # stage before resetting it for this one.
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1]._peak = max(stack[-1]._peak, peak)
+            tracemalloc.reset_peak()
+            self._base, self._peak = current, current
+        stack.append(self)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        seconds = time.perf_counter() - self._start
+        stats = self.stats
+        stats.calls += 1
+        stats.seconds += seconds
+        stats.rows += self.rows
+        stats.bytes += self.bytes
+        stats.max_rss = max_rss()
+        stack = self._metrics._stack
+        stack.pop()
+        if self._metrics.memory:
+            peak = max(self._peak, tracemalloc.get_traced_memory()[1])
+            stats.peak_memory = max(stats.peak_memory or 0, peak - self._base)
+            if stack:
+                stack[-1]._peak = max(stack[-1]._peak, peak)
+        return False
+
+
+class Metrics:
+    """Stage statistics for this process. Use the module-level functions, which share one instance."""
+
+    def __init__(self):
+        self.enabled = False
+        self.memory = False
+        self.stages = {}
+        self._stack = []
+        self._started_tracemalloc = False
+
+    def enable(self, memory=False):
+        """Start recording; memory=True also tracks peak memory with tracemalloc."""
+        self.enabled = True
+        self.memory = memory
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start(1)
+            self._started_tracemalloc = True
+
+    def disable(self):
+        self.enabled = False
+        self.memory = False
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def reset(self):
+        self.stages = {}
+
+    def stage(self, name):
+        """Context manager measuring one run of stage `name`; add rows/bytes with .add()."""
+        if not self.enabled:
+            return _NULL_STAGE
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = self.stages[name] = StageStats(name)
+        return _Stage(self, stats)
+
+    def add(self, rows=0, bytes=0):
+        """Count rows/bytes on the innermost open stage (no-op when disabled or outside a stage)."""
+        if self._stack:
+            self._stack[-1].add(rows, bytes)
+
+    def timed(self, name=None):
+        """Decorator: every call of the function is a run of stage `name`.
+
+        The name defaults to module.function. Do not use it on generator
+        functions, it would only time the creation of the generator.
+        """
+        def decorate(func):
+            stage_name = name or f'{func.__module__.rsplit(".", 1)[-1]}.{func.__qualname__}'
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self.stage(stage_name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def records(self):
+        return [stats.to_dict() for stats in self.stages.values()]
+
+    # ========================================================================
+    # 3. JSON LINES AND PROMETHEUS TEXT OUTPUT
+    # ========================================================================
+    def write(self, path, program=None):
+        """Write the stage statistics: Prometheus text if `path` ends in .prom, else append JSON lines."""
+        program = program or os.path.basename(sys.argv[0]) or 'python'
+        if path.endswith('.prom'):
+            # Written to a temporary file and renamed, so a node_exporter
+            # textfile collector never reads half a file.
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(self.prometheus_text(program))
+            os.replace(tmp_path, path)
+            return
+        stamp = time.strftime('%Y-%m-%dT%H:%M:%S%z')
+        with open(path, 'a', encoding='utf-8') as f:
+            for record in self.records():
+                f.write(json.dumps({'time': stamp, 'program': program, 'pid': os.getpid(), **record}) + '\n')
+
+    def prometheus_text(self, program='python'):
+        """The statistics in the Prometheus text exposition format."""
+        families = [
+            ('seconds_total', 'counter', 'Wall time spent in the stage.', 'seconds'),
+            ('calls_total', 'counter', 'Times the stage ran.', 'calls'),
+            ('rows_total', 'counter', 'Rows processed by the stage.', 'rows'),
+            ('bytes_read_total', 'counter', 'Bytes read by the stage.', 'bytes'),
+            ('rows_per_second', 'gauge', 'Rows per second of stage wall time.', 'rows_per_second'),
+            ('peak_memory_bytes', 'gauge', 'Peak traced memory above the stage start (tracemalloc).',
+             'peak_memory'),
+            ('max_rss_bytes', 'gauge', 'Process peak resident set size when the stage last finished.', 'max_rss'),
+        ]
+        lines = []
+        for suffix, kind, help_text, attribute in families:
+            samples = [(stats.name, getattr(stats, attribute)) for stats in self.stages.values()
+                       if attribute != 'rows_per_second' or stats.rows]
+            samples = [(name, value) for name, value in samples if value is not None]
+            if not samples:
+                continue
+            metric = f'{PROMETHEUS_PREFIX}_{suffix}'
+            lines.append(f'# HELP {metric} {help_text}')
+            lines.append(f'# TYPE {metric} {kind}')
+            for name, value in samples:
+                lines.append(f'{metric}{{program="{_label(program)}",stage="{_label(name)}"}} {value}')
+        return '\n'.join(lines) + '\n' if lines else ''
+
+
+def _label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+METRICS = Metrics()
+
+enable = METRICS.enable
+disable = METRICS.disable
+stage = METRICS.stage
+add = METRICS.add
+timed = METRICS.timed
+
+
+# ============================================================================
+# 4. COMMAND LINE OPTIONS AND PROFILING SESSIONS
+# ============================================================================
+def add_arguments(parser):
+    """Add --metrics, --memory and --profile to an argparse parser."""
+    group = parser.add_argument_group('instrumentation')
+    group.add_argument('--metrics', metavar='FILE',
+                       help='record per-stage time, rows/s and bytes: JSON lines, or Prometheus text for *.prom')
+    group.add_argument('--memory', action='store_true',
+                       help='with --metrics: also record peak memory per stage (tracemalloc, slower)')
+    group.add_argument('--profile', metavar='FILE',
+                       help='write a cProfile dump (view with python -m pstats, snakeviz or flameprof)')
+    return group
+
+
+@contextmanager
+def session(args, metrics=METRICS):
+    """Enable what the add_arguments() options ask for; write the metrics and the profile on exit.
+
+    The output is written even if the body raises, so a failed run still
+    shows which stage it was in and how long the others took.
+    """
+    profiler = None
+    if args.metrics:
+        metrics.enable(memory=args.memory)
+    if args.profile:
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        yield metrics
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+            print(f'profile written to {args.profile}', file=sys.stderr)
+        if args.metrics:
+            metrics.write(args.metrics)
+            metrics.disable()
+            metrics.reset()
+            print(f'metrics written to {args.metrics}', file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Print a summary of a metrics JSON lines file.')
+    parser.add_argument('path', help='file written with --metrics')
+    parser.add_argument('--last', action='store_true', help='only the most recent run (last time stamp)')
+    args = parser.parse_args(argv)
+
+    with open(args.path, encoding='utf-8') as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    if args.last and records:
+        last = (records[-1]['time'], records[-1]['pid'])
+        records = [record for record in records if (record['time'], record['pid']) == last]
+    print(f'{"stage":<36} {"calls":>7} {"seconds":>10} {"rows/s":>14} {"MB/s":>9} {"peak MB":>9} {"RSS MB":>9}')
+    for record in sorted(records, key=lambda record: record['seconds'], reverse=True):
+        peak, rss = record['peak_memory_bytes'], record.get('max_rss_bytes')
+        print(f'{record["stage"]:<36} {record["calls"]:>7} {record["seconds"]:>10.3f} '
+              f'{record["rows_per_second"]:>14,.0f} {record["bytes_per_second"] / 1e6:>9.1f} '
+              f'{"-" if peak is None else f"{peak / 1e6:.1f}":>9} {"-" if rss is None else f"{rss / 1e6:.0f}":>9}')
+
+
+if __name__ == '__main__':
+    main()
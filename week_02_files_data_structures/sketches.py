@@ -0,0 +1,345 @@
+# Approximate aggregate sketches
+# Fixed-memory data structures that answer aggregate questions approximately:
+#
+#   Sketch          | Answers                         | Memory (defaults)
+#   HyperLogLog     | number of distinct values       | 16 KB (2**14 one-byte registers)
+#   TDigest         | quantiles (p50, p99, ...)       | ~ a few hundred centroids
+#   CountMinSketch  | frequency of any value          | 5 x 2048 counters = 80 KB
+#   HeavyHitters    | top-N most frequent values      | CountMinSketch + N candidates
+#
+# Every sketch is MERGEABLE: two sketches built on two halves of the data merge
+# into the sketch of the whole data. This is what makes them usable with the
+# chunked and parallel code paths of csv_log_analyzer.py.
+# Every sketch also converts to/from a plain dict (to_dict/from_dict) so it can
+# be stored as JSON, e.g. inside a checkpoint file.
+#
+# Values are hashed with blake2b instead of hash(), because hash() of a str is
+# randomised per process and sketches built in different worker processes
+# would not merge.
+
+# ============================================================================
+# INDEX - Topics Covered in This File
+# ============================================================================
+# 1. Stable 64-bit hashing
+# 2. HyperLogLog (distinct counts)
+# 3. t-digest (quantiles)
+# 4. Count-Min sketch (frequencies)
+# 5. Heavy hitters (top-N on top of Count-Min)
+# ============================================================================
+
+import base64
+import math
+from array import array
+from bisect import bisect_left
+from hashlib import blake2b
+
+
+# ============================================================================
+# 1. STABLE 64-BIT HASHING
+# ============================================================================
+def hash64(value):
+    """Stable 64-bit hash of a str/bytes value (same result in every process)."""
+    if isinstance(value, str):
+        value = value.encode('utf-8')
+    return int.from_bytes(blake2b(value, digest_size=8).digest(), 'little')
+
+
+def _encode(buffer):
+    return base64.b64encode(bytes(buffer)).decode('ascii')
+
+
+def _decode_array(typecode, text):
+    values = array(typecode)
+    values.frombytes(base64.b64decode(text))
+    return values
+
+
+# ============================================================================
+# 2. HYPERLOGLOG
+# ============================================================================
+class HyperLogLog:
+    """Distinct count estimator; standard error is about 1.04 / sqrt(2**precision).
+
+    precision=14 -> 16384 registers, ~0.8% typical error, 16 KB of memory.
+    """
+
+    def __init__(self, precision=14):
+        if not 4 <= precision <= 18:
+            raise ValueError('precision must be between 4 and 18')
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value):
+        self._add_hash(hash64(value))
+
+    def _add_hash(self, hashed):
+        p = self.precision
+        index = hashed >> (64 - p)
+        rest = hashed & ((1 << (64 - p)) - 1)
+        rank = (64 - p) - rest.bit_length() + 1  # position of the first 1 bit
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, values):
+        # Same logic as add(), inlined: this loop is the hot path of distinct counting.
+        registers = self.registers
+        shift = 64 - self.precision
+        mask = (1 << shift) - 1
+        for value in set(values):  # duplicates cannot change a register
+            if isinstance(value, str):
+                value = value.encode('utf-8')
+            hashed = int.from_bytes(blake2b(value, digest_size=8).digest(), 'little')
+            index = hashed >> shift
+            rank = shift - (hashed & mask).bit_length() + 1
+            if rank > registers[index]:
+                registers[index] = rank
+
+    def count(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / math.fsum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            return m * math.log(m / zeros)  # linear counting for small cardinalities
+        return estimate
+
+    def merge(self, other):
+        if other.precision != self.precision:
+            raise ValueError('cannot merge HyperLogLog sketches with different precision')
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    def to_dict(self):
+        return {'precision': self.precision, 'registers': _encode(self.registers)}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data['precision'])
+        sketch.registers = bytearray(base64.b64decode(data['registers']))
+        return sketch
+
+
+# ============================================================================
+# 3. T-DIGEST
+# ============================================================================
+# Values are summarised by centroids (mean, weight). Centroids near the tails
+# (q close to 0 or 1) are kept small and centroids near the median may grow, so
+# extreme quantiles such as p99 stay accurate. Incoming values are buffered and
+# merged into the centroids in sorted batches ("merging t-digest").
+class TDigest:
+    """Quantile estimator with bounded size (about `compression` centroids)."""
+
+    def __init__(self, compression=200, buffer_size=None):
+        self.compression = compression
+        self.buffer_size = buffer_size or compression * 10
+        self.means = array('d')
+        self.weights = array('d')
+        self.buffer = array('d')
+        self.count = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value):
+        self.buffer.append(value)
+        if len(self.buffer) >= self.buffer_size:
+            self._compress()
+
+    def extend(self, values):
+        self.buffer.extend(values)
+        if len(self.buffer) >= self.buffer_size:
+            self._compress()
+
+    def _k_to_q_limit(self, q):
+        # Scale function k1: k(q) = delta / (2 pi) * asin(2q - 1). A centroid
+        # may span at most one unit of k, this returns the q where it must stop.
+        delta = self.compression
+        k = delta / (2 * math.pi) * math.asin(2 * q - 1) + 1
+        if k >= delta / 4:
+            return 1.0
+        return (math.sin(k * 2 * math.pi / delta) + 1) / 2
+
+    def _compress(self, extra_means=(), extra_weights=()):
+        if not self.buffer and not extra_means:
+            return
+        if self.buffer:
+            self.min = min(self.min, min(self.buffer))
+            self.max = max(self.max, max(self.buffer))
+        points = sorted(list(zip(self.means, self.weights)) + [(value, 1.0) for value in self.buffer] +
+                        list(zip(extra_means, extra_weights)))
+        self.buffer = array('d')
+        total = math.fsum(weight for _, weight in points)
+        means = array('d')
+        weights = array('d')
+        cumulative = 0.0
+        mean, weight = points[0]
+        limit = self._k_to_q_limit(0.0)
+        for next_mean, next_weight in points[1:]:
+            if (cumulative + weight + next_weight) / total <= limit:
+                weight += next_weight
+                mean += (next_mean - mean) * next_weight / weight
+            else:
+                means.append(mean)
+                weights.append(weight)
+                cumulative += weight
+                limit = self._k_to_q_limit(cumulative / total)
+                mean, weight = next_mean, next_weight
+        means.append(mean)
+        weights.append(weight)
+        self.means, self.weights, self.count = means, weights, total
+
+    def quantile(self, q):
+        """Estimated value at quantile q (0 <= q <= 1); NaN if empty."""
+        self._compress()
+        if not self.means:
+            return math.nan
+        if len(self.means) == 1:
+            return self.means[0]
+        target = q * self.count
+        # Centroid i covers [cumulative, cumulative + weight], its mean sits in the middle.
+        centers = []
+        cumulative = 0.0
+        for weight in self.weights:
+            centers.append(cumulative + weight / 2)
+            cumulative += weight
+        if target <= centers[0]:
+            if centers[0] <= 0.5:
+                return self.means[0]
+            return self.min + (self.means[0] - self.min) * target / centers[0]
+        if target >= centers[-1]:
+            if self.count - centers[-1] <= 0.5:
+                return self.means[-1]
+            return self.means[-1] + (self.max - self.means[-1]) * (target - centers[-1]) / (self.count - centers[-1])
+        i = bisect_left(centers, target)
+        left, right = centers[i - 1], centers[i]
+        return self.means[i - 1] + (self.means[i] - self.means[i - 1]) * (target - left) / (right - left)
+
+    def merge(self, other):
+        other._compress()
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress(other.means, other.weights)
+        return self
+
+    def to_dict(self):
+        self._compress()
+        return {'compression': self.compression, 'min': self.min, 'max': self.max,
+                'means': _encode(self.means), 'weights': _encode(self.weights)}
+
+    @classmethod
+    def from_dict(cls, data):
+        digest = cls(data['compression'])
+        digest.min, digest.max = data['min'], data['max']
+        digest.means = _decode_array('d', data['means'])
+        digest.weights = _decode_array('d', data['weights'])
+        digest.count = math.fsum(digest.weights)
+        return digest
+
+
+# ============================================================================
+# 4. COUNT-MIN SKETCH
+# ============================================================================
+class CountMinSketch:
+    """Frequency estimator; never under-counts.
+
+    With probability 1 - exp(-depth) the over-count is at most e / width * total.
+    """
+
+    def __init__(self, width=2048, depth=5):
+        self.width = width
+        self.depth = depth
+        self.counts = array('q', bytes(8 * width * depth))
+        self.total = 0
+
+    def _cells(self, hashed):
+        # Double hashing: row i uses h1 + i * h2.
+        h1, h2 = hashed & 0xFFFFFFFF, hashed >> 32 | 1
+        width = self.width
+        return [row * width + (h1 + row * h2) % width for row in range(self.depth)]
+
+    def add(self, value, count=1):
+        return self.add_hash(hash64(value), count)
+
+    def add_hash(self, hashed, count=1):
+        """Add `count` to a pre-hashed value and return its new estimate."""
+        counts = self.counts
+        estimate = None
+        for cell in self._cells(hashed):
+            counts[cell] += count
+            if estimate is None or counts[cell] < estimate:
+                estimate = counts[cell]
+        self.total += count
+        return estimate
+
+    def estimate(self, value):
+        counts = self.counts
+        return min(counts[cell] for cell in self._cells(hash64(value)))
+
+    def merge(self, other):
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError('cannot merge Count-Min sketches with different dimensions')
+        self.counts = array('q', map(sum, zip(self.counts, other.counts)))
+        self.total += other.total
+        return self
+
+    def to_dict(self):
+        return {'width': self.width, 'depth': self.depth, 'total': self.total, 'counts': _encode(self.counts)}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data['width'], data['depth'])
+        sketch.counts = _decode_array('q', data['counts'])
+        sketch.total = data['total']
+        return sketch
+
+
+# ============================================================================
+# 5. HEAVY HITTERS
+# ============================================================================
+class HeavyHitters:
+    """Approximate top-N: a Count-Min sketch plus the `capacity` best candidates.
+
+    Keep capacity a few times larger than the N you report, so values that are
+    close to the cut-off do not fall out of the candidate set.
+    """
+
+    def __init__(self, capacity=100, width=2048, depth=5):
+        self.capacity = capacity
+        self.sketch = CountMinSketch(width, depth)
+        self.candidates = {}  # value -> estimated count
+
+    def update(self, values):
+        # Count the batch exactly first, so the sketch sees each distinct value once.
+        batch = {}
+        for value in values:
+            batch[value] = batch.get(value, 0) + 1
+        add_hash = self.sketch.add_hash
+        candidates = self.candidates
+        for value, count in batch.items():
+            candidates[value] = add_hash(hash64(value), count)
+        self._trim()
+
+    def _trim(self):
+        if len(self.candidates) > self.capacity:
+            best = sorted(self.candidates.items(), key=lambda item: item[1], reverse=True)[:self.capacity]
+            self.candidates = dict(best)
+
+    def most_common(self, n=None):
+        items = sorted(self.candidates.items(), key=lambda item: (-item[1], item[0]))
+        return items if n is None else items[:n]
+
+    def merge(self, other):
+        self.sketch.merge(other.sketch)
+        estimate = self.sketch.estimate
+        self.candidates = {value: estimate(value) for value in set(self.candidates) | set(other.candidates)}
+        self._trim()
+        return self
+
+    def to_dict(self):
+        return {'capacity': self.capacity, 'sketch': self.sketch.to_dict(), 'candidates': self.candidates}
+
+    @classmethod
+    def from_dict(cls, data):
+        hitters = cls(data['capacity'])
+        hitters.sketch = CountMinSketch.from_dict(data['sketch'])
+        hitters.candidates = dict(data['candidates'])
+        return hitters
@@ -0,0 +1 @@
+"""Week 3: NumPy: temperature series analysis."""
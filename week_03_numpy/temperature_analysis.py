@@ -0,0 +1,409 @@
+# Temperature Analysis with NumPy
+# Rolling statistics, seasonal baselines and z-score anomalies for a long time
+# series (e.g. data/temperatures.csv, or decades of per-minute sensor readings).
+#
+# Every statistic is computed in O(n) with whole-array operations, never with
+# a Python loop over the rows or over the window:
+#   rolling mean / std -> cumulative sums: each window sum is the difference
+#                         of two prefix sums, whatever the window size
+#   rolling min / max  -> van Herk / Gil-Werman: prefix and suffix minimums
+#                         inside blocks of `window` values, two lookups per row
+#   rolling median     -> sliding_window_view, processed in slices
+#   seasonal baseline  -> np.bincount per season key (hour, day of year, ...)
+#
+# Missing values are NaN and are skipped; a window needs at least
+# `min_periods` real values (default: the whole window) to give a result.
+#
+# Streaming: RollingWindow and SeasonalBaseline keep a small state between
+# chunks (the last `window` values, per-season counts/means), so a file that
+# does not fit in memory is processed chunk by chunk with the same results as
+# one call over the whole series.
+#
+# Usage:
+#   python -m week_03_numpy.temperature_analysis data/temperatures.csv --window 30
+#   python -m week_03_numpy.temperature_analysis sensor.csv --time-column time --value-column temp \
+#       --window 1440 --period month_hour --threshold 4
+
+# ============================================================================
+# INDEX - Topics Covered in This File
+# ============================================================================
+# 1. Rolling window statistics (cumsum, van Herk / Gil-Werman, sliding_window_view)
+# 2. Streaming rolling window with carried-over state
+# 3. Seasonal baselines (bincount)
+# 4. Z-score anomalies
+# 5. Reading the series from CSV and command line interface
+# ============================================================================
+
+import argparse
+import heapq
+import warnings
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from week_02_files_data_structures.csv_reader import DEFAULT_CHUNK_SIZE, FLOAT, STR, read_chunks
+
+DEFAULT_TIME_COLUMN = 'date'
+DEFAULT_VALUE_COLUMN = 'temperature'
+DEFAULT_THRESHOLD = 3.0
+MEDIAN_BLOCK_VALUES = 1 << 22  # window values copied at once by rolling_median()
+
+# Season key -> number of distinct keys
+PERIODS = {'hour': 24, 'dayofweek': 7, 'dayofyear': 366, 'month': 12, 'month_hour': 12 * 24}
+
+
+# ============================================================================
+# 1. ROLLING WINDOW STATISTICS
+# ============================================================================
+# All rolling functions use trailing windows: the value at position i
+# describes values[i - window + 1 : i + 1], like pandas' rolling().
+def _as_float(values):
+    return np.asarray(values, dtype=np.float64)
+
+
+def _check_window(window, min_periods):
+    if window < 1:
+        raise ValueError('window must be at least 1')
+    if min_periods is None:
+        return window
+    if not 1 <= min_periods <= window:
+        raise ValueError('min_periods must be between 1 and window')
+    return min_periods
+
+
+def _window_sums(x, window):
+    """Sum of every trailing window: prefix[i + 1] - prefix[i + 1 - window]."""
+    prefix = np.cumsum(x)
+    sums = prefix.copy()
+    if window < len(x):
+        sums[window:] -= prefix[:-window]
+    return sums
+
+
+def _window_extreme(x, window, reduce):
+    """Trailing window min (reduce=np.fmin) or max (np.fmax), O(n) for any window.
+
+    van Herk / Gil-Werman: split the series into blocks of `window` values.
+    A window covers the end of one block and the start of the next, so its
+    minimum is min(suffix-min of the first block, prefix-min of the next).
+    fmin/fmax ignore NaN unless every value is NaN.
+    """
+    n = len(x)
+    out = np.empty(n)
+    head = min(window - 1, n)
+    out[:head] = reduce.accumulate(x[:head])  # windows still growing at the start
+    if n >= window:
+        blocks = -(-n // window)
+        padded = np.full(blocks * window, np.nan)
+        padded[:n] = x
+        padded = padded.reshape(blocks, window)
+        prefix = reduce.accumulate(padded, axis=1).ravel()
+        suffix = reduce.accumulate(padded[:, ::-1], axis=1)[:, ::-1].ravel()
+        out[window - 1:] = reduce(suffix[:n - window + 1], prefix[window - 1:n])
+    return out
+
+
+def rolling_stats(values, window, min_periods=None):
+    """Rolling count, mean, std, min, max and z-score of a 1-d series.
+
+    Returns a dict of arrays with the same length as `values`. 'zscore' is
+    each value measured against the window that ends just before it, so a
+    spike does not inflate its own baseline.
+    """
+    min_periods = _check_window(window, min_periods)
+    x = _as_float(values)
+    valid = ~np.isnan(x)
+    # Summing values minus a typical value keeps the prefix sums small, which
+    # avoids losing precision when the variance is computed from them.
+    shift = x[valid][0] if valid.any() else 0.0
+    centered = np.where(valid, x - shift, 0.0)
+    count = _window_sums(valid.astype(np.float64), window)
+    sum1 = _window_sums(centered, window)
+    sum2 = _window_sums(centered * centered, window)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = sum1 / count
+        variance = np.maximum((sum2 - sum1 * mean) / (count - 1), 0.0)
+    enough = count >= min_periods
+    mean = np.where(enough, mean + shift, np.nan)
+    std = np.where(enough & (count > 1), np.sqrt(variance), np.nan)
+    low = np.where(enough, _window_extreme(x, window, np.fmin), np.nan)
+    high = np.where(enough, _window_extreme(x, window, np.fmax), np.nan)
+
+    zscore = np.full(len(x), np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        zscore[1:] = np.where(std[:-1] > 0, (x[1:] - mean[:-1]) / std[:-1], np.nan)
+    return {'count': count.astype(np.int64), 'mean': mean, 'std': std, 'min': low, 'max': high,
+            'zscore': zscore}
+
+
+def rolling_mean(values, window, min_periods=None):
+    return rolling_stats(values, window, min_periods)['mean']
+
+
+def rolling_std(values, window, min_periods=None):
+    return rolling_stats(values, window, min_periods)['std']
+
+
+def rolling_min(values, window, min_periods=None):
+    min_periods = _check_window(window, min_periods)
+    x = _as_float(values)
+    count = _window_sums((~np.isnan(x)).astype(np.float64), window)
+    return np.where(count >= min_periods, _window_extreme(x, window, np.fmin), np.nan)
+
+
+def rolling_max(values, window, min_periods=None):
+    min_periods = _check_window(window, min_periods)
+    x = _as_float(values)
+    count = _window_sums((~np.isnan(x)).astype(np.float64), window)
+    return np.where(count >= min_periods, _window_extreme(x, window, np.fmax), np.nan)
+
+
+def rolling_median(values, window):
+    """Rolling median of complete windows (NaN for the first window - 1 values).
+
+    sliding_window_view gives a (n - window + 1, window) view without copying;
+    np.nanmedian needs a copy to partition, so the view is processed in slices
+    of about MEDIAN_BLOCK_VALUES values to keep memory bounded. Unlike the
+    other rolling functions this is O(n * window) work, done in C.
+    """
+    _check_window(window, None)
+    x = _as_float(values)
+    out = np.full(len(x), np.nan)
+    if len(x) < window:
+        return out
+    windows = sliding_window_view(x, window)
+    step = max(1, MEDIAN_BLOCK_VALUES // window)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # all-NaN windows give NaN
+        for start in range(0, len(windows), step):
+            block = windows[start:start + step]
+            if np.isnan(block).any():
+                out[window - 1 + start:window - 1 + start + len(block)] = np.nanmedian(block, axis=1)
+            else:
+                out[window - 1 + start:window - 1 + start + len(block)] = np.median(block, axis=1)
+    return out
+
+
+# ============================================================================
+# 2. STREAMING ROLLING WINDOW
+# ============================================================================
+class RollingWindow:
+    """rolling_stats() over a stream of chunks.
+
+    The last `window` values are carried over to the next chunk (one more than
+    a window, for the z-score of the next value), so update() returns exactly
+    what rolling_stats() would return for those positions of the full series.
+    """
+
+    def __init__(self, window, min_periods=None):
+        self.min_periods = _check_window(window, min_periods)
+        self.window = window
+        self.seen = 0
+        self._tail = np.empty(0)
+
+    def update(self, values):
+        """Return rolling_stats() for the positions of this chunk."""
+        x = _as_float(values)
+        extended = np.concatenate((self._tail, x))
+        stats = rolling_stats(extended, self.window, self.min_periods)
+        skip = len(self._tail)
+        self._tail = extended[-self.window:].copy()
+        self.seen += len(x)
+        return {name: column[skip:] for name, column in stats.items()}
+
+
+# ============================================================================
+# 3. SEASONAL BASELINES
+# ============================================================================
+def to_datetime64(times):
+    """Convert ISO date strings (or datetime64 values) to datetime64[s]; bad values become NaT."""
+    try:
+        return np.asarray(times, dtype='datetime64[s]')
+    except ValueError:
+        return np.array([_parse_time(value) for value in times], dtype='datetime64[s]')
+
+
+def _parse_time(value):
+    try:
+        return np.datetime64(value, 's')
+    except ValueError:
+        return np.datetime64('NaT')
+
+
+def season_keys(times, period):
+    """Integer season of each timestamp: 0-23 for 'hour', 0 = Monday for 'dayofweek', ..."""
+    if period not in PERIODS:
+        raise ValueError(f'unknown period {period!r}, expected one of: {", ".join(PERIODS)}')
+    times = to_datetime64(times)
+    days = times.astype('datetime64[D]')
+    if period == 'dayofweek':
+        return (days.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday
+    if period == 'dayofyear':
+        return (days - days.astype('datetime64[Y]')).astype(np.int64)
+    month = times.astype('datetime64[M]').astype(np.int64) % 12
+    if period == 'month':
+        return month
+    hour = (times.astype('datetime64[h]') - days).astype(np.int64)
+    return hour if period == 'hour' else month * 24 + hour
+
+
+class SeasonalBaseline:
+    """Mean and standard deviation of the values for each season key.
+
+    Per-chunk counts, means and squared deviations are computed with
+    np.bincount and combined with the parallel variance formula (Chan et
+    al.), so update() can be called once per chunk and baselines built on
+    different parts of the data can be merged.
+    """
+
+    def __init__(self, period='dayofyear'):
+        if period not in PERIODS:
+            raise ValueError(f'unknown period {period!r}, expected one of: {", ".join(PERIODS)}')
+        self.period = period
+        size = PERIODS[period]
+        self.count = np.zeros(size)
+        self.mean = np.zeros(size)
+        self._m2 = np.zeros(size)  # sum of squared deviations from the mean
+
+    def _keys(self, times, values):
+        times = to_datetime64(times)
+        x = _as_float(values)
+        valid = ~np.isnan(x) & ~np.isnat(times)
+        return season_keys(times[valid], self.period), x[valid]
+
+    def update(self, times, values):
+        keys, x = self._keys(times, values)
+        size = len(self.count)
+        count = np.bincount(keys, minlength=size).astype(np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = np.nan_to_num(np.bincount(keys, weights=x, minlength=size) / count)
+        m2 = np.bincount(keys, weights=(x - mean[keys]) ** 2, minlength=size)
+        self._combine(count, mean, m2)
+
+    def _combine(self, count, mean, m2):
+        total = self.count + count
+        delta = mean - self.mean
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = np.where(total > 0, count / total, 0.0)
+        self.mean = self.mean + delta * ratio
+        self._m2 = self._m2 + m2 + delta * delta * self.count * ratio
+        self.count = total
+
+    def merge(self, other):
+        if other.period != self.period:
+            raise ValueError(f'cannot merge a {other.period!r} baseline into a {self.period!r} baseline')
+        self._combine(other.count, other.mean, other._m2)
+
+    def std(self, ddof=1):
+        """Standard deviation per season key (NaN where there are not enough values)."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(self.count > ddof, np.sqrt(self._m2 / (self.count - ddof)), np.nan)
+
+    def zscores(self, times, values):
+        """Z-score of each value against the baseline of its season."""
+        times = to_datetime64(times)
+        x = _as_float(values)
+        z = np.full(len(x), np.nan)
+        ok = ~np.isnat(times)
+        keys = season_keys(times[ok], self.period)
+        std = self.std()[keys]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z[ok] = np.where(std > 0, (x[ok] - self.mean[keys]) / std, np.nan)
+        return z
+
+
+# ============================================================================
+# 4. Z-SCORE ANOMALIES
+# ============================================================================
+def anomalies(zscores, threshold=DEFAULT_THRESHOLD):
+    """Positions where |z| > threshold (NaN z-scores are never anomalies)."""
+    with np.errstate(invalid='ignore'):
+        return np.flatnonzero(np.abs(zscores) > threshold)
+
+
+def detect_anomalies(values, window, threshold=DEFAULT_THRESHOLD, min_periods=None, times=None, period=None):
+    """Return (positions, zscores) of anomalous values.
+
+    Without `period`, each value is compared with the rolling window before
+    it. With `period` (and `times`), it is compared with the seasonal
+    baseline of the whole series instead.
+    """
+    if period is None:
+        z = rolling_stats(values, window, min_periods)['zscore']
+    else:
+        if times is None:
+            raise ValueError('times are required for a seasonal baseline')
+        baseline = SeasonalBaseline(period)
+        baseline.update(times, values)
+        z = baseline.zscores(times, values)
+    return anomalies(z, threshold), z
+
+
+# ============================================================================
+# 5. READING THE SERIES FROM CSV AND COMMAND LINE INTERFACE
+# ============================================================================
+def iter_series(path, time_column=DEFAULT_TIME_COLUMN, value_column=DEFAULT_VALUE_COLUMN,
+                chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield (times, values) NumPy array pairs, `chunk_size` rows at a time."""
+    schema = [(time_column, STR), (value_column, FLOAT)]
+    for chunk in read_chunks(path, chunk_size=chunk_size, columns=[time_column, value_column], schema=schema):
+        yield to_datetime64(chunk[time_column]), np.frombuffer(chunk[value_column], dtype=np.float64)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Rolling statistics and z-score anomalies of a time series.')
+    parser.add_argument('path', help='CSV file with a time column and a value column')
+    parser.add_argument('--time-column', default=DEFAULT_TIME_COLUMN)
+    parser.add_argument('--value-column', default=DEFAULT_VALUE_COLUMN)
+    parser.add_argument('--window', type=int, default=30, help='rolling window in rows (default: 30)')
+    parser.add_argument('--min-periods', type=int, help='values needed in a window (default: window)')
+    parser.add_argument('--period', choices=list(PERIODS),
+                        help='compare with a seasonal baseline instead of the rolling window')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='|z| above this is an anomaly')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='rows per chunk')
+    parser.add_argument('--top', type=int, default=10, help='largest anomalies to print')
+    args = parser.parse_args(argv)
+
+    def series():
+        return iter_series(args.path, args.time_column, args.value_column, args.chunk_size)
+
+    baseline = None
+    if args.period:
+        baseline = SeasonalBaseline(args.period)  # first pass: build the baseline
+        for times, values in series():
+            baseline.update(times, values)
+
+    rolling = RollingWindow(args.window, args.min_periods)
+    rows = present = found = 0
+    total = 0.0
+    low, high = np.inf, -np.inf
+    largest = []  # heap of (|z|, time, value, z)
+    for times, values in series():
+        stats = rolling.update(values)
+        z = stats['zscore'] if baseline is None else baseline.zscores(times, values)
+        rows += len(values)
+        total += np.nansum(values)
+        present += np.count_nonzero(~np.isnan(values))
+        if np.isfinite(values).any():
+            low, high = min(low, np.nanmin(values)), max(high, np.nanmax(values))
+        positions = anomalies(z, args.threshold)
+        found += len(positions)
+        for i in positions[np.argsort(-np.abs(z[positions]))[:args.top]]:
+            item = (abs(z[i]), str(times[i]), values[i], z[i])
+            if len(largest) < args.top:
+                heapq.heappush(largest, item)
+            else:
+                heapq.heappushpop(largest, item)
+
+    print(f'{args.path}: {rows} rows')
+    if present:
+        print(f'  min {low:.2f}  max {high:.2f}  mean {total / present:.2f}')
+    against = f'{args.period} baseline' if baseline is not None else f'rolling window of {args.window}'
+    print(f'  {found} anomalies with |z| > {args.threshold} against the {against}')
+    for _, time, value, z in sorted(largest, reverse=True):
+        print(f'  {time}  {value:10.2f}  z={z:+.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+"""Week 4: pandas: Titanic feature pipeline."""
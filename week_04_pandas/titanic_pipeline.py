@@ -0,0 +1,365 @@
+# Titanic feature pipeline
+# The cleaning and encoding steps from titanic_analysis.ipynb as a reusable
+# pipeline of stages:
+#
+#   load      -> data/titanic.csv through the columnar cache (column_cache.py)
+#   clean     -> Title from Name, FamilySize, IsAlone, HasCabin; drop free text
+#   fill      -> missing values from precomputed statistics (fit_statistics)
+#   encode    -> categorical columns to compact integer codes (int8/int16)
+#   downcast  -> smallest integer and float32 dtypes that hold the values
+#
+# Every stage's output is memoized on disk. A stage's key is a hash of its
+# input's key, its name, its parameters and its code, starting from the source
+# file's content hash. The code part is code_fingerprint() (week 2), which also
+# covers default arguments, the constants it reads (TITLE_MAP, COMMON_TITLES)
+# and the helpers it calls, so:
+#   - nothing changed          -> only the last stage's output is loaded
+#   - a stage's parameters or code changed -> that stage and the ones after it run
+#   - the CSV changed          -> everything runs again
+#
+# Memory: each stage receives a DataFrame that only the pipeline holds (fresh
+# from disk or from the previous stage) and is allowed to modify it in place,
+# so there is one working copy at a time instead of one per step.
+#
+# Usage:
+#   python -m week_04_pandas.titanic_pipeline data/titanic.csv
+#   python -m week_04_pandas.titanic_pipeline test.csv --statistics train_statistics.json
+#   python -m week_04_pandas.titanic_pipeline data/titanic.csv --no-cache --metrics metrics.jsonl --memory
+
+# ============================================================================
+# INDEX - Topics Covered in This File
+# ============================================================================
+# 1. Stages and stage keys
+# 2. On-disk stage cache
+# 3. Running a list of stages
+# 4. Titanic stages: clean, statistics, fill, encode, downcast
+# 5. Building the feature table and command line interface
+# ============================================================================
+
+import argparse
+import hashlib
+import json
+import os
+import time
+
+from week_02_files_data_structures import instrumentation
+from week_02_files_data_structures.code_fingerprint import code_fingerprint
+from week_02_files_data_structures.column_cache import DATA_DIR, ensure_cache, load_dataframe
+
+DEFAULT_CACHE_DIR = os.path.join(DATA_DIR, '.cache', 'pipeline')
+CATEGORICAL_COLUMNS = ('Sex', 'Embarked', 'Title')
+DROP_COLUMNS = ('Name', 'Ticket', 'Cabin')
+TITLE_MAP = {'Mlle': 'Miss', 'Ms': 'Miss', 'Mme': 'Mrs'}
+COMMON_TITLES = ('Mr', 'Mrs', 'Miss', 'Master')
+
+
+# ============================================================================
+# 1. STAGES AND STAGE KEYS
+# ============================================================================
+class Stage:
+    """One step of a pipeline: `func(df, **params)` returns the next DataFrame."""
+
+    __slots__ = ('name', 'func', 'params')
+
+    def __init__(self, name, func, **params):
+        self.name = name
+        self.func = func
+        self.params = params
+
+    def key(self, input_key):
+        """Hash of the input key, the stage name, its parameters and its code."""
+        text = json.dumps([input_key, self.name, self.params, code_fingerprint(self.func)],
+                          sort_keys=True, default=str)
+        return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+    def __call__(self, df):
+        return self.func(df, **self.params)
+
+    def __repr__(self):
+        return f'Stage({self.name!r})'
+
+
+# ============================================================================
+# 2. ON-DISK STAGE CACHE
+# ============================================================================
+def _parquet_available():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class StageCache:
+    """DataFrames and JSON values stored under their stage key.
+
+    DataFrames are written as Parquet when pyarrow is installed (keeps
+    categorical and downcast dtypes, fast to read) and pickled otherwise.
+    Files are written to a temporary name and renamed, so an interrupted run
+    never leaves a half-written entry behind.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, enabled=True):
+        self.directory = directory
+        self.enabled = enabled
+        self.extension = '.parquet' if _parquet_available() else '.pkl'
+
+    def _path(self, key, extension):
+        return os.path.join(self.directory, key[:2], key + extension)
+
+    def _write(self, path, write):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.tmp{os.getpid()}'
+        write(tmp_path)
+        os.replace(tmp_path, path)
+
+    def has(self, key):
+        return self.enabled and os.path.exists(self._path(key, self.extension))
+
+    def load(self, key):
+        import pandas as pd
+
+        path = self._path(key, self.extension)
+        return pd.read_parquet(path) if self.extension == '.parquet' else pd.read_pickle(path)
+
+    def save(self, key, df):
+        if not self.enabled:
+            return
+        if self.extension == '.parquet':
+            self._write(self._path(key, self.extension), lambda path: df.to_parquet(path, index=False))
+        else:
+            self._write(self._path(key, self.extension), df.to_pickle)
+
+    def load_json(self, key):
+        if not self.enabled:
+            return None
+        try:
+            with open(self._path(key, '.json'), encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save_json(self, key, value):
+        if not self.enabled:
+            return
+
+        def write(path):
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(value, f)
+        self._write(self._path(key, '.json'), write)
+
+
+# ============================================================================
+# 3. RUNNING A LIST OF STAGES
+# ============================================================================
+def run_stages(stages, input_key, load_input, cache, log=None):
+    """Run `stages` on the input and return (DataFrame, key of the result).
+
+    input_key  : fingerprint of the input (e.g. the source file hash)
+    load_input : called without arguments to get the input DataFrame, only
+                 if no stage output is cached
+    log        : optional list; (stage name, 'cached' or 'computed', seconds)
+                 is appended for every stage that was loaded or run
+    """
+    keys = []
+    key = input_key
+    for stage in stages:
+        key = stage.key(key)
+        keys.append(key)
+
+    # Start from the last stage whose output is already on disk.
+    start = 0
+    df = None
+    for position in range(len(stages) - 1, -1, -1):
+        if cache.has(keys[position]):
+            began = time.perf_counter()
+            with instrumentation.stage('titanic_pipeline.cache_load') as metrics_stage:
+                df = cache.load(keys[position])
+                metrics_stage.add(rows=len(df))
+            if log is not None:
+                log.append((stages[position].name, 'cached', time.perf_counter() - began))
+            start = position + 1
+            break
+    if df is None:
+        # Named after the stage it feeds: build_features() nests one run_stages() in another.
+        input_name = f'{stages[0].name}_input' if stages else 'input'
+        with instrumentation.stage(f'titanic_pipeline.{input_name}') as metrics_stage:
+            df = load_input()
+            metrics_stage.add(rows=len(df))
+
+    for stage, key in zip(stages[start:], keys[start:]):
+        began = time.perf_counter()
+        with instrumentation.stage(f'titanic_pipeline.{stage.name}') as metrics_stage:
+            df = stage(df)
+            metrics_stage.add(rows=len(df))
+        with instrumentation.stage('titanic_pipeline.cache_save'):
+            cache.save(key, df)
+        if log is not None:
+            log.append((stage.name, 'computed', time.perf_counter() - began))
+    return df, keys[-1] if keys else input_key
+
+
+# ============================================================================
+# 4. TITANIC STAGES
+# ============================================================================
+def load_titanic(path):
+    """Read the CSV through the columnar cache: memory-mapped numbers, categorical strings."""
+    return load_dataframe(path)
+
+
+def clean(df, drop=DROP_COLUMNS):
+    """Add Title, FamilySize, IsAlone and HasCabin; drop free-text columns."""
+    if 'Name' in df:
+        title = df['Name'].astype(str).str.extract(r',\s*([^.]+)\.', expand=False).str.strip()
+        title = title.replace(TITLE_MAP)
+        df['Title'] = title.where(title.isin(COMMON_TITLES), 'Rare').where(title.notna())
+    if 'SibSp' in df and 'Parch' in df:
+        df['FamilySize'] = df['SibSp'] + df['Parch'] + 1
+        df['IsAlone'] = (df['FamilySize'] == 1).astype('int8')
+    if 'Cabin' in df:
+        df['HasCabin'] = df['Cabin'].notna().astype('int8')
+    return df.drop(columns=[name for name in drop if name in df])
+
+
+def fit_statistics(df, categorical=CATEGORICAL_COLUMNS):
+    """Fill values and category lists computed once from the (training) data.
+
+    Age is filled with the median of the passenger's Title, which is much
+    closer than the overall median (a 'Master' is a boy).
+    """
+    import pandas as pd
+
+    numeric = df.select_dtypes('number')
+    statistics = {
+        'median': {name: float(value) for name, value in numeric.median().items() if pd.notna(value)},
+        'mode': {},
+        'categories': {},
+        'age_by_title': {},
+    }
+    for name in categorical:
+        if name in df:
+            values = df[name].dropna().astype(str)
+            if len(values):
+                statistics['mode'][name] = values.mode().iloc[0]
+            statistics['categories'][name] = sorted(values.unique())
+    if 'Age' in df and 'Title' in df:
+        by_title = df.groupby(df['Title'].astype(str), observed=True)['Age'].median().dropna()
+        statistics['age_by_title'] = {title: float(age) for title, age in by_title.items()}
+    return statistics
+
+
+def fill_missing(df, statistics):
+    """Fill missing values from `statistics` (see fit_statistics)."""
+    import pandas as pd
+
+    if 'Age' in df and 'Title' in df and statistics['age_by_title']:
+        by_title = df['Title'].astype(object).map(statistics['age_by_title'])
+        df['Age'] = df['Age'].fillna(by_title.astype('float64'))
+    fills = {name: value for name, value in statistics['median'].items() if name in df}
+    fills.update({name: value for name, value in statistics['mode'].items() if name in df})
+    for name, value in fills.items():
+        column = df[name]
+        if isinstance(column.dtype, pd.CategoricalDtype) and value not in column.cat.categories:
+            column = column.cat.add_categories([value])
+        df[name] = column.fillna(value)
+    return df
+
+
+def encode(df, categories):
+    """Replace categorical columns by integer codes in a fixed category order.
+
+    The categories come from fit_statistics(), so train and test data get the
+    same codes. A value that was not seen during fitting gets -1.
+    """
+    import pandas as pd
+
+    for name, values in categories.items():
+        if name not in df:
+            continue
+        codes = pd.Index(values).get_indexer(df[name].astype(object))  # -1 if not found
+        df[name] = codes.astype('int8' if len(values) < 127 else 'int16')
+    return df
+
+
+def downcast(df):
+    """Store every numeric column in the smallest dtype that holds its values."""
+    import pandas as pd
+
+    for name in df.select_dtypes('integer').columns:
+        df[name] = pd.to_numeric(df[name], downcast='integer')
+    for name in df.select_dtypes('floating').columns:
+        df[name] = pd.to_numeric(df[name], downcast='float')
+    return df
+
+
+# ============================================================================
+# 5. BUILDING THE FEATURE TABLE AND COMMAND LINE INTERFACE
+# ============================================================================
+def build_features(path, statistics=None, cache_dir=DEFAULT_CACHE_DIR, use_cache=True, log=None):
+    """Return (features DataFrame, statistics) for a Titanic-style CSV file.
+
+    statistics : fill values and categories from fit_statistics(). Leave it
+                 out for training data (they are computed from this file and
+                 cached); pass the training statistics for test data.
+    """
+    cache = StageCache(cache_dir, enabled=use_cache)
+    source_key = ensure_cache(path)['hash']
+    clean_stage = Stage('clean', clean)
+    clean_key = clean_stage.key(source_key)
+    clean_df = None
+
+    def cleaned():
+        nonlocal clean_df
+        if clean_df is None:
+            clean_df = run_stages([clean_stage], source_key, lambda: load_titanic(path), cache, log)[0]
+        return clean_df
+
+    if statistics is None:
+        statistics_key = Stage('statistics', fit_statistics).key(clean_key)
+        statistics = cache.load_json(statistics_key)
+        if statistics is None:
+            statistics = fit_statistics(cleaned())
+            cache.save_json(statistics_key, statistics)
+
+    feature_stages = [
+        Stage('fill', fill_missing, statistics=statistics),
+        Stage('encode', encode, categories=statistics['categories']),
+        Stage('downcast', downcast),
+    ]
+    features, _ = run_stages(feature_stages, clean_key, cleaned, cache, log)
+    return features, statistics
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build the Titanic feature table with cached stages.')
+    parser.add_argument('path', nargs='?', default=os.path.join(DATA_DIR, 'titanic.csv'), help='Titanic CSV file')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help='stage cache directory')
+    parser.add_argument('--no-cache', action='store_true', help='run every stage without reading or writing the cache')
+    parser.add_argument('--statistics', help='JSON file with training statistics (for test data)')
+    parser.add_argument('--save-statistics', help='write the statistics used to this JSON file')
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    statistics = None
+    if args.statistics:
+        with open(args.statistics, encoding='utf-8') as f:
+            statistics = json.load(f)
+    log = []
+    start = time.perf_counter()
+    with instrumentation.session(args):
+        features, statistics = build_features(args.path, statistics, args.cache_dir, not args.no_cache, log)
+    seconds = time.perf_counter() - start
+    if args.save_statistics:
+        with open(args.save_statistics, 'w', encoding='utf-8') as f:
+            json.dump(statistics, f, indent=2)
+
+    for name, status, stage_seconds in log:
+        print(f'  {name:<10} {status:<9} {stage_seconds * 1000:8.1f} ms')
+    memory = features.memory_usage(deep=True).sum()
+    print(f'{args.path}: {len(features)} rows, {features.shape[1]} columns, '
+          f'{memory / 1024:.1f} KiB in {seconds * 1000:.1f} ms')
+    print(features.dtypes.to_string())
+
+
+if __name__ == '__main__':
+    main()
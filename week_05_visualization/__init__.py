@@ -0,0 +1 @@
+"""Week 5: visualization: downsampled and binned matplotlib plots with a render cache."""
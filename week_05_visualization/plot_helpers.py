@@ -0,0 +1,400 @@
+# Plot helpers for large data - downsampling, binned density plots, render cache
+# The week 5 notebooks hand every point to matplotlib. A line with a few
+# million points or a scatter with a few million markers takes minutes to
+# draw, although the picture has only ~1000 pixel columns. These helpers
+# reduce the data to what can be seen before it reaches matplotlib:
+#
+#   line plots    -> LTTB (largest triangle three buckets): keeps the points
+#                    that shape the curve, ~2 per pixel column
+#                    min-max: keeps each bucket's lowest and highest point, so
+#                    no spike (e.g. a temperature anomaly) disappears
+#   scatter plots -> points counted into a 2D histogram with np.bincount, drawn
+#                    as one image (pcolormesh) or as hexagons (hexbin over the
+#                    pre-binned counts instead of the raw points)
+#   re-runs       -> RenderCache stores each rendered figure as a PNG under a
+#                    key made of the data fingerprint, the plot spec and the
+#                    drawing code; an unchanged chart is loaded, not redrawn
+#
+# NumPy is the only requirement for the downsampling and binning functions;
+# matplotlib is imported when a figure is drawn.
+#
+# Usage in a notebook:
+#   from week_05_visualization.plot_helpers import RenderCache, line_plot, scatter_plot
+#   def draw(fig, data, title):
+#       ax = fig.add_subplot()
+#       line_plot(ax, data['date'], data['temperature'])
+#       ax.set_title(title)
+#   RenderCache().show(draw, df, {'title': 'Temperatures'})
+#
+# Usage from the command line:
+#   python -m week_05_visualization.plot_helpers data/temperatures.csv --out temperatures.png
+#   python -m week_05_visualization.plot_helpers sensor.csv --time-column time --value-column temp --method minmax
+
+# ============================================================================
+# INDEX - Topics Covered in This File
+# ============================================================================
+# 1. Downsampling long series (LTTB, min-max)
+# 2. Pre-binned 2D density (histogram, hexbin)
+# 3. Plotting functions (line_plot, scatter_plot, density_plot)
+# 4. Render cache (data fingerprint + plot spec)
+# 5. Command line interface
+# ============================================================================
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+from week_02_files_data_structures.code_fingerprint import code_fingerprint
+from week_02_files_data_structures.column_cache import DATA_DIR, file_hash
+
+DEFAULT_POINTS = 2000          # kept by downsample() when no target is given
+DEFAULT_BINS = 256             # 2D histogram cells per axis
+DEFAULT_GRIDSIZE = 100         # hexagons across the x axis
+HEXBIN_OVERSAMPLING = 4        # histogram cells per hexagon (per axis) before hexbin
+DEFAULT_SCATTER_POINTS = 50000  # more than this -> density plot instead of markers
+# scatter_plot() takes the keyword arguments of both sides: the marker ones
+# are dropped when it draws a density plot, the density ones when it draws
+# markers (alpha, cmap, label, zorder, ... go to both).
+MARKER_KWARGS = frozenset({'s', 'c', 'color', 'marker', 'edgecolors', 'edgecolor', 'linewidths', 'linewidth',
+                           'plotnonfinite'})
+DENSITY_KWARGS = frozenset({'bins', 'gridsize', 'extent', 'log'})
+DEFAULT_FIGSIZE = (10, 4)
+DEFAULT_DPI = 100
+DEFAULT_CACHE_DIR = os.path.join(DATA_DIR, '.cache', 'plots')
+METHODS = ('lttb', 'minmax')
+
+
+# ============================================================================
+# 1. DOWNSAMPLING LONG SERIES
+# ============================================================================
+def _numeric(x):
+    """float64 copy of x; datetimes become nanoseconds since the first value."""
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        x = x.astype('datetime64[ns]').view(np.int64)
+        return (x - x[0]).astype(np.float64) if len(x) else x.astype(np.float64)
+    return x.astype(np.float64)
+
+
+def lttb_indices(x, y, n_out):
+    """Indices of the n_out points chosen by Largest Triangle Three Buckets.
+
+    The first and last points are kept; the rest are split into n_out - 2
+    buckets and each bucket keeps the point forming the largest triangle with
+    the point kept before it and the average of the next bucket. The loop runs
+    once per bucket (not per point), with NumPy inside each bucket.
+    """
+    n = len(y)
+    if n_out < 3:
+        raise ValueError(f'n_out must be at least 3, got {n_out}')
+    if n <= n_out:
+        return np.arange(n)
+    x, y = _numeric(x), np.asarray(y, dtype=np.float64)
+    edges = (np.arange(n_out - 1) * ((n - 2) / (n_out - 2))).astype(np.int64) + 1
+    edges[-1] = n - 1
+    # Average of every bucket at once; a NaN value is left out of its bucket's average.
+    # reduceat's last segment runs to the end of the array: stop it before the final point.
+    present = ~np.isnan(y[:-1])
+    counts = np.add.reduceat(present.astype(np.int64), edges[:-1])
+    avg_x = np.add.reduceat(x[:-1], edges[:-1]) / np.diff(edges)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        avg_y = np.add.reduceat(np.where(present, y[:-1], 0.0), edges[:-1]) / counts
+    # The bucket after the last one is the final point.
+    avg_x = np.append(avg_x[1:], x[-1])
+    avg_y = np.append(avg_y[1:], y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs((x[a] - avg_x[i]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y[i] - y[a]))
+        a = lo + int(np.argmax(np.where(np.isnan(area), -1.0, area)))
+        selected[i + 1] = a
+    return selected
+
+
+def minmax_indices(y, n_out):
+    """Indices of the minimum and maximum of each of n_out // 2 equal buckets (sorted).
+
+    Also keeps the first and last points, so at most n_out + 2 indices.
+    NaN values are only chosen when a whole bucket is NaN.
+    """
+    n = len(y)
+    if n_out < 2:
+        raise ValueError(f'n_out must be at least 2, got {n_out}')
+    if n <= n_out:
+        return np.arange(n)
+    y = np.asarray(y, dtype=np.float64)
+    size = -(-n // (n_out // 2))  # values per bucket, rounded up
+    full = n // size
+    low = high = y
+    if np.isnan(y).any():
+        low, high = np.where(np.isnan(y), np.inf, y), np.where(np.isnan(y), -np.inf, y)
+    starts = np.arange(full) * size
+    parts = [[0, n - 1],
+             starts + low[:full * size].reshape(full, size).argmin(axis=1),
+             starts + high[:full * size].reshape(full, size).argmax(axis=1)]
+    if full * size < n:  # last, shorter bucket
+        parts.append([full * size + low[full * size:].argmin(), full * size + high[full * size:].argmax()])
+    return np.unique(np.concatenate(parts))
+
+
+def downsample(x, y, n_out=DEFAULT_POINTS, method='lttb'):
+    """Return (x, y) reduced to about n_out points; short series are returned as they are.
+
+    x may be numbers or datetimes (or None for 0, 1, 2, ...); the returned
+    points are original (x, y) pairs, never interpolated ones.
+    """
+    y = np.asarray(y)
+    x = np.arange(len(y)) if x is None else np.asarray(x)
+    if len(x) != len(y):
+        raise ValueError(f'x has {len(x)} values, y has {len(y)}')
+    if method == 'lttb':
+        index = lttb_indices(x, y, n_out)
+    elif method == 'minmax':
+        index = minmax_indices(y, n_out)
+    else:
+        raise ValueError(f'method must be one of {METHODS}, got {method!r}')
+    return x[index], y[index]
+
+
+# ============================================================================
+# 2. PRE-BINNED 2D DENSITY
+# ============================================================================
+def data_extent(x, y):
+    """((xmin, xmax), (ymin, ymax)) of the finite values, widened if a side has zero width."""
+    extent = []
+    for values in (x, y):
+        values = values[np.isfinite(values)]
+        low, high = (float(values.min()), float(values.max())) if len(values) else (0.0, 1.0)
+        extent.append((low - 0.5, high + 0.5) if low == high else (low, high))
+    return tuple(extent)
+
+
+def bin2d(x, y, bins=DEFAULT_BINS, extent=None, counts=None):
+    """Count points into a bins x bins (or bins=(nx, ny)) grid.
+
+    Returns (counts, xedges, yedges) with counts[i, j] the number of points in
+    x cell i and y cell j, like np.histogram2d but with one np.bincount pass.
+    Points outside `extent` ((xmin, xmax), (ymin, ymax); default: the data's)
+    and NaN are ignored. Passing the `counts` of a previous call (and the same
+    extent) adds to it, for data read in chunks.
+    """
+    x, y = _numeric(x), np.asarray(y, dtype=np.float64)
+    nx, ny = (bins, bins) if np.isscalar(bins) else bins
+    (x0, x1), (y0, y1) = extent if extent is not None else data_extent(x, y)
+    inside = (x >= x0) & (x <= x1) & (y >= y0) & (y <= y1)
+    x, y = x[inside], y[inside]
+    ix = np.minimum(((x - x0) * (nx / (x1 - x0))).astype(np.intp), nx - 1)  # x1 itself goes in the last cell
+    iy = np.minimum(((y - y0) * (ny / (y1 - y0))).astype(np.intp), ny - 1)
+    found = np.bincount(ix * ny + iy, minlength=nx * ny).reshape(nx, ny)
+    if counts is None:
+        counts = found
+    else:
+        counts += found
+    return counts, np.linspace(x0, x1, nx + 1), np.linspace(y0, y1, ny + 1)
+
+
+# ============================================================================
+# 3. PLOTTING FUNCTIONS
+# ============================================================================
+def line_plot(ax, x, y=None, max_points=None, method='lttb', **kwargs):
+    """ax.plot() of a long series after downsampling.
+
+    max_points defaults to two points per pixel column of the axes, which is
+    as much detail as the figure can show. Extra keyword arguments go to
+    ax.plot(). Called with one series, plots it against 0, 1, 2, ...
+    """
+    if y is None:
+        x, y = None, x
+    if max_points is None:
+        max_points = max(int(2 * ax.bbox.width), 100)
+    x, y = downsample(x, y, max_points, method)
+    return ax.plot(x, y, **kwargs)
+
+
+def density_plot(ax, x, y, kind='hist2d', bins=DEFAULT_BINS, gridsize=DEFAULT_GRIDSIZE, extent=None, log=True,
+                 cmap='viridis', **kwargs):
+    """Draw the point density of (x, y) as a 2D histogram image or as hexagons.
+
+    Both draw from bin2d() counts, so matplotlib never sees the raw points.
+    For hexbin the counts are computed on a grid HEXBIN_OVERSAMPLING times
+    finer than the hexagons and passed as weights of the cell centers. `log`
+    colors by log(count), which keeps sparse regions visible next to dense ones.
+    Extra keyword arguments go to ax.pcolormesh() or ax.hexbin().
+    """
+    x, y = _numeric(x), np.asarray(y, dtype=np.float64)
+    if extent is None:
+        extent = data_extent(x, y)
+    if kind == 'hist2d':
+        from matplotlib.colors import LogNorm
+
+        counts, xedges, yedges = bin2d(x, y, bins, extent)
+        return ax.pcolormesh(xedges, yedges, np.ma.masked_equal(counts.T, 0), norm=LogNorm() if log else None,
+                             cmap=cmap, **kwargs)
+    if kind == 'hexbin':
+        fine = gridsize * HEXBIN_OVERSAMPLING
+        counts, xedges, yedges = bin2d(x, y, fine, extent)
+        i, j = np.nonzero(counts)
+        centers_x = (xedges[:-1] + xedges[1:]) / 2
+        centers_y = (yedges[:-1] + yedges[1:]) / 2
+        return ax.hexbin(centers_x[i], centers_y[j], C=counts[i, j], reduce_C_function=np.sum, gridsize=gridsize,
+                         extent=(*extent[0], *extent[1]), bins='log' if log else None, cmap=cmap, **kwargs)
+    raise ValueError(f"kind must be 'hist2d' or 'hexbin', got {kind!r}")
+
+
+def scatter_plot(ax, x, y, max_points=DEFAULT_SCATTER_POINTS, kind='hist2d', **kwargs):
+    """ax.scatter() for up to max_points points, density_plot() above that.
+
+    The same call works on both sides of max_points: MARKER_KWARGS are only
+    used by ax.scatter(), DENSITY_KWARGS only by density_plot().
+    """
+    if len(x) <= max_points:
+        return ax.scatter(x, y, **{key: value for key, value in kwargs.items() if key not in DENSITY_KWARGS})
+    return density_plot(ax, x, y, kind, **{key: value for key, value in kwargs.items() if key not in MARKER_KWARGS})
+
+
+# ============================================================================
+# 4. RENDER CACHE
+# ============================================================================
+def _update_fingerprint(digest, value):
+    if value is None or isinstance(value, (bool, int, float, str, bytes)):
+        digest.update(f'{type(value).__name__}:{value!r};'.encode())
+    elif isinstance(value, np.ndarray):
+        digest.update(f'ndarray:{value.dtype.str}:{value.shape};'.encode())
+        if value.dtype.hasobject:
+            digest.update(repr(value.tolist()).encode())
+        else:
+            digest.update(np.ascontiguousarray(value).reshape(-1).view(np.uint8))
+    elif type(value).__module__.startswith('pandas'):
+        import pandas as pd
+
+        if isinstance(value, pd.DataFrame):
+            digest.update(repr([(str(name), str(dtype)) for name, dtype in value.dtypes.items()]).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, dict):
+        digest.update(b'dict{')
+        for key in sorted(value, key=repr):
+            _update_fingerprint(digest, key)
+            _update_fingerprint(digest, value[key])
+        digest.update(b'}')
+    elif isinstance(value, (list, tuple)):
+        digest.update(f'{type(value).__name__}[{len(value)}'.encode())
+        for item in value:
+            _update_fingerprint(digest, item)
+        digest.update(b']')
+    elif isinstance(value, os.PathLike):
+        digest.update(f'file:{file_hash(value)};'.encode())  # a file stands for its contents
+    else:
+        raise TypeError(f'cannot fingerprint {type(value).__name__}; use arrays, DataFrames, '
+                        f'numbers, strings, paths, lists or dicts')
+
+
+def fingerprint(*values):
+    """Content hash of arrays, DataFrames/Series, paths (file contents) and plain values."""
+    digest = hashlib.blake2b(digest_size=16)
+    for value in values:
+        _update_fingerprint(digest, value)
+    return digest.hexdigest()
+
+
+class RenderCache:
+    """Rendered figures on disk, keyed by data, plot spec and drawing code.
+
+    render(draw, data, spec) calls draw(fig, data, **spec) on a new figure
+    and saves it, unless a figure for the same data fingerprint, spec, size,
+    code of `draw` (with the constants and project helpers it uses, see
+    code_fingerprint.py) and version of this file and matplotlib is already saved.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, draw, data, spec=None, figsize=DEFAULT_FIGSIZE, dpi=DEFAULT_DPI, fmt='png'):
+        import matplotlib
+
+        return fingerprint(data, spec or {}, list(figsize), dpi, fmt, code_fingerprint(draw),
+                           file_hash(__file__), matplotlib.__version__)
+
+    def render(self, draw, data, spec=None, figsize=DEFAULT_FIGSIZE, dpi=DEFAULT_DPI, fmt='png', force=False):
+        """Return the path of the rendered figure, drawing it only on a cache miss."""
+        path = os.path.join(self.cache_dir, self.key(draw, data, spec, figsize, dpi, fmt) + '.' + fmt)
+        if not force and os.path.exists(path):
+            self.hits += 1
+            return path
+        from matplotlib.figure import Figure  # no pyplot: nothing is opened or kept alive
+
+        self.misses += 1
+        fig = Figure(figsize=figsize, dpi=dpi, layout='tight')
+        draw(fig, data, **(spec or {}))
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        fig.savefig(tmp_path, format=fmt)
+        os.replace(tmp_path, path)
+        return path
+
+    def show(self, draw, data, spec=None, **kwargs):
+        """render() for notebooks: an IPython Image of the figure (the path without IPython)."""
+        path = self.render(draw, data, spec, **kwargs)
+        try:
+            from IPython.display import Image
+        except ImportError:
+            return path
+        return Image(filename=path)
+
+    def clear(self):
+        """Delete every cached figure."""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+
+# ============================================================================
+# 5. COMMAND LINE INTERFACE
+# ============================================================================
+def draw_series(fig, data, title='', method='lttb', max_points=None):
+    """Line plot of data = {'time': ..., 'value': ...} (used by the command line)."""
+    ax = fig.add_subplot()
+    line_plot(ax, data['time'], data['value'], max_points=max_points, method=method, linewidth=0.8)
+    ax.set_title(title)
+    ax.grid(alpha=0.3)
+
+
+def main(argv=None):
+    from week_03_numpy.temperature_analysis import DEFAULT_TIME_COLUMN, DEFAULT_VALUE_COLUMN, iter_series
+
+    parser = argparse.ArgumentParser(description='Plot a long time series from a CSV file, downsampled and cached.')
+    parser.add_argument('path', help='CSV file with a time column and a value column')
+    parser.add_argument('--time-column', default=DEFAULT_TIME_COLUMN)
+    parser.add_argument('--value-column', default=DEFAULT_VALUE_COLUMN)
+    parser.add_argument('--method', choices=METHODS, default='lttb')
+    parser.add_argument('--points', type=int, help='points to draw (default: 2 per pixel column)')
+    parser.add_argument('--out', help='copy the figure here (default: print its cache path)')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--force', action='store_true', help='redraw even if cached')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    chunks = list(iter_series(args.path, args.time_column, args.value_column))
+    data = {'time': np.concatenate([times for times, _ in chunks]),
+            'value': np.concatenate([values for _, values in chunks])}
+    read = time.perf_counter() - start
+    cache = RenderCache(args.cache_dir)
+    spec = {'title': f'{os.path.basename(args.path)}: {args.value_column}', 'method': args.method,
+            'max_points': args.points}
+    path = cache.render(draw_series, data, spec, force=args.force)
+    if args.out:
+        shutil.copyfile(path, args.out)
+    print(json.dumps({'rows': len(data['value']), 'read_s': round(read, 3),
+                      'plot_s': round(time.perf_counter() - start - read, 3),
+                      'cached': bool(cache.hits), 'figure': args.out or path}))
+
+
+if __name__ == '__main__':
+    main()
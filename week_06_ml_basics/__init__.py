@@ -0,0 +1 @@
+"""Week 6: machine learning basics with scikit-learn: house price model and model search."""
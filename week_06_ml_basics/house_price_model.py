@@ -0,0 +1,351 @@
+# House Price Model - out-of-core training
+# Linear regression of a price on numeric house features, trained from a CSV
+# file that is streamed in chunks, so the data never has to fit in memory
+# (the notebook's one-shot fit() on a full DataFrame needs all of it at once).
+#
+# Two training methods, both one chunk at a time:
+#   normal -> accumulate the normal equations X'X and X'y chunk by chunk and
+#             solve them at the end. Exact: gives the same coefficients as an
+#             in-memory least-squares fit. Memory is (features + 2)^2 numbers.
+#   sgd    -> scikit-learn's SGDRegressor.partial_fit() on each standardized
+#             chunk, for several passes (epochs) over the file. Approximate,
+#             but also works for models where no closed form exists.
+#
+# The scaler statistics (mean and standard deviation of every feature, and of
+# the target for SGD) are updated chunk by chunk as well (RunningScaler), with
+# the parallel variance formula, so they match StandardScaler on the full data.
+#
+# Usage:
+#   python -m week_06_ml_basics.house_price_model data/house_prices.csv --target price
+#   python -m week_06_ml_basics.house_price_model data/house_prices.csv --features area,bedrooms,bathrooms \
+#       --method sgd --epochs 5 --check
+#   python -m week_06_ml_basics.house_price_model big.csv --chunk-size 200000 --save model.json
+#   python -m week_06_ml_basics.house_price_model big.csv --metrics metrics.prom --profile train.prof
+
+# ============================================================================
+# INDEX - Topics Covered in This File
+# ============================================================================
+# 1. Streaming (X, y) chunks from CSV
+# 2. Running scaler statistics
+# 3. Normal equations, updated chunk by chunk
+# 4. SGD with partial_fit
+# 5. Linear model, streaming metrics and the in-memory check
+# 6. Command line interface
+# ============================================================================
+
+import argparse
+import json
+
+import numpy as np
+
+from week_02_files_data_structures import instrumentation
+from week_02_files_data_structures.csv_reader import DEFAULT_CHUNK_SIZE, STR, infer_schema, read_chunks
+
+DEFAULT_TARGET = 'price'
+ID_COLUMNS = ('id',)
+# Text values accepted in feature columns (e.g. mainroad, basement in Housing.csv)
+BINARY_VALUES = {'yes': 1.0, 'no': 0.0, 'true': 1.0, 'false': 0.0, '1': 1.0, '0': 0.0}
+
+
+# ============================================================================
+# 1. STREAMING (X, y) CHUNKS FROM CSV
+# ============================================================================
+def default_features(path, target=DEFAULT_TARGET):
+    """Every numeric column except the target and id columns."""
+    return [name for name, kind in infer_schema(path) if kind != STR and name != target and name not in ID_COLUMNS]
+
+
+def _to_float(values, name):
+    if not isinstance(values, list):  # array('q') or array('d') from csv_reader
+        return np.asarray(values, dtype=np.float64)
+    try:
+        return np.array([BINARY_VALUES[value.strip().lower()] for value in values])
+    except KeyError as e:
+        raise ValueError(f'column {name!r} is not numeric (value {e.args[0]!r})') from None
+
+
+def iter_xy(path, features, target=DEFAULT_TARGET, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield (X, y) float64 arrays, `chunk_size` rows at a time.
+
+    Rows with a missing feature or target are skipped.
+    """
+    schema = infer_schema(path)
+    for chunk in read_chunks(path, chunk_size=chunk_size, columns=list(features) + [target], schema=schema):
+        with instrumentation.stage('house_price_model.to_xy') as stage:
+            X = np.column_stack([_to_float(chunk[name], name) for name in features])
+            y = _to_float(chunk[target], target)
+            keep = ~(np.isnan(X).any(axis=1) | np.isnan(y))
+            if not keep.all():
+                X, y = X[keep], y[keep]
+            stage.add(rows=len(y))
+        if len(y):
+            yield X, y
+
+
+# ============================================================================
+# 2. RUNNING SCALER STATISTICS
+# ============================================================================
+class RunningScaler:
+    """Mean and standard deviation per column, updated one chunk at a time.
+
+    Each chunk's count, mean and sum of squared deviations are combined with
+    the totals so far (Chan et al.), which avoids the precision loss of
+    accumulating sum(x) and sum(x**2). Same result as StandardScaler.fit().
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = None
+        self._m2 = None
+
+    def partial_fit(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X[:, None]
+        if not len(X):
+            return self
+        mean = X.mean(axis=0)
+        m2 = ((X - mean) ** 2).sum(axis=0)
+        self._combine(len(X), mean, m2)
+        return self
+
+    def _combine(self, count, mean, m2):
+        if self.mean is None:
+            self.count, self.mean, self._m2 = count, mean, m2
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean = self.mean + delta * (count / total)
+        self._m2 = self._m2 + m2 + delta * delta * (self.count * count / total)
+        self.count = total
+
+    def merge(self, other):
+        if other.mean is not None:
+            self._combine(other.count, other.mean, other._m2)
+        return self
+
+    @property
+    def var(self):
+        return self._m2 / self.count
+
+    @property
+    def scale(self):
+        """Standard deviation, with 1.0 for constant columns (like StandardScaler)."""
+        std = np.sqrt(self.var)
+        return np.where(std > 0, std, 1.0)
+
+    def transform(self, X):
+        return (np.asarray(X, dtype=np.float64) - self.mean) / self.scale
+
+
+# ============================================================================
+# 3. NORMAL EQUATIONS, UPDATED CHUNK BY CHUNK
+# ============================================================================
+class NormalEquations:
+    """Least squares from the Gram matrix Z'Z of Z = [1, X - shift, y - shift].
+
+    Only the (features + 2)^2 matrix is kept between chunks. The values are
+    shifted by the first chunk's means before squaring, which keeps the sums
+    small (prices are ~1e6, their squares ~1e12) and the solve well
+    conditioned; the intercept is corrected for the shift at the end.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._gram = None
+        self._x_shift = None
+        self._y_shift = None
+
+    def partial_fit(self, X, y):
+        if not len(y):
+            return self
+        if self._gram is None:
+            self._x_shift, self._y_shift = X.mean(axis=0), y.mean()
+            self._gram = np.zeros((X.shape[1] + 2, X.shape[1] + 2))
+        Z = np.empty((len(y), X.shape[1] + 2))
+        Z[:, 0] = 1.0
+        np.subtract(X, self._x_shift, out=Z[:, 1:-1])
+        np.subtract(y, self._y_shift, out=Z[:, -1])
+        self._gram += Z.T @ Z
+        self.count += len(y)
+        return self
+
+    def solve(self, alpha=0.0):
+        """Return (coefficients, intercept). alpha > 0 adds a ridge penalty (not on the intercept)."""
+        if self._gram is None:
+            raise ValueError('no data: call partial_fit() first')
+        A = self._gram[:-1, :-1].copy()
+        b = self._gram[:-1, -1]
+        if alpha:
+            A[1:, 1:] += alpha * np.eye(len(A) - 1)
+        try:
+            solution = np.linalg.solve(A, b)
+        except np.linalg.LinAlgError:  # collinear features: minimum-norm solution
+            solution = np.linalg.lstsq(A, b, rcond=None)[0]
+        coef = solution[1:]
+        return coef, float(self._y_shift + solution[0] - self._x_shift @ coef)
+
+
+@instrumentation.timed('house_price_model.fit_normal')
+def fit_normal(path, features, target=DEFAULT_TARGET, chunk_size=DEFAULT_CHUNK_SIZE, alpha=0.0):
+    """One pass over the file: normal equations and scaler statistics together."""
+    equations = NormalEquations()
+    scaler = RunningScaler()
+    for X, y in iter_xy(path, features, target, chunk_size):
+        equations.partial_fit(X, y)
+        scaler.partial_fit(X)
+        instrumentation.add(rows=len(y))
+    coef, intercept = equations.solve(alpha)
+    return LinearModel(features, target, coef, intercept, scaler)
+
+
+# ============================================================================
+# 4. SGD WITH PARTIAL_FIT
+# ============================================================================
+@instrumentation.timed('house_price_model.fit_sgd')
+def fit_sgd(path, features, target=DEFAULT_TARGET, chunk_size=DEFAULT_CHUNK_SIZE, epochs=5, seed=0,
+            **sgd_params):
+    """Pass 1 fits the scalers; then `epochs` passes of SGDRegressor.partial_fit().
+
+    SGD needs standardized inputs to converge with one learning rate for all
+    features, so X and y are scaled with the streamed statistics and the
+    coefficients are converted back to original units at the end.
+    """
+    from sklearn.linear_model import SGDRegressor
+
+    x_scaler, y_scaler = RunningScaler(), RunningScaler()
+    for X, y in iter_xy(path, features, target, chunk_size):
+        x_scaler.partial_fit(X)
+        y_scaler.partial_fit(y)
+    if not x_scaler.count:
+        raise ValueError(f'{path}: no complete rows to train on')
+
+    sgd_params.setdefault('random_state', seed)
+    model = SGDRegressor(**sgd_params)
+    rng = np.random.default_rng(seed)
+    for _ in range(epochs):
+        for X, y in iter_xy(path, features, target, chunk_size):
+            order = rng.permutation(len(y))  # files are often sorted; shuffle within the chunk
+            model.partial_fit(x_scaler.transform(X[order]), y_scaler.transform(y[order]).ravel())
+            instrumentation.add(rows=len(y))
+
+    y_mean, y_scale = y_scaler.mean[0], y_scaler.scale[0]
+    coef = model.coef_ * y_scale / x_scaler.scale
+    intercept = float(y_mean + y_scale * model.intercept_[0] - coef @ x_scaler.mean)
+    return LinearModel(features, target, coef, intercept, x_scaler)
+
+
+# ============================================================================
+# 5. LINEAR MODEL, STREAMING METRICS AND THE IN-MEMORY CHECK
+# ============================================================================
+class LinearModel:
+    """Coefficients in original units, plus the feature statistics seen in training."""
+
+    def __init__(self, features, target, coef, intercept, scaler=None):
+        self.features = list(features)
+        self.target = target
+        self.coef = np.asarray(coef, dtype=np.float64)
+        self.intercept = intercept
+        self.scaler = scaler
+
+    def predict(self, X):
+        return np.asarray(X, dtype=np.float64) @ self.coef + self.intercept
+
+    def to_dict(self):
+        data = {'features': self.features, 'target': self.target, 'coef': self.coef.tolist(),
+                'intercept': self.intercept}
+        if self.scaler is not None and self.scaler.mean is not None:
+            data.update(rows=self.scaler.count, mean=self.scaler.mean.tolist(), std=np.sqrt(self.scaler.var).tolist())
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['features'], data['target'], data['coef'], data['intercept'])
+
+
+@instrumentation.timed('house_price_model.evaluate')
+def evaluate(model, path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Stream the file once and return {'rows', 'rmse', 'mae', 'r2'} of the model."""
+    targets = RunningScaler()
+    absolute = squared = 0.0
+    for X, y in iter_xy(path, model.features, model.target, chunk_size):
+        residual = y - model.predict(X)
+        absolute += np.abs(residual).sum()
+        squared += residual @ residual
+        targets.partial_fit(y)
+        instrumentation.add(rows=len(y))
+    rows = targets.count
+    if not rows:
+        return {'rows': 0, 'rmse': float('nan'), 'mae': float('nan'), 'r2': float('nan')}
+    total = targets.var[0] * rows
+    return {'rows': rows, 'rmse': float(np.sqrt(squared / rows)), 'mae': float(absolute / rows),
+            'r2': float(1 - squared / total) if total > 0 else float('nan')}
+
+
+@instrumentation.timed('house_price_model.fit_in_memory')
+def fit_in_memory(path, features, target=DEFAULT_TARGET):
+    """Reference fit: load everything and solve with np.linalg.lstsq. Only for small files."""
+    chunks = list(iter_xy(path, features, target))
+    X = np.concatenate([X for X, _ in chunks])
+    y = np.concatenate([y for _, y in chunks])
+    design = np.column_stack((np.ones(len(y)), X))
+    solution = np.linalg.lstsq(design, y, rcond=None)[0]
+    return LinearModel(features, target, solution[1:], float(solution[0]))
+
+
+def compare(model, reference):
+    """Largest relative difference between the coefficients (and intercept) of two models."""
+    ours = np.append(model.coef, model.intercept)
+    theirs = np.append(reference.coef, reference.intercept)
+    return float(np.max(np.abs(ours - theirs) / np.maximum(np.abs(theirs), 1e-12)))
+
+
+# ============================================================================
+# 6. COMMAND LINE INTERFACE
+# ============================================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Train a house price regression on a CSV file in chunks.')
+    parser.add_argument('path', help='CSV file with a header row')
+    parser.add_argument('--target', default=DEFAULT_TARGET, help='column to predict (default: price)')
+    parser.add_argument('--features', help='comma separated feature columns (default: all numeric columns)')
+    parser.add_argument('--method', choices=['normal', 'sgd'], default='normal', help='training method')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='rows per chunk')
+    parser.add_argument('--alpha', type=float, default=0.0,
+                        help='ridge penalty for normal (default 0); SGD regularization for sgd (default 0.0001)')
+    parser.add_argument('--epochs', type=int, default=5, help='passes over the file for sgd')
+    parser.add_argument('--test', help='CSV file to evaluate on (default: the training file)')
+    parser.add_argument('--check', action='store_true',
+                        help='also fit in memory and compare the coefficients (small files only)')
+    parser.add_argument('--save', help='write the model as JSON to this file')
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    features = args.features.split(',') if args.features else default_features(args.path, args.target)
+    if not features:
+        parser.error(f'{args.path}: no numeric feature columns found')
+    with instrumentation.session(args):
+        if args.method == 'normal':
+            model = fit_normal(args.path, features, args.target, args.chunk_size, args.alpha)
+        else:
+            model = fit_sgd(args.path, features, args.target, args.chunk_size, args.epochs,
+                            alpha=args.alpha or 0.0001)
+
+        print(f'{args.method} fit on {model.scaler.count} rows')
+        print(f'  {"intercept":<16} {model.intercept:14.4f}')
+        for name, value in zip(features, model.coef):
+            print(f'  {name:<16} {value:14.4f}')
+        metrics = evaluate(model, args.test or args.path, args.chunk_size)
+        print(f'rows={metrics["rows"]}  rmse={metrics["rmse"]:.4g}  mae={metrics["mae"]:.4g}  r2={metrics["r2"]:.4f}')
+
+        if args.check:
+            reference = fit_in_memory(args.path, features, args.target)
+            reference_metrics = evaluate(reference, args.test or args.path, args.chunk_size)
+            print(f'in-memory lstsq: r2={reference_metrics["r2"]:.4f}, '
+                  f'max relative coefficient difference {compare(model, reference):.2e}')
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(model.to_dict(), f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,372 @@
+# Model search - parallel, resumable cross-validated grid search
+# Runs every (parameters, fold) combination of a parameter grid as a separate
+# task on a process pool, for the scikit-learn estimators used in
+# sklearn_intro.ipynb and house_price_model.ipynb.
+#
+# Data is shared, not copied: X and y are saved once as .npy files and every
+# worker memory-maps them (np.load(mmap_mode='r')). A task only sends its
+# parameters and fold number to the worker; the fold indices are recomputed
+# there from a seeded KFold, so the dataset is never pickled.
+#
+# Results are cached: every finished (parameters, fold) result is appended to
+# a JSON lines file as soon as it arrives. Running the same search again, after
+# a crash or with a bigger grid, only runs the tasks that are not in the file.
+#
+# Usage:
+#   python -m week_06_ml_basics.model_search --dataset iris --estimator knn_classifier \
+#       --grid '{"n_neighbors": [1, 3, 5, 7, 9], "weights": ["uniform", "distance"]}'
+#   python -m week_06_ml_basics.model_search --csv data/house_prices.csv --target price \
+#       --estimator ridge --scale --grid '{"alpha": [0.01, 0.1, 1, 10, 100]}' --folds 5 --workers 4
+#   (add --metrics metrics.jsonl or --profile search.prof to see where the time goes)
+
+# ============================================================================
+# INDEX - Topics Covered in This File
+# ============================================================================
+# 1. Shared memory-mapped arrays
+# 2. Estimators and parameter grids
+# 3. Worker tasks
+# 4. Result cache (JSON lines)
+# 5. Running the search on a process pool
+# 6. Command line interface
+# ============================================================================
+
+import argparse
+import hashlib
+import importlib
+import itertools
+import json
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from week_02_files_data_structures import instrumentation
+from week_02_files_data_structures.column_cache import DATA_DIR, file_hash
+from week_06_ml_basics.house_price_model import DEFAULT_TARGET, default_features, iter_xy
+
+DEFAULT_CACHE_DIR = os.path.join(DATA_DIR, '.cache', 'model_search')
+DEFAULT_FOLDS = 5
+
+# Short names for the estimators used in the notebooks; any 'module.Class' path also works.
+ESTIMATORS = {
+    'linear': 'sklearn.linear_model.LinearRegression',
+    'ridge': 'sklearn.linear_model.Ridge',
+    'lasso': 'sklearn.linear_model.Lasso',
+    'sgd': 'sklearn.linear_model.SGDRegressor',
+    'tree': 'sklearn.tree.DecisionTreeRegressor',
+    'forest': 'sklearn.ensemble.RandomForestRegressor',
+    'knn': 'sklearn.neighbors.KNeighborsRegressor',
+    'logistic': 'sklearn.linear_model.LogisticRegression',
+    'knn_classifier': 'sklearn.neighbors.KNeighborsClassifier',
+    'tree_classifier': 'sklearn.tree.DecisionTreeClassifier',
+    'forest_classifier': 'sklearn.ensemble.RandomForestClassifier',
+    'svc': 'sklearn.svm.SVC',
+}
+DATASETS = ('iris', 'wine', 'breast_cancer', 'diabetes')  # bundled with scikit-learn, no download
+
+
+# ============================================================================
+# 1. SHARED MEMORY-MAPPED ARRAYS
+# ============================================================================
+def _array_paths(directory, name):
+    return os.path.join(directory, f'{name}_X.npy'), os.path.join(directory, f'{name}_y.npy')
+
+
+@instrumentation.timed('model_search.save_arrays')
+def save_arrays(X, y, directory=DEFAULT_CACHE_DIR):
+    """Save in-memory X and y as .npy files named after their content; return (x_path, y_path)."""
+    X = np.ascontiguousarray(X)
+    y = np.ascontiguousarray(y)
+    digest = hashlib.blake2b(digest_size=12)
+    for array in (X, y):
+        digest.update(str((array.dtype.str, array.shape)).encode())
+        digest.update(memoryview(array).cast('B'))
+    x_path, y_path = _array_paths(os.path.join(directory, 'arrays'), digest.hexdigest())
+    if not (os.path.exists(x_path) and os.path.exists(y_path)):
+        os.makedirs(os.path.dirname(x_path), exist_ok=True)
+        np.save(x_path + '.tmp.npy', X)
+        np.save(y_path + '.tmp.npy', y)
+        os.replace(x_path + '.tmp.npy', x_path)
+        os.replace(y_path + '.tmp.npy', y_path)
+    return x_path, y_path
+
+
+@instrumentation.timed('model_search.arrays_from_csv')
+def arrays_from_csv(path, features, target=DEFAULT_TARGET, directory=DEFAULT_CACHE_DIR):
+    """Stream a CSV file into X/y .npy files without loading it; return (x_path, y_path).
+
+    The files are named after the CSV's content hash and the columns, so they
+    are built once per version of the file. The first pass counts the rows,
+    the second writes the chunks straight into the memory-mapped output.
+    """
+    key = f'{file_hash(path)}|{",".join(features)}|{target}'
+    name = hashlib.blake2b(key.encode(), digest_size=12).hexdigest()
+    x_path, y_path = _array_paths(os.path.join(directory, 'arrays'), name)
+    if os.path.exists(x_path) and os.path.exists(y_path):
+        return x_path, y_path
+
+    rows = sum(len(y) for _, y in iter_xy(path, features, target))
+    os.makedirs(os.path.dirname(x_path), exist_ok=True)
+    X_out = np.lib.format.open_memmap(x_path + '.tmp.npy', mode='w+', dtype=np.float64, shape=(rows, len(features)))
+    y_out = np.lib.format.open_memmap(y_path + '.tmp.npy', mode='w+', dtype=np.float64, shape=(rows,))
+    start = 0
+    for X, y in iter_xy(path, features, target):
+        X_out[start:start + len(y)] = X
+        y_out[start:start + len(y)] = y
+        start += len(y)
+    instrumentation.add(rows=rows, bytes=os.path.getsize(path))
+    X_out.flush()
+    y_out.flush()
+    del X_out, y_out
+    os.replace(x_path + '.tmp.npy', x_path)
+    os.replace(y_path + '.tmp.npy', y_path)
+    return x_path, y_path
+
+
+def load_sklearn_dataset(name):
+    """(X, y) of one of the small datasets bundled with scikit-learn."""
+    from sklearn import datasets
+
+    return getattr(datasets, f'load_{name}')(return_X_y=True)
+
+
+# ============================================================================
+# 2. ESTIMATORS AND PARAMETER GRIDS
+# ============================================================================
+def make_estimator(name, params, scale=False):
+    """Create the estimator `name` (short name or 'module.Class') with `params`.
+
+    scale=True puts a StandardScaler in front, fitted on the training fold only.
+    """
+    module_name, _, class_name = ESTIMATORS.get(name, name).rpartition('.')
+    estimator = getattr(importlib.import_module(module_name), class_name)(**params)
+    if scale:
+        from sklearn.pipeline import make_pipeline
+        from sklearn.preprocessing import StandardScaler
+
+        estimator = make_pipeline(StandardScaler(), estimator)
+    return estimator
+
+
+def expand_grid(grid):
+    """{'a': [1, 2], 'b': ['x']} -> [{'a': 1, 'b': 'x'}, {'a': 2, 'b': 'x'}].
+
+    A list of such dicts is expanded one by one and concatenated, like
+    scikit-learn's ParameterGrid.
+    """
+    if isinstance(grid, list):
+        return [params for part in grid for params in expand_grid(part)]
+    names = sorted(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+# ============================================================================
+# 3. WORKER TASKS
+# ============================================================================
+_ARRAYS = {}  # per worker process: path -> memory-mapped array, opened once
+
+
+def _open(path):
+    if path not in _ARRAYS:
+        _ARRAYS[path] = np.load(path, mmap_mode='r')
+    return _ARRAYS[path]
+
+
+def fold_indices(rows, folds, fold, seed, y=None):
+    """(train, test) indices of one fold; stratified when `y` is given (classification)."""
+    from sklearn.model_selection import KFold, StratifiedKFold
+
+    if y is not None:
+        splits = StratifiedKFold(n_splits=folds, shuffle=True, random_state=seed).split(np.zeros(rows), y)
+    else:
+        splits = KFold(n_splits=folds, shuffle=True, random_state=seed).split(np.zeros(rows))
+    return next(itertools.islice(splits, fold, None))
+
+
+def run_task(task):
+    """Fit and score one (parameters, fold). Runs in a worker process.
+
+    Only the memory-mapped rows of this fold are read; the arrays themselves
+    are never sent through the pool.
+    """
+    X = _open(task['x_path'])
+    y = _open(task['y_path'])
+    estimator = make_estimator(task['estimator'], task['params'], task['scale'])
+    from sklearn.base import is_classifier
+
+    stratify = np.asarray(y) if is_classifier(estimator) else None
+    train, test = fold_indices(len(y), task['folds'], task['fold'], task['seed'], stratify)
+
+    start = time.perf_counter()
+    estimator.fit(X[train], y[train])
+    fit_seconds = time.perf_counter() - start
+    if task['scoring']:
+        from sklearn.metrics import get_scorer
+
+        score = get_scorer(task['scoring'])(estimator, X[test], y[test])
+    else:
+        score = estimator.score(X[test], y[test])  # R^2 for regressors, accuracy for classifiers
+    return {'score': float(score), 'fit_seconds': fit_seconds,
+            'score_seconds': time.perf_counter() - start - fit_seconds}
+
+
+# ============================================================================
+# 4. RESULT CACHE (JSON LINES)
+# ============================================================================
+def task_key(task):
+    """Everything that determines a task's result: data, estimator, params and fold."""
+    fields = {name: task[name] for name in ('estimator', 'params', 'scale', 'folds', 'fold', 'seed', 'scoring')}
+    fields['data'] = [os.path.basename(task['x_path']), os.path.basename(task['y_path'])]
+    return hashlib.blake2b(json.dumps(fields, sort_keys=True, default=str).encode(), digest_size=16).hexdigest()
+
+
+class ResultCache:
+    """Append-only JSON lines file of finished task results, keyed by task_key().
+
+    Each result is written and flushed as soon as it arrives, so a crash loses
+    at most the tasks that were running. A last line cut off by a crash is
+    ignored when the file is read back.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.results = {}
+        if path and os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    self.results[record['key']] = record
+        self._file = None
+
+    def __contains__(self, key):
+        return key in self.results
+
+    def add(self, key, task, result):
+        record = dict(result, key=key, estimator=task['estimator'], params=task['params'], fold=task['fold'])
+        self.results[key] = record
+        if self.path:
+            if self._file is None:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                self._file = open(self.path, 'a+', encoding='utf-8')
+                if self._file.tell():
+                    self._file.seek(self._file.tell() - 1)
+                    if self._file.read(1) != '\n':  # finish a line cut off by a crash
+                        self._file.write('\n')
+            self._file.write(json.dumps(record, default=str) + '\n')
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+# ============================================================================
+# 5. RUNNING THE SEARCH ON A PROCESS POOL
+# ============================================================================
+@instrumentation.timed('model_search.search')
+def search(estimator, grid, x_path, y_path, folds=DEFAULT_FOLDS, seed=0, scoring=None, scale=False,
+           workers=None, cache_path=None, progress=None):
+    """Cross-validate every parameter combination in `grid`; return (summary, counts).
+
+    summary : list of {'params', 'mean', 'std', 'scores', 'fit_seconds'},
+              best mean score first
+    counts  : {'cached': tasks found in the cache, 'computed': tasks run now}
+    progress: optional callable(done, total), called as tasks finish
+    """
+    candidates = expand_grid(grid)
+    tasks = [{'x_path': x_path, 'y_path': y_path, 'estimator': estimator, 'params': params, 'scale': scale,
+              'folds': folds, 'fold': fold, 'seed': seed, 'scoring': scoring}
+             for params in candidates for fold in range(folds)]
+    cache = ResultCache(cache_path)
+    keys = [task_key(task) for task in tasks]
+    pending = [(key, task) for key, task in zip(keys, tasks) if key not in cache]
+    counts = {'cached': len(tasks) - len(pending), 'computed': 0}
+
+    try:
+        if workers == 1 or len(pending) <= 1:
+            for key, task in pending:
+                cache.add(key, task, run_task(task))
+                counts['computed'] += 1
+                if progress:
+                    progress(counts['cached'] + counts['computed'], len(tasks))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(run_task, task): (key, task) for key, task in pending}
+                try:
+                    for future in as_completed(futures):
+                        key, task = futures[future]
+                        cache.add(key, task, future.result())
+                        counts['computed'] += 1
+                        if progress:
+                            progress(counts['cached'] + counts['computed'], len(tasks))
+                except BaseException:
+                    # Keep what has finished; do not start the queued tasks.
+                    for future in futures:
+                        future.cancel()
+                    raise
+    finally:
+        cache.close()
+
+    summary = []
+    for position, params in enumerate(candidates):
+        records = [cache.results[key] for key in keys[position * folds:(position + 1) * folds]]
+        scores = [record['score'] for record in records]
+        summary.append({'params': params, 'mean': statistics.fmean(scores),
+                        'std': statistics.pstdev(scores) if len(scores) > 1 else 0.0, 'scores': scores,
+                        'fit_seconds': sum(record['fit_seconds'] for record in records)})
+    summary.sort(key=lambda item: item['mean'], reverse=True)
+    return summary, counts
+
+
+# ============================================================================
+# 6. COMMAND LINE INTERFACE
+# ============================================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Parallel, resumable cross-validated grid search.')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--dataset', choices=DATASETS, help='dataset bundled with scikit-learn')
+    source.add_argument('--csv', help='CSV file (streamed into memory-mapped arrays)')
+    parser.add_argument('--target', default=DEFAULT_TARGET, help='target column for --csv (default: price)')
+    parser.add_argument('--features', help='comma separated feature columns for --csv (default: all numeric)')
+    parser.add_argument('--estimator', required=True, help=f'one of {", ".join(ESTIMATORS)} or module.Class')
+    parser.add_argument('--grid', default='{}', help='JSON dict (or list of dicts) of parameter lists')
+    parser.add_argument('--folds', type=int, default=DEFAULT_FOLDS, help='cross-validation folds (default: 5)')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the fold split')
+    parser.add_argument('--scoring', help='scikit-learn scorer name (default: estimator.score)')
+    parser.add_argument('--scale', action='store_true', help='standardize features inside each fold')
+    parser.add_argument('--workers', type=int, default=0, help='worker processes (default: CPU count)')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help='arrays and result cache directory')
+    parser.add_argument('--top', type=int, default=10, help='number of results to print')
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args(argv)
+    with instrumentation.session(args):
+        _run(args)
+
+
+def _run(args):
+    if args.csv:
+        features = args.features.split(',') if args.features else default_features(args.csv, args.target)
+        x_path, y_path = arrays_from_csv(args.csv, features, args.target, args.cache_dir)
+    else:
+        x_path, y_path = save_arrays(*load_sklearn_dataset(args.dataset), directory=args.cache_dir)
+    cache_path = os.path.join(args.cache_dir, 'results.jsonl')
+
+    start = time.perf_counter()
+    summary, counts = search(args.estimator, json.loads(args.grid), x_path, y_path, folds=args.folds,
+                             seed=args.seed, scoring=args.scoring, scale=args.scale,
+                             workers=args.workers or os.cpu_count(), cache_path=cache_path)
+    seconds = time.perf_counter() - start
+    print(f'{len(summary)} candidates x {args.folds} folds: {counts["computed"]} run, '
+          f'{counts["cached"]} from cache, {seconds:.2f} s')
+    for rank, item in enumerate(summary[:args.top], 1):
+        print(f'{rank:>3}. {item["mean"]:.4f} +/- {item["std"]:.4f}  {json.dumps(item["params"])}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+"""Week 7: deep learning with PyTorch: MNIST data, model and inference server."""
@@ -0,0 +1,236 @@
+# MNIST data - preprocessed once, memory-mapped, loaded in batches
+# The notebook decodes and transforms every image one by one on every epoch
+# (PIL image -> ToTensor -> Normalize, then collate 64 single images into a
+# batch). On CPU that costs more than the training step itself.
+#
+# Here the raw IDX files are converted ONCE into .npy files:
+#   uint8   -> 1 byte per pixel, normalized on the fly per batch (default)
+#   float16 -> already normalized, 2 bytes per pixel, no work at load time
+# and the Dataset memory-maps them. Indexing it with a list of indices returns
+# a whole batch from one NumPy fancy-index read, so the DataLoader moves one
+# tensor per batch between processes instead of 256 small ones.
+#
+#   data/mnist/train-images-idx3-ubyte.gz ...    <- raw files (as downloaded)
+#   data/.cache/mnist/train_images_uint8.npy     <- preprocessed, memory-mapped
+#
+# Usage:
+#   python -m week_07_deep_learning.mnist_data                     # preprocess data/mnist
+#   python -m week_07_deep_learning.mnist_data --raw-dir ~/mnist --dtype float16
+
+# ============================================================================
+# INDEX - Topics Covered in This File
+# ============================================================================
+# 1. Reading IDX files
+# 2. Preprocessing into memory-mapped .npy files
+# 3. Memory-mapped Dataset with batched indexing
+# 4. DataLoader configuration
+# 5. Command line interface
+# ============================================================================
+
+import argparse
+import gzip
+import json
+import os
+
+import numpy as np
+
+from week_02_files_data_structures.column_cache import DATA_DIR
+
+RAW_DIR = os.path.join(DATA_DIR, 'mnist')
+CACHE_DIR = os.path.join(DATA_DIR, '.cache', 'mnist')
+RAW_FILES = {
+    'train': ('train-images-idx3-ubyte', 'train-labels-idx1-ubyte'),
+    'test': ('t10k-images-idx3-ubyte', 't10k-labels-idx1-ubyte'),
+}
+DTYPES = ('uint8', 'float16')
+# Mean and standard deviation of the MNIST training pixels (scaled to 0-1)
+MNIST_MEAN = 0.1307
+MNIST_STD = 0.3081
+
+
+# ============================================================================
+# 1. READING IDX FILES
+# ============================================================================
+# IDX: 2 zero bytes, a type code (0x08 = unsigned byte), the number of
+# dimensions, one big-endian uint32 per dimension, then the raw values.
+def find_raw(raw_dir, name):
+    """Path of `name` or `name.gz` in raw_dir."""
+    for candidate in (name, name + '.gz'):
+        path = os.path.join(raw_dir, candidate)
+        if os.path.exists(path):
+            return path
+    raise FileNotFoundError(f'{name}(.gz) not found in {raw_dir}')
+
+
+def read_idx(path):
+    """Read an IDX file (optionally gzipped) into a uint8 NumPy array."""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rb') as f:
+        header = f.read(4)
+        if header[:2] != b'\x00\x00' or header[2] != 0x08:
+            raise ValueError(f'{path}: not an unsigned-byte IDX file')
+        dims = [int.from_bytes(f.read(4), 'big') for _ in range(header[3])]
+        data = np.frombuffer(f.read(), dtype=np.uint8)
+    if data.size != int(np.prod(dims)):
+        raise ValueError(f'{path}: expected {int(np.prod(dims))} values, found {data.size}')
+    return data.reshape(dims)
+
+
+def write_idx(path, array):
+    """Write a uint8 array as an IDX file (gzipped if path ends with .gz)."""
+    array = np.ascontiguousarray(array, dtype=np.uint8)
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'wb') as f:
+        f.write(bytes([0, 0, 0x08, array.ndim]))
+        for size in array.shape:
+            f.write(size.to_bytes(4, 'big'))
+        f.write(array.tobytes())
+
+
+# ============================================================================
+# 2. PREPROCESSING INTO MEMORY-MAPPED .NPY FILES
+# ============================================================================
+def _paths(cache_dir, split, dtype):
+    return (os.path.join(cache_dir, f'{split}_images_{dtype}.npy'),
+            os.path.join(cache_dir, f'{split}_labels.npy'),
+            os.path.join(cache_dir, f'{split}_{dtype}.json'))
+
+
+def preprocess(split='train', raw_dir=RAW_DIR, cache_dir=CACHE_DIR, dtype='uint8', force=False):
+    """Convert the raw IDX files of `split` into .npy files; return the image file path.
+
+    Skipped when the output is newer than the raw files. float16 images are
+    stored normalized: (pixel / 255 - MNIST_MEAN) / MNIST_STD.
+    """
+    if dtype not in DTYPES:
+        raise ValueError(f'dtype must be one of {DTYPES}, got {dtype!r}')
+    images_raw, labels_raw = (find_raw(raw_dir, name) for name in RAW_FILES[split])
+    images_path, labels_path, meta_path = _paths(cache_dir, split, dtype)
+    newest_raw = max(os.path.getmtime(images_raw), os.path.getmtime(labels_raw))
+    if not force and os.path.exists(meta_path) and os.path.getmtime(meta_path) >= newest_raw:
+        return images_path
+
+    os.makedirs(cache_dir, exist_ok=True)
+    images = read_idx(images_raw)
+    labels = read_idx(labels_raw)
+    if len(images) != len(labels):
+        raise ValueError(f'{split}: {len(images)} images but {len(labels)} labels')
+    if dtype == 'float16':
+        images = ((images / np.float32(255) - np.float32(MNIST_MEAN)) / np.float32(MNIST_STD)).astype(np.float16)
+    for path, array in ((images_path, images), (labels_path, labels.astype(np.int64))):
+        np.save(path + '.tmp.npy', array)
+        os.replace(path + '.tmp.npy', path)
+    with open(meta_path, 'w', encoding='utf-8') as f:  # written last: marks the split as complete
+        json.dump({'split': split, 'dtype': dtype, 'count': len(images), 'shape': list(images.shape[1:]),
+                   'mean': MNIST_MEAN, 'std': MNIST_STD}, f)
+    return images_path
+
+
+# ============================================================================
+# 3. MEMORY-MAPPED DATASET WITH BATCHED INDEXING
+# ============================================================================
+class MNISTMemmap:
+    """MNIST images from a memory-mapped .npy file.
+
+    dataset[i]            -> (image (1, 28, 28), label)
+    dataset[[i, j, ...]]  -> (images (n, 1, 28, 28), labels (n,)), one read
+    dataset[a:b]          -> same for a range, without copying (a view of the map)
+
+    Images are uint8 or normalized float16, as stored; to_input() turns a
+    batch into normalized float32 for the model. The file is opened lazily
+    in each process, so DataLoader workers never pickle the data. It is a
+    plain map-style dataset (__len__ and __getitem__), so importing this
+    module does not import torch.
+    """
+
+    def __init__(self, split='train', cache_dir=CACHE_DIR, dtype='uint8'):
+        self.images_path, self.labels_path, meta_path = _paths(cache_dir, split, dtype)
+        with open(meta_path, encoding='utf-8') as f:
+            self.meta = json.load(f)
+        self.dtype = dtype
+        self._images = None
+        self._labels = None
+
+    def _open(self):
+        # mmap_mode='c' (copy-on-write) gives writable arrays, so torch.from_numpy
+        # can wrap them without copying or warning; nothing is written back.
+        self._images = np.load(self.images_path, mmap_mode='c')
+        self._labels = np.load(self.labels_path, mmap_mode='c')
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_images'] = state['_labels'] = None
+        return state
+
+    def __len__(self):
+        return self.meta['count']
+
+    def __getitem__(self, index):
+        import torch
+
+        if self._images is None:
+            self._open()
+        if isinstance(index, slice):
+            images, labels = self._images[index], self._labels[index]
+        elif isinstance(index, (int, np.integer)):
+            return torch.from_numpy(self._images[index][None]), int(self._labels[index])
+        else:
+            # Sorted indices read the file front to back; the order within a
+            # batch does not matter for training.
+            index = np.sort(np.asarray(index))
+            images, labels = self._images[index], self._labels[index]
+        return torch.from_numpy(images[:, None]), torch.from_numpy(labels)
+
+
+def to_input(images, mean=MNIST_MEAN, std=MNIST_STD):
+    """Normalized float32 batch from uint8 (scaled here) or float16 (already normalized) images."""
+    import torch
+
+    if images.dtype == torch.uint8:
+        return images.float().div_(255).sub_(mean).div_(std)
+    return images.float()
+
+
+# ============================================================================
+# 4. DATALOADER CONFIGURATION
+# ============================================================================
+def make_loader(dataset, batch_size=256, shuffle=True, workers=None, pin_memory=None, drop_last=False):
+    """DataLoader that asks the dataset for whole batches.
+
+    batch_size=None turns off per-sample collation: the BatchSampler yields
+    lists of indices and MNISTMemmap returns each batch as two tensors.
+    workers defaults to min(4, CPU count); pin_memory defaults to True when
+    CUDA is available (page-locked batches copy to the GPU asynchronously).
+    """
+    import torch
+    from torch.utils.data import BatchSampler, DataLoader, RandomSampler, SequentialSampler
+
+    if workers is None:
+        workers = min(4, os.cpu_count() or 1)
+    if pin_memory is None:
+        pin_memory = torch.cuda.is_available()
+    sampler = RandomSampler(dataset) if shuffle else SequentialSampler(dataset)
+    return DataLoader(dataset, batch_size=None, sampler=BatchSampler(sampler, batch_size, drop_last),
+                      num_workers=workers, pin_memory=pin_memory, persistent_workers=workers > 0,
+                      prefetch_factor=4 if workers > 0 else None)
+
+
+# ============================================================================
+# 5. COMMAND LINE INTERFACE
+# ============================================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Preprocess MNIST IDX files into memory-mapped .npy files.')
+    parser.add_argument('--raw-dir', default=RAW_DIR, help='directory with the IDX files (default: data/mnist)')
+    parser.add_argument('--cache-dir', default=CACHE_DIR, help='output directory (default: data/.cache/mnist)')
+    parser.add_argument('--dtype', choices=DTYPES, default='uint8', help='stored image type')
+    parser.add_argument('--force', action='store_true', help='rebuild even if up to date')
+    args = parser.parse_args(argv)
+
+    for split in RAW_FILES:
+        path = preprocess(split, args.raw_dir, args.cache_dir, args.dtype, args.force)
+        dataset = MNISTMemmap(split, args.cache_dir, args.dtype)
+        print(f'{split}: {len(dataset)} images -> {path} ({os.path.getsize(path) / 1e6:.1f} MB)')
+
+
+if __name__ == '__main__':
+    main()
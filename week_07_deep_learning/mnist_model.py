@@ -0,0 +1,132 @@
+# MNIST model - CNN training on the memory-mapped dataset
+# The network and training loop of mnist_pytorch.ipynb, fed by mnist_data.py:
+# batches come straight from the memory-mapped files through a multi-worker
+# DataLoader, and are normalized once per batch with to_input().
+#
+# Usage:
+#   python -m week_07_deep_learning.mnist_data              # preprocess once
+#   python -m week_07_deep_learning.mnist_model --epochs 3 --workers 4
+#   python -m week_07_deep_learning.mnist_model --dtype float16 --batch-size 512 --save mnist_cnn.pt
+#   python -m week_07_deep_learning.mnist_model --epochs 1 --metrics metrics.jsonl --profile train.prof
+
+# ============================================================================
+# INDEX - Topics Covered in This File
+# ============================================================================
+# 1. The network
+# 2. Training and evaluation loops
+# 3. Command line interface
+# ============================================================================
+
+import argparse
+import time
+
+import torch
+from torch import nn
+
+from week_02_files_data_structures import instrumentation
+from week_07_deep_learning.mnist_data import (CACHE_DIR, DTYPES, RAW_DIR, MNISTMemmap, make_loader, preprocess,
+                                              to_input)
+
+
+# ============================================================================
+# 1. THE NETWORK
+# ============================================================================
+class MNISTNet(nn.Module):
+    """Two convolution blocks and two fully connected layers (~225k parameters)."""
+
+    def __init__(self):
+        super().__init__()
+        self.features = nn.Sequential(
+            nn.Conv2d(1, 32, 3), nn.ReLU(), nn.MaxPool2d(2),   # 28 -> 26 -> 13
+            nn.Conv2d(32, 64, 3), nn.ReLU(), nn.MaxPool2d(2),  # 13 -> 11 -> 5
+        )
+        self.classifier = nn.Sequential(
+            nn.Flatten(), nn.Linear(64 * 5 * 5, 128), nn.ReLU(), nn.Linear(128, 10),
+        )
+
+    def forward(self, x):
+        return self.classifier(self.features(x))
+
+
+# ============================================================================
+# 2. TRAINING AND EVALUATION LOOPS
+# ============================================================================
+@instrumentation.timed('mnist_model.train_epoch')
+def train_epoch(model, loader, optimizer, device='cpu'):
+    """One pass over `loader`; returns (mean loss, images per second)."""
+    model.train()
+    loss_fn = nn.CrossEntropyLoss()
+    total_loss = 0.0
+    seen = 0
+    start = time.perf_counter()
+    for images, labels in loader:
+        images = to_input(images.to(device, non_blocking=True))
+        labels = labels.to(device, non_blocking=True)
+        optimizer.zero_grad(set_to_none=True)
+        loss = loss_fn(model(images), labels)
+        loss.backward()
+        optimizer.step()
+        total_loss += loss.item() * len(labels)
+        seen += len(labels)
+    seconds = time.perf_counter() - start
+    instrumentation.add(rows=seen)
+    return total_loss / max(seen, 1), seen / seconds
+
+
+@instrumentation.timed('mnist_model.evaluate')
+@torch.no_grad()
+def evaluate(model, loader, device='cpu'):
+    """Return (accuracy, images per second)."""
+    model.eval()
+    correct = seen = 0
+    start = time.perf_counter()
+    for images, labels in loader:
+        predictions = model(to_input(images.to(device, non_blocking=True))).argmax(dim=1)
+        correct += (predictions == labels.to(device)).sum().item()
+        seen += len(labels)
+    instrumentation.add(rows=seen)
+    return correct / max(seen, 1), seen / (time.perf_counter() - start)
+
+
+# ============================================================================
+# 3. COMMAND LINE INTERFACE
+# ============================================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Train the MNIST CNN from memory-mapped data.')
+    parser.add_argument('--raw-dir', default=RAW_DIR, help='directory with the IDX files')
+    parser.add_argument('--cache-dir', default=CACHE_DIR, help='preprocessed data directory')
+    parser.add_argument('--dtype', choices=DTYPES, default='uint8', help='stored image type')
+    parser.add_argument('--epochs', type=int, default=3)
+    parser.add_argument('--batch-size', type=int, default=256)
+    parser.add_argument('--lr', type=float, default=1e-3)
+    parser.add_argument('--workers', type=int, help='DataLoader worker processes (default: min(4, CPUs))')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--save', help='write the trained state_dict to this file')
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args(argv)
+    with instrumentation.session(args):
+        _run(args)
+
+
+def _run(args):
+    torch.manual_seed(args.seed)
+    device = 'cuda' if torch.cuda.is_available() else 'cpu'
+    for split in ('train', 'test'):
+        preprocess(split, args.raw_dir, args.cache_dir, args.dtype)
+    train_loader = make_loader(MNISTMemmap('train', args.cache_dir, args.dtype), args.batch_size,
+                               shuffle=True, workers=args.workers)
+    test_loader = make_loader(MNISTMemmap('test', args.cache_dir, args.dtype), 1024,
+                              shuffle=False, workers=args.workers)
+
+    model = MNISTNet().to(device)
+    optimizer = torch.optim.Adam(model.parameters(), lr=args.lr)
+    for epoch in range(1, args.epochs + 1):
+        loss, train_rate = train_epoch(model, train_loader, optimizer, device)
+        accuracy, _ = evaluate(model, test_loader, device)
+        print(f'epoch {epoch}: loss {loss:.4f}  test accuracy {accuracy:.4f}  {train_rate:,.0f} images/s')
+    if args.save:
+        torch.save(model.state_dict(), args.save)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,323 @@
+# MNIST inference server - micro-batched, quantized, CPU only
+# Serves the CNN from mnist_model.py over HTTP. A forward pass over one image
+# costs almost as much as a pass over 32, so concurrent requests are collected
+# into micro-batches:
+#
+#   request -> asyncio.Queue -> batcher waits until max_batch_size images are
+#   queued or the oldest one has waited max_latency_ms -> one forward pass ->
+#   every request's future gets its own row of the result
+#
+# The forward pass runs in a worker thread (PyTorch releases the GIL), so the
+# event loop keeps accepting requests meanwhile; they form the next batch.
+# --max-latency-ms 0 never waits: each batch is whatever queued up during the
+# previous forward pass (lowest latency when the load is light).
+#
+# The model is prepared for CPU inference where the installed PyTorch allows:
+#   - dynamic int8 quantization of the Linear layers (quantize_dynamic)
+#   - TorchScript tracing (or torch.compile with --compile)
+# Each step falls back to the plain model with a warning if it is unavailable.
+# torch (and mnist_model.py, which needs it) is imported by load_model() and
+# the batcher, so decode_image() and the HTTP code import in milliseconds.
+#
+# Protocol: POST /predict with 784 raw bytes (28x28 uint8, row major) or JSON
+# {"pixels": [...784 numbers 0-255...]}; the reply is
+# {"digit": 7, "confidence": 0.998}. GET /health returns {"status": "ok"}.
+#
+# Usage:
+#   python -m week_07_deep_learning.mnist_server --model mnist_cnn.pt --port 8000
+#   python -m week_07_deep_learning.mnist_server --model mnist_cnn.pt --max-batch-size 64 --max-latency-ms 2
+#   python -m benchmarks.bench_mnist_server            # load generator
+
+# ============================================================================
+# INDEX - Topics Covered in This File
+# ============================================================================
+# 1. Preparing the model for CPU inference (quantization, TorchScript)
+# 2. Micro-batcher (asyncio queue)
+# 3. Minimal HTTP server
+# 4. Command line interface
+# ============================================================================
+
+import argparse
+import asyncio
+import json
+import time
+import warnings
+
+import numpy as np
+
+from week_07_deep_learning.mnist_data import to_input
+
+IMAGE_SHAPE = (28, 28)
+IMAGE_BYTES = IMAGE_SHAPE[0] * IMAGE_SHAPE[1]
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_MAX_LATENCY_MS = 2.0
+MAX_BODY_BYTES = 64 * 1024
+
+
+# ============================================================================
+# 1. PREPARING THE MODEL FOR CPU INFERENCE
+# ============================================================================
+def load_model(path=None, quantize=True, script=True, compile=False):
+    """Return (model, list of applied optimizations) ready for inference.
+
+    path     : state_dict saved by mnist_model.py (random weights if None)
+    quantize : int8 dynamic quantization of the Linear layers
+    script   : TorchScript trace (ignored when compile=True)
+    compile  : torch.compile instead of TorchScript
+    """
+    import torch
+    from torch import nn
+
+    from week_07_deep_learning.mnist_model import MNISTNet
+
+    model = MNISTNet()
+    if path:
+        model.load_state_dict(torch.load(path, map_location='cpu', weights_only=True))
+    model.eval()
+    applied = []
+    if quantize:
+        try:
+            model = torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+            applied.append('int8-dynamic')
+        except (AttributeError, RuntimeError) as e:
+            warnings.warn(f'dynamic quantization unavailable, using float32: {e}')
+    example = torch.zeros(1, 1, *IMAGE_SHAPE)
+    if compile:
+        try:
+            model = torch.compile(model)
+            with torch.inference_mode():
+                model(example)  # compile now, not on the first request
+            applied.append('torch.compile')
+        except Exception as e:  # missing compiler toolchain, unsupported platform, ...
+            warnings.warn(f'torch.compile failed, running eagerly: {e}')
+    elif script:
+        try:
+            with torch.inference_mode(False), torch.no_grad(), warnings.catch_warnings():
+                warnings.simplefilter('ignore')  # TorchScript deprecation notices
+                model = torch.jit.freeze(torch.jit.trace(model, example))
+            applied.append('torchscript')
+        except Exception as e:
+            warnings.warn(f'TorchScript tracing failed, running eagerly: {e}')
+    return model, applied
+
+
+def decode_image(body, content_type=''):
+    """784 raw bytes or JSON {"pixels": [...]} -> uint8 array of shape (28, 28).
+
+    The Content-Type decides which one the body is. Only without one is the
+    body taken as JSON when it starts with '{' (a raw image can start with
+    byte 123 too, so a request that says octet-stream is never sniffed).
+    """
+    if 'json' in content_type.lower() or (not content_type and body[:1] == b'{'):
+        pixels = np.asarray(json.loads(body)['pixels'], dtype=np.float32)
+        if pixels.size != IMAGE_BYTES or pixels.min() < 0 or pixels.max() > 255:
+            raise ValueError(f'expected {IMAGE_BYTES} pixel values between 0 and 255')
+        return pixels.astype(np.uint8).reshape(IMAGE_SHAPE)
+    if len(body) != IMAGE_BYTES:
+        raise ValueError(f'expected {IMAGE_BYTES} bytes, got {len(body)}')
+    return np.frombuffer(body, dtype=np.uint8).reshape(IMAGE_SHAPE)
+
+
+# ============================================================================
+# 2. MICRO-BATCHER
+# ============================================================================
+class MicroBatcher:
+    """Collects concurrent predict() calls into batches for one forward pass.
+
+    A batch is sent as soon as it has max_batch_size images, or when the
+    first image in it has waited max_latency_ms, whichever comes first. With
+    max_batch_size=1 every request gets its own forward pass (no batching).
+    """
+
+    def __init__(self, model, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_latency_ms=DEFAULT_MAX_LATENCY_MS):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency_ms / 1000
+        self.batches = 0
+        self.images = 0
+        self._queue = None
+        self._task = None
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def predict(self, image):
+        """Classify one (28, 28) uint8 image; returns (digit, confidence)."""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((image, future))
+        return await future
+
+    async def _collect(self):
+        batch = [await self._queue.get()]
+        deadline = time.perf_counter() + self.max_latency
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():  # take what is already waiting without yielding
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    def _infer(self, images):
+        import torch  # already loaded with the model; a dictionary lookup here
+
+        with torch.inference_mode():
+            batch = to_input(torch.from_numpy(np.stack(images))[:, None])
+            probabilities = torch.softmax(self.model(batch), dim=1)
+            confidence, digits = probabilities.max(dim=1)
+        return digits.tolist(), confidence.tolist()
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            futures = [future for _, future in batch]
+            try:
+                digits, confidence = await loop.run_in_executor(None, self._infer, [image for image, _ in batch])
+            except Exception as e:
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.batches += 1
+            self.images += len(batch)
+            for future, digit, score in zip(futures, digits, confidence):
+                if not future.done():  # the client may have gone away
+                    future.set_result((digit, score))
+
+
+# ============================================================================
+# 3. MINIMAL HTTP SERVER
+# ============================================================================
+# Just enough HTTP/1.1 for the load generator and curl: one request at a time
+# per connection, Content-Length bodies, keep-alive by default.
+async def read_request(reader):
+    """Return (method, path, headers, body), or None when the client closed the connection."""
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    method, path, _ = request_line.decode('latin1').split(' ', 2)
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get('content-length', 0))
+    if length > MAX_BODY_BYTES:
+        raise ValueError('request body too large')
+    body = await reader.readexactly(length) if length else b''
+    return method, path, headers, body
+
+
+def write_response(writer, status, payload, keep_alive=True):
+    body = json.dumps(payload).encode()
+    reason = {200: 'OK', 400: 'Bad Request', 404: 'Not Found'}.get(status, 'Error')
+    writer.write(f'HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n'
+                 f'Content-Length: {len(body)}\r\nConnection: {"keep-alive" if keep_alive else "close"}\r\n\r\n'
+                 .encode() + body)
+
+
+def make_handler(batcher):
+    async def handle(reader, writer):
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except (ValueError, asyncio.IncompleteReadError) as e:
+                    write_response(writer, 400, {'error': str(e)}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+                method, path, headers, body = request
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                if method == 'POST' and path == '/predict':
+                    try:
+                        image = decode_image(body, headers.get('content-type', ''))
+                    except (ValueError, KeyError) as e:
+                        write_response(writer, 400, {'error': str(e)}, keep_alive)
+                    else:
+                        digit, confidence = await batcher.predict(image)
+                        write_response(writer, 200, {'digit': digit, 'confidence': round(confidence, 6)}, keep_alive)
+                elif method == 'GET' and path == '/health':
+                    write_response(writer, 200, {'status': 'ok', 'batches': batcher.batches,
+                                                 'images': batcher.images}, keep_alive)
+                else:
+                    write_response(writer, 404, {'error': f'no route for {method} {path}'}, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+    return handle
+
+
+async def serve(model, host='127.0.0.1', port=8000, max_batch_size=DEFAULT_MAX_BATCH_SIZE,
+                max_latency_ms=DEFAULT_MAX_LATENCY_MS, ready=None):
+    """Run the HTTP server until cancelled.
+
+    `ready` (an asyncio.Future) receives the listening port, useful with port=0.
+    """
+    batcher = MicroBatcher(model, max_batch_size, max_latency_ms)
+    await batcher.start()
+    server = await asyncio.start_server(make_handler(batcher), host, port)
+    try:
+        if ready is not None:
+            ready.set_result(server.sockets[0].getsockname()[1])
+        async with server:
+            await server.serve_forever()
+    finally:
+        await batcher.stop()
+
+
+# ============================================================================
+# 4. COMMAND LINE INTERFACE
+# ============================================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve the MNIST CNN over HTTP with micro-batching.')
+    parser.add_argument('--model', help='state_dict from mnist_model.py --save (default: random weights)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--max-batch-size', type=int, default=DEFAULT_MAX_BATCH_SIZE)
+    parser.add_argument('--max-latency-ms', type=float, default=DEFAULT_MAX_LATENCY_MS,
+                        help='longest time a request waits for its batch to fill')
+    parser.add_argument('--no-quantize', action='store_true', help='keep float32 Linear layers')
+    parser.add_argument('--no-script', action='store_true', help='do not trace with TorchScript')
+    parser.add_argument('--compile', action='store_true', help='use torch.compile instead of TorchScript')
+    parser.add_argument('--threads', type=int, help='PyTorch intra-op threads (default: PyTorch default)')
+    args = parser.parse_args(argv)
+
+    if args.threads:
+        import torch
+
+        torch.set_num_threads(args.threads)
+    model, applied = load_model(args.model, quantize=not args.no_quantize, script=not args.no_script,
+                                compile=args.compile)
+    print(f'serving on http://{args.host}:{args.port} ({", ".join(applied) or "eager float32"}, '
+          f'batches up to {args.max_batch_size} / {args.max_latency_ms} ms)')
+    try:
+        asyncio.run(serve(model, args.host, args.port, args.max_batch_size, args.max_latency_ms))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+"""Week 8 final project: a DAG pipeline runner and the house price pipeline built with it."""
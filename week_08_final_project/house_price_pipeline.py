@@ -0,0 +1,276 @@
+# House price pipeline - the week 8 final project, end to end
+# From the raw CSV to trained models, evaluation and charts, declared as a DAG
+# of stages for pipeline.py. Each stage reads and writes files in the work
+# directory (default data/.cache/final_project):
+#
+#   ingest            house_prices.csv       -> houses.npz          (csv_reader chunks, one array per column)
+#   features          houses.npz             -> features.npz        (yes/no -> 0/1, one-hot text, train/test split)
+#   explore_plot      houses.npz             -> price_vs_area.png   (plot_helpers density plot)
+#   train_<model>     features.npz           -> <model>_model.pkl   (model_search estimators, one stage per model)
+#   evaluate_<model>  features.npz, model    -> <model>_metrics.json, <model>_predictions.npy
+#   report            every metrics file     -> report.json
+#   plot_predictions  features, predictions  -> predictions.png
+#
+# explore_plot runs next to features, and the models train and evaluate at the
+# same time (--workers). A second run with nothing changed skips every stage;
+# after a change only the stages it reaches run; after a failure the next run
+# continues from the stages that did not finish.
+#
+# Usage:
+#   python -m benchmarks.datasets house_prices 1000000        # a big synthetic input, if needed
+#   python -m week_08_final_project.house_price_pipeline data/house_prices.csv --workers 4
+#   python -m week_08_final_project.house_price_pipeline big.csv --on-error skip --max-errors 0.1%
+#   python -m week_08_final_project.house_price_pipeline data/house_prices.csv --rerun train_boosting
+#   python -m week_08_final_project.house_price_pipeline --list
+
+# ============================================================================
+# INDEX - Topics Covered in This File
+# ============================================================================
+# 1. Ingest: CSV to typed column arrays
+# 2. Feature engineering and the train/test split
+# 3. Training and evaluation
+# 4. Report and charts
+# 5. The DAG and command line interface
+# ============================================================================
+
+import argparse
+import json
+import os
+import pickle
+import time
+
+import numpy as np
+
+from week_02_files_data_structures import instrumentation
+from week_02_files_data_structures.column_cache import DATA_DIR
+from week_02_files_data_structures.csv_reader import (DEFAULT_CHUNK_SIZE, FAIL, SKIP, BadRows, infer_schema,
+                                                       parse_max_errors, read_chunks, to_numpy)
+from week_05_visualization.plot_helpers import DEFAULT_DPI, scatter_plot
+from week_06_ml_basics.house_price_model import BINARY_VALUES, DEFAULT_TARGET, ID_COLUMNS
+from week_06_ml_basics.model_search import make_estimator
+from week_08_final_project.pipeline import Pipeline, Stage, StageError
+
+DEFAULT_INPUT = os.path.join(DATA_DIR, 'house_prices.csv')
+DEFAULT_WORK_DIR = os.path.join(DATA_DIR, '.cache', 'final_project')
+DEFAULT_TEST_FRACTION = 0.2
+# name -> (model_search estimator, parameters, standardize the features first)
+MODELS = {
+    'ridge': ('ridge', {'alpha': 1.0}, True),
+    'boosting': ('sklearn.ensemble.HistGradientBoostingRegressor', {'max_iter': 200, 'random_state': 0}, False),
+}
+
+
+# ============================================================================
+# 1. INGEST: CSV TO TYPED COLUMN ARRAYS
+# ============================================================================
+def ingest(csv_path, table_path, on_error=FAIL, max_errors=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Stream the CSV with csv_reader and save every column as one array in an .npz file."""
+    schema = infer_schema(csv_path)
+    parts = {name: [] for name, _ in schema}
+    with BadRows(csv_path, on_error, max_errors) as bad_rows:
+        for chunk in read_chunks(csv_path, chunk_size=chunk_size, schema=schema, bad_rows=bad_rows):
+            for name, values in to_numpy(chunk).items():
+                # Text columns come back as object arrays; np.savez needs fixed-width strings.
+                parts[name].append(values.astype(str) if values.dtype == object else values)
+    if not any(parts.values()):
+        raise ValueError(f'{csv_path}: no data rows')
+    np.savez(table_path, **{name: np.concatenate(values) for name, values in parts.items()})
+
+
+# ============================================================================
+# 2. FEATURE ENGINEERING AND THE TRAIN/TEST SPLIT
+# ============================================================================
+def encode_column(name, values):
+    """(feature names, float64 columns) for one table column.
+
+    Numbers stay as they are, yes/no style text becomes 0/1 (BINARY_VALUES of
+    house_price_model.py), any other text one 0/1 column per value.
+    """
+    if values.dtype.kind in 'iuf':
+        return [name], [values.astype(np.float64)]
+    categories, codes = np.unique(np.char.lower(np.char.strip(values)), return_inverse=True)
+    if set(categories.tolist()) <= BINARY_VALUES.keys():
+        lookup = np.array([BINARY_VALUES[category] for category in categories.tolist()])
+        return [name], [lookup[codes]]
+    return ([f'{name}={category}' for category in categories.tolist()],
+            [(codes == code).astype(np.float64) for code in range(len(categories))])
+
+
+def build_features(table_path, features_path, target=DEFAULT_TARGET, test_fraction=DEFAULT_TEST_FRACTION, seed=0):
+    """Feature matrix and target from the table, split into seeded train and test rows.
+
+    Rows with a missing value are dropped, as in house_price_model.iter_xy().
+    """
+    with np.load(table_path) as table:
+        columns = {name: table[name] for name in table.files}
+    y = columns.pop(target).astype(np.float64)
+    names, matrix = [], []
+    for name, values in columns.items():
+        if name not in ID_COLUMNS:
+            column_names, column_values = encode_column(name, values)
+            names.extend(column_names)
+            matrix.extend(column_values)
+    X = np.column_stack(matrix)
+    keep = ~(np.isnan(X).any(axis=1) | np.isnan(y))
+    X, y = X[keep], y[keep]
+    order = np.random.default_rng(seed).permutation(len(y))
+    test, train = order[:int(len(y) * test_fraction)], order[int(len(y) * test_fraction):]
+    np.savez(features_path, X_train=X[train], y_train=y[train], X_test=X[test], y_test=y[test],
+             names=np.array(names))
+
+
+# ============================================================================
+# 3. TRAINING AND EVALUATION
+# ============================================================================
+def train(features_path, model_path, estimator, estimator_params=None, scale=False):
+    """Fit a model_search estimator on the training rows and pickle it."""
+    model = make_estimator(estimator, estimator_params or {}, scale)
+    with np.load(features_path) as features:
+        model.fit(features['X_train'], features['y_train'])
+    with open(model_path, 'wb') as f:
+        pickle.dump(model, f)
+
+
+def evaluate(features_path, model_path, metrics_path, predictions_path):
+    """Predict the test rows; write the predictions and {'rows', 'rmse', 'mae', 'r2'} as JSON."""
+    with open(model_path, 'rb') as f:
+        model = pickle.load(f)
+    with np.load(features_path) as features:
+        X, y = features['X_test'], features['y_test']
+    predictions = model.predict(X)
+    np.save(predictions_path, predictions)
+    residual = y - predictions
+    total = ((y - y.mean()) ** 2).sum()
+    metrics = {'rows': len(y), 'rmse': float(np.sqrt(np.mean(residual ** 2))), 'mae': float(np.abs(residual).mean()),
+               'r2': float(1 - residual @ residual / total) if total > 0 else float('nan')}
+    with open(metrics_path, 'w', encoding='utf-8') as f:
+        json.dump(metrics, f, indent=2)
+
+
+# ============================================================================
+# 4. REPORT AND CHARTS
+# ============================================================================
+def write_report(report_path, **metrics_paths):
+    """Collect the metrics of every model ({model name: metrics file}) in one JSON file."""
+    report = {}
+    for name, path in metrics_paths.items():
+        with open(path, encoding='utf-8') as f:
+            report[name] = json.load(f)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+
+def _new_figure(figsize):
+    from matplotlib.figure import Figure  # no pyplot: works in worker processes without a display
+
+    return Figure(figsize=figsize, dpi=DEFAULT_DPI, layout='tight')
+
+
+def plot_price_vs_area(table_path, figure_path, x='area', y=DEFAULT_TARGET):
+    """Price against area; a density plot above plot_helpers' scatter limit."""
+    with np.load(table_path) as table:
+        x_values, y_values = table[x], table[y]
+    fig = _new_figure((8, 5))
+    ax = fig.add_subplot()
+    scatter_plot(ax, x_values, y_values)
+    ax.set_xlabel(x)
+    ax.set_ylabel(y)
+    ax.set_title(f'{y} vs {x} ({len(y_values)} houses)')
+    fig.savefig(figure_path)
+
+
+def plot_predictions(features_path, figure_path, **predictions_paths):
+    """Predicted against actual test prices, one panel per model ({model name: predictions file})."""
+    with np.load(features_path) as features:
+        actual = features['y_test']
+    fig = _new_figure((5 * len(predictions_paths), 5))
+    low, high = actual.min(), actual.max()
+    for position, (name, path) in enumerate(predictions_paths.items(), 1):
+        ax = fig.add_subplot(1, len(predictions_paths), position)
+        scatter_plot(ax, actual, np.load(path))
+        ax.plot([low, high], [low, high], color='red', linewidth=1)
+        ax.set_xlabel(f'actual {DEFAULT_TARGET}')
+        ax.set_ylabel(f'predicted {DEFAULT_TARGET}')
+        ax.set_title(name)
+    fig.savefig(figure_path)
+
+
+# ============================================================================
+# 5. THE DAG AND COMMAND LINE INTERFACE
+# ============================================================================
+def build_pipeline(csv_path=DEFAULT_INPUT, work_dir=DEFAULT_WORK_DIR, models=MODELS, on_error=FAIL, max_errors=None,
+                   test_fraction=DEFAULT_TEST_FRACTION, seed=0):
+    """The week 8 pipeline for one input CSV file (see the table at the top of this file)."""
+    stages = [
+        Stage('ingest', ingest, {'csv_path': csv_path}, {'table_path': 'houses.npz'},
+              on_error=on_error, max_errors=max_errors),
+        Stage('features', build_features, {'table_path': 'houses.npz'}, {'features_path': 'features.npz'},
+              test_fraction=test_fraction, seed=seed),
+        Stage('explore_plot', plot_price_vs_area, {'table_path': 'houses.npz'}, {'figure_path': 'price_vs_area.png'}),
+    ]
+    for name, (estimator, params, scale) in models.items():
+        stages.append(Stage(f'train_{name}', train, {'features_path': 'features.npz'},
+                            {'model_path': f'{name}_model.pkl'}, estimator=estimator, estimator_params=params,
+                            scale=scale))
+        stages.append(Stage(f'evaluate_{name}', evaluate,
+                            {'features_path': 'features.npz', 'model_path': f'{name}_model.pkl'},
+                            {'metrics_path': f'{name}_metrics.json', 'predictions_path': f'{name}_predictions.npy'}))
+    stages.append(Stage('report', write_report, {name: f'{name}_metrics.json' for name in models},
+                        {'report_path': 'report.json'}))
+    stages.append(Stage('plot_predictions', plot_predictions,
+                        {'features_path': 'features.npz', **{name: f'{name}_predictions.npy' for name in models}},
+                        {'figure_path': 'predictions.png'}))
+    return Pipeline(stages, work_dir)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the week 8 house price pipeline, skipping finished stages.')
+    parser.add_argument('path', nargs='?', default=DEFAULT_INPUT, help='house prices CSV file')
+    parser.add_argument('--work-dir', default=DEFAULT_WORK_DIR, help='directory for the outputs and the manifest')
+    parser.add_argument('--workers', type=int, default=0,
+                        help='stages run at the same time (0 = one per CPU, 1 = one after the other in this process)')
+    parser.add_argument('--rerun', action='append', default=[], metavar='STAGE',
+                        help="run this stage even if it is up to date (repeatable; 'all' for every stage)")
+    parser.add_argument('--on-error', choices=[FAIL, SKIP], default=FAIL, help='what ingest does with a malformed row')
+    parser.add_argument('--max-errors', type=parse_max_errors, metavar='N',
+                        help='error budget for --on-error skip: a number of rows or a fraction (0.01 or 1%%)')
+    parser.add_argument('--test-fraction', type=float, default=DEFAULT_TEST_FRACTION, help='share of rows held out')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the train/test split')
+    parser.add_argument('--list', action='store_true', help='print the stages and their dependencies, run nothing')
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    pipeline = build_pipeline(args.path, args.work_dir, on_error=args.on_error, max_errors=args.max_errors,
+                              test_fraction=args.test_fraction, seed=args.seed)
+    if args.list:
+        print('\n'.join(pipeline.describe()))
+        return
+    unknown = [name for name in args.rerun if name != 'all' and name not in pipeline.stages]
+    if unknown:
+        parser.error(f'unknown stage(s): {", ".join(unknown)}')
+
+    log = []
+    start = time.perf_counter()
+    try:
+        with instrumentation.session(args):
+            pipeline.run(args.workers or os.cpu_count() or 1, args.rerun, log)
+    except StageError as error:
+        _print_log(log)
+        parser.exit(1, f'{error}\n')
+    _print_log(log)
+    print(f'{sum(status == "ran" for _, status, _ in log)} of {len(log)} stages ran '
+          f'in {time.perf_counter() - start:.2f} s; outputs in {args.work_dir}')
+    with open(os.path.join(args.work_dir, 'report.json'), encoding='utf-8') as f:
+        report = json.load(f)
+    for name, metrics in report.items():
+        print(f'  {name:<12} rows={metrics["rows"]}  rmse={metrics["rmse"]:.4g}  mae={metrics["mae"]:.4g}  '
+              f'r2={metrics["r2"]:.4f}')
+
+
+def _print_log(log):
+    for name, status, seconds in log:
+        print(f'  {name:<20} {status:<8} {seconds:8.2f} s')
+
+
+if __name__ == '__main__':
+    main()
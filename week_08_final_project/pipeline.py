@@ -0,0 +1,317 @@
+# Pipeline runner - a DAG of stages with file artifacts
+# Runs the steps of a project as a directed acyclic graph (DAG). Every stage
+# declares the files it reads (inputs) and the files it writes (outputs); a
+# stage that reads another stage's output depends on that stage. From this:
+#
+#   order       -> a stage starts as soon as the stages it depends on are done
+#   parallelism -> stages that do not depend on each other run at the same
+#                  time on a process pool (workers > 1)
+#   skipping    -> a stage's key is a hash of its name, parameters, code and
+#                  the CONTENT of its input files; a stage whose key and output
+#                  files match the manifest is not run again
+#   resuming    -> the manifest is saved after every finished stage, so after
+#                  a failure the next run starts with the stages that did not finish
+#
+# Keys use content hashes, not timestamps: a stage that runs again and writes
+# the same bytes as before (e.g. ingest after `touch data.csv`) does not make
+# the stages after it run. File hashes are remembered with the file's size and
+# mtime, so an unchanged file is not read again (as in column_cache.py).
+#
+# Outputs are written to a temporary directory and moved into place only when
+# the stage succeeded, so a failed or interrupted stage never leaves a file that
+# looks finished. When a stage fails, no new stage is started, the running ones
+# are allowed to finish (and are kept), and StageError is raised.
+#
+# The code part of the key is code_fingerprint() (week 2): the stage function,
+# its defaults, the constants it reads and the project helpers it calls, such
+# as model_search.make_estimator, so editing any of them runs the stage again.
+#
+# Usage: see house_price_pipeline.py, which declares the week 8 pipeline.
+
+# ============================================================================
+# INDEX - Topics Covered in This File
+# ============================================================================
+# 1. Stages and artifacts
+# 2. Content hashes and the manifest
+# 3. The DAG: order, skipping, parallel runs and resuming
+# 4. Running a stage (worker process or this one)
+# ============================================================================
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+
+from week_02_files_data_structures.code_fingerprint import code_fingerprint
+from week_02_files_data_structures.column_cache import file_hash
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+PARTIAL_DIR = '.partial'  # inside the work directory: outputs of stages that have not finished
+RERUN_ALL = 'all'
+
+
+# ============================================================================
+# 1. STAGES AND ARTIFACTS
+# ============================================================================
+class Stage:
+    """One step of the DAG: `func(**inputs, **outputs, **params)` writes the output files.
+
+    inputs  : {argument name: file}; a file written by another stage is given
+              by its name in the work directory, any other file by its path
+    outputs : {argument name: file name} written by the stage into the work directory
+    params  : keyword arguments passed to func as they are; part of the stage
+              key, so they must be JSON serializable
+    func must be a module-level function, so a worker process can import it.
+    """
+
+    __slots__ = ('name', 'func', 'inputs', 'outputs', 'params')
+
+    def __init__(self, name, func, inputs=None, outputs=None, **params):
+        self.name = name
+        self.func = func
+        self.inputs = dict(inputs or {})
+        self.outputs = dict(outputs or {})
+        self.params = params
+
+    def __repr__(self):
+        return f'Stage({self.name!r})'
+
+
+class StageError(RuntimeError):
+    """A stage raised or did not write all of its outputs."""
+
+
+# ============================================================================
+# 2. CONTENT HASHES AND THE MANIFEST
+# ============================================================================
+class Manifest:
+    """What the work directory holds, saved as JSON next to the outputs.
+
+    files  : absolute path -> {'size', 'mtime_ns', 'hash'}; a file whose size
+             and mtime still match is not hashed again
+    stages : stage name -> {'key', 'outputs': {file name: hash}, 'seconds', 'finished'}
+    A manifest of another version is ignored, which runs every stage again.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = {}
+        if data.get('version') != MANIFEST_VERSION:
+            data = {}
+        self.files = data.get('files', {})
+        self.stages = data.get('stages', {})
+
+    def file_hash(self, path):
+        """Content hash of `path`, from the manifest if the file has not changed since."""
+        path = os.path.abspath(path)
+        info = os.stat(path)
+        entry = self.files.get(path)
+        if entry is not None and entry['size'] == info.st_size and entry['mtime_ns'] == info.st_mtime_ns:
+            return entry['hash']
+        digest = file_hash(path)
+        self.files[path] = {'size': info.st_size, 'mtime_ns': info.st_mtime_ns, 'hash': digest}
+        return digest
+
+    def is_done(self, name, key, outputs):
+        """True if stage `name` finished with this key and its outputs ({file name: path}) are unchanged."""
+        entry = self.stages.get(name)
+        if entry is None or entry['key'] != key:
+            return False
+        return all(os.path.exists(path) and self.file_hash(path) == entry['outputs'].get(file)
+                   for file, path in outputs.items())
+
+    def record(self, name, key, outputs, seconds):
+        self.stages[name] = {'key': key, 'seconds': round(seconds, 3), 'finished': time.time(),
+                             'outputs': {file: self.file_hash(path) for file, path in outputs.items()}}
+
+    def save(self):
+        """Write the manifest atomically (temporary file + rename)."""
+        temporary = f'{self.path}.tmp'
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION, 'files': self.files, 'stages': self.stages}, f, indent=1)
+        os.replace(temporary, self.path)
+
+
+# ============================================================================
+# 3. THE DAG: ORDER, SKIPPING, PARALLEL RUNS AND RESUMING
+# ============================================================================
+def topological_order(dependencies):
+    """Names from {name: names it depends on}, every one after its dependencies.
+
+    Ties keep the order of `dependencies`. Raises ValueError on a cycle.
+    """
+    order, done = [], set()
+    remaining = dict(dependencies)
+    while remaining:
+        ready = [name for name, needs in remaining.items() if done.issuperset(needs)]
+        if not ready:
+            raise ValueError(f'dependency cycle between stages: {", ".join(remaining)}')
+        for name in ready:
+            order.append(name)
+            done.add(name)
+            del remaining[name]
+    return order
+
+
+class Pipeline:
+    """Stages connected by their files, and the work directory their outputs go to."""
+
+    def __init__(self, stages, work_dir):
+        self.work_dir = work_dir
+        self.stages = {}
+        self.producers = {}  # output file name -> name of the stage that writes it
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f'two stages are called {stage.name!r}')
+            self.stages[stage.name] = stage
+            for file in stage.outputs.values():
+                if file in self.producers:
+                    raise ValueError(f'{file} is written by both {self.producers[file]!r} and {stage.name!r}')
+                self.producers[file] = stage.name
+        self.dependencies = {
+            stage.name: sorted({self.producers[file] for file in stage.inputs.values() if file in self.producers})
+            for stage in stages}
+        self.order = topological_order(self.dependencies)
+
+    def path(self, file):
+        """Where a file named in a stage's inputs or outputs is."""
+        return os.path.join(self.work_dir, file) if file in self.producers else file
+
+    def describe(self):
+        """One line per stage in run order: name, the stages it waits for, its outputs."""
+        lines = []
+        for name in self.order:
+            needs = ', '.join(self.dependencies[name]) or '-'
+            lines.append(f'{name:<20} after: {needs:<32} writes: {", ".join(self.stages[name].outputs.values())}')
+        return lines
+
+    def key(self, stage, manifest):
+        """Hash of the stage's name, parameters, code and input file contents."""
+        inputs = {}
+        for argument, file in stage.inputs.items():
+            path = self.path(file)
+            if not os.path.exists(path):
+                raise StageError(f'stage {stage.name!r}: input {path} does not exist')
+            inputs[argument] = manifest.file_hash(path)
+        text = json.dumps([stage.name, stage.params, code_fingerprint(stage.func), inputs, stage.outputs],
+                          sort_keys=True, default=str)
+        return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+    def run(self, workers=1, rerun=(), log=None):
+        """Run every stage that is not up to date; return the log.
+
+        workers : stages run at the same time, each in its own process
+                  (1 = one after the other in this process)
+        rerun   : names of stages to run even if they are up to date ('all': every stage)
+        log     : list to append (stage name, status, seconds) to, in the order
+                  stages finish; status is 'skipped' (up to date), 'ran',
+                  'failed' or 'not run' (after another stage failed)
+        """
+        log = [] if log is None else log
+        os.makedirs(self.work_dir, exist_ok=True)
+        manifest = Manifest(os.path.join(self.work_dir, MANIFEST_NAME))
+        executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else _InProcess()
+        waiting = list(self.order)
+        finished = set()
+        running = {}  # future -> (stage, key, temporary directory)
+        failures = []
+        try:
+            while True:
+                if not failures:
+                    self._start_ready(waiting, finished, running, workers, executor, manifest, rerun, log)
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, key, partial = running.pop(future)
+                    try:
+                        seconds = future.result()
+                        self._commit(stage, key, partial, seconds, manifest)
+                    except Exception as error:
+                        failures.append((stage.name, error))
+                        log.append((stage.name, 'failed', 0.0))
+                        continue
+                    finished.add(stage.name)
+                    log.append((stage.name, 'ran', seconds))
+        finally:
+            executor.shutdown()
+            manifest.save()
+            try:
+                os.rmdir(os.path.join(self.work_dir, PARTIAL_DIR))
+            except OSError:  # not there, or a failed stage's partial outputs are left to look at
+                pass
+        log.extend((name, 'not run', 0.0) for name in waiting)
+        if failures:
+            name, error = failures[0]
+            raise StageError(f'stage {name!r} failed: {error!r}; {len(finished)} finished stages are kept, '
+                             f'run again to resume') from error
+        return log
+
+    def _start_ready(self, waiting, finished, running, workers, executor, manifest, rerun, log):
+        # `waiting` is in topological order, so a skipped stage makes the
+        # stages after it ready within the same pass.
+        for name in list(waiting):
+            if len(running) >= workers:
+                return
+            if not finished.issuperset(self.dependencies[name]):
+                continue
+            waiting.remove(name)
+            stage = self.stages[name]
+            key = self.key(stage, manifest)
+            outputs = {file: self.path(file) for file in stage.outputs.values()}
+            if name not in rerun and RERUN_ALL not in rerun and manifest.is_done(name, key, outputs):
+                finished.add(name)
+                log.append((name, 'skipped', 0.0))
+                continue
+            partial = os.path.join(self.work_dir, PARTIAL_DIR, name)
+            shutil.rmtree(partial, ignore_errors=True)
+            os.makedirs(partial)
+            kwargs = {argument: self.path(file) for argument, file in stage.inputs.items()}
+            kwargs.update((argument, os.path.join(partial, file)) for argument, file in stage.outputs.items())
+            kwargs.update(stage.params)
+            running[executor.submit(_run_stage, stage.func, kwargs)] = (stage, key, partial)
+
+    def _commit(self, stage, key, partial, seconds, manifest):
+        """Move a finished stage's outputs into place and record it in the manifest."""
+        missing = [file for file in stage.outputs.values() if not os.path.exists(os.path.join(partial, file))]
+        if missing:
+            raise StageError(f'stage {stage.name!r} did not write {", ".join(missing)}')
+        outputs = {}
+        for file in stage.outputs.values():
+            outputs[file] = self.path(file)
+            os.replace(os.path.join(partial, file), outputs[file])
+        shutil.rmtree(partial, ignore_errors=True)
+        manifest.record(stage.name, key, outputs, seconds)
+        manifest.save()
+
+
+# ============================================================================
+# 4. RUNNING A STAGE
+# ============================================================================
+def _run_stage(func, kwargs):
+    # Runs in a worker process (in this one with workers=1); returns the seconds it took.
+    started = time.perf_counter()
+    func(**kwargs)
+    return time.perf_counter() - started
+
+
+class _InProcess:
+    """The part of the executor interface run() uses, running each stage at submit()."""
+
+    def submit(self, func, *args):
+        future = Future()
+        try:
+            future.set_result(func(*args))
+        except Exception as error:
+            future.set_exception(error)
+        return future
+
+    def shutdown(self):
+        pass